@@ -7,6 +7,7 @@ import logging
 from openai import AsyncOpenAI
 from pydantic import BaseModel, Field
 from dataclasses import dataclass
+from contextvars import ContextVar
 import os
 
 from langgraph.graph import StateGraph, START, END
@@ -17,10 +18,8 @@ logger = logging.getLogger(__name__)
 
 from config.settings import settings
 
-from utils.state_serializer import (
-    create_agent_response,
-    serialize_state_with_datetime
-)
+from utils.state_serializer import create_agent_response
+from utils.state_delta import state_payload
 
 from schemas.chat import ChatMessage, MessageRole, AssetReference
 from schemas.agent_responses import AgentResponse, StatusResponse
@@ -43,11 +42,30 @@ VECTOR_STORE_ID = os.getenv("VECTOR_STORE_ID", "vs_68347e57e7408191a5a775f40db83
 # Initialize OpenAI client
 client = AsyncOpenAI(api_key=OPENAI_API_KEY)
 
-# Module-level service instances
-_mission_service: Optional[MissionService] = None
-_session_service: Optional[UserSessionService] = None
-_state_transition_service: Optional[StateTransitionService] = None
-_user_id: Optional[int] = None
+@dataclass
+class AgentContext:
+    """Per-request services and identity for agent nodes, taken from the graph config"""
+    mission_service: Optional[MissionService] = None
+    session_service: Optional[UserSessionService] = None
+    state_transition_service: Optional[StateTransitionService] = None
+    user_id: Optional[int] = None
+    request_id: str = "unknown"
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "AgentContext":
+        configurable = config.get('configurable', {})
+        return cls(
+            mission_service=configurable.get('mission_service'),
+            session_service=configurable.get('session_service'),
+            state_transition_service=configurable.get('state_transition_service'),
+            user_id=configurable.get('user_id'),
+            request_id=configurable.get('request_id', "unknown")
+        )
+
+
+# Context of the graph invocation currently running. Each chat stream runs in
+# its own task, so concurrent streams in one worker never see each other's services.
+_agent_context: ContextVar[AgentContext] = ContextVar("agent_context", default=AgentContext())
 
 
 class State(BaseModel):
@@ -66,14 +84,11 @@ class State(BaseModel):
 # Helper Functions
 # ---------------------------------------------------------------------------
 
-def _initialize_services(config: Dict[str, Any]) -> None:
-    """Initialize module-level services from config"""
-    global _mission_service, _session_service, _state_transition_service, _user_id
-    configurable = config.get('configurable', {})
-    _mission_service = configurable.get('mission_service')
-    _session_service = configurable.get('session_service')
-    _state_transition_service = configurable.get('state_transition_service')
-    _user_id = configurable.get('user_id')
+def _initialize_services(config: Dict[str, Any]) -> AgentContext:
+    """Bind the services from this invocation's config to the current context"""
+    context = AgentContext.from_config(config)
+    _agent_context.set(context)
+    return context
 
 async def _update_mission_unified(state: State, mission_id: str = None) -> None:
     """
@@ -84,20 +99,21 @@ async def _update_mission_unified(state: State, mission_id: str = None) -> None:
         mission_id: Optional. If provided and state.mission exists, persists the mission before refreshing.
                     Also sets the ID for the mission to be refreshed into the state.
     """
-    if not _mission_service or not _user_id:
+    context = _agent_context.get()
+    if not context.mission_service or not context.user_id:
         logger.warning("Cannot update mission - services not initialized")
         return
         
     # Step 1: If mission_id is provided and there's a mission object, persist it.
     if mission_id and state.mission:
-        await _mission_service.update_mission(mission_id, _user_id, state.mission)
+        await context.mission_service.update_mission(mission_id, context.user_id, state.mission)
         logger.debug(f"Successfully persisted mission {mission_id}")
     
     # Step 2: Determine which mission to refresh from the database.
     id_to_refresh = mission_id or (state.mission.id if state.mission else None)
     
     if id_to_refresh:
-        updated_mission = await _mission_service.get_mission(id_to_refresh, _user_id)
+        updated_mission = await context.mission_service.get_mission(id_to_refresh, context.user_id)
         if updated_mission:
             state.mission = updated_mission
             state.mission_id = updated_mission.id  # Ensure ID consistency
@@ -107,14 +123,15 @@ async def _update_mission_unified(state: State, mission_id: str = None) -> None:
 
 async def _send_to_state_transition_service(transaction_type: TransactionType, data: Dict[str, Any]) -> TransactionResult:
     """Helper function to send any proposal to StateTransitionService"""
-    if not (_state_transition_service and _user_id):
+    context = _agent_context.get()
+    if not (context.state_transition_service and context.user_id):
         raise StateTransitionError("StateTransitionService not initialized")
     
     # Add user_id to data if not present
     if 'user_id' not in data:
-        data['user_id'] = _user_id
+        data['user_id'] = context.user_id
     
-    return await _state_transition_service.updateState(transaction_type, data)
+    return await context.state_transition_service.updateState(transaction_type, data)
 
 async def _handle_mission_proposal_creation(parsed_response, state: State, response_message: ChatMessage) -> None:
     """Handle mission proposal: 1) LLM generated proposal, 2) Send to StateTransitionService"""
@@ -214,6 +231,24 @@ async def _handle_implementation_plan_proposal(parsed_response, state: State, re
         response_message.content = f"Error creating implementation plan: {str(e)}"
         raise e
 
+class _TokenStream:
+    """Forwards response text tokens from a streaming prompt call to the StreamWriter"""
+
+    def __init__(self, writer: StreamWriter):
+        self.writer = writer
+        self.streamed = False
+
+    def __call__(self, token: str) -> None:
+        self.streamed = True
+        self.writer(AgentResponse(
+            token=token,
+            response_text=None,
+            payload=None,
+            status=None,
+            error=None,
+            debug=None
+        ).model_dump())
+
 def _validate_state_coordination(mission: Optional[Mission]) -> List[str]:
     """
     Validate state coordination per the status system specification.
@@ -282,21 +317,21 @@ async def supervisor_node(state: State, writer: StreamWriter, config: Dict[str,
         "Initializing services from config",
         extra={"request_id": request_id, "config_keys": list(config.keys())}
     )
-    _initialize_services(config)
+    context = _initialize_services(config)
     logger.debug(
         "Services initialization complete",
         extra={
             "request_id": request_id,
-            "mission_service_ready": _mission_service is not None,
-            "state_transition_service_ready": _state_transition_service is not None,
-            "user_id": _user_id
+            "mission_service_ready": context.mission_service is not None,
+            "state_transition_service_ready": context.state_transition_service is not None,
+            "user_id": context.user_id
         }
     )
     
     if writer:
         status_response = StatusResponse(
             status="supervisor_routing",
-            payload=serialize_state_with_datetime(state),
+            payload=state_payload(state),
             error=None,
             debug="Supervisor analyzing mission and hop status to determine routing"
         )
@@ -476,7 +511,7 @@ async def supervisor_node(state: State, writer: StreamWriter, config: Dict[str,
                 status="supervisor_routing_completed",
                 error=None,
                 debug=f"Mission: {state.mission.status if state.mission else 'No mission'}, Hop: {state.mission.current_hop.status if state.mission and state.mission.current_hop else 'No current hop'}, Routing to: {next_node}",
-                payload=serialize_state_with_datetime(State(**state_update))
+                payload=state_payload(State(**state_update))
             )
             writer(agent_response.model_dump())
 
@@ -487,7 +522,7 @@ async def supervisor_node(state: State, writer: StreamWriter, config: Dict[str,
             error_response = AgentResponse(
                 token=None,
                 response_text=None,
-                payload=serialize_state_with_datetime(state),
+                payload=state_payload(state),
                 status="supervisor_error",
                 error=str(e),
                 debug=f"Error in supervisor_node: {type(e).__name__}"
@@ -515,7 +550,7 @@ async def mission_specialist_node(state: State, writer: StreamWriter, config: Di
     if writer:
         status_response = StatusResponse(
             status="mission_specialist_starting",
-            payload=serialize_state_with_datetime(state),
+            payload=state_payload(state),
             error=None,
             debug="Mission specialist node starting analysis"
         )
@@ -528,10 +563,12 @@ async def mission_specialist_node(state: State, writer: StreamWriter, config: Di
             extra={"request_id": request_id, "has_mission": bool(state.mission)}
         )
         promptCaller = MissionDefinitionPromptCaller()
+        token_stream = _TokenStream(writer) if writer else None
         
         parsed_response = await promptCaller.invoke(
             mission=state.mission,
-            messages=state.messages
+            messages=state.messages,
+            on_token=token_stream
         )
 
         logger.debug(
@@ -587,7 +624,7 @@ async def mission_specialist_node(state: State, writer: StreamWriter, config: Di
         if writer:
             # Send simplified response without proposal payload
             agent_response = AgentResponse(**create_agent_response(
-                token=response_message.content[0:100],
+                token=None if token_stream.streamed else response_message.content[0:100],
                 response_text=response_message.content,
                 status="mission_specialist_completed",
                 payload={},  # No proposal payload - mission is now directly in state
@@ -609,7 +646,7 @@ async def mission_specialist_node(state: State, writer: StreamWriter, config: Di
             error_response = AgentResponse(
                 token=None,
                 response_text=None,
-                payload=serialize_state_with_datetime(state),
+                payload=state_payload(state),
                 status="mission_specialist_error",
                 error=str(e),
                 debug=error_traceback
@@ -635,7 +672,7 @@ async def hop_designer_node(state: State, writer: StreamWriter, config: Dict[str
     if writer:
         status_response = StatusResponse(
             status="hop_designer_started",
-            payload=serialize_state_with_datetime(state),
+            payload=state_payload(state),
             error=None,
             debug="Hop designer node started - analyzing mission requirements"
         )
@@ -644,10 +681,12 @@ async def hop_designer_node(state: State, writer: StreamWriter, config: Dict[str
     try:
         # Create and use the simplified prompt caller
         promptCaller = HopDesignerPromptCaller()
+        token_stream = _TokenStream(writer) if writer else None
         
         parsed_response = await promptCaller.invoke(
             mission=state.mission,
-            messages=state.messages
+            messages=state.messages,
+            on_token=token_stream
         )
 
         # Create response message
@@ -688,7 +727,7 @@ async def hop_designer_node(state: State, writer: StreamWriter, config: Dict[str
         if writer:
             # Send simplified response without proposal payload
             agent_response = AgentResponse(**create_agent_response(
-                token=response_message.content[0:100],
+                token=None if token_stream.streamed else response_message.content[0:100],
                 response_text=response_message.content,
                 status="hop_designer_completed",
                 debug=f"Response type: {parsed_response.response_type}, Hop status: {state.mission.current_hop.status if state.mission.current_hop else 'No hop'}, {state.mission.current_hop.name if state.mission.current_hop else 'No hop name'}",
@@ -710,7 +749,7 @@ async def hop_designer_node(state: State, writer: StreamWriter, config: Dict[str
             error_response = AgentResponse(
                 token=None,
                 response_text=None,
-                payload=serialize_state_with_datetime(state),
+                payload=state_payload(state),
                 status="hop_designer_error",
                 error=str(e),
                 debug=error_traceback
@@ -733,7 +772,7 @@ async def hop_implementer_node(state: State, writer: StreamWriter, config: Dict[
     if writer:
         status_response = StatusResponse(
             status="hop_implementer_starting",
-            payload=serialize_state_with_datetime(state),
+            payload=state_payload(state),
             error=None,
             debug="Hop implementer node starting - analyzing hop implementation"
         )
@@ -747,8 +786,10 @@ async def hop_implementer_node(state: State, writer: StreamWriter, config: Dict[
 
         # Step 1: Generate proposal from LLM
         promptCaller = HopImplementerPromptCaller()
+        token_stream = _TokenStream(writer) if writer else None
         parsed_response: HopImplementationResponse = await promptCaller.invoke(
-            mission=state.mission
+            mission=state.mission,
+            on_token=token_stream
         )
 
         # Create response message
@@ -786,7 +827,7 @@ async def hop_implementer_node(state: State, writer: StreamWriter, config: Dict[
 
         if writer:
             agent_response = AgentResponse(**create_agent_response(
-                token=response_message.content[0:100],
+                token=None if token_stream.streamed else response_message.content[0:100],
                 response_text=response_message.content,
                 status="hop_implementer_completed",
                 payload={},
@@ -808,7 +849,7 @@ async def hop_implementer_node(state: State, writer: StreamWriter, config: Dict[
             error_response = AgentResponse(
                 token=None,
                 response_text=None,
-                payload=serialize_state_with_datetime(state),
+                payload=state_payload(state),
                 status="hop_implementer_error",
                 error=str(e),
                 debug=error_traceback
@@ -828,7 +869,7 @@ async def asset_search_node(state: State, writer: StreamWriter, config: Dict[str
     if writer:
         status_response = StatusResponse(
             status="asset_search_starting",
-            payload=serialize_state_with_datetime(state),
+            payload=state_payload(state),
             error=None,
             debug="Asset search node starting - preparing to search for assets"
         )
@@ -890,7 +931,7 @@ async def asset_search_node(state: State, writer: StreamWriter, config: Dict[str
                 status="asset_search_completed",
                 error=None,
                 debug=f"Found {len(search_results)} search results for query: {search_params['query']}",
-                payload=serialize_state_with_datetime(State(**state_update))
+                payload=state_payload(State(**state_update))
             )
             writer(agent_response.model_dump())
 
@@ -902,7 +943,7 @@ async def asset_search_node(state: State, writer: StreamWriter, config: Dict[str
             error_response = AgentResponse(
                 token=None,
                 response_text=None,
-                payload=serialize_state_with_datetime(state),
+                payload=state_payload(state),
                 status="asset_search_error",
                 error=str(e),
                 debug=f"Error in asset_search_node: {type(e).__name__}"
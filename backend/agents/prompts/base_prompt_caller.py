@@ -1,4 +1,4 @@
-from typing import Dict, Any, List, Optional, Union, Type
+from typing import Dict, Any, List, Optional, Union, Type, Callable, Tuple
 from pydantic import BaseModel, create_model, Field
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.output_parsers import PydanticOutputParser
@@ -7,7 +7,9 @@ import httpx
 from schemas.chat import ChatMessage
 from utils.message_formatter import format_langchain_messages, format_messages_for_openai
 from utils.prompt_logger import log_prompt_messages
+from utils.partial_json import JsonFieldStreamer
 from config.llm_models import get_model_capabilities, supports_reasoning_effort, supports_temperature, get_valid_reasoning_efforts
+import inspect
 import json
 
 # Available OpenAI models (as of January 2025)
@@ -42,11 +44,18 @@ def get_shared_openai_client():
     return _shared_openai_client
 
 
+def _cached_prompt_tokens(usage: Any) -> int:
+    details = getattr(usage, "prompt_tokens_details", None) if usage else None
+    return getattr(details, "cached_tokens", None) or 0
+
+
 class LLMUsage(BaseModel):
     """Token usage information from LLM calls"""
     prompt_tokens: int = 0
     completion_tokens: int = 0
     total_tokens: int = 0
+    cached_prompt_tokens: int = 0  # Prompt tokens served from the provider's prompt cache
+    prompt_tokens_saved: int = 0  # Estimated prompt tokens saved by prompt compilation, where a caller compiles prompts
 
 
 class LLMResponse(BaseModel):
@@ -229,6 +238,9 @@ class BasePromptCaller:
         model: Optional[str] = None,
         temperature: Optional[float] = None,
         reasoning_effort: Optional[str] = None,
+        on_token: Optional[Callable[[str], Any]] = None,
+        stream_field: str = "response_content",
+        prompt_messages: Optional[List[Dict[str, str]]] = None,
         **kwargs: Dict[str, Any]
     ) -> Union[BaseModel, LLMResponse]:
         """
@@ -241,6 +253,11 @@ class BasePromptCaller:
             model: Override the model for this call (optional)
             temperature: Override the temperature for this call (optional)
             reasoning_effort: Override the reasoning effort for this call (optional)
+            on_token: Callback (sync or async) receiving text of stream_field as it is generated.
+                When set, the completion is streamed; the full object is still validated at the end.
+            stream_field: Top-level string field of the response to forward to on_token
+            prompt_messages: Already compiled messages in OpenAI format (optional). When set,
+                they are sent as-is instead of rendering the prompt template.
             **kwargs: Additional variables to format into the prompt
             
         Returns:
@@ -252,7 +269,10 @@ class BasePromptCaller:
             messages = []
         
         # Format messages
-        formatted_messages = self.get_formatted_messages(messages, **kwargs)
+        if prompt_messages is not None:
+            formatted_messages = prompt_messages
+        else:
+            formatted_messages = self.get_formatted_messages(messages, **kwargs)
         
         # Log prompt if requested
         if log_prompt:
@@ -314,21 +334,64 @@ class BasePromptCaller:
             print(f"Note: Temperature parameter not supported for model {use_model} with reasoning_effort")
         
         # Call OpenAI
-        response = await self.client.chat.completions.create(**api_params)
+        if on_token:
+            response_text, usage = await self._stream_completion(api_params, on_token, stream_field)
+        else:
+            response = await self.client.chat.completions.create(**api_params)
+            response_text = response.choices[0].message.content
+            usage = response.usage
         
         # Parse response
-        response_text = response.choices[0].message.content
         parsed_result = self.parser.parse(response_text)
         
         # Extract usage information
         usage_info = LLMUsage(
-            prompt_tokens=response.usage.prompt_tokens if response.usage else 0,
-            completion_tokens=response.usage.completion_tokens if response.usage else 0,
-            total_tokens=response.usage.total_tokens if response.usage else 0
+            prompt_tokens=usage.prompt_tokens if usage else 0,
+            completion_tokens=usage.completion_tokens if usage else 0,
+            total_tokens=usage.total_tokens if usage else 0,
+            cached_prompt_tokens=_cached_prompt_tokens(usage)
         )
         
         # Return based on return_usage flag
         if return_usage:
             return LLMResponse(result=parsed_result, usage=usage_info)
         else:
-            return parsed_result 
\ No newline at end of file
+            return parsed_result 
+
+    async def _stream_completion(
+        self,
+        api_params: Dict[str, Any],
+        on_token: Callable[[str], Any],
+        stream_field: str
+    ) -> Tuple[str, Any]:
+        """
+        Stream a chat completion, forwarding stream_field text to on_token as it arrives.
+
+        Returns:
+            Tuple of (full response text, usage or None)
+        """
+        stream = await self.client.chat.completions.create(
+            **api_params,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+
+        streamer = JsonFieldStreamer(stream_field)
+        chunks: List[str] = []
+        usage = None
+        async for chunk in stream:
+            if chunk.usage:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            content = chunk.choices[0].delta.content
+            if not content:
+                continue
+            chunks.append(content)
+            text = streamer.feed(content)
+            if text:
+                result = on_token(text)
+                if inspect.isawaitable(result):
+                    await result
+
+        return ''.join(chunks), usage
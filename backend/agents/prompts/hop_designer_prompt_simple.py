@@ -5,6 +5,7 @@ from datetime import datetime
 from schemas.workflow import Mission
 from schemas.lite_models import HopLite
 
+from config.settings import settings
 from utils.message_formatter import format_tool_descriptions_for_hop_design
 from .base_prompt_caller import BasePromptCaller
 
@@ -277,8 +278,14 @@ Based on the provided context, design the next hop in the mission workflow. Use
         Returns:
             Parsed response as a HopDesignResponse
         """
-        # Format tool descriptions
-        tool_descriptions = format_tool_descriptions_for_hop_design()
+        # Format tool descriptions (optionally only those relevant to the mission)
+        if settings.TOOL_CATALOG_RELEVANT_ONLY:
+            tool_descriptions = format_tool_descriptions_for_hop_design(
+                relevant_to=" ".join([mission.goal or "", *(asset.description or "" for asset in mission.get_outputs())]),
+                token_budget=settings.TOOL_CATALOG_TOKEN_BUDGET
+            )
+        else:
+            tool_descriptions = format_tool_descriptions_for_hop_design()
         
         # Extract mission goal
         mission_goal = mission.goal if mission.goal else "No goal specified"
@@ -6,6 +6,7 @@ from schemas.chat import ChatMessage
 from schemas.workflow import Mission, Hop
 from schemas.lite_models import ToolStepLite
 
+from config.settings import settings
 from utils.message_formatter import format_tool_descriptions_for_implementation
 
 from .base_prompt_caller import BasePromptCaller
@@ -211,7 +212,13 @@ Now implement this hop by designing the tool steps."""
         hop_description = self._format_hop_description(current_hop)
         desired_assets = self._format_desired_assets(current_hop)
         available_assets = self._format_available_assets(current_hop)
-        tools_list = format_tool_descriptions_for_implementation()
+        if settings.TOOL_CATALOG_RELEVANT_ONLY:
+            tools_list = format_tool_descriptions_for_implementation(
+                relevant_to=f"{current_hop.name} {current_hop.description or ''} {mission.goal or ''}",
+                token_budget=settings.TOOL_CATALOG_TOKEN_BUDGET
+            )
+        else:
+            tools_list = format_tool_descriptions_for_implementation()
         
         # Call base invoke with individual variables
         response = await super().invoke(
@@ -108,6 +108,16 @@ TASK_CONFIGS = {
         }
     },
     
+    # Article chat (streamed, plain text)
+    "article_chat": {
+        "default": {
+            "model": "gpt-4.1",  # Supports automatic prompt caching of the stable prompt prefix
+            "temperature": 0.7,
+            "max_tokens": 1500,
+            "description": "Conversational analysis of a single article"
+        }
+    },
+
     # Default fallback
     "default": {
         "general": {
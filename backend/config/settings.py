@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 import os
+import tempfile
 from dotenv import load_dotenv, find_dotenv
 
 # Force reload of environment variables
@@ -18,11 +19,33 @@ class Settings(BaseSettings):
     DB_PASSWORD: str = os.getenv("DB_PASSWORD")
     DB_NAME: str = os.getenv("DB_NAME")
 
+    # Database pool settings
+    # The connection budget is shared by every gunicorn worker (WEB_CONCURRENCY) and
+    # split between each worker's sync and async engines; DB_POOL_SIZE/DB_MAX_OVERFLOW
+    # override the derived per-engine values.
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "1"))
+    DB_MAX_CONNECTIONS: int = int(os.getenv("DB_MAX_CONNECTIONS", "60"))
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "0"))  # 0 = derive from DB_MAX_CONNECTIONS
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "-1"))  # -1 = derive from DB_MAX_CONNECTIONS
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_LEAK_THRESHOLD_SECONDS: float = float(os.getenv("DB_LEAK_THRESHOLD_SECONDS", "10"))  # 0 disables leak reporting
+    DB_LEAK_CAPTURE_STACKS: bool = os.getenv("DB_LEAK_CAPTURE_STACKS", "false").lower() == "true"  # Record checkout call sites (walks the stack per checkout)
+
     # Authentication settings
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
 
+    # Authenticated-principal cache (per worker process)
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: int = int(os.getenv("AUTH_PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+    AUTH_PRINCIPAL_CACHE_MAX_SIZE: int = int(os.getenv("AUTH_PRINCIPAL_CACHE_MAX_SIZE", "10000"))
+    # Skip the DB when claims carry user_id/role. Off by default: a trusted token keeps working until it
+    # expires even if its user is deleted or deactivated, since only role changes invalidate it.
+    AUTH_TRUST_TOKEN_CLAIMS: bool = os.getenv("AUTH_TRUST_TOKEN_CLAIMS", "false").lower() == "true"
+    # How often each worker reads other workers' logouts and role changes (auth_revocations table)
+    AUTH_REVOCATION_SYNC_SECONDS: float = float(os.getenv("AUTH_REVOCATION_SYNC_SECONDS", "2"))
+
     # API settings
     ANTHROPIC_API_KEY: str = os.getenv("ANTHROPIC_API_KEY")
     ANTHROPIC_MODEL: str = "claude-3-sonnet-20240229"
@@ -37,10 +60,74 @@ class Settings(BaseSettings):
     # Search Provider Limits
     GOOGLE_SCHOLAR_MAX_RESULTS_PER_CALL: int = int(os.getenv("GOOGLE_SCHOLAR_MAX_RESULTS_PER_CALL", "20"))
     PUBMED_MAX_RESULTS_PER_CALL: int = int(os.getenv("PUBMED_MAX_RESULTS_PER_CALL", "10000"))
+
+    # Multi-item LLM extraction (ExtractionService.extract_multiple_items)
+    EXTRACTION_MAX_CONCURRENCY: int = int(os.getenv("EXTRACTION_MAX_CONCURRENCY", "10"))  # Items extracted at once per call
+    EXTRACTION_ITEM_TIMEOUT_SECONDS: float = float(os.getenv("EXTRACTION_ITEM_TIMEOUT_SECONDS", "120"))  # 0 disables
+    EXTRACTION_SCHEMA_IN_PROMPT: bool = os.getenv("EXTRACTION_SCHEMA_IN_PROMPT", "false").lower() == "true"  # Only needed if response_format isn't enforced
+
+    # SerpAPI rate budget for concurrent Scholar page fetches (per worker process)
+    SERPAPI_MAX_CONCURRENT_REQUESTS: int = int(os.getenv("SERPAPI_MAX_CONCURRENT_REQUESTS", "4"))
+    SERPAPI_MIN_REQUEST_INTERVAL_SECONDS: float = float(os.getenv("SERPAPI_MIN_REQUEST_INTERVAL_SECONDS", "0.25"))  # Between request starts
+
+    # SerpAPI response cache, shared by all workers on a host through a small SQLite file
+    SERPAPI_CACHE_MODE: str = os.getenv("SERPAPI_CACHE_MODE", "read_write")  # read_write, cache_only or off
+    SERPAPI_CACHE_DB_PATH: str = os.getenv("SERPAPI_CACHE_DB_PATH", os.path.join(tempfile.gettempdir(), "jambot_serpapi_cache.sqlite3"))
+    SERPAPI_CACHE_TTL_SECONDS: int = int(os.getenv("SERPAPI_CACHE_TTL_SECONDS", "86400"))
+    SERPAPI_CACHE_STALE_SECONDS: int = int(os.getenv("SERPAPI_CACHE_STALE_SECONDS", "604800"))  # Served past the TTL while refreshed in the background
+
+    # Scholar abstract enrichment (Semantic Scholar / Crossref by DOI)
+    SCHOLAR_ENRICHMENT_MAX_CONNECTIONS: int = int(os.getenv("SCHOLAR_ENRICHMENT_MAX_CONNECTIONS", "20"))  # Shared session, per worker process
+    SCHOLAR_ENRICHMENT_CACHE_DB_PATH: str = os.getenv("SCHOLAR_ENRICHMENT_CACHE_DB_PATH", os.path.join(tempfile.gettempdir(), "jambot_doi_abstracts.sqlite3"))
+    SCHOLAR_ENRICHMENT_CACHE_TTL_SECONDS: int = int(os.getenv("SCHOLAR_ENRICHMENT_CACHE_TTL_SECONDS", "2592000"))
+    SCHOLAR_ENRICHMENT_NEGATIVE_TTL_SECONDS: int = int(os.getenv("SCHOLAR_ENRICHMENT_NEGATIVE_TTL_SECONDS", "86400"))  # DOIs without an abstract
+
+    # Search provider health, shared by all workers on a host through a small SQLite file
+    PROVIDER_HEALTH_DB_PATH: str = os.getenv("PROVIDER_HEALTH_DB_PATH", os.path.join(tempfile.gettempdir(), "jambot_provider_health.sqlite3"))
+    PROVIDER_HEALTH_PROBE_INTERVAL_SECONDS: int = int(os.getenv("PROVIDER_HEALTH_PROBE_INTERVAL_SECONDS", "60"))
+    PROVIDER_HEALTH_SYNC_SECONDS: float = float(os.getenv("PROVIDER_HEALTH_SYNC_SECONDS", "1"))  # In-memory breaker state <-> shared store
+    PROVIDER_HEALTH_TTL_SECONDS: int = int(os.getenv("PROVIDER_HEALTH_TTL_SECONDS", "300"))  # Probe results older than this are unknown
+    PROVIDER_BREAKER_WINDOW_SECONDS: int = int(os.getenv("PROVIDER_BREAKER_WINDOW_SECONDS", "60"))
+    PROVIDER_BREAKER_MIN_REQUESTS: int = int(os.getenv("PROVIDER_BREAKER_MIN_REQUESTS", "5"))
+    PROVIDER_BREAKER_FAILURE_RATE: float = float(os.getenv("PROVIDER_BREAKER_FAILURE_RATE", "0.5"))  # Trips at this failure ratio
+    PROVIDER_BREAKER_COOLDOWN_SECONDS: int = int(os.getenv("PROVIDER_BREAKER_COOLDOWN_SECONDS", "30"))  # Open -> one trial request
+    SERPAPI_QUOTA_RESERVE: int = int(os.getenv("SERPAPI_QUOTA_RESERVE", "0"))  # Stop searching when this many searches are left
+
+    # PubMed search designer coverage checks (per worker process)
+    PUBMED_COVERAGE_CACHE_TTL_SECONDS: int = int(os.getenv("PUBMED_COVERAGE_CACHE_TTL_SECONDS", "3600"))
+    PUBMED_COVERAGE_CACHE_MAX_SIZE: int = int(os.getenv("PUBMED_COVERAGE_CACHE_MAX_SIZE", "50000"))
     
+    # Agent prompt tool catalog: describe only tools relevant to the mission/hop, within a token budget
+    TOOL_CATALOG_RELEVANT_ONLY: bool = os.getenv("TOOL_CATALOG_RELEVANT_ONLY", "false").lower() == "true"
+    TOOL_CATALOG_TOKEN_BUDGET: int = int(os.getenv("TOOL_CATALOG_TOKEN_BUDGET", "3000"))
+
+    # Article chat prompt
+    ARTICLE_CHAT_HISTORY_TOKEN_BUDGET: int = int(os.getenv("ARTICLE_CHAT_HISTORY_TOKEN_BUDGET", "6000"))
+    ARTICLE_CHAT_COMPANY_CONTEXT_TTL_SECONDS: int = int(os.getenv("ARTICLE_CHAT_COMPANY_CONTEXT_TTL_SECONDS", "600"))  # Per worker
+
     # Smart Search Filtering Limits
     MAX_ARTICLES_TO_FILTER: int = int(os.getenv("MAX_ARTICLES_TO_FILTER", "500"))
 
+    # Embedding pre-filter before LLM article filtering; thresholds come from scripts/calibrate_filter_prefilter.py
+    FILTER_PREFILTER_ENABLED: bool = os.getenv("FILTER_PREFILTER_ENABLED", "false").lower() == "true"
+    FILTER_PREFILTER_BACKEND: str = os.getenv("FILTER_PREFILTER_BACKEND", "openai")  # openai (cached) or local (sentence-transformers)
+    FILTER_PREFILTER_MODEL: str = os.getenv("FILTER_PREFILTER_MODEL", "text-embedding-3-small")  # Thresholds are specific to the model
+    FILTER_PREFILTER_REJECT_BELOW: float = float(os.getenv("FILTER_PREFILTER_REJECT_BELOW", "0.15"))  # Cosine similarity
+    FILTER_PREFILTER_ACCEPT_ABOVE: float = float(os.getenv("FILTER_PREFILTER_ACCEPT_ABOVE", "1.0"))  # 1.0 never auto-accepts
+    FILTER_PREFILTER_CACHE_DB_PATH: str = os.getenv("FILTER_PREFILTER_CACHE_DB_PATH", os.path.join(tempfile.gettempdir(), "jambot_embeddings.sqlite3"))
+    FILTER_PREFILTER_CACHE_TTL_SECONDS: int = int(os.getenv("FILTER_PREFILTER_CACHE_TTL_SECONDS", "2592000"))
+
+    # Semantic search over workbench group articles (local vector index, one per host)
+    ARTICLE_INDEX_DIR: str = os.getenv("ARTICLE_INDEX_DIR", os.path.join(tempfile.gettempdir(), "jambot_article_index"))
+    ARTICLE_INDEX_BACKEND: str = os.getenv("ARTICLE_INDEX_BACKEND", "openai")  # openai (cached) or local (sentence-transformers)
+    ARTICLE_INDEX_MODEL: str = os.getenv("ARTICLE_INDEX_MODEL", "text-embedding-3-small")  # Changing it clears the index
+    ARTICLE_INDEX_IVF_MIN_CANDIDATES: int = int(os.getenv("ARTICLE_INDEX_IVF_MIN_CANDIDATES", "20000"))  # Exact scan below this
+    ARTICLE_INDEX_IVF_NPROBE: int = int(os.getenv("ARTICLE_INDEX_IVF_NPROBE", "8"))  # Clusters scanned per IVF query
+
+    # Server-side search result sets (SmartSearch2 handles)
+    RESULT_SET_CACHE_MAX_SETS: int = int(os.getenv("RESULT_SET_CACHE_MAX_SETS", "200"))  # In-memory LRU size per worker
+    RESULT_SET_TTL_SECONDS: int = int(os.getenv("RESULT_SET_TTL_SECONDS", "86400"))
+
     # Email/SMTP settings
     SMTP_SERVER: str = os.getenv("SMTP_SERVER", "smtp.gmail.com")
     SMTP_PORT: int = int(os.getenv("SMTP_PORT", "587"))
@@ -79,10 +166,25 @@ class Settings(BaseSettings):
     TOOL_STUBBING_DELAY_MS: int = int(os.getenv("TOOL_STUBBING_DELAY_MS", "500"))  # Simulate realistic delays
     TOOL_STUBBING_FAILURE_RATE: float = float(os.getenv("TOOL_STUBBING_FAILURE_RATE", "0.0"))  # 0.0-1.0 for testing error handling
 
+    # Hop Execution Settings
+    HOP_MAX_PARALLEL_STEPS: int = int(os.getenv("HOP_MAX_PARALLEL_STEPS", "4"))  # Independent tool steps run concurrently per hop
+
+    # group_reduce tool: streaming hash aggregation that spills partial groups to disk
+    # At most GROUP_REDUCE_MAX_GROUPS_IN_MEMORY partial groups are open at once (oversized spill
+    # partitions are re-partitioned); with include_items each can also hold GROUP_REDUCE_MAX_ITEMS_PER_GROUP items.
+    GROUP_REDUCE_MAX_GROUPS_IN_MEMORY: int = int(os.getenv("GROUP_REDUCE_MAX_GROUPS_IN_MEMORY", "50000"))  # Spill past this many open groups
+    GROUP_REDUCE_SPILL_PARTITIONS: int = int(os.getenv("GROUP_REDUCE_SPILL_PARTITIONS", "16"))
+    GROUP_REDUCE_SPILL_DIR: str = os.getenv("GROUP_REDUCE_SPILL_DIR", tempfile.gettempdir())
+    GROUP_REDUCE_MAX_ITEMS_PER_GROUP: int = int(os.getenv("GROUP_REDUCE_MAX_ITEMS_PER_GROUP", "100"))  # Cap for include_items
+
     @property
     def DATABASE_URL(self) -> str:
         return f"mysql+pymysql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return f"mysql+aiomysql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+
     @property
     def anthropic_model(self) -> str:
         """Get the default Anthropic model"""
@@ -19,6 +19,10 @@ API_TIMEOUTS = {
     "crossref": 5,
     "web_scraping": 5,
 
+    # Unified search providers - per-provider deadline in multi-provider searches
+    "pubmed_search": 30,
+    "scholar_search": 45,
+
     # Database operations
     "database_pool": 30,
     "database_query": 10,
@@ -33,7 +37,7 @@ STREAMING_CONFIG = {
     "enrichment_batch_timeout": 30,
 
     # Maximum concurrent enrichment requests
-    "max_concurrent_enrichment": 5 if IS_PRODUCTION else 3,
+    "max_concurrent_enrichment": 10 if IS_PRODUCTION else 5,
 
     # Total stream timeout (seconds) - must be less than proxy timeout
     "max_stream_duration": 290,  # Just under 5 minutes
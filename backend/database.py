@@ -1,27 +1,91 @@
-from typing import Generator
+from typing import AsyncGenerator, Dict, Generator
 import logging
 from models import Base
 from config.settings import settings
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from utils.db_pool_monitor import (
+    InstrumentedQueuePool,
+    InstrumentedAsyncAdaptedQueuePool,
+    attach_leak_detection,
+    get_pool_status
+)
 import pymysql
 pymysql.install_as_MySQLdb()
 
 logger = logging.getLogger(__name__)
 
+
+def get_pool_config() -> Dict[str, int]:
+    """
+    Derive per-engine pool sizing from the server connection budget.
+
+    DB_MAX_CONNECTIONS is divided across WEB_CONCURRENCY worker processes and
+    then between each worker's sync and async engines, so the fleet can never
+    open more connections than the budget. Roughly two thirds of each engine's
+    share is kept as persistent pool connections, the rest as overflow.
+    """
+    workers = max(1, settings.WEB_CONCURRENCY)
+    per_engine = max(2, settings.DB_MAX_CONNECTIONS // workers // 2)
+    pool_size = settings.DB_POOL_SIZE or max(1, per_engine * 2 // 3)
+    max_overflow = settings.DB_MAX_OVERFLOW if settings.DB_MAX_OVERFLOW >= 0 else max(0, per_engine - pool_size)
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE
+    }
+
+
+pool_config = get_pool_config()
+logger.info(
+    f"DB pool per engine: size={pool_config['pool_size']} overflow={pool_config['max_overflow']} "
+    f"timeout={pool_config['pool_timeout']}s (workers={settings.WEB_CONCURRENCY}, "
+    f"max_connections={settings.DB_MAX_CONNECTIONS})"
+)
+
 # Create engine with AWS RDS connection
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_size=5,
-    max_overflow=10,
-    pool_timeout=30,
-    pool_recycle=1800,
-    pool_pre_ping=True
+    poolclass=InstrumentedQueuePool,
+    pool_pre_ping=True,
+    **pool_config
 )
 
 # Create sessionmaker
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for request handlers that must not block the event loop
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL,
+    poolclass=InstrumentedAsyncAdaptedQueuePool,
+    pool_pre_ping=True,
+    **pool_config
+)
+
+# Async sessionmaker - expire_on_commit=False so committed objects stay readable
+# without an implicit (and in async, illegal) lazy refresh
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+attach_leak_detection(
+    engine,
+    InstrumentedQueuePool.metrics_name,
+    settings.DB_LEAK_THRESHOLD_SECONDS,
+    capture_sites=settings.DB_LEAK_CAPTURE_STACKS
+)
+attach_leak_detection(
+    async_engine.sync_engine,
+    InstrumentedAsyncAdaptedQueuePool.metrics_name,
+    settings.DB_LEAK_THRESHOLD_SECONDS,
+    capture_sites=settings.DB_LEAK_CAPTURE_STACKS
+)
+
 
 def get_db() -> Generator:
     """
@@ -37,6 +101,28 @@ def get_db() -> Generator:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency that provides an async database session
+
+    Queries issued through this session await the driver instead of blocking
+    the event loop, so slow queries don't stall concurrent SSE streams.
+
+    Yields:
+        AsyncSession: SQLAlchemy async database session
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_db_pool_status() -> Dict:
+    """Checkout latency, wait-queue, overflow and leak metrics for both engines"""
+    return get_pool_status({
+        InstrumentedQueuePool.metrics_name: engine,
+        InstrumentedAsyncAdaptedQueuePool.metrics_name: async_engine.sync_engine
+    })
+
+
 def init_db():
     logger.info("Initializing database...")
     try:
@@ -125,4 +125,23 @@ class ToolStepNotFoundError(NotFoundError):
 class AssetNotFoundError(NotFoundError):
     """Raised when an asset is not found."""
     def __init__(self, asset_id: str):
-        super().__init__(f"Asset {asset_id} not found") 
\ No newline at end of file
+        super().__init__(f"Asset {asset_id} not found") 
+
+class ResultSetNotFoundError(NotFoundError):
+    """Raised when a search result set handle is unknown or expired."""
+    def __init__(self, result_set_id: str):
+        super().__init__(f"Result set {result_set_id} not found or expired")
+
+class ProviderUnavailableError(AppError):
+    """Raised when a search provider is skipped because it is down, tripped or out of quota."""
+    def __init__(self, provider_id: str, reason: str):
+        super().__init__(f"Provider {provider_id} is currently unavailable: {reason}", status_code=503)
+        self.provider_id = provider_id
+        self.reason = reason
+
+class ExtractionItemError(AppError):
+    """Raised when an item fails during a multi-item extraction that must not continue on errors."""
+    def __init__(self, item_id: str, error: str):
+        super().__init__(f"Extraction failed for item {item_id}: {error}")
+        self.item_id = item_id
+        self.error = error
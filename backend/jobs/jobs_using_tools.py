@@ -3,6 +3,7 @@ from datetime import datetime
 from dataclasses import dataclass
 
 from schemas.canonical_types import CanonicalEmail
+from services.group_reduce import group_reduce as engine_group_reduce
 
 T = TypeVar('T')
 K = TypeVar('K') 
@@ -83,8 +84,8 @@ def extract(
 # Method 3: Group Reduce (enhanced with metadata)
 def group_reduce(
     items: Iterable[T],
-    key_func: Callable[[T], K],
-    reduce_func: Callable[[List[T]], V],
+    key_func: Union[str, Callable[[T], K]],
+    reduce_func: Union[str, Callable[[List[T]], V]],
     sort_by: str = "group_key",
     sort_direction: str = "asc",
     include_items: bool = False
@@ -94,8 +95,10 @@ def group_reduce(
     
     Args:
         items: Iterable of objects to group
-        key_func: Function to extract grouping key from each item
-        reduce_func: Function to aggregate items in each group
+        key_func: Function to extract grouping key from each item, or a key expression
+            (e.g. 'sender', 'date(timestamp)')
+        reduce_func: Function to aggregate items in each group, or a reduce expression
+            (e.g. 'count, avg(score), top_k(tags, 3)')
         sort_by: Field to sort results by
         sort_direction: 'asc' or 'desc'
         include_items: Whether to include original items in results
@@ -103,6 +106,13 @@ def group_reduce(
     Returns:
         List of GroupedResult objects
     """
+    if isinstance(key_func, str) and isinstance(reduce_func, str):
+        # Expressions run on the streaming engine used by the group_reduce tool
+        engine_result = engine_group_reduce(
+            items, key_func, reduce_func, sort_by, sort_direction, include_items
+        )
+        return [GroupedResult(**grouped) for grouped in engine_result.grouped_results]
+
     # Group items
     groups = {}
     for item in items:
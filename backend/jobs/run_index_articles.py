@@ -0,0 +1,41 @@
+"""
+Rebuild the workbench article index (services/article_vector_index.py) from
+scratch: embeds every group article of every user, then trains the IVF
+centroids used once a user's candidate set passes ARTICLE_INDEX_IVF_MIN_CANDIDATES.
+
+Searches keep the index up to date incrementally; run this after changing
+ARTICLE_INDEX_MODEL, to reclaim space left by removed articles, or to retrain
+the clusters after the collection has grown.
+"""
+
+import asyncio
+from typing import Optional
+
+from sqlalchemy import select
+
+from database import AsyncSessionLocal
+from models import ArticleGroup as ArticleGroupModel
+from services.article_search_service import ArticleSearchService
+
+
+async def run_index_articles(nlist: Optional[int] = None):
+    async with AsyncSessionLocal() as db:
+        service = ArticleSearchService(db)
+        service.index.clear()
+
+        user_ids = (await db.scalars(select(ArticleGroupModel.user_id).distinct())).all()
+        print(f"Indexing group articles of {len(user_ids)} users")
+
+        for user_id in user_ids:
+            try:
+                result = await service.sync_user(user_id)
+                print(f"User {user_id}: {result['added']} articles indexed")
+            except Exception as e:
+                print(f"Error indexing articles of user {user_id}: {str(e)}")
+
+        clusters = await asyncio.to_thread(service.index.train_ivf, nlist)
+        print(f"Trained {clusters} IVF clusters")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_index_articles())
@@ -1,14 +1,23 @@
+import asyncio
+from contextlib import suppress
 from fastapi import FastAPI, Depends, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 # from routers import search, auth, workflow, tools, files, bot, email, asset
 from routers import auth, email, asset, chat, llm, tools, search, web_retrieval, mission, hop, tool_step, user_session, state_transition, pubmed, google_scholar, extraction, unified_search, lab, article_chat, workbench, smart_search, smart_search2, pubmed_search_designer, analytics
-from database import init_db
+from database import init_db, get_db_pool_status
+from models import User, UserRole
+from services.auth_service import validate_token
+from services.principal_cache import principal_cache
 from config import settings, setup_logging
 from middleware import LoggingMiddleware
 from pydantic import ValidationError
 from starlette.responses import JSONResponse
+from utils.db_pool_monitor import monitor_connection_leaks
+from services.search_providers import list_providers
+from services.search_providers.health import get_provider_health_service, start_provider_health_probes
+from services.google_scholar_enrichment import close_shared_session
 
 # Setup logging first
 logger, request_id_filter = setup_logging()
@@ -78,15 +87,45 @@ app.include_router(analytics.router, prefix="/api")  # /api/analytics
 logger.info("Routers included")
 
 
+def _log_task_failure(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Background task {task.get_name()} failed", exc_info=task.exception())
+
+
+def _track_background_task(task: asyncio.Task) -> asyncio.Task:
+    """Keep a long-running task on app.state so it is logged on failure and cancelled on shutdown"""
+    task.add_done_callback(_log_task_failure)
+    app.state.background_tasks.append(task)
+    return task
+
+
 @app.on_event("startup")
 async def startup_event():
     logger.info("Application starting up...")
     init_db()
     logger.info("Database initialized")
+    app.state.background_tasks = []
+    if settings.DB_LEAK_THRESHOLD_SECONDS > 0:
+        _track_background_task(asyncio.create_task(monitor_connection_leaks(), name="db-leak-monitor"))
+    _track_background_task(asyncio.create_task(principal_cache.run_revocation_sync(), name="auth-revocation-sync"))
+    for task in start_provider_health_probes(list_providers()):
+        _track_background_task(task)
     #logger.info(f"Settings object: {settings}")
     #logger.info(f"ACCESS_TOKEN_EXPIRE_MINUTES value: {settings.ACCESS_TOKEN_EXPIRE_MINUTES}")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    tasks = getattr(app.state, "background_tasks", [])
+    for task in tasks:
+        task.cancel()
+    for task in tasks:
+        # Failures were already logged by _log_task_failure
+        with suppress(asyncio.CancelledError, Exception):
+            await task
+    await close_shared_session()
+
+
 @app.get("/")
 async def root():
     """Root endpoint - redirects to API health check"""
@@ -97,6 +136,24 @@ async def health_check():
     """Health check endpoint for monitoring"""
     return {"status": "healthy", "version": settings.SETTING_VERSION}
 
+@app.get("/api/health/db-pool")
+async def db_pool_health(current_user: User = Depends(validate_token)):
+    """Connection pool checkout latency, wait-queue, overflow and leak metrics (admin only)"""
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only administrators can view pool metrics")
+    return {"workers": settings.WEB_CONCURRENCY, "pools": get_db_pool_status()}
+
+@app.get("/api/health/providers")
+async def provider_health(current_user: User = Depends(validate_token)):
+    """Shared search provider availability, circuit breaker state and remaining quota (admin only)"""
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only administrators can view provider health")
+    health = get_provider_health_service()
+    return {
+        provider_id: await asyncio.to_thread(health.get_status, provider_id)
+        for provider_id in list_providers()
+    }
+
 
 @app.exception_handler(ValidationError)
 async def validation_exception_handler(request: Request, exc: ValidationError):
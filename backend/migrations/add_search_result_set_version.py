@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Migration to add the version column to the search_result_sets table
+
+Appends to a result set shared between workers bump the version with a
+compare-and-swap UPDATE, and cached copies are checked against it.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import ProgrammingError
+from config import settings
+import logging
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def run_migration():
+    """Add version column to search_result_sets table"""
+
+    # Create engine
+    engine = create_engine(settings.DATABASE_URL)
+
+    try:
+        with engine.connect() as connection:
+            # Check if the table exists
+            result = connection.execute(text("""
+                SELECT COUNT(*)
+                FROM information_schema.tables
+                WHERE table_name = 'search_result_sets'
+            """))
+
+            if result.scalar() == 0:
+                logger.info("search_result_sets table does not exist yet. Skipping migration.")
+                return
+
+            # Check if the column already exists
+            result = connection.execute(text("""
+                SELECT COUNT(*)
+                FROM information_schema.columns
+                WHERE table_name = 'search_result_sets'
+                AND column_name = 'version'
+            """))
+
+            if result.scalar() > 0:
+                logger.info("version column already exists. Migration not needed.")
+                return
+
+            logger.info("Adding version column to search_result_sets table...")
+            connection.execute(text("""
+                ALTER TABLE search_result_sets
+                ADD COLUMN version INT NOT NULL DEFAULT 0;
+            """))
+            connection.commit()
+            logger.info("Successfully added version column.")
+
+    except ProgrammingError as e:
+        logger.error(f"Database error during migration: {e}")
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error during migration: {e}")
+        raise
+
+if __name__ == "__main__":
+    logger.info("Starting search_result_sets version column migration...")
+    run_migration()
+    logger.info("Migration completed successfully!")
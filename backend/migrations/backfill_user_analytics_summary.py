@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Migration to backfill the analytics counters from existing user_events
+
+Creates the user_analytics_summary and user_journey_summary tables (if
+init_db hasn't already) and recomputes every user's counters from their
+tracked events, one user per transaction. Events tracked from now on update
+the counters themselves; re-running replaces each user's counters with a
+fresh count, so it can also be used to repair them.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from config import settings
+from models import UserEvent, UserAnalyticsSummary, UserJourneySummary
+from services.analytics_summary_service import AnalyticsSummaryService
+import logging
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def run_migration():
+    """Recompute user_analytics_summary and user_journey_summary from user_events"""
+
+    engine = create_engine(settings.DATABASE_URL)
+    UserAnalyticsSummary.__table__.create(bind=engine, checkfirst=True)
+    UserJourneySummary.__table__.create(bind=engine, checkfirst=True)
+    Session = sessionmaker(bind=engine)
+
+    with Session() as db:
+        user_ids = db.scalars(select(UserEvent.user_id).distinct()).all()
+    logger.info(f"Backfilling analytics counters for {len(user_ids)} users")
+
+    total_events = 0
+    for user_id in user_ids:
+        with Session() as db:
+            events = AnalyticsSummaryService(db).rebuild_user(user_id)
+            db.commit()
+        total_events += events
+        logger.info(f"User {user_id}: {events} events")
+
+    logger.info(f"Backfilled {len(user_ids)} users, {total_events} events in total")
+
+
+if __name__ == "__main__":
+    logger.info("Starting analytics summary backfill...")
+    run_migration()
+    logger.info("Migration completed successfully!")
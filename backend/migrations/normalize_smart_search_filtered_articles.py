@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Migration to move smart_search_sessions.filtered_articles into per-article rows
+
+Creates the smart_search_filtered_articles table (if init_db hasn't already)
+and copies each session's filtered_articles JSON blob into one row per
+article, then clears the blob. Sessions are processed in batches so the
+blobs are never all in memory at once. Safe to re-run: sessions that
+already have rows are skipped.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, select, null
+from sqlalchemy.orm import sessionmaker
+from config import settings
+from models import SmartSearchSession, SmartSearchFilteredArticle
+from services.smart_search_session_service import build_filtered_article_rows
+import logging
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 50
+
+
+def run_migration():
+    """Copy filtered_articles blobs into smart_search_filtered_articles rows"""
+
+    engine = create_engine(settings.DATABASE_URL)
+    SmartSearchFilteredArticle.__table__.create(bind=engine, checkfirst=True)
+    Session = sessionmaker(bind=engine)
+
+    migrated_sessions = 0
+    migrated_articles = 0
+    last_id = ""
+    with Session() as db:
+        while True:
+            # Sessions with a blob and no rows yet, walked in id order
+            session_ids = db.scalars(
+                select(SmartSearchSession.id).where(
+                    SmartSearchSession.id > last_id,
+                    SmartSearchSession.filtered_articles.isnot(None),
+                    ~select(SmartSearchFilteredArticle.id).where(
+                        SmartSearchFilteredArticle.session_id == SmartSearchSession.id
+                    ).exists()
+                ).order_by(SmartSearchSession.id).limit(BATCH_SIZE)
+            ).all()
+            if not session_ids:
+                break
+            last_id = session_ids[-1]
+
+            for session_id in session_ids:
+                blob = db.scalar(
+                    select(SmartSearchSession.filtered_articles).where(SmartSearchSession.id == session_id)
+                ) or []
+                db.add_all(build_filtered_article_rows(session_id, blob))
+                db.query(SmartSearchSession).filter(SmartSearchSession.id == session_id).update(
+                    {SmartSearchSession.filtered_articles: null()}, synchronize_session=False
+                )
+                migrated_sessions += 1
+                migrated_articles += len(blob)
+
+            db.commit()
+            logger.info(f"Migrated {migrated_sessions} sessions ({migrated_articles} articles) so far...")
+
+    logger.info(f"Migrated {migrated_sessions} sessions, {migrated_articles} filtered articles in total")
+
+
+if __name__ == "__main__":
+    logger.info("Starting filtered_articles normalization migration...")
+    run_migration()
+    logger.info("Migration completed successfully!")
@@ -1,6 +1,6 @@
 from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum, TIMESTAMP, JSON, LargeBinary, Boolean, UniqueConstraint, Index, Float
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship, foreign, remote, validates
+from sqlalchemy.orm import relationship, foreign, remote, validates, deferred
 from datetime import datetime
 from typing import Optional, Dict, Any
 from sqlalchemy.sql import text
@@ -115,6 +115,21 @@ class User(Base):
     article_groups = relationship("ArticleGroup", back_populates="user", cascade="all, delete-orphan")
     company_profile = relationship("UserCompanyProfile", back_populates="user", uselist=False, cascade="all, delete-orphan")
 
+
+class AuthRevocation(Base):
+    """
+    Revoked access tokens (logout) and per-user principal invalidations (role changes),
+    read by every worker on every host into its principal cache (services/principal_cache.py)
+    """
+    __tablename__ = "auth_revocations"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    jti = Column(String(64), nullable=True)  # Set for a revoked token
+    user_id = Column(Integer, nullable=True)  # Set for a user invalidation
+    created_at = Column(Float, nullable=False, index=True)  # Epoch seconds, compared with token iat
+    expires_at = Column(Float, nullable=False, index=True)  # Epoch seconds after which the row can be pruned
+
+
 class Asset(Base):
     __tablename__ = "assets"
     
@@ -884,7 +899,9 @@ class SmartSearchSession(Base):
     
     # Step 7: Filtering Results
     filtering_metadata = Column(JSON)
-    filtered_articles = Column(JSON)  # Store the actual filtered articles results
+    # Legacy blob of filtered article results, superseded by SmartSearchFilteredArticle rows.
+    # Deferred so session listings never load it; only read for sessions not yet migrated.
+    filtered_articles = deferred(Column(JSON))
     
     # Session Status
     status = Column(String(50), default="in_progress")  # in_progress, completed, abandoned
@@ -898,9 +915,24 @@ class SmartSearchSession(Base):
     total_prompt_tokens = Column(Integer, default=0)  # Total input tokens used
     total_completion_tokens = Column(Integer, default=0)  # Total output tokens generated
     total_tokens = Column(Integer, default=0)  # Total tokens used across all LLM calls
+
+    # Per-article filter results; rows are removed by the database on session delete
+    filtered_article_rows = relationship(
+        "SmartSearchFilteredArticle",
+        back_populates="session",
+        order_by="SmartSearchFilteredArticle.position",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="noload"
+    )
     
-    def to_dict(self):
-        """Convert to dictionary for API responses"""
+    def to_dict(self, filtered_articles: Optional[list] = None):
+        """
+        Convert to dictionary for API responses.
+
+        Filtered articles live in their own table, so they are only included
+        when the caller loaded them (see SmartSearchSessionService).
+        """
         return {
             "id": self.id,
             "user_id": self.user_id,
@@ -918,7 +950,7 @@ class SmartSearchSession(Base):
             "submitted_discriminator": self.submitted_discriminator,
             "filter_strictness": self.filter_strictness,
             "filtering_metadata": self.filtering_metadata,
-            "filtered_articles": self.filtered_articles,
+            "filtered_articles": filtered_articles,
             "status": self.status,
             "last_step_completed": self.last_step_completed,
             "session_duration_seconds": self.session_duration_seconds,
@@ -929,6 +961,71 @@ class SmartSearchSession(Base):
         }
 
 
+class SmartSearchFilteredArticle(Base):
+    """
+    Filter result and extracted features for one article in a smart search session.
+    """
+    __tablename__ = "smart_search_filtered_articles"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    session_id = Column(String(36), ForeignKey("smart_search_sessions.id", ondelete="CASCADE"), nullable=False)
+    article_id = Column(String(512), nullable=False)
+    position = Column(Integer, nullable=False, default=0)  # Order within the session's results
+
+    # Filter result
+    passed = Column(Boolean, nullable=False, default=False)
+    confidence = Column(Float, nullable=False, default=0.0)
+    reasoning = Column(Text)
+
+    # CanonicalResearchArticle data (without extracted_features) and feature values
+    article = Column(JSON, nullable=False)
+    extracted_features = Column(JSON)
+
+    session = relationship("SmartSearchSession", back_populates="filtered_article_rows")
+
+    __table_args__ = (
+        UniqueConstraint('session_id', 'article_id', name='uq_smart_search_filtered_article'),
+        Index('idx_smart_search_filtered_position', 'session_id', 'position'),
+    )
+
+    def to_dict(self):
+        """Convert to the FilteredArticle dictionary shape"""
+        return {
+            "article": {**(self.article or {}), "extracted_features": self.extracted_features or {}},
+            "passed": self.passed,
+            "confidence": self.confidence,
+            "reasoning": self.reasoning or ""
+        }
+
+
+class SearchResultSet(Base):
+    """
+    Server-side search result set referenced by handle from SmartSearch2.
+
+    Result sets live in an in-process LRU cache; rows here hold sets that
+    were spilled out of the cache (or persisted for other workers) so that a
+    handle stays resolvable until it expires.
+    """
+    __tablename__ = "search_result_sets"
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid4()))
+    user_id = Column(Integer, ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False)
+
+    source = Column(String(50), nullable=True)
+    query = Column(Text, nullable=True)
+    articles = Column(JSON, nullable=False, default=list)  # List[CanonicalResearchArticle] as JSON
+    article_count = Column(Integer, nullable=False, default=0)
+    version = Column(Integer, nullable=False, default=0)  # Bumped by every append, for cache checks and atomic appends
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index('idx_search_result_sets_user', 'user_id'),
+        Index('idx_search_result_sets_expires', 'expires_at'),
+    )
+
+
 # ============================================================================
 # SmartSearch2 Event-Based Tracking Model
 # ============================================================================
@@ -997,3 +1094,48 @@ class UserEvent(Base):
         Index('idx_event_type_time', 'event_type', 'timestamp'),
         Index('idx_user_journey', 'user_id', 'journey_id'),
     )
+
+
+class UserAnalyticsSummary(Base):
+    """
+    Per-user event counters, maintained as events are tracked (services/analytics_summary_service.py)
+    so the analytics panel doesn't aggregate user_events on every refresh
+    """
+    __tablename__ = "user_analytics_summary"
+
+    user_id = Column(String(255), primary_key=True)
+
+    total_events = Column(Integer, nullable=False, default=0)
+    total_journeys = Column(Integer, nullable=False, default=0)
+    searches = Column(Integer, nullable=False, default=0)  # SEARCH_EXECUTE events
+    filters = Column(Integer, nullable=False, default=0)  # FILTER_APPLY events
+    extractions = Column(Integer, nullable=False, default=0)  # COLUMNS_ADD events
+
+    # LLM tokens reported in event_data["token_usage"]
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    total_tokens = Column(Integer, nullable=False, default=0)
+
+    event_type_counts = Column(JSON, nullable=False, default=dict)  # event_type value -> count
+    daily_event_counts = Column(JSON, nullable=False, default=dict)  # "YYYY-MM-DD" -> count, last 30 days only
+
+    first_event_at = Column(DateTime, nullable=True)
+    last_event_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class UserJourneySummary(Base):
+    """Per-journey event count and time span, maintained alongside UserAnalyticsSummary"""
+    __tablename__ = "user_journey_summary"
+
+    user_id = Column(String(255), nullable=False, primary_key=True)
+    journey_id = Column(String(36), nullable=False, primary_key=True)
+
+    event_count = Column(Integer, nullable=False, default=0)
+    start_time = Column(DateTime, nullable=False)
+    end_time = Column(DateTime, nullable=False)
+    last_event_type = Column(Enum(EventType), nullable=True)
+
+    __table_args__ = (
+        Index('idx_journey_summary_user_end', 'user_id', 'end_time'),
+    )
@@ -9,11 +9,13 @@ import os
 import logging
 import json
 
-from models import User, UserCompanyProfile
+from models import User
 from services.auth_service import validate_token
+from services.article_chat_prompt_builder import ArticleChatPromptBuilder, company_context_cache
 from database import get_db
 from sqlalchemy.orm import Session
 from config.settings import settings
+from config.llm_models import get_task_config
 
 logger = logging.getLogger(__name__)
 
@@ -58,67 +60,32 @@ async def chat_about_article_stream(
     """
     Streaming chat endpoint for article discussions.
     No database persistence - frontend manages conversation history.
+
+    The prompt is laid out for provider-side prefix caching (see
+    ArticleChatPromptBuilder); the done event reports token usage, including
+    cached prompt tokens.
     """
+    task_config = get_task_config("article_chat")
+    model = task_config["model"]
+
+    # Resolved before streaming starts; cached per user so follow-up turns skip the profile query
+    company = company_context_cache.get(db, current_user.user_id)
+    prompt = ArticleChatPromptBuilder(model).build(
+        company,
+        request.article_context,
+        request.conversation_history,
+        request.message
+    )
+
     async def generate_response():
         try:
-            # Fetch user's company profile for dynamic context
-            company_profile = db.query(UserCompanyProfile).filter(
-                UserCompanyProfile.user_id == current_user.user_id
-            ).first()
-            
-            if not company_profile:
-                # Fallback to default context if no profile exists
-                company_context = "You are a research agent focused on analyzing scientific literature for business relevance."
-                analysis_instructions = "Analyze this article for potential business implications and opportunities."
-            else:
-                company_context = company_profile.generate_company_context()
-                analysis_instructions = company_profile.generate_analysis_instructions()
-
-            # Build the system prompt with dynamic company context
-            system_prompt = f"""{company_context}
-
-You are analyzing the following research article:
-
-Title: {request.article_context.title}
-Authors: {', '.join(request.article_context.authors)}
-Journal: {request.article_context.journal or 'Not specified'}
-Year: {request.article_context.publication_year or 'Not specified'}
-DOI: {request.article_context.doi or 'Not specified'}
-
-Abstract:
-{request.article_context.abstract or 'No abstract available'}
-
-Extracted Features:
-{format_features(request.article_context.extracted_features)}
-
-Your role is to:
-{analysis_instructions}
-
-Focus on providing business-relevant analysis while maintaining scientific accuracy."""
-
-            # Build messages for OpenAI
-            messages = [{"role": "system", "content": system_prompt}]
-            
-            # Add conversation history (last 10 messages for context)
-            for msg in request.conversation_history[-10:]:
-                messages.append({
-                    "role": msg["role"],
-                    "content": msg["content"]
-                })
-            
-            # Add current message
-            messages.append({
-                "role": "user",
-                "content": request.message
-            })
-            
-            # Stream response from OpenAI
             stream = await client.chat.completions.create(
-                model="gpt-4-turbo-preview",
-                messages=messages,
-                temperature=0.7,
-                max_tokens=1500,
-                stream=True
+                model=model,
+                messages=prompt.messages,
+                temperature=task_config["temperature"],
+                max_tokens=task_config["max_tokens"],
+                stream=True,
+                stream_options={"include_usage": True}
             )
             
             # Send initial metadata
@@ -126,14 +93,19 @@ Focus on providing business-relevant analysis while maintaining scientific accur
                 "type": "metadata",
                 "data": {
                     "article_id": request.article_context.id,
-                    "model": "gpt-4-turbo-preview"
+                    "model": model,
+                    "history_messages_kept": prompt.history_messages_kept,
+                    "history_messages_dropped": prompt.history_messages_dropped
                 }
             }
             yield f"data: {json.dumps(initial_data)}\n\n"
             
-            # Stream content chunks
+            # Stream content chunks; the last chunk carries usage and no choices
+            usage = None
             async for chunk in stream:
-                if chunk.choices[0].delta.content is not None:
+                if chunk.usage:
+                    usage = chunk.usage
+                if chunk.choices and chunk.choices[0].delta.content is not None:
                     content_data = {
                         "type": "content",
                         "data": {
@@ -145,7 +117,7 @@ Focus on providing business-relevant analysis while maintaining scientific accur
             # Send completion signal
             completion_data = {
                 "type": "done",
-                "data": {}
+                "data": {"usage": usage_summary(usage)} if usage else {}
             }
             yield f"data: {json.dumps(completion_data)}\n\n"
             
@@ -165,15 +137,15 @@ Focus on providing business-relevant analysis while maintaining scientific accur
         headers={"Cache-Control": "no-cache", "Connection": "keep-alive"}
     )
 
-def format_features(features: Dict[str, Any]) -> str:
-    """Format extracted features for the prompt"""
-    if not features:
-        return "No extracted features available"
-    
-    formatted = []
-    for key, value in features.items():
-        # Convert snake_case to Title Case
-        formatted_key = key.replace('_', ' ').title()
-        formatted.append(f"- {formatted_key}: {value}")
-    
-    return "\n".join(formatted)
\ No newline at end of file
+def usage_summary(usage) -> Dict[str, int]:
+    """Token usage for the done event, including prompt tokens served from the provider's cache"""
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = getattr(details, "cached_tokens", None) or 0
+    logger.info(f"Article chat usage: {usage.prompt_tokens} prompt ({cached_tokens} cached), "
+                f"{usage.completion_tokens} completion")
+    return {
+        "prompt_tokens": usage.prompt_tokens,
+        "cached_tokens": cached_tokens,
+        "completion_tokens": usage.completion_tokens,
+        "total_tokens": usage.total_tokens
+    }
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Form
+from fastapi import APIRouter, Depends, HTTPException, status, Form, Security
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from typing import Annotated, List
 from datetime import datetime
+import asyncio
 import logging
 
 from database import get_db
@@ -94,10 +96,17 @@ async def get_current_user(
     """
     Get current user information including role
     """
+    registration_date = current_user.registration_date
+    if registration_date is None:
+        # Principals resolved from token claims don't carry the registration date
+        registration_date = db.query(User.registration_date).filter(
+            User.user_id == current_user.user_id
+        ).scalar()
+
     return UserResponse(
         email=current_user.email,
         user_id=current_user.user_id,
-        registration_date=current_user.registration_date,
+        registration_date=registration_date,
         role=current_user.role
     )
 
@@ -138,6 +147,7 @@ async def update_user_role(
     target_user.role = new_role
     db.commit()
     db.refresh(target_user)
+    auth_service.invalidate_user_principal(target_user.user_id)
     
     return UserResponse(
         email=target_user.email,
@@ -147,6 +157,23 @@ async def update_user_role(
     )
 
 
+@router.post(
+    "/logout",
+    summary="Revoke the current access token"
+)
+async def logout(
+    credentials: HTTPAuthorizationCredentials = Security(auth_service.security),
+    current_user: User = Depends(auth_service.validate_token)
+):
+    """
+    Revoke the access token used for this request so it can no longer
+    authenticate, and drop it from the principal cache.
+    """
+    # Records the revocation in the shared database
+    await asyncio.to_thread(auth_service.revoke_token, credentials.credentials)
+    return {"message": "Logged out"}
+
+
 @router.get(
     "/users",
     response_model=List[UserResponse],
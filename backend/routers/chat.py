@@ -9,6 +9,7 @@ from pydantic import BaseModel, Field
 
 from database import get_db
 from config.logging_config import get_request_id
+from utils.state_delta import StateDeltaEncoder, dumps
 
 # Create logger for this module
 logger = logging.getLogger(__name__)
@@ -21,7 +22,7 @@ from schemas.agent_responses import AgentResponse, StatusResponse
 from services.auth_service import validate_token
 from services.mission_service import MissionService, get_mission_service
 from services.user_session_service import UserSessionService, get_user_session_service
-from services.chat_service import ChatService, get_chat_service
+from services.chat_service import AsyncChatService, get_async_chat_service
 from services.mission_context_builder import MissionContextBuilder, get_mission_context_builder_service
 from services.state_transition_service import StateTransitionService, get_state_transition_service
 
@@ -64,7 +65,7 @@ async def chat_stream(
     chat_request: ChatRequest,
     session_service: UserSessionService = Depends(get_user_session_service),
     mission_service: MissionService = Depends(get_mission_service),
-    chat_service: ChatService = Depends(get_chat_service),
+    chat_service: AsyncChatService = Depends(get_async_chat_service),
     context_builder: MissionContextBuilder = Depends(get_mission_context_builder_service),
     state_transition_service: StateTransitionService = Depends(get_state_transition_service),
     current_user = Depends(validate_token),
@@ -84,6 +85,10 @@ async def chat_stream(
 
     The event field is used to indicate the type of response.
 
+    The agent state is not repeated in every payload. The first event carries
+    {"type": "snapshot", "version": 1, "state": ...}; later state payloads are
+    {"type": "delta", "version": n, "base_version": n - 1, "ops": [...]} JSON
+    patches against the previous version, and are omitted when nothing changed.
     """
     
     async def event_generator():
@@ -145,7 +150,7 @@ async def chat_stream(
                             "message_length": len(latest_message.content)
                         }
                     )
-                    chat_service.save_message(chat_id, current_user.user_id, latest_message)
+                    await chat_service.save_message(chat_id, current_user.user_id, latest_message)
             
             # Get mission from database
             mission: Optional[Mission] = None
@@ -222,6 +227,21 @@ async def chat_stream(
                 }
             }
             
+            # Send the initial state once; later state payloads are sent as deltas against it
+            state_encoder = StateDeltaEncoder()
+            snapshot_response = AgentResponse(
+                token=None,
+                response_text=None,
+                payload=state_encoder.encode(state),
+                status=None,
+                error=None,
+                debug=None
+            )
+            yield {
+                "event": "message",
+                "data": dumps(snapshot_response.model_dump())
+            }
+            
             # Stream agent responses
             logger.info(
                 "Starting agent processing pipeline",
@@ -251,14 +271,14 @@ async def chat_stream(
                             created_at=datetime.utcnow(),
                             updated_at=datetime.utcnow()
                         )
-                        chat_service.save_message(chat_id, current_user.user_id, ai_message)
+                        await chat_service.save_message(chat_id, current_user.user_id, ai_message)
                       
                     
                     # Create proper AgentResponse object
                     agent_response = AgentResponse(
                         token=output.get("token"),
                         response_text=output.get("response_text"),
-                        payload=output.get("payload"),
+                        payload=state_encoder.encode_payload(output.get("payload")),
                         status=output.get("status"),
                         error=output.get("error"),
                         debug=output.get("debug")
@@ -266,7 +286,7 @@ async def chat_stream(
                     
                     yield {
                         "event": "message",
-                        "data": agent_response.model_dump_json()
+                        "data": dumps(agent_response.model_dump())
                     }
                 else:
                     # Handle non-dict outputs as AgentResponse
@@ -309,11 +329,11 @@ async def chat_stream(
 async def get_chat_messages(
     chat_id: str,
     current_user = Depends(validate_token),
-    chat_service: ChatService = Depends(get_chat_service)
+    chat_service: AsyncChatService = Depends(get_async_chat_service)
 ) -> Dict[str, List[ChatMessage]]:
     """Get all messages for a specific chat"""
     try:
-        messages = chat_service.get_chat_messages(chat_id, current_user.user_id)
+        messages = await chat_service.get_chat_messages(chat_id, current_user.user_id)
         return {"messages": messages}
         
     except Exception as e:
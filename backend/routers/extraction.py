@@ -5,18 +5,21 @@ This module provides REST API endpoints for the extraction service,
 allowing external access to LLM-powered data extraction capabilities.
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator, Callable, Tuple
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field, ValidationError
+import json
 import logging
 
 from database import get_db
 from models import User
 
+from agents.prompts.base_prompt_caller import LLMUsage
 from services.auth_service import validate_token
-from services.extraction_service import get_extraction_service
+from services.extraction_service import ExtractionResult, get_extraction_service
 from schemas.entity_extraction import (
     EntityExtractionResponse,
     ArticleArchetypeRequest,
@@ -67,6 +70,98 @@ class ResearchFeaturesRequest(BaseModel):
     articles: List[Dict[str, Any]] = Field(..., description="List of academic articles to analyze")
 
 
+def _to_api_result(result: ExtractionResult) -> Dict[str, Any]:
+    """Convert an extraction result to the API format"""
+    api_result = {
+        "item_id": result.item_id,
+        "original_item": result.original_item,
+        "extraction": result.extraction,
+        "extraction_timestamp": result.extraction_timestamp
+    }
+    if result.error:
+        api_result["error"] = result.error
+    if result.confidence_score is not None:
+        api_result["confidence_score"] = result.confidence_score
+    return api_result
+
+
+def _to_enriched_article_result(result: ExtractionResult) -> Dict[str, Any]:
+    """Convert a research features extraction result to the enriched article format"""
+    # Create enriched article
+    enriched_article = result.original_item.copy()
+    
+    if "metadata" not in enriched_article:
+        enriched_article["metadata"] = {}
+    
+    # Add extraction results to metadata (already includes relevance score)
+    if result.extraction:
+        enriched_article["metadata"]["features"] = result.extraction
+    
+    if result.error:
+        enriched_article["metadata"]["feature_extraction_error"] = result.error
+    
+    enriched_article["metadata"]["feature_extraction_timestamp"] = result.extraction_timestamp
+    
+    return {
+        "item_id": result.item_id,
+        "enriched_article": enriched_article,
+        "extraction_timestamp": result.extraction_timestamp
+    }
+
+
+def _usage_totals(results: List[ExtractionResult]) -> Dict[str, int]:
+    """Token usage summed over extraction results, including prompt tokens saved by prompt compilation"""
+    totals = LLMUsage()
+    for result in results:
+        if result.usage:
+            for field, value in result.usage.model_dump().items():
+                setattr(totals, field, getattr(totals, field) + value)
+    return totals.model_dump()
+
+
+def _sse_format(data: dict) -> str:
+    return f"data: {json.dumps(data, default=str)}\n\n"
+
+
+async def _stream_extraction_events(
+    results: AsyncIterator[Tuple[int, ExtractionResult]],
+    total: int,
+    to_api: Callable[[ExtractionResult], Dict[str, Any]]
+) -> AsyncIterator[str]:
+    """SSE events for a streaming extraction: one per finished item, then a summary"""
+    completed = 0
+    failed = 0
+    finished: List[ExtractionResult] = []
+    try:
+        yield _sse_format({"status": "starting", "payload": {"total": total}})
+        async for index, result in results:
+            completed += 1
+            failed += 1 if result.error else 0
+            finished.append(result)
+            yield _sse_format({
+                "status": "result",
+                "payload": {"index": index, "result": to_api(result), "completed": completed, "total": total}
+            })
+        yield _sse_format({
+            "status": "complete",
+            "payload": {
+                "items_processed": completed,
+                "successful_extractions": completed - failed,
+                "failed_extractions": failed,
+                "usage": _usage_totals(finished)
+            }
+        })
+    except Exception as e:
+        yield _sse_format({"status": "error", "error": str(e)})
+
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no"
+}
+
+
 @router.post("/extract-multiple", response_model=ExtractionResponse)
 async def extract_multiple_items(
     request: ExtractionRequest,
@@ -104,28 +199,9 @@ async def extract_multiple_items(
         )
         
         # Convert results to API format
-        results = []
-        successful_extractions = 0
-        failed_extractions = 0
-        
-        for result in extraction_results:
-            api_result = {
-                "item_id": result.item_id,
-                "original_item": result.original_item,
-                "extraction": result.extraction,
-                "extraction_timestamp": result.extraction_timestamp
-            }
-            
-            if result.error:
-                api_result["error"] = result.error
-                failed_extractions += 1
-            else:
-                successful_extractions += 1
-                
-            if result.confidence_score is not None:
-                api_result["confidence_score"] = result.confidence_score
-                
-            results.append(api_result)
+        results = [_to_api_result(result) for result in extraction_results]
+        failed_extractions = sum(1 for result in extraction_results if result.error)
+        successful_extractions = len(extraction_results) - failed_extractions
         
         return ExtractionResponse(
             results=results,
@@ -133,6 +209,7 @@ async def extract_multiple_items(
                 "items_processed": len(request.items),
                 "successful_extractions": successful_extractions,
                 "failed_extractions": failed_extractions,
+                "usage": _usage_totals(extraction_results),
                 "schema_key": request.schema_key
             },
             success=True
@@ -144,6 +221,33 @@ async def extract_multiple_items(
         raise HTTPException(status_code=500, detail=f"Extraction failed: {str(e)}")
 
 
+@router.post("/extract-multiple/stream")
+async def stream_extract_multiple_items(
+    request: ExtractionRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(validate_token)
+):
+    """
+    Extract data from multiple items, streaming each result via SSE as it finishes.
+    
+    Items are extracted concurrently, so results arrive out of order; each event
+    carries the item's index in the request.
+    """
+    extraction_service = get_extraction_service()
+    results = extraction_service.iter_extract_multiple_items(
+        items=request.items,
+        result_schema=request.result_schema,
+        extraction_instructions=request.extraction_instructions,
+        schema_key=request.schema_key,
+        continue_on_error=request.continue_on_error
+    )
+    return StreamingResponse(
+        _stream_extraction_events(results, len(request.items), _to_api_result),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+
 @router.post("/extract-single", response_model=SingleExtractionResponse)
 async def extract_single_item(
     raw_request: Request,
@@ -262,33 +366,9 @@ async def extract_research_features(
         )
         
         # Convert results to enriched articles format
-        results = []
-        successful_extractions = 0
-        failed_extractions = 0
-        
-        for result in extraction_results:
-            # Create enriched article
-            enriched_article = result.original_item.copy()
-            
-            if "metadata" not in enriched_article:
-                enriched_article["metadata"] = {}
-            
-            # Add extraction results to metadata (already includes relevance score)
-            if result.extraction:
-                enriched_article["metadata"]["features"] = result.extraction
-                successful_extractions += 1
-            
-            if result.error:
-                enriched_article["metadata"]["feature_extraction_error"] = result.error
-                failed_extractions += 1
-            
-            enriched_article["metadata"]["feature_extraction_timestamp"] = result.extraction_timestamp
-            
-            results.append({
-                "item_id": result.item_id,
-                "enriched_article": enriched_article,
-                "extraction_timestamp": result.extraction_timestamp
-            })
+        results = [_to_enriched_article_result(result) for result in extraction_results]
+        successful_extractions = sum(1 for result in extraction_results if result.extraction)
+        failed_extractions = sum(1 for result in extraction_results if result.error)
         
         return ExtractionResponse(
             results=results,
@@ -296,6 +376,7 @@ async def extract_research_features(
                 "articles_processed": len(request.articles),
                 "successful_extractions": successful_extractions,
                 "failed_extractions": failed_extractions,
+                "usage": _usage_totals(extraction_results),
                 "schema_type": "research_features"
             },
             success=True
@@ -307,6 +388,32 @@ async def extract_research_features(
         raise HTTPException(status_code=500, detail=f"Research feature extraction failed: {str(e)}")
 
 
+@router.post("/research-features/stream")
+async def stream_research_features(
+    request: ResearchFeaturesRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(validate_token)
+):
+    """
+    Extract research features from academic articles, streaming each enriched
+    article via SSE as it finishes.
+    """
+    from schemas.research_features import RESEARCH_FEATURES_SCHEMA, RESEARCH_FEATURES_EXTRACTION_INSTRUCTIONS
+    
+    extraction_service = get_extraction_service()
+    results = extraction_service.iter_extract_with_predefined_schema(
+        items=request.articles,
+        schema_name="research_features",
+        predefined_schemas={"research_features": RESEARCH_FEATURES_SCHEMA},
+        predefined_instructions={"research_features": RESEARCH_FEATURES_EXTRACTION_INSTRUCTIONS}
+    )
+    return StreamingResponse(
+        _stream_extraction_events(results, len(request.articles), _to_enriched_article_result),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+
 @router.get("/schemas/research-features")
 async def get_research_features_schema(
     current_user: User = Depends(validate_token)
@@ -393,7 +500,7 @@ async def test_extraction_service(
 # ================== ARCHETYPE-DRIVEN EXTRACTION ==================
 
 from pydantic import BaseModel, Field
-from services.extraction_service import get_extraction_service
+from services.extraction_service import ExtractionResult, get_extraction_service
 
 
 class ArchetypeToGraphRequest(BaseModel):
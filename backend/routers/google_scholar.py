@@ -9,9 +9,10 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
-import asyncio
 import time
 import logging
+import httpx
+
 from config.timeout_settings import get_streaming_config
 
 logger = logging.getLogger(__name__)
@@ -103,7 +104,7 @@ async def search_google_scholar(
         service = GoogleScholarService()
         
         # Perform the search
-        articles, search_metadata = service.search_articles(
+        articles, search_metadata = await service.search_articles_async(
             query=request.query,
             num_results=request.num_results,
             year_low=request.year_low,
@@ -175,11 +176,12 @@ async def test_google_scholar_connection(
                 "message": "SerpAPI key not configured. Set SERPAPI_KEY environment variable."
             }
         
-        # Try a minimal search to test the connection
+        # Try a minimal search to test the connection (never answered from the response cache)
         try:
-            articles, metadata = service.search_articles(
+            articles, metadata = await service.search_articles_async(
                 query="test",
-                num_results=1
+                num_results=1,
+                use_cache=False
             )
             return {
                 "status": "success",
@@ -245,6 +247,7 @@ async def stream_google_scholar(
 
     async def event_generator():
         accumulated = 0
+        client = httpx.AsyncClient(timeout=30)
         try:
             # Announce start
             yield _sse_format({"status": "starting", "payload": {"query": request.query}})
@@ -284,37 +287,41 @@ async def stream_google_scholar(
                     }
                 })
 
-                # Get articles synchronously (SerpAPI call), optionally enriching within batch
-                articles, meta = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    service._search_single_batch,
+                scholar_articles, meta = await service.fetch_page_async(
+                    client,
                     request.query,
                     current_batch,
                     request.year_low,
                     request.year_high,
                     request.sort_by or "relevance",
-                    start_index,
-                    bool(request.enrich_summaries)
+                    start_index
                 )
 
-                if not articles:
+                if not scholar_articles:
                     yield _sse_format({"status": "complete", "payload": {"returned": accumulated, "metadata": meta}})
                     break
 
-                # Enrichment already handled inside _search_single_batch when requested
+                if request.enrich_summaries:
+                    # Emit each article as soon as its enrichment finishes
+                    async for article in service.iter_enriched_articles(scholar_articles, start_index):
+                        yield _sse_format({
+                            "status": "articles",
+                            "payload": {"articles": [article.model_dump()], "metadata": meta}
+                        })
+                else:
+                    service._use_snippets_as_abstracts(scholar_articles)
+                    articles = service._to_canonical_articles(scholar_articles, start_index)
+                    yield _sse_format({
+                        "status": "articles",
+                        "payload": {
+                            "articles": [a.model_dump() for a in articles],
+                            "metadata": meta
+                        }
+                    })
 
-                accumulated += len(articles)
+                accumulated += len(scholar_articles)
                 start_index += current_batch
 
-                # Emit batch of articles
-                yield _sse_format({
-                    "status": "articles",
-                    "payload": {
-                        "articles": [a.model_dump() for a in articles],
-                        "metadata": meta
-                    }
-                })
-
                 # If we hit total available or target, stop
                 total_available = meta.get("total_results", 0)
                 if total_available and accumulated >= min(total_available, target):
@@ -327,6 +334,7 @@ async def stream_google_scholar(
         except Exception as e:
             yield _sse_format({"status": "error", "error": str(e)})
         finally:
+            await client.aclose()
             # Track completion event with results
             try:
                 from services.event_tracking import EventTracker
@@ -1,7 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from sse_starlette.sse import EventSourceResponse
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
+import asyncio
+import json
 
 from database import get_db
 
@@ -261,7 +264,7 @@ async def execute_hop(
     db: Session = Depends(get_db),
     current_user = Depends(validate_token)
 ):
-    """Execute all tool steps in a hop sequentially"""
+    """Execute all tool steps in a hop, running independent steps concurrently"""
     import logging
     logger = logging.getLogger(__name__)
     
@@ -288,4 +291,46 @@ async def execute_hop(
             "error": str(e),
             "exception_type": type(e).__name__
         })
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e)) 
+
+
+@router.post("/{hop_id}/execute/stream")
+async def execute_hop_stream(
+    hop_id: str,
+    db: Session = Depends(get_db),
+    current_user = Depends(validate_token)
+):
+    """
+    Execute a hop, streaming per-step progress as Server-Sent Events.
+    
+    Emits "step" events (step_started, step_completed, step_failed,
+    step_skipped) as independent tool steps run concurrently, then a single
+    "result" event with the HopExecutionResponse.
+    """
+    hop_service = HopService(db)
+    
+    async def event_generator():
+        events: asyncio.Queue = asyncio.Queue()
+        execution = asyncio.create_task(
+            hop_service.execute_hop(hop_id, current_user.user_id, on_step_event=events.put_nowait)
+        )
+        try:
+            while not (execution.done() and events.empty()):
+                getter = asyncio.create_task(events.get())
+                done, _ = await asyncio.wait({getter, execution}, return_when=asyncio.FIRST_COMPLETED)
+                if getter in done:
+                    yield {"event": "step", "data": json.dumps(getter.result())}
+                else:
+                    getter.cancel()
+            
+            yield {"event": "result", "data": json.dumps(execution.result())}
+        except Exception as e:
+            yield {
+                "event": "error",
+                "data": json.dumps({"error": str(e)})
+            }
+        finally:
+            if not execution.done():
+                execution.cancel()
+    
+    return EventSourceResponse(event_generator())
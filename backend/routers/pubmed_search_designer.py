@@ -16,6 +16,7 @@ from schemas.canonical_types import CanonicalResearchArticle
 from schemas.research_article_converters import legacy_article_to_canonical_pubmed, pubmed_to_research_article
 
 from services.pubmed_service import fetch_articles_by_ids, search_pubmed_count
+from services.pubmed_coverage_service import PubMedCoverageService
 from services.auth_service import validate_token
 
 logger = logging.getLogger(__name__)
@@ -134,49 +135,26 @@ async def test_search_phrase(
     Test a PubMed search phrase for result count and coverage of target IDs.
 
     This endpoint:
-    1. Gets the estimated result count for the search phrase
-    2. Tests if each target PubMed ID would be found by the search
+    1. Gets the estimated result count for the search phrase (count-only query)
+    2. Tests which target PubMed IDs would be found, with the search restricted
+       to those IDs; results are cached per phrase and ID
     3. Returns coverage statistics
     """
     try:
         logger.info(f"Testing search phrase for user {current_user.email}: {request.search_phrase}")
 
-        # Execute the search to get actual PubMed IDs that would be returned
-        from services.pubmed_service import PubMedService
-        pubmed_service = PubMedService()
+        # Ask PubMed only about the target IDs instead of downloading the phrase's result set
+        coverage = PubMedCoverageService().check_coverage(request.search_phrase, request.pubmed_ids)
 
-        # Get the IDs that the search phrase would return
-        search_result_ids, total_count = pubmed_service._get_article_ids(
-            request.search_phrase,
-            max_results=10000  # Get a large number to ensure we capture all matches
-        )
-
-        logger.debug(f"Search '{request.search_phrase}' returned {len(search_result_ids)} IDs")
-        logger.debug(f"Target PMIDs: {request.pubmed_ids}")
-
-        # Convert search results to set for fast lookup
-        search_result_set = set(search_result_ids)
-
-        # Check which of our target PMIDs are covered by the search
-        covered_ids = [pmid for pmid in request.pubmed_ids if pmid in search_result_set]
-        not_covered_ids = [pmid for pmid in request.pubmed_ids if pmid not in search_result_set]
-
-        logger.debug(f"Covered IDs: {covered_ids}")
-        logger.debug(f"Not covered IDs: {not_covered_ids}")
-
-        # Calculate coverage percentage
-        total_ids = len(request.pubmed_ids)
-        coverage_count = len(covered_ids)
-        coverage_percentage = round((coverage_count / total_ids * 100), 1) if total_ids > 0 else 0.0
-
-        logger.info(f"Search coverage: {coverage_count}/{total_ids} ({coverage_percentage}%)")
+        logger.debug(f"Covered IDs: {coverage.covered_ids}")
+        logger.debug(f"Not covered IDs: {coverage.not_covered_ids}")
 
         return TestSearchResponse(
-            estimated_count=total_count,
-            coverage_count=coverage_count,
-            coverage_percentage=coverage_percentage,
-            covered_ids=covered_ids,
-            not_covered_ids=not_covered_ids
+            estimated_count=coverage.estimated_count,
+            coverage_count=len(coverage.covered_ids),
+            coverage_percentage=coverage.coverage_percentage,
+            covered_ids=coverage.covered_ids,
+            not_covered_ids=coverage.not_covered_ids
         )
 
     except Exception as e:
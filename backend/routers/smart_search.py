@@ -8,11 +8,12 @@ import logging
 from typing import List, Optional, Dict, Any
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 from pydantic import BaseModel, Field
 
 from models import SmartSearchSession
-from database import get_db
+from database import get_db, get_async_db
 
 # Import only core domain models from schemas
 from schemas.smart_search import (
@@ -29,7 +30,7 @@ from schemas.features import FeatureDefinition, FeatureExtractionRequest as Base
 
 from services.auth_service import validate_token
 from services.smart_search_service import SmartSearchService
-from services.smart_search_session_service import SmartSearchSessionService
+from services.smart_search_session_service import SmartSearchSessionService, AsyncSmartSearchSessionService
 
 logger = logging.getLogger(__name__)
 
@@ -553,8 +554,7 @@ async def extract_features(
             raise HTTPException(status_code=404, detail="Session not found")
         
         # Get filtered articles (accepted ones only)
-        filtered_articles = session.filtered_articles or []
-        accepted_articles = [fa for fa in filtered_articles if fa.get('passed', False)]
+        accepted_articles = session_service.get_filtered_articles(session, passed_only=True)
         
         if not accepted_articles:
             raise HTTPException(status_code=400, detail="No accepted articles found in session")
@@ -622,7 +622,7 @@ async def extract_features(
 @router.get("/sessions", response_model=SessionListResponse)
 async def get_search_sessions(
     current_user = Depends(validate_token),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     limit: int = 50,
     offset: int = 0
 ) -> SessionListResponse:
@@ -630,8 +630,8 @@ async def get_search_sessions(
     Get user's smart search session history
     """
     try:
-        session_service = SmartSearchSessionService(db)
-        return session_service.get_user_sessions(
+        session_service = AsyncSmartSearchSessionService(db)
+        return await session_service.get_user_sessions(
             user_id=current_user.user_id,
             limit=limit,
             offset=offset
@@ -645,7 +645,7 @@ async def get_search_sessions(
 @router.get("/admin/sessions", response_model=SessionListResponse)
 async def get_all_search_sessions(
     current_user = Depends(validate_token),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     limit: int = 50,
     offset: int = 0
 ) -> SessionListResponse:
@@ -657,8 +657,8 @@ async def get_all_search_sessions(
         raise HTTPException(status_code=403, detail="Admin access required")
     
     try:
-        session_service = SmartSearchSessionService(db)
-        return session_service.get_all_sessions(
+        session_service = AsyncSmartSearchSessionService(db)
+        return await session_service.get_all_sessions(
             limit=limit,
             offset=offset
         )
@@ -672,19 +672,19 @@ async def get_all_search_sessions(
 async def get_search_session(
     session_id: str,
     current_user = Depends(validate_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> SmartSearchSessionDict:
     """
     Get specific smart search session details
     """
     try:
-        session_service = SmartSearchSessionService(db)
-        session = session_service.get_session(session_id, current_user.user_id)
+        session_service = AsyncSmartSearchSessionService(db)
+        session = await session_service.get_session(session_id, current_user.user_id)
         
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
         
-        return SmartSearchSessionDict(**session.to_dict())
+        return SmartSearchSessionDict(**await session_service.session_to_dict(session))
         
     except HTTPException:
         raise
@@ -745,7 +745,7 @@ async def reset_session_to_step(
         logger.info(f"Session {session_id} reset to step {request.step} for user {current_user.user_id}")
         return SessionResetResponse(
             message=f"Session reset to step {request.step}",
-            session=SmartSearchSessionDict(**session.to_dict())
+            session=SmartSearchSessionDict(**session_service.session_to_dict(session))
         )
         
     except HTTPException:
@@ -18,6 +18,8 @@ from schemas.smart_search import SearchPaginationInfo, FilteredArticle
 
 from services.auth_service import validate_token
 from services.smart_search_service import SmartSearchService
+from services.result_set_service import ResultSetService, get_result_set_service
+from exceptions import AppError
 
 # Event tracking imports
 from utils.tracking_decorator import auto_track
@@ -45,6 +47,8 @@ class DirectSearchRequest(BaseModel):
     source: str = Field(..., description="Search source: 'pubmed' or 'google_scholar'")
     max_results: int = Field(50, ge=1, le=1000, description="Maximum results to return")
     offset: int = Field(0, ge=0, description="Offset for pagination")
+    result_set_id: Optional[str] = Field(None, description="Existing result set to append this page to (load more)")
+    register_result_set: bool = Field(False, description="Register the results in a new server-side result set")
 
 class DirectSearchResponse(BaseModel):
     """Response from direct search"""
@@ -52,6 +56,7 @@ class DirectSearchResponse(BaseModel):
     pagination: SearchPaginationInfo = Field(..., description="Pagination information")
     source: str = Field(..., description="Source that was searched")
     query: str = Field(..., description="Query that was executed")
+    result_set_id: Optional[str] = Field(None, description="Server-side handle for all articles retrieved so far, when requested")
 
 class ConceptExpansionRequest(BaseModel):
     """Request for expanding concepts to Boolean expressions"""
@@ -76,7 +81,9 @@ class KeywordCombinationResponse(BaseModel):
 
 class FeatureExtractionRequest(BaseModel):
     """Request for feature extraction from articles"""
-    articles: List[CanonicalResearchArticle] = Field(..., description="Articles to extract features from")
+    articles: Optional[List[CanonicalResearchArticle]] = Field(None, description="Articles to extract features from (omit when using result_set_id)")
+    result_set_id: Optional[str] = Field(None, description="Result set handle returned by /search")
+    article_ids: Optional[List[str]] = Field(None, description="Subset of article IDs within the result set")
     features: List[CanonicalFeatureDefinition] = Field(..., description="Feature definitions to extract")
 
 class FeatureExtractionResponse(BaseModel):
@@ -86,7 +93,9 @@ class FeatureExtractionResponse(BaseModel):
 
 class ArticleFilterRequest(BaseModel):
     """Request for filtering articles using semantic discriminator"""
-    articles: List[CanonicalResearchArticle] = Field(..., description="Articles to filter")
+    articles: Optional[List[CanonicalResearchArticle]] = Field(None, description="Articles to filter (omit when using result_set_id)")
+    result_set_id: Optional[str] = Field(None, description="Result set handle returned by /search")
+    article_ids: Optional[List[str]] = Field(None, description="Subset of article IDs within the result set")
     filter_condition: str = Field(..., description="Filter condition for evaluating articles")
     strictness: str = Field("medium", description="Filtering strictness: low, medium, or high")
 
@@ -99,6 +108,7 @@ class ArticleFilterResponse(BaseModel):
     average_confidence: float = Field(..., description="Average confidence of accepted articles")
     duration_seconds: float = Field(..., description="Processing duration in seconds")
     token_usage: dict = Field(..., description="LLM token usage statistics")
+    prefilter: Optional[dict] = Field(None, description="Embedding pre-filter statistics, including LLM calls saved, when it ran")
 
 class EvidenceSpecRequest(BaseModel):
     """Request for evidence specification refinement"""
@@ -122,6 +132,18 @@ class ConceptExtractionResponse(BaseModel):
     concepts: List[str] = Field(..., description="Extracted searchable concepts")
     evidence_specification: str = Field(..., description="Input evidence specification")
 
+async def _resolve_articles(
+    articles: Optional[List[CanonicalResearchArticle]],
+    result_set_id: Optional[str],
+    article_ids: Optional[List[str]],
+    user_id: int,
+    result_sets: ResultSetService
+) -> List[CanonicalResearchArticle]:
+    """Articles sent inline, or the (subset of the) referenced server-side result set"""
+    if result_set_id:
+        return await result_sets.get_articles(result_set_id, user_id, article_ids)
+    return articles or []
+
 # ============================================================================
 # API Endpoints
 # ============================================================================
@@ -170,13 +192,19 @@ async def search(
     req: Request,  # Added for tracking
     response: Response,  # Added for journey ID response header
     current_user = Depends(validate_token),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    result_sets: ResultSetService = Depends(get_result_set_service)
 ) -> DirectSearchResponse:
     """
     Direct search without session management - optimized for SmartSearch2
     
     This endpoint provides direct access to search functionality without
     requiring the full SmartSearch workflow or session management.
+
+    With register_result_set, results are registered in a server-side result
+    set whose handle is returned, so the filter and extraction steps can
+    reference the articles instead of uploading them. Pass result_set_id when
+    loading more pages to extend the same set.
     
     Args:
         request: Search parameters
@@ -204,14 +232,25 @@ async def search(
             offset=request.offset,
             selected_sources=[request.source]
         )
+
+        result_set = None
+        if request.result_set_id:
+            result_set = await result_sets.append(request.result_set_id, current_user.user_id, result.articles)
+        elif request.register_result_set:
+            result_set = await result_sets.create(
+                current_user.user_id, result.articles, source=request.source, query=request.query
+            )
         
         return DirectSearchResponse(
             articles=result.articles,
             pagination=result.pagination,
             source=request.source,
-            query=request.query
+            query=request.query,
+            result_set_id=result_set.id if result_set else None
         )
         
+    except AppError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
     except ValueError as e:
         logger.error(f"Direct search validation error for user {current_user.user_id}: {e}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -226,13 +265,16 @@ async def filter_articles(
     request: ArticleFilterRequest,
     req: Request,  # Added for tracking
     current_user = Depends(validate_token),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    result_sets: ResultSetService = Depends(get_result_set_service)
 ) -> ArticleFilterResponse:
     """
     Filter articles using semantic discriminator without session management.
 
     This endpoint allows direct filtering of a list of articles against an
-    evidence specification using AI-powered semantic discrimination.
+    evidence specification using AI-powered semantic discrimination. Articles
+    are either sent inline or referenced by result_set_id (optionally narrowed
+    by article_ids).
 
     Args:
         request: Filter request with articles and criteria
@@ -249,21 +291,24 @@ async def filter_articles(
         import time
         start_time = time.time()
 
-        logger.info(f"User {current_user.user_id} filtering {len(request.articles)} articles")
-
         # Validate strictness level
         if request.strictness not in ['low', 'medium', 'high']:
             raise HTTPException(status_code=400, detail="Strictness must be 'low', 'medium', or 'high'")
 
-        if not request.articles:
+        articles = await _resolve_articles(
+            request.articles, request.result_set_id, request.article_ids, current_user.user_id, result_sets
+        )
+        logger.info(f"User {current_user.user_id} filtering {len(articles)} articles")
+
+        if not articles:
             raise HTTPException(status_code=400, detail="At least one article is required")
 
         # Use SmartSearchService to filter articles with clean approach
         service = SmartSearchService()
 
         # Filter articles using the clean filtering method (no discriminator generation needed)
-        filtered_articles, usage = await service.filter_articles_with_criteria(
-            articles=request.articles,
+        filtered_articles, usage, prefilter_report = await service.filter_articles_with_prefilter(
+            articles=articles,
             filter_condition=request.filter_condition
         )
 
@@ -298,11 +343,14 @@ async def filter_articles(
             total_rejected=total_rejected,
             average_confidence=round(average_confidence, 3),
             duration_seconds=round(duration_seconds, 2),
-            token_usage=token_usage
+            token_usage=token_usage,
+            prefilter=prefilter_report.to_dict() if prefilter_report else None
         )
 
     except HTTPException:
         raise
+    except AppError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
     except Exception as e:
         logger.error(f"Article filtering failed for user {current_user.user_id}: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Article filtering failed: {str(e)}")
@@ -314,13 +362,16 @@ async def extract_features(
     request: FeatureExtractionRequest,
     req: Request,
     current_user = Depends(validate_token),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    result_sets: ResultSetService = Depends(get_result_set_service)
 ) -> FeatureExtractionResponse:
     """
     Extract AI features from articles without session management.
     
     This endpoint allows direct feature extraction from a list of articles
     using custom AI features - perfect for SmartSearch2's session-less approach.
+    Articles are either sent inline or referenced by result_set_id (optionally
+    narrowed by article_ids).
     
     Args:
         request: Feature extraction request with articles and feature definitions
@@ -334,17 +385,20 @@ async def extract_features(
         HTTPException: If extraction fails
     """
     try:
-        logger.info(f"User {current_user.user_id} extracting {len(request.features)} features from {len(request.articles)} articles")
-        
         if not request.features:
             raise HTTPException(status_code=400, detail="At least one feature definition is required")
+
+        articles = await _resolve_articles(
+            request.articles, request.result_set_id, request.article_ids, current_user.user_id, result_sets
+        )
+        logger.info(f"User {current_user.user_id} extracting {len(request.features)} features from {len(articles)} articles")
         
-        if not request.articles:
+        if not articles:
             raise HTTPException(status_code=400, detail="At least one article is required")
         
         # Convert articles to dict format expected by the service
         articles_dict = []
-        for article in request.articles:
+        for article in articles:
             article_dict = {
                 'id': article.id,
                 'title': article.title,
@@ -365,7 +419,7 @@ async def extract_features(
         
         # Calculate metadata
         extraction_metadata = {
-            'total_articles': len(request.articles),
+            'total_articles': len(articles),
             'features_extracted': len(request.features),
             'successful_extractions': len(results)
         }
@@ -379,6 +433,8 @@ async def extract_features(
         
     except HTTPException:
         raise
+    except AppError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
     except Exception as e:
         logger.error(f"Feature extraction failed for user {current_user.user_id}: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Feature extraction failed: {str(e)}")
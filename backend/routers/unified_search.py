@@ -14,7 +14,10 @@ from models import User
 from services.search_providers import (
     UnifiedSearchParams, 
     SearchResponse,
+    MergedSearchResponse,
     get_provider,
+    fan_out_search,
+    merged_search,
     list_providers,
     get_available_providers
 )
@@ -175,13 +178,16 @@ async def batch_unified_search(
     date_type: Optional[Literal["completion", "publication", "entry", "revised"]] = Query(None, description="Date type for filtering (PubMed-specific)"),
     include_citations: bool = Query(True, description="Include citation information"),
     include_pdf_links: bool = Query(True, description="Include PDF links where available"),
+    timeout: Optional[float] = Query(None, gt=0, le=120, description="Per-provider deadline in seconds"),
     current_user: User = Depends(validate_token)
 ):
     """
     Perform searches across multiple providers simultaneously.
     
-    This endpoint allows searching multiple providers with the same query
-    and returns results from all providers.
+    This endpoint searches all providers concurrently, each under its own
+    deadline, so the total latency is that of the slowest provider. A
+    provider that fails or times out yields an error entry rather than
+    failing the whole batch.
     
     Args:
         providers: List of providers to search
@@ -190,6 +196,7 @@ async def batch_unified_search(
         sort_by: Sort results by relevance or date
         year_low: Filter by minimum publication year
         year_high: Filter by maximum publication year
+        timeout: Optional per-provider deadline override
         
     Returns:
         List of SearchResponse objects, one per provider
@@ -214,50 +221,42 @@ async def batch_unified_search(
         page=page
     )
     
-    results = []
+    return await fan_out_search(providers, search_params, timeout)
+
+
+@router.post("/search/merged", response_model=MergedSearchResponse)
+async def merged_unified_search(
+    providers: List[Literal["pubmed", "scholar"]] = Query(..., description="Search providers to use"),
+    query: str = Query(..., description="Search query"),
+    num_results: int = Query(20, ge=1, le=100, description="Number of results per provider"),
+    sort_by: Literal["relevance", "date"] = Query("relevance", description="Sort order"),
+    year_low: Optional[int] = Query(None, description="Minimum publication year (Scholar compatibility)"),
+    year_high: Optional[int] = Query(None, description="Maximum publication year (Scholar compatibility)"),
+    date_from: Optional[str] = Query(None, description="Start date in YYYY-MM-DD format (PubMed full precision)"),
+    date_to: Optional[str] = Query(None, description="End date in YYYY-MM-DD format (PubMed full precision)"),
+    date_type: Optional[Literal["completion", "publication", "entry", "revised"]] = Query(None, description="Date type for filtering (PubMed-specific)"),
+    timeout: Optional[float] = Query(None, gt=0, le=120, description="Per-provider deadline in seconds"),
+    current_user: User = Depends(validate_token)
+):
+    """
+    Search multiple providers concurrently and merge the results.
     
-    for provider_id in providers:
-        # Get the provider
-        search_provider = get_provider(provider_id)
-        if not search_provider:
-            logger.warning(f"Skipping unknown provider: {provider_id}")
-            continue
-        
-        try:
-            # Check availability
-            if not await search_provider.is_available():
-                logger.warning(f"Provider {provider_id} is unavailable")
-                # Add error response for this provider
-                results.append(SearchResponse(
-                    articles=[],
-                    metadata={
-                        "total_results": 0,
-                        "returned_results": 0,
-                        "search_time": 0.0,
-                        "provider": provider_id
-                    },
-                    success=False,
-                    error=f"Provider {provider_id} is currently unavailable"
-                ))
-                continue
-            
-            # Perform search
-            response = await search_provider.search(search_params)
-            results.append(response)
-            
-        except Exception as e:
-            logger.error(f"Error searching {provider_id}: {e}")
-            # Add error response for this provider
-            results.append(SearchResponse(
-                articles=[],
-                metadata={
-                    "total_results": 0,
-                    "returned_results": 0,
-                    "search_time": 0.0,
-                    "provider": provider_id
-                },
-                success=False,
-                error=str(e)
-            ))
+    Articles found by more than one provider are deduplicated by DOI and
+    PMID, keeping the first provider's record and filling its missing
+    fields from the duplicates.
+    
+    Returns:
+        MergedSearchResponse with deduplicated articles and per-provider metadata
+    """
+    search_params = UnifiedSearchParams(
+        query=query,
+        num_results=num_results,
+        sort_by=sort_by,
+        year_low=year_low,
+        year_high=year_high,
+        date_from=date_from,
+        date_to=date_to,
+        date_type=date_type
+    )
     
-    return results
\ No newline at end of file
+    return await merged_search(providers, search_params, timeout)
@@ -8,7 +8,7 @@ Single API that handles both:
 Delegates to separate services but provides unified API experience.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from typing import Dict, List, Any, Optional
 from pydantic import BaseModel, Field, ValidationError
 from sqlalchemy.orm import Session
@@ -24,10 +24,14 @@ from schemas.canonical_types import CanonicalResearchArticle
 
 from services.auth_service import validate_token
 from services.extraction_service import ExtractionService, get_extraction_service
-from services.article_group_service import ArticleGroupService
+from services.article_group_service import (
+    ArticleGroupService, AsyncArticleGroupService, get_async_article_group_service
+)
 from services.article_group_detail_service import ArticleGroupDetailService
+from services.article_search_service import ArticleSearchService, get_article_search_service, sync_user_index
 from services.feature_preset_service import FeaturePresetService
 from services.chat_quick_action_service import ChatQuickActionService
+from services.article_chat_prompt_builder import company_context_cache
 
 router = APIRouter(prefix="/workbench", tags=["workbench"])
 
@@ -100,6 +104,18 @@ class ArticleGroupDeleteResponse(BaseModel):
     deleted_group_id: str = Field(..., description="ID of the deleted group")
     deleted_articles_count: int = Field(..., description="Number of articles that were deleted")
 
+class ArticleSearchHit(BaseModel):
+    """A group article matching a semantic search"""
+    detail_id: str = Field(..., description="ID of the article within its group")
+    group_id: str = Field(..., description="ID of the group")
+    group_name: str = Field(..., description="Name of the group")
+    score: float = Field(..., description="Cosine similarity to the query")
+    article: Dict[str, Any] = Field(..., description="Stored article data")
+
+class ArticleSearchResponse(BaseModel):
+    """Response with semantic search hits, best match first"""
+    results: List[ArticleSearchHit] = Field(..., description="Matching articles")
+
 # ================== WORKBENCH ANALYSIS MODELS ==================
 
 # New Unified Extraction Models
@@ -230,22 +246,46 @@ async def get_user_groups(
     limit: int = 20,
     search: Optional[str] = None,
     current_user: User = Depends(validate_token),
-    db: Session = Depends(get_db)
+    group_service: AsyncArticleGroupService = Depends(get_async_article_group_service)
 ):
     """Get paginated list of user's workbench groups."""
-    group_service = ArticleGroupService(db)
-    return group_service.get_user_groups(current_user.user_id, page, limit, search)
+    return await group_service.get_user_groups(current_user.user_id, page, limit, search)
 
 
 @router.post("/groups", response_model=ArticleGroup)
 async def create_group(
     request: CreateArticleGroupRequest,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(validate_token),
     db: Session = Depends(get_db)
 ):
     """Create a new workbench group."""
     group_service = ArticleGroupService(db)
-    return group_service.create_group(current_user.user_id, request)
+    result = group_service.create_group(current_user.user_id, request)
+    if request.articles:
+        background_tasks.add_task(sync_user_index, current_user.user_id)
+    return result
+
+
+@router.get("/search", response_model=ArticleSearchResponse)
+async def search_group_articles(
+    background_tasks: BackgroundTasks,
+    q: str = Query(..., min_length=1, description="Search text"),
+    limit: int = Query(20, ge=1, le=100),
+    group_id: Optional[List[str]] = Query(None, description="Restrict to these groups"),
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    source: Optional[List[str]] = Query(None, description="Restrict to these sources"),
+    current_user: User = Depends(validate_token),
+    search_service: ArticleSearchService = Depends(get_article_search_service)
+):
+    """Semantic search over the articles in the user's groups (indexed ones; indexing catches up in the background)."""
+    results = await search_service.search(
+        current_user.user_id, q, limit,
+        group_ids=group_id, year_from=year_from, year_to=year_to, sources=source
+    )
+    background_tasks.add_task(sync_user_index, current_user.user_id)
+    return ArticleSearchResponse(results=results)
 
 
 @router.get("/groups/{group_id}", response_model=ArticleGroupDetailResponse)
@@ -254,11 +294,10 @@ async def get_group_details(
     page: int = 1,
     page_size: int = 20,
     current_user: User = Depends(validate_token),
-    db: Session = Depends(get_db)
+    group_service: AsyncArticleGroupService = Depends(get_async_article_group_service)
 ):
     """Get detailed information about a specific group with pagination."""
-    group_service = ArticleGroupService(db)
-    result = group_service.get_group_details(current_user.user_id, group_id, page, page_size)
+    result = await group_service.get_group_details(current_user.user_id, group_id, page, page_size)
     
     if not result:
         raise HTTPException(
@@ -273,6 +312,7 @@ async def get_group_details(
 async def update_group(
     group_id: str,
     request: UpdateArticleGroupRequest,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(validate_token),
     db: Session = Depends(get_db)
 ):
@@ -286,12 +326,14 @@ async def update_group(
             detail="Group not found or access denied"
         )
     
+    background_tasks.add_task(sync_user_index, current_user.user_id)
     return result
 
 
 @router.delete("/groups/{group_id}", response_model=ArticleGroupDeleteResponse)
 async def delete_group(
     group_id: str,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(validate_token),
     db: Session = Depends(get_db)
 ):
@@ -305,6 +347,7 @@ async def delete_group(
             detail="Group not found or access denied"
         )
     
+    background_tasks.add_task(sync_user_index, current_user.user_id)
     return result
 
 
@@ -312,6 +355,7 @@ async def delete_group(
 async def add_articles_to_group(
     group_id: str,
     request: AddArticlesRequest,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(validate_token),
     db: Session = Depends(get_db)
 ):
@@ -325,6 +369,7 @@ async def add_articles_to_group(
             detail="Group not found or access denied"
         )
     
+    background_tasks.add_task(sync_user_index, current_user.user_id)
     return result
 
 
@@ -757,6 +802,7 @@ async def update_company_profile(
     
     db.commit()
     db.refresh(profile)
+    company_context_cache.invalidate_user(current_user.user_id)
     
     return CompanyProfileResponse(
         id=str(profile.id),
@@ -224,7 +224,7 @@ class CanonicalScoredArticle(BaseModel):
     """
     article_with_features: CanonicalPubMedExtraction = Field(description="Article with extracted features")
     total_score: float = Field(description="Total calculated score")
-    score_breakdown: Dict[str, float] = Field(description="Breakdown of score components")
+    score_breakdown: Dict[str, Any] = Field(description="Breakdown of score components (raw score, weight and weighted score per criterion)")
     percentile_rank: Optional[float] = Field(default=None, description="Percentile rank among all scored articles")
     scoring_metadata: Optional[Dict[str, Any]] = Field(default=None, description="Scoring methodology metadata")
 
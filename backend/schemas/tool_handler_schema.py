@@ -24,6 +24,7 @@ class ToolParameterValue(BaseModel):
     value: Any = Field(description="The actual parameter value")
     parameter_type: Optional[str] = Field(None, description="Type hint for the parameter")
     parameter_name: Optional[str] = Field(None, description="Original parameter name")
+    asset_id: Optional[str] = Field(None, description="Asset the value was mapped from, so handlers can stream its full content")
 
 
 class ToolHandlerInput(BaseModel):
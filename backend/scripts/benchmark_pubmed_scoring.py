@@ -0,0 +1,100 @@
+"""
+PubMed Scoring Benchmark
+
+Times the columnar scoring and ranking engine behind pubmed_score_articles
+and pubmed_filter_rank on synthetic extractions, stage by stage: packing the
+features, scoring (components, totals, percentiles, normalization), building
+the CanonicalScoredArticle outputs, and filtering + ranking with all filters
+applied. For comparison it also times the O(n^2) percentile loop the handler
+used before, up to --baseline-max articles.
+
+Usage:
+
+    python scripts/benchmark_pubmed_scoring.py --sizes 1000 10000 100000 --baseline-max 10000
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import random
+import time
+from typing import List
+
+from schemas.canonical_types import CanonicalPubMedExtraction
+from services.pubmed_scoring import (
+    DEFAULT_SCORING_CRITERIA,
+    FeatureColumns,
+    build_scored_articles,
+    filter_rank,
+    score_columns
+)
+
+FILTERS = {
+    "journal_filter": ["Nature", "Cell"],
+    "author_filter": ["Smith", "Lee"],
+    "study_type": ["rct", "cohort"],
+    "year_range": {"start": 2015, "end": 2025}
+}
+
+
+def make_extractions(n: int, seed: int = 0) -> List[CanonicalPubMedExtraction]:
+    rng = random.Random(seed)
+    return [
+        CanonicalPubMedExtraction(
+            item_id=str(i),
+            original_article={
+                "pmid": str(i), "title": f"Article {i}", "abstract": "...",
+                "journal": rng.choice(["Nature", "Cell", "JAMA", "BMJ"]),
+                "authors": rng.sample(["Smith", "Jones", "Lee", "Garcia", "Chen"], 2),
+                "publication_date": f"{rng.randint(2000, 2026)}-{rng.randint(1, 12):02d}-01"
+            },
+            extraction={
+                "clinical_relevance": rng.randint(1, 5),
+                "innovation_score": str(rng.randint(1, 5)),
+                "quality_indicators": rng.choice(["randomized, blinded", "controlled", "peer-reviewed", ""]),
+                "sample_size": f"n={rng.randint(5, 5000)}",
+                "study_type": rng.choice(["RCT", "Cohort", "Review", "Case report"])
+            }
+        )
+        for i in range(n)
+    ]
+
+
+def quadratic_percentiles(scores: List[float]) -> List[float]:
+    """The per-article percentile loop pubmed_score_articles used before"""
+    return [len([s for s in scores if s < score]) / len(scores) * 100 for score in scores]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark columnar PubMed scoring and ranking")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--baseline-max", type=int, default=10000, help="Largest size to time the O(n^2) percentile loop at")
+    args = parser.parse_args()
+
+    print(f"{'articles':>9} {'pack ms':>9} {'score ms':>9} {'build ms':>9} {'rank ms':>9} {'O(n^2) pct ms':>14}")
+    for n in args.sizes:
+        extractions = make_extractions(n)
+        columns, pack_ms = timed(lambda: FeatureColumns.from_extractions(extractions))
+        scores, score_ms = timed(lambda: score_columns(columns, DEFAULT_SCORING_CRITERIA))
+        scored, build_ms = timed(lambda: build_scored_articles(extractions, scores, {}))
+        _, rank_ms = timed(lambda: filter_rank(scored, 20.0, FILTERS, max_results=50))
+
+        baseline = "skipped"
+        if n <= args.baseline_max:
+            totals = scores.total.tolist()
+            _, baseline_ms = timed(lambda: quadratic_percentiles(totals))
+            baseline = f"{baseline_ms:.1f}"
+
+        print(f"{n:>9} {pack_ms:>9.1f} {score_ms:>9.1f} {build_ms:>9.1f} {rank_ms:>9.1f} {baseline:>14}")
+
+
+if __name__ == "__main__":
+    main()
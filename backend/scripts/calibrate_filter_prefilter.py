@@ -0,0 +1,114 @@
+"""
+Embedding Pre-filter Calibration
+
+Chooses FILTER_PREFILTER_REJECT_BELOW / FILTER_PREFILTER_ACCEPT_ABOVE from
+historical LLM filter decisions: the filtered articles of recent smart search
+sessions, scored against each session's discriminator with the configured
+embedding model (FILTER_PREFILTER_BACKEND / FILTER_PREFILTER_MODEL, or the
+flags below). Decisions made by the pre-filter itself and failed evaluations
+are left out.
+
+Prints the thresholds, how they would have done on the history (LLM calls
+saved, accepted articles lost, rejected articles let through) and the
+settings to use.
+
+Usage:
+
+    python scripts/calibrate_filter_prefilter.py --sessions 200 --max-missed-rate 0.01 --max-false-accept-rate 0.02
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+from typing import List, Tuple
+
+from pydantic import ValidationError
+
+from config.settings import settings
+from database import SessionLocal
+from models import SmartSearchSession
+from schemas.canonical_types import CanonicalResearchArticle
+from services.embedding_prefilter import REASONING_PREFIX, EmbeddingPrefilter, calibrate_thresholds, create_embedder
+from services.smart_search_session_service import SmartSearchSessionService
+
+
+def load_history(limit: int) -> List[Tuple[str, List[CanonicalResearchArticle], List[bool]]]:
+    """(filter condition, articles, LLM decisions) for the most recent filtered sessions"""
+    db = SessionLocal()
+    try:
+        session_service = SmartSearchSessionService(db)
+        sessions = db.query(SmartSearchSession).filter(
+            (SmartSearchSession.submitted_discriminator.isnot(None))
+            | (SmartSearchSession.generated_discriminator.isnot(None))
+        ).order_by(SmartSearchSession.created_at.desc()).limit(limit).all()
+
+        history = []
+        for session in sessions:
+            condition = session.submitted_discriminator or session.generated_discriminator
+            articles, passed = [], []
+            for filtered in session_service.get_filtered_articles(session):
+                reasoning = filtered.get("reasoning") or ""
+                if reasoning.startswith(REASONING_PREFIX) or reasoning.startswith("Evaluation failed"):
+                    continue
+                try:
+                    articles.append(CanonicalResearchArticle.model_validate(filtered["article"]))
+                except ValidationError:
+                    continue
+                passed.append(bool(filtered.get("passed")))
+            if condition and articles:
+                history.append((condition, articles, passed))
+        return history
+    finally:
+        db.close()
+
+
+async def score_history(prefilter: EmbeddingPrefilter, history) -> Tuple[List[float], List[bool]]:
+    similarities: List[float] = []
+    labels: List[bool] = []
+    for condition, articles, passed in history:
+        similarities.extend((await prefilter.similarities(condition, articles)).tolist())
+        labels.extend(passed)
+    return similarities, labels
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Calibrate the embedding pre-filter thresholds on historical filter decisions")
+    parser.add_argument("--sessions", type=int, default=200, help="Most recent sessions to use")
+    parser.add_argument("--max-missed-rate", type=float, default=0.01, help="Share of LLM-accepted articles the reject threshold may reject")
+    parser.add_argument("--max-false-accept-rate", type=float, default=0.02, help="Share of LLM-rejected articles among the auto-accepted")
+    parser.add_argument("--backend", default=settings.FILTER_PREFILTER_BACKEND)
+    parser.add_argument("--model", default=settings.FILTER_PREFILTER_MODEL)
+    args = parser.parse_args()
+
+    history = load_history(args.sessions)
+    if not history:
+        print("No filtered smart search sessions to calibrate on")
+        return
+
+    prefilter = EmbeddingPrefilter(create_embedder(args.backend, args.model), reject_below=0.0, accept_above=1.0)
+    similarities, labels = await score_history(prefilter, history)
+    calibration = calibrate_thresholds(
+        similarities, labels,
+        max_missed_rate=args.max_missed_rate,
+        max_false_accept_rate=args.max_false_accept_rate
+    )
+
+    print(f"Sessions:          {len(history)}")
+    print(f"Articles:          {calibration.samples} ({calibration.llm_accepted} accepted by the LLM)")
+    print(f"Reject below:      {calibration.reject_below:.4f} -> {calibration.auto_rejected} auto-rejected, "
+          f"{calibration.missed_accepts} of them LLM-accepted")
+    print(f"Accept above:      {calibration.accept_above:.4f} -> {calibration.auto_accepted} auto-accepted, "
+          f"{calibration.false_accepts} of them LLM-rejected")
+    print(f"LLM calls saved:   {calibration.llm_calls_saved_fraction:.1%}")
+    print()
+    print(f"FILTER_PREFILTER_BACKEND={args.backend}")
+    print(f"FILTER_PREFILTER_MODEL={args.model}")
+    print(f"FILTER_PREFILTER_REJECT_BELOW={calibration.reject_below:.4f}")
+    print(f"FILTER_PREFILTER_ACCEPT_ABOVE={calibration.accept_above:.4f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,124 @@
+"""
+Async DB Load Test
+
+Compares event-loop responsiveness under mixed LLM + DB traffic when DB work
+goes through the synchronous session (PyMySQL) versus the async session
+(aiomysql).
+
+Simulated LLM streams await a token every TOKEN_INTERVAL seconds and record
+how late each token arrives; concurrently, DB workers issue `SELECT SLEEP(n)`
+to model slow queries. With sync sessions every query blocks the loop and
+token lateness grows with query time; with async sessions it should stay
+near zero. Reports p50/p95/p99 token lateness for both modes.
+
+Requires the configured MySQL database. Usage:
+
+    python scripts/load_test_async_db.py --streams 50 --db-workers 10 --duration 10
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+from sqlalchemy import text
+
+from database import SessionLocal, AsyncSessionLocal
+
+TOKEN_INTERVAL = 0.02
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _llm_stream(stop_at: float, lateness: List[float]):
+    """Simulate a token stream and record how late each token is delivered."""
+    while time.monotonic() < stop_at:
+        expected = time.monotonic() + TOKEN_INTERVAL
+        await asyncio.sleep(TOKEN_INTERVAL)
+        lateness.append(max(0.0, time.monotonic() - expected))
+
+
+async def _sync_db_worker(stop_at: float, query_seconds: float, latencies: List[float]):
+    """Issue slow queries through a synchronous session (blocks the loop)."""
+    while time.monotonic() < stop_at:
+        start = time.monotonic()
+        db = SessionLocal()
+        try:
+            db.execute(text("SELECT SLEEP(:s)"), {"s": query_seconds})
+        finally:
+            db.close()
+        latencies.append(time.monotonic() - start)
+        await asyncio.sleep(0)
+
+
+async def _async_db_worker(stop_at: float, query_seconds: float, latencies: List[float]):
+    """Issue slow queries through an async session."""
+    while time.monotonic() < stop_at:
+        start = time.monotonic()
+        async with AsyncSessionLocal() as db:
+            await db.execute(text("SELECT SLEEP(:s)"), {"s": query_seconds})
+        latencies.append(time.monotonic() - start)
+
+
+async def run_scenario(mode: str, streams: int, db_workers: int, duration: float, query_seconds: float) -> dict:
+    stop_at = time.monotonic() + duration
+    lateness: List[float] = []
+    db_latencies: List[float] = []
+    worker = _sync_db_worker if mode == "sync" else _async_db_worker
+
+    await asyncio.gather(
+        *(_llm_stream(stop_at, lateness) for _ in range(streams)),
+        *(worker(stop_at, query_seconds, db_latencies) for _ in range(db_workers))
+    )
+
+    return {
+        "mode": mode,
+        "tokens": len(lateness),
+        "queries": len(db_latencies),
+        "token_lateness_p50_ms": _percentile(lateness, 50) * 1000,
+        "token_lateness_p95_ms": _percentile(lateness, 95) * 1000,
+        "token_lateness_p99_ms": _percentile(lateness, 99) * 1000,
+        "query_latency_mean_ms": (statistics.mean(db_latencies) * 1000) if db_latencies else 0.0
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compare sync vs async DB sessions under mixed load")
+    parser.add_argument("--streams", type=int, default=50, help="Concurrent simulated LLM streams")
+    parser.add_argument("--db-workers", type=int, default=10, help="Concurrent DB workers")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per scenario")
+    parser.add_argument("--query-seconds", type=float, default=0.05, help="Server-side SLEEP per query")
+    args = parser.parse_args()
+
+    results = []
+    for mode in ("sync", "async"):
+        print(f"Running {mode} scenario for {args.duration}s...")
+        results.append(await run_scenario(mode, args.streams, args.db_workers, args.duration, args.query_seconds))
+
+    print()
+    print(f"{'mode':<6} {'tokens':>8} {'queries':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'query ms':>9}")
+    for r in results:
+        print(
+            f"{r['mode']:<6} {r['tokens']:>8} {r['queries']:>8} "
+            f"{r['token_lateness_p50_ms']:>8.1f} {r['token_lateness_p95_ms']:>8.1f} "
+            f"{r['token_lateness_p99_ms']:>8.1f} {r['query_latency_mean_ms']:>9.1f}"
+        )
+
+    sync_p99, async_p99 = results[0]["token_lateness_p99_ms"], results[1]["token_lateness_p99_ms"]
+    if async_p99 > 0:
+        print(f"\np99 token lateness improvement: {sync_p99 / async_p99:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,197 @@
+"""
+Analytics Summary Service
+
+Maintains the per-user (UserAnalyticsSummary) and per-journey
+(UserJourneySummary) counters as events are tracked, so the analytics
+endpoints read a row instead of aggregating user_events. History from before
+the counters existed is loaded with migrations/backfill_user_analytics_summary.py.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models import EventType, UserAnalyticsSummary, UserEvent, UserJourneySummary
+
+RECENT_EVENT_DAYS = 30
+
+# Event types with a dedicated counter column
+_COUNTER_COLUMNS = {
+    EventType.SEARCH_EXECUTE: "searches",
+    EventType.FILTER_APPLY: "filters",
+    EventType.COLUMNS_ADD: "extractions",
+}
+
+
+def _token_usage(event_data: Optional[Dict[str, Any]]) -> Dict[str, int]:
+    """prompt/completion/total tokens reported in an event's token_usage, 0 when absent"""
+    usage = (event_data or {}).get("token_usage")
+    if not isinstance(usage, dict):
+        usage = {}
+    counts = {}
+    for key in ("prompt_tokens", "completion_tokens", "total_tokens"):
+        try:
+            counts[key] = int(usage.get(key) or 0)
+        except (TypeError, ValueError):
+            counts[key] = 0
+    return counts
+
+
+def _day(timestamp: datetime) -> str:
+    return timestamp.date().isoformat()
+
+
+def _recent_cutoff(now: Optional[datetime] = None) -> str:
+    return _day((now or datetime.utcnow()) - timedelta(days=RECENT_EVENT_DAYS))
+
+
+def _new_summary(user_id: str) -> UserAnalyticsSummary:
+    return UserAnalyticsSummary(
+        user_id=user_id, total_events=0, total_journeys=0, searches=0, filters=0, extractions=0,
+        prompt_tokens=0, completion_tokens=0, total_tokens=0, event_type_counts={}, daily_event_counts={}
+    )
+
+
+def _apply_event(
+    summary: UserAnalyticsSummary,
+    journey: UserJourneySummary,
+    event_type: EventType,
+    timestamp: datetime,
+    event_data: Optional[Dict[str, Any]]
+):
+    """Add one event to a user's and a journey's counters"""
+    event_type = EventType(event_type)
+
+    summary.total_events += 1
+    column = _COUNTER_COLUMNS.get(event_type)
+    if column:
+        setattr(summary, column, getattr(summary, column) + 1)
+    for key, tokens in _token_usage(event_data).items():
+        setattr(summary, key, getattr(summary, key) + tokens)
+
+    # JSON columns are reassigned (not mutated) so the change is detected
+    type_counts = dict(summary.event_type_counts or {})
+    type_counts[event_type.value] = type_counts.get(event_type.value, 0) + 1
+    summary.event_type_counts = type_counts
+
+    cutoff = _recent_cutoff()
+    day = _day(timestamp)
+    daily_counts = {d: n for d, n in (summary.daily_event_counts or {}).items() if d >= cutoff}
+    if day >= cutoff:
+        daily_counts[day] = daily_counts.get(day, 0) + 1
+    summary.daily_event_counts = daily_counts
+
+    if summary.first_event_at is None or timestamp < summary.first_event_at:
+        summary.first_event_at = timestamp
+    if summary.last_event_at is None or timestamp >= summary.last_event_at:
+        summary.last_event_at = timestamp
+
+    journey.event_count += 1
+    if timestamp < journey.start_time:
+        journey.start_time = timestamp
+    if timestamp >= journey.end_time:
+        journey.end_time = timestamp
+        journey.last_event_type = event_type
+
+
+class AnalyticsSummaryService:
+    """Reads and maintains the analytics counters"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _locked(self, model, create, **key):
+        """Row for update, created (race-safely) if it doesn't exist yet; returns (row, created)"""
+        row = self.db.query(model).filter_by(**key).with_for_update().first()
+        if row is not None:
+            return row, False
+        try:
+            with self.db.begin_nested():
+                row = create()
+                self.db.add(row)
+            return row, True
+        except IntegrityError:
+            # Created concurrently by another request
+            return self.db.query(model).filter_by(**key).with_for_update().one(), False
+
+    def record_event(self, event: UserEvent):
+        """Count a tracked event; runs in the caller's transaction so counters commit with the event"""
+        summary, _ = self._locked(
+            UserAnalyticsSummary, lambda: _new_summary(event.user_id), user_id=event.user_id
+        )
+        journey, new_journey = self._locked(
+            UserJourneySummary,
+            lambda: UserJourneySummary(
+                user_id=event.user_id, journey_id=event.journey_id, event_count=0,
+                start_time=event.timestamp, end_time=event.timestamp
+            ),
+            user_id=event.user_id, journey_id=event.journey_id
+        )
+        if new_journey:
+            summary.total_journeys += 1
+        _apply_event(summary, journey, event.event_type, event.timestamp, event.event_data)
+
+    def rebuild_user(self, user_id: str) -> int:
+        """
+        Recompute a user's counters from user_events, replacing what is stored.
+        Does not commit.
+
+        Returns:
+            Number of events counted
+        """
+        self.db.query(UserJourneySummary).filter(UserJourneySummary.user_id == user_id).delete()
+        self.db.query(UserAnalyticsSummary).filter(UserAnalyticsSummary.user_id == user_id).delete()
+
+        summary = _new_summary(user_id)
+        journeys: Dict[str, UserJourneySummary] = {}
+        events = self.db.query(
+            UserEvent.journey_id, UserEvent.event_type, UserEvent.timestamp, UserEvent.event_data
+        ).filter(UserEvent.user_id == user_id).order_by(UserEvent.timestamp).yield_per(1000)
+
+        for journey_id, event_type, timestamp, event_data in events:
+            journey = journeys.get(journey_id)
+            if journey is None:
+                journey = journeys[journey_id] = UserJourneySummary(
+                    user_id=user_id, journey_id=journey_id, event_count=0, start_time=timestamp, end_time=timestamp
+                )
+                summary.total_journeys += 1
+            _apply_event(summary, journey, event_type, timestamp, event_data)
+
+        self.db.add(summary)
+        self.db.add_all(journeys.values())
+        return summary.total_events
+
+    def get_user_summary(self, user_id: str) -> Dict[str, Any]:
+        """Totals, last-30-day event count and per-type breakdown for a user"""
+        summary = self.db.get(UserAnalyticsSummary, user_id)
+        if summary is None:
+            return {"total_journeys": 0, "total_events": 0, "recent_events_30d": 0, "event_type_breakdown": {}}
+
+        cutoff = _recent_cutoff()
+        return {
+            "total_journeys": summary.total_journeys,
+            "total_events": summary.total_events,
+            "recent_events_30d": sum(n for d, n in (summary.daily_event_counts or {}).items() if d >= cutoff),
+            "event_type_breakdown": dict(summary.event_type_counts or {}),
+            "searches": summary.searches,
+            "filters": summary.filters,
+            "extractions": summary.extractions,
+            "token_usage": {
+                "prompt_tokens": summary.prompt_tokens,
+                "completion_tokens": summary.completion_tokens,
+                "total_tokens": summary.total_tokens
+            },
+            "first_event_at": summary.first_event_at.isoformat() if summary.first_event_at else None,
+            "last_event_at": summary.last_event_at.isoformat() if summary.last_event_at else None
+        }
+
+    def get_journey(self, user_id: str, journey_id: str) -> Optional[UserJourneySummary]:
+        return self.db.get(UserJourneySummary, (user_id, journey_id))
+
+    def get_recent_journeys(self, user_id: str, limit: int = 10) -> List[UserJourneySummary]:
+        """A user's journeys with the most recent activity first"""
+        return self.db.query(UserJourneySummary).filter(
+            UserJourneySummary.user_id == user_id
+        ).order_by(UserJourneySummary.end_time.desc()).limit(limit).all()
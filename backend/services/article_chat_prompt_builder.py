@@ -0,0 +1,219 @@
+"""
+Article Chat Prompt Builder
+
+Lays out article chat prompts so that consecutive turns share the longest
+possible prefix, which providers with automatic prompt caching bill and serve
+at a discount:
+
+1. Static instructions plus the user's company context (identical for every
+   article the user discusses)
+2. The per-article block (identical for every turn about the article)
+3. Conversation history, trimmed to a token budget
+4. The new user message
+
+History is trimmed by tokens (tiktoken), not by message count. When it is over
+budget, the oldest messages are dropped in steps of HISTORY_TRIM_STEP, so the
+first kept message, and with it the cached prefix, stays the same for several
+turns instead of moving on every turn.
+
+Rendered company context is cached per user for a short TTL so streaming
+requests skip the profile query; profile updates invalidate it.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import tiktoken
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+from models import UserCompanyProfile
+
+logger = logging.getLogger(__name__)
+
+# Oldest history messages are dropped this many at a time (two exchanges)
+HISTORY_TRIM_STEP = 4
+# Per-message formatting overhead in chat completion prompts
+MESSAGE_TOKEN_OVERHEAD = 4
+
+STATIC_INSTRUCTIONS = """You are discussing a single research article with company personnel.
+Ground every answer in the article details provided below; say so when the article does not contain the information asked for.
+Focus on providing business-relevant analysis while maintaining scientific accuracy."""
+
+DEFAULT_COMPANY_CONTEXT = "You are a research agent focused on analyzing scientific literature for business relevance."
+DEFAULT_ANALYSIS_INSTRUCTIONS = "Analyze this article for potential business implications and opportunities."
+
+
+@dataclass(frozen=True)
+class CompanyContext:
+    """Rendered company profile text used in article chat prompts"""
+    company_context: str = DEFAULT_COMPANY_CONTEXT
+    analysis_instructions: str = DEFAULT_ANALYSIS_INSTRUCTIONS
+
+    @classmethod
+    def from_profile(cls, profile: Optional[UserCompanyProfile]) -> "CompanyContext":
+        if profile is None:
+            return cls()
+        return cls(
+            company_context=profile.generate_company_context(),
+            analysis_instructions=profile.generate_analysis_instructions()
+        )
+
+
+class CompanyContextCache:
+    """Per-user TTL cache of rendered company context"""
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[int, Tuple[CompanyContext, float]] = {}
+        self._lock = Lock()
+
+    def get(self, db: Session, user_id: int) -> CompanyContext:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[1] > now:
+                return entry[0]
+
+        profile = db.query(UserCompanyProfile).filter(UserCompanyProfile.user_id == user_id).first()
+        context = CompanyContext.from_profile(profile)
+        with self._lock:
+            self._entries[user_id] = (context, now + self.ttl_seconds)
+        return context
+
+    def invalidate_user(self, user_id: int):
+        """Drop a user's cached context, e.g. after their company profile changes"""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+@lru_cache(maxsize=None)
+def _encoding_for_model(model: str) -> tiktoken.Encoding:
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def format_features(features: Dict[str, Any]) -> str:
+    """Format extracted features for the prompt"""
+    if not features:
+        return "No extracted features available"
+
+    formatted = []
+    for key, value in features.items():
+        # Convert snake_case to Title Case
+        formatted_key = key.replace('_', ' ').title()
+        formatted.append(f"- {formatted_key}: {value}")
+
+    return "\n".join(formatted)
+
+
+@dataclass
+class ArticleChatPrompt:
+    """Messages for one article chat turn plus history trimming stats"""
+    messages: List[Dict[str, str]]
+    history_messages_kept: int
+    history_messages_dropped: int
+    history_tokens: int
+
+
+class ArticleChatPromptBuilder:
+    """Builds prefix-stable article chat prompts with a token-budgeted history"""
+
+    def __init__(
+        self,
+        model: str,
+        history_token_budget: Optional[int] = None,
+        count_tokens: Optional[Callable[[str], int]] = None
+    ):
+        self.model = model
+        self.history_token_budget = (
+            history_token_budget if history_token_budget is not None else settings.ARTICLE_CHAT_HISTORY_TOKEN_BUDGET
+        )
+        self._count_tokens = count_tokens
+
+    def count_tokens(self, text: str) -> int:
+        if self._count_tokens is None:
+            encoding = _encoding_for_model(self.model)
+            self._count_tokens = lambda value: len(encoding.encode(value))
+        return self._count_tokens(text)
+
+    def build(
+        self,
+        company: CompanyContext,
+        article: Any,
+        history: List[Dict[str, str]],
+        message: str
+    ) -> ArticleChatPrompt:
+        """
+        Build the messages for a chat turn.
+
+        Args:
+            company: Rendered company context for the user
+            article: Article context (title, authors, journal, publication_year, doi,
+                abstract, extracted_features)
+            history: Previous messages as [{'role': ..., 'content': ...}], oldest first
+            message: The new user message
+        """
+        kept, tokens = self.trim_history(history)
+        messages = [
+            {"role": "system", "content": self.render_instructions(company)},
+            {"role": "system", "content": self.render_article(article)},
+            *({"role": msg["role"], "content": msg["content"]} for msg in kept),
+            {"role": "user", "content": message}
+        ]
+        return ArticleChatPrompt(
+            messages=messages,
+            history_messages_kept=len(kept),
+            history_messages_dropped=len(history) - len(kept),
+            history_tokens=tokens
+        )
+
+    def trim_history(self, history: List[Dict[str, str]]) -> Tuple[List[Dict[str, str]], int]:
+        """Keep the newest messages that fit the budget, dropping the oldest in HISTORY_TRIM_STEP steps"""
+        sizes = [self.count_tokens(msg["content"]) + MESSAGE_TOKEN_OVERHEAD for msg in history]
+        total = sum(sizes)
+        start = 0
+        while total > self.history_token_budget and start < len(history):
+            step_end = min(start + HISTORY_TRIM_STEP, len(history))
+            total -= sum(sizes[start:step_end])
+            start = step_end
+        return history[start:], total
+
+    @staticmethod
+    def render_instructions(company: CompanyContext) -> str:
+        return f"""{STATIC_INSTRUCTIONS}
+
+{company.company_context}
+
+Your role is to:
+{company.analysis_instructions}"""
+
+    @staticmethod
+    def render_article(article: Any) -> str:
+        return f"""You are analyzing the following research article:
+
+Title: {article.title}
+Authors: {', '.join(article.authors)}
+Journal: {article.journal or 'Not specified'}
+Year: {article.publication_year or 'Not specified'}
+DOI: {article.doi or 'Not specified'}
+
+Abstract:
+{article.abstract or 'No abstract available'}
+
+Extracted Features:
+{format_features(article.extracted_features)}"""
+
+
+# Global cache instance
+company_context_cache = CompanyContextCache(ttl_seconds=settings.ARTICLE_CHAT_COMPANY_CONTEXT_TTL_SECONDS)
@@ -7,9 +7,12 @@ No database logic should exist in routers - it all goes here.
 
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import Depends
 from datetime import datetime
 
+from database import get_async_db
 from models import ArticleGroup as ArticleGroupModel, User
 from models import ArticleGroupDetail as ArticleGroupDetailModel
 from schemas.canonical_types import CanonicalResearchArticle
@@ -335,19 +338,7 @@ class ArticleGroupService:
     
     def _group_to_summary(self, group: ArticleGroupModel) -> dict:
         """Convert ArticleGroupModel to summary format."""
-        return {
-            "id": group.id,
-            "user_id": group.user_id,
-            "name": group.name,
-            "description": group.description,
-            "search_query": group.search_query,
-            "search_provider": group.search_provider,
-            "search_params": group.search_params,
-            "feature_definitions": group.feature_definitions,
-            "article_count": group.article_count,
-            "created_at": group.created_at.isoformat() if group.created_at else None,
-            "updated_at": group.updated_at.isoformat() if group.updated_at else None
-        }
+        return _group_summary(group)
     
     def _group_to_detail_paginated(self, group: ArticleGroupModel, page: int = 1, page_size: int = 20) -> dict:
         """Convert ArticleGroupModel to detailed format with paginated articles."""
@@ -364,71 +355,7 @@ class ArticleGroupService:
             ArticleGroupDetailModel.article_group_id == group.id
         ).order_by(ArticleGroupDetailModel.position).offset(offset).limit(page_size).all()
         
-        # Create proper ArticleGroupDetail objects
-        article_items = []
-        for detail in articles:
-            try:
-                article_detail = ArticleGroupDetail(
-                    id=detail.id,
-                    article_id=detail.article_data.get('id', ''),
-                    group_id=detail.article_group_id,
-                    article=CanonicalResearchArticle(**detail.article_data),
-                    feature_data=detail.feature_data or {},
-                    notes=detail.notes or '',
-                    position=detail.position,
-                    added_at=detail.created_at.isoformat()
-                )
-                # Convert to dict to avoid serialization issues
-                article_items.append(article_detail.dict())
-            except Exception as e:
-                print(f"Error creating ArticleGroupDetail: {e}")
-                print(f"Detail data: {detail.__dict__}")
-                raise
-        
-        # Reconstruct feature data for each feature definition
-        # For paginated results, we only include data for articles on current page
-        reconstructed_features = []
-        for feature_def in group.feature_definitions:
-            feature_values = {}
-            for article_item in article_items:
-                article_id = article_item['article']['id']
-                feature_id = feature_def.get("id", feature_def["name"])
-                if feature_id in article_item['feature_data']:
-                    feature_values[article_id] = str(article_item['feature_data'][feature_id])
-            
-            reconstructed_features.append({
-                "id": feature_def.get("id", feature_def["name"]),
-                "name": feature_def["name"],
-                "description": feature_def["description"],
-                "type": feature_def["type"],
-                "data": feature_values,
-                "options": feature_def.get("options", {})
-            })
-        
-        # Calculate pagination metadata
-        total_pages = (total_count + page_size - 1) // page_size
-        
-        # Return data with pagination metadata
-        return {
-            "id": group.id,
-            "user_id": group.user_id,
-            "name": group.name,
-            "description": group.description,
-            "search_query": group.search_query,
-            "search_provider": group.search_provider,
-            "search_params": group.search_params,
-            "feature_definitions": reconstructed_features,
-            "article_count": group.article_count,
-            "created_at": group.created_at.isoformat() if group.created_at else None,
-            "updated_at": group.updated_at.isoformat() if group.updated_at else None,
-            "articles": article_items,
-            "pagination": {
-                "current_page": page,
-                "total_pages": total_pages,
-                "total_results": total_count,
-                "page_size": page_size
-            }
-        }
+        return _build_paginated_detail(group, articles, total_count, page, page_size)
     
     def _group_to_detail(self, group: ArticleGroupModel) -> dict:
         """Convert ArticleGroupModel to detailed format with articles."""
@@ -494,6 +421,177 @@ class ArticleGroupService:
         }
 
 
+class AsyncArticleGroupService:
+    """
+    Async variant of ArticleGroupService for the read-heavy workbench endpoints.
+    
+    Group listing and paginated detail views are polled by the workbench UI;
+    running them on an AsyncSession keeps them from blocking the event loop.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_user_groups(
+        self, 
+        user_id: int, 
+        page: int = 1, 
+        limit: int = 20,
+        search: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get paginated list of user's article groups."""
+        conditions = [ArticleGroupModel.user_id == user_id]
+        if search:
+            conditions.append(
+                ArticleGroupModel.name.ilike(f"%{search}%") |
+                ArticleGroupModel.description.ilike(f"%{search}%")
+            )
+        
+        total = await self.db.scalar(
+            select(func.count()).select_from(ArticleGroupModel).where(*conditions)
+        ) or 0
+        
+        offset = (page - 1) * limit
+        result = await self.db.scalars(
+            select(ArticleGroupModel).where(*conditions)
+            .order_by(ArticleGroupModel.updated_at.desc())
+            .offset(offset).limit(limit)
+        )
+        
+        return {
+            "groups": [_group_summary(group) for group in result.all()],
+            "total": total,
+            "page": page,
+            "limit": limit,
+            "total_pages": (total + limit - 1) // limit
+        }
+    
+    async def get_group_details(self, user_id: int, group_id: str, page: int = 1, page_size: int = 20) -> Optional[ArticleGroupWithDetails]:
+        """Get detailed information about a specific group with pagination."""
+        group = await self.db.scalar(
+            select(ArticleGroupModel).where(
+                ArticleGroupModel.id == group_id,
+                ArticleGroupModel.user_id == user_id
+            )
+        )
+        
+        if not group:
+            return None
+        
+        total_count = await self.db.scalar(
+            select(func.count()).select_from(ArticleGroupDetailModel).where(
+                ArticleGroupDetailModel.article_group_id == group.id
+            )
+        ) or 0
+        
+        result = await self.db.scalars(
+            select(ArticleGroupDetailModel).where(
+                ArticleGroupDetailModel.article_group_id == group.id
+            ).order_by(ArticleGroupDetailModel.position)
+            .offset((page - 1) * page_size).limit(page_size)
+        )
+        
+        detail_data = _build_paginated_detail(group, list(result.all()), total_count, page, page_size)
+        return ArticleGroupWithDetails(**detail_data)
+
+
+def _group_summary(group: ArticleGroupModel) -> dict:
+    """Convert ArticleGroupModel to summary format."""
+    return {
+        "id": group.id,
+        "user_id": group.user_id,
+        "name": group.name,
+        "description": group.description,
+        "search_query": group.search_query,
+        "search_provider": group.search_provider,
+        "search_params": group.search_params,
+        "feature_definitions": group.feature_definitions,
+        "article_count": group.article_count,
+        "created_at": group.created_at.isoformat() if group.created_at else None,
+        "updated_at": group.updated_at.isoformat() if group.updated_at else None
+    }
+
+
+def _build_paginated_detail(
+    group: ArticleGroupModel,
+    articles: List[ArticleGroupDetailModel],
+    total_count: int,
+    page: int,
+    page_size: int
+) -> dict:
+    """Build the paginated group detail payload from already-loaded rows."""
+    # Create proper ArticleGroupDetail objects
+    article_items = []
+    for detail in articles:
+        try:
+            article_detail = ArticleGroupDetail(
+                id=detail.id,
+                article_id=detail.article_data.get('id', ''),
+                group_id=detail.article_group_id,
+                article=CanonicalResearchArticle(**detail.article_data),
+                feature_data=detail.feature_data or {},
+                notes=detail.notes or '',
+                position=detail.position,
+                added_at=detail.created_at.isoformat()
+            )
+            # Convert to dict to avoid serialization issues
+            article_items.append(article_detail.dict())
+        except Exception as e:
+            print(f"Error creating ArticleGroupDetail: {e}")
+            print(f"Detail data: {detail.__dict__}")
+            raise
+    
+    # Reconstruct feature data for each feature definition
+    # For paginated results, we only include data for articles on current page
+    reconstructed_features = []
+    for feature_def in group.feature_definitions:
+        feature_values = {}
+        for article_item in article_items:
+            article_id = article_item['article']['id']
+            feature_id = feature_def.get("id", feature_def["name"])
+            if feature_id in article_item['feature_data']:
+                feature_values[article_id] = str(article_item['feature_data'][feature_id])
+        
+        reconstructed_features.append({
+            "id": feature_def.get("id", feature_def["name"]),
+            "name": feature_def["name"],
+            "description": feature_def["description"],
+            "type": feature_def["type"],
+            "data": feature_values,
+            "options": feature_def.get("options", {})
+        })
+    
+    # Calculate pagination metadata
+    total_pages = (total_count + page_size - 1) // page_size
+    
+    # Return data with pagination metadata
+    return {
+        "id": group.id,
+        "user_id": group.user_id,
+        "name": group.name,
+        "description": group.description,
+        "search_query": group.search_query,
+        "search_provider": group.search_provider,
+        "search_params": group.search_params,
+        "feature_definitions": reconstructed_features,
+        "article_count": group.article_count,
+        "created_at": group.created_at.isoformat() if group.created_at else None,
+        "updated_at": group.updated_at.isoformat() if group.updated_at else None,
+        "articles": article_items,
+        "pagination": {
+            "current_page": page,
+            "total_pages": total_pages,
+            "total_results": total_count,
+            "page_size": page_size
+        }
+    }
+
+
 def get_article_group_service(db: Session = None) -> ArticleGroupService:
     """Dependency injection for ArticleGroupService."""
-    return ArticleGroupService(db)
\ No newline at end of file
+    return ArticleGroupService(db)
+
+
+async def get_async_article_group_service(db: AsyncSession = Depends(get_async_db)) -> AsyncArticleGroupService:
+    """Dependency injection for AsyncArticleGroupService."""
+    return AsyncArticleGroupService(db)
@@ -0,0 +1,180 @@
+"""
+Article Search Service
+
+Semantic search over the articles a user has saved in workbench groups.
+Embeddings live in the local ArticleVectorIndex. A search only reads what is
+already indexed; bringing the user's part of the index in line with the
+database (new group articles are embedded, removed ones tombstoned) runs as a
+background job (sync_user_index) after group changes and after each search,
+so a large import never holds up a search request.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.settings import settings
+from database import AsyncSessionLocal, get_async_db
+from models import ArticleGroup as ArticleGroupModel
+from models import ArticleGroupDetail as ArticleGroupDetailModel
+from services.article_vector_index import ArticleVectorIndex, IndexEntry, get_article_vector_index
+from services.embedding_prefilter import article_text, create_embedder
+
+logger = logging.getLogger(__name__)
+
+# Group articles embedded and indexed per batch while syncing
+SYNC_BATCH_SIZE = 500
+
+
+def _article_year(article_data: Dict[str, Any]) -> Optional[int]:
+    year = article_data.get("publication_year") or article_data.get("year")
+    try:
+        return int(year) if year is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+_embedder: Optional[Any] = None
+
+
+def get_article_embedder() -> Any:
+    """Process-wide embedder for ARTICLE_INDEX_BACKEND / ARTICLE_INDEX_MODEL"""
+    global _embedder
+    if _embedder is None:
+        _embedder = create_embedder(settings.ARTICLE_INDEX_BACKEND, settings.ARTICLE_INDEX_MODEL)
+    return _embedder
+
+
+class ArticleSearchService:
+    """Semantic search over a user's workbench group articles"""
+
+    def __init__(self, db: AsyncSession, index: Optional[ArticleVectorIndex] = None, embedder: Any = None):
+        self.db = db
+        self.embedder = embedder or get_article_embedder()
+        self.index = index or get_article_vector_index(self.embedder.name)
+
+    async def _user_article_ids(self, user_id: int) -> Dict[str, str]:
+        """detail_id -> group_id of every article in the user's groups"""
+        result = await self.db.execute(
+            select(ArticleGroupDetailModel.id, ArticleGroupDetailModel.article_group_id)
+            .join(ArticleGroupModel, ArticleGroupModel.id == ArticleGroupDetailModel.article_group_id)
+            .where(ArticleGroupModel.user_id == user_id)
+        )
+        return {detail_id: group_id for detail_id, group_id in result.all()}
+
+    async def _load_articles(self, detail_ids: Sequence[str]) -> Dict[str, Tuple[Dict[str, Any], str]]:
+        """detail_id -> (article_data, group name)"""
+        loaded = {}
+        for start in range(0, len(detail_ids), SYNC_BATCH_SIZE):
+            result = await self.db.execute(
+                select(ArticleGroupDetailModel.id, ArticleGroupDetailModel.article_data, ArticleGroupModel.name)
+                .join(ArticleGroupModel, ArticleGroupModel.id == ArticleGroupDetailModel.article_group_id)
+                .where(ArticleGroupDetailModel.id.in_(detail_ids[start:start + SYNC_BATCH_SIZE]))
+            )
+            loaded.update({detail_id: (data or {}, name) for detail_id, data, name in result.all()})
+        return loaded
+
+    async def sync_user(self, user_id: int) -> Dict[str, int]:
+        """
+        Bring a user's index entries in line with their group articles.
+
+        Articles without a title or abstract have nothing to embed and are skipped.
+
+        Returns:
+            Number of articles added to and removed from the index
+        """
+        current = await self._user_article_ids(user_id)
+        indexed = await self.index.run(self.index.indexed_ids, user_id)
+
+        stale = [detail_id for detail_id, group_id in indexed.items() if current.get(detail_id) != group_id]
+        missing = [detail_id for detail_id, group_id in current.items() if indexed.get(detail_id) != group_id]
+        if stale:
+            await self.index.run(self.index.remove, stale)
+
+        added = 0
+        for start in range(0, len(missing), SYNC_BATCH_SIZE):
+            articles = await self._load_articles(missing[start:start + SYNC_BATCH_SIZE])
+            entries, texts = [], []
+            for detail_id, (article_data, _) in articles.items():
+                text = article_text(article_data)
+                if not text:
+                    continue
+                entries.append(IndexEntry(
+                    detail_id=detail_id,
+                    user_id=user_id,
+                    group_id=current[detail_id],
+                    year=_article_year(article_data),
+                    source=article_data.get("source")
+                ))
+                texts.append(text)
+            if entries:
+                vectors = await self.embedder.embed(texts)
+                await self.index.run(self.index.add, entries, vectors)
+                added += len(entries)
+
+        if added or stale:
+            logger.info(f"Article index sync for user {user_id}: {added} added, {len(stale)} removed")
+        return {"added": added, "removed": len(stale)}
+
+    async def search(
+        self,
+        user_id: int,
+        query: str,
+        limit: int = 20,
+        group_ids: Optional[List[str]] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        sources: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        The user's group articles most similar to the query.
+
+        Articles not indexed yet aren't found; schedule sync_user_index to pick them up.
+
+        Returns:
+            Dicts with detail_id, group_id, group_name, score and article (stored article_data),
+            best match first
+        """
+        query_vector = (await self.embedder.embed([query]))[0]
+        hits = await self.index.run(
+            self.index.search, user_id, query_vector, limit,
+            group_ids=group_ids, year_from=year_from, year_to=year_to, sources=sources
+        )
+        articles = await self._load_articles([hit.detail_id for hit in hits])
+        return [
+            {
+                "detail_id": hit.detail_id,
+                "group_id": hit.group_id,
+                "group_name": articles[hit.detail_id][1],
+                "score": hit.score,
+                "article": articles[hit.detail_id][0]
+            }
+            for hit in hits
+            if hit.detail_id in articles
+        ]
+
+
+async def get_article_search_service(db: AsyncSession = Depends(get_async_db)) -> ArticleSearchService:
+    """Get ArticleSearchService instance for dependency injection."""
+    return ArticleSearchService(db)
+
+
+# Users whose index sync is running in this process
+_syncing_users: Set[int] = set()
+
+
+async def sync_user_index(user_id: int):
+    """Background task: index a user's group articles after they change or are searched"""
+    if user_id in _syncing_users:
+        return
+    _syncing_users.add(user_id)
+    try:
+        async with AsyncSessionLocal() as db:
+            await ArticleSearchService(db).sync_user(user_id)
+    except Exception as e:
+        logger.warning(f"Article index sync for user {user_id} failed: {e}")
+    finally:
+        _syncing_users.discard(user_id)
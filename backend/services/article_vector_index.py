@@ -0,0 +1,388 @@
+"""
+Article Vector Index
+
+Local semantic index over the articles in users' workbench groups
+(ArticleGroupDetail.article_data title + abstract), kept on disk in
+ARTICLE_INDEX_DIR and shared by all workers on the host:
+
+- vectors.f32: unit-length float32 embeddings, one row per indexed group
+  article, append-only and memory-mapped for queries
+- index.sqlite3: which row belongs to which group article, with the owner,
+  group, year and source used for filtering, and the embedding model
+- centroids.npy: optional IVF coarse quantizer (k-means centroids, trained by
+  jobs/run_index_articles.py); rows added later are assigned to their nearest
+  centroid as they come in
+
+A query selects the user's rows that match the filters from SQLite and
+scores them against the query vector with matrix products (exact, flat).
+When more than ARTICLE_INDEX_IVF_MIN_CANDIDATES rows qualify and centroids
+exist, only rows in the ARTICLE_INDEX_IVF_NPROBE clusters nearest to the query
+are scored.
+
+Appends are serialized across processes by an IMMEDIATE SQLite transaction,
+and vectors are written to the data file before their rows are committed, so
+readers never see a row without its vector. Removed articles are only marked
+deleted; their vector rows stay until the next rebuild. clear() bumps the
+"generation" in index_info, and readers remap the data file whenever the
+generation or the file (inode, size) changes, so no worker keeps reading the
+vectors of a cleared index.
+"""
+
+import logging
+import os
+import sqlite3
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from config.settings import settings
+from utils.sqlite_store import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+# Rows scored per matrix product, to bound the memory a query copies out of the map
+SCORE_CHUNK_ROWS = 4096
+# The data file grows by at least this many rows at a time
+MIN_GROWTH_ROWS = 1024
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS index_info (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    """
+    CREATE TABLE IF NOT EXISTS entries (
+        row INTEGER PRIMARY KEY,
+        detail_id TEXT NOT NULL,
+        user_id INTEGER NOT NULL,
+        group_id TEXT NOT NULL,
+        year INTEGER,
+        source TEXT,
+        list_id INTEGER,
+        deleted INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_entries_user ON entries (user_id, deleted)",
+    "CREATE INDEX IF NOT EXISTS ix_entries_detail ON entries (detail_id)",
+]
+
+
+@dataclass
+class IndexEntry:
+    """A group article to index"""
+    detail_id: str
+    user_id: int
+    group_id: str
+    year: Optional[int] = None
+    source: Optional[str] = None
+
+
+@dataclass
+class IndexHit:
+    detail_id: str
+    group_id: str
+    score: float
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _chunks(values: Sequence, size: int = 500) -> Iterable[Sequence]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class ArticleVectorIndex(SQLiteStore):
+    """Flat + IVF cosine index over group articles, memory-mapped from ARTICLE_INDEX_DIR"""
+
+    def __init__(self, directory: str, model: str):
+        """
+        Args:
+            directory: Where the index files live (created if missing)
+            model: Name of the embedding model; an index built with another model is cleared
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.model = model
+        self._vectors_path = os.path.join(directory, "vectors.f32")
+        self._centroids_path = os.path.join(directory, "centroids.npy")
+        self._vectors: Optional[np.memmap] = None
+        self._mapped_signature: Optional[tuple] = None
+        self._centroids: Optional[np.ndarray] = None
+        self._centroids_mtime: Optional[float] = None
+
+        # Appends hold the write lock while they write vectors, so wait longer for it
+        super().__init__(os.path.join(directory, "index.sqlite3"), _SCHEMA, timeout=30)
+        with self.connect() as conn:
+            built_with = self._info(conn, "model")
+        if built_with is not None and built_with != model:
+            logger.warning(f"Article index in {directory} was built with {built_with}, clearing it for {model}")
+            self.clear()
+
+    @staticmethod
+    def _info(conn: sqlite3.Connection, key: str) -> Optional[str]:
+        row = conn.execute("SELECT value FROM index_info WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _set_info(conn: sqlite3.Connection, key: str, value):
+        conn.execute("INSERT OR REPLACE INTO index_info (key, value) VALUES (?, ?)", (key, str(value)))
+
+    @property
+    def dim(self) -> Optional[int]:
+        with self.connect() as conn:
+            dim = self._info(conn, "dim")
+        return int(dim) if dim else None
+
+    def _vector_map(self, dim: int, generation: Optional[str]) -> Optional[np.memmap]:
+        """
+        Read-only map of the data file, remapped when another process has grown
+        it, or cleared the index and started a new file (generation or inode changed)
+        """
+        try:
+            stat = os.stat(self._vectors_path)
+        except FileNotFoundError:
+            self._vectors = None
+            self._mapped_signature = None
+            return None
+        if stat.st_size == 0:
+            return None
+        signature = (generation, stat.st_ino, stat.st_size)
+        if self._vectors is None or signature != self._mapped_signature:
+            self._vectors = np.memmap(
+                self._vectors_path, dtype=np.float32, mode="r", shape=(stat.st_size // (4 * dim), dim)
+            )
+            self._mapped_signature = signature
+        return self._vectors
+
+    def _centroid_table(self) -> Optional[np.ndarray]:
+        if not os.path.exists(self._centroids_path):
+            self._centroids = None
+            return None
+        mtime = os.path.getmtime(self._centroids_path)
+        if self._centroids is None or mtime != self._centroids_mtime:
+            self._centroids = np.load(self._centroids_path)
+            self._centroids_mtime = mtime
+        return self._centroids
+
+    def _write_vectors(self, start_row: int, vectors: np.ndarray):
+        """Write vectors at start_row, growing the data file as needed (caller holds the write lock)"""
+        dim = vectors.shape[1]
+        needed = (start_row + len(vectors)) * dim * 4
+        size = os.path.getsize(self._vectors_path) if os.path.exists(self._vectors_path) else 0
+        if needed > size:
+            new_size = max(needed, size * 2, MIN_GROWTH_ROWS * dim * 4)
+            with open(self._vectors_path, "ab") as f:
+                f.truncate(new_size)
+        target = np.memmap(
+            self._vectors_path, dtype=np.float32, mode="r+", offset=start_row * dim * 4, shape=vectors.shape
+        )
+        target[:] = vectors
+        target.flush()
+        del target
+
+    def add(self, entries: Sequence[IndexEntry], vectors: np.ndarray):
+        """Index group articles; an already indexed detail_id is replaced"""
+        if not entries:
+            return
+        vectors = _normalize(vectors)
+        if len(vectors) != len(entries):
+            raise ValueError("entries and vectors must have the same length")
+
+        with self.transaction() as conn:
+            dim = self._info(conn, "dim")
+            if dim is None:
+                self._set_info(conn, "dim", vectors.shape[1])
+                self._set_info(conn, "model", self.model)
+            elif int(dim) != vectors.shape[1]:
+                raise ValueError(f"Vectors have {vectors.shape[1]} dimensions, the index has {dim}")
+
+            start_row = int(self._info(conn, "next_row") or 0)
+            self._write_vectors(start_row, vectors)
+            list_ids = self._assign_lists(vectors)
+
+            for chunk in _chunks([entry.detail_id for entry in entries]):
+                conn.execute(
+                    f"DELETE FROM entries WHERE detail_id IN ({','.join('?' * len(chunk))})", tuple(chunk)
+                )
+            conn.executemany(
+                "INSERT INTO entries (row, detail_id, user_id, group_id, year, source, list_id) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (start_row + i, entry.detail_id, entry.user_id, entry.group_id, entry.year, entry.source, list_id)
+                    for i, (entry, list_id) in enumerate(zip(entries, list_ids))
+                ]
+            )
+            self._set_info(conn, "next_row", start_row + len(entries))
+
+    def _assign_lists(self, vectors: np.ndarray) -> List[Optional[int]]:
+        centroids = self._centroid_table()
+        if centroids is None:
+            return [None] * len(vectors)
+        return np.argmax(vectors @ centroids.T, axis=1).tolist()
+
+    def remove(self, detail_ids: Sequence[str]):
+        with self.connect() as conn:
+            for chunk in _chunks(list(detail_ids)):
+                conn.execute(
+                    f"UPDATE entries SET deleted = 1 WHERE detail_id IN ({','.join('?' * len(chunk))})", tuple(chunk)
+                )
+
+    def indexed_ids(self, user_id: int) -> Dict[str, str]:
+        """detail_id -> group_id of a user's indexed articles"""
+        with self.connect() as conn:
+            rows = conn.execute(
+                "SELECT detail_id, group_id FROM entries WHERE user_id = ? AND deleted = 0", (user_id,)
+            ).fetchall()
+        return dict(rows)
+
+    def search(
+        self,
+        user_id: int,
+        query_vector: np.ndarray,
+        k: int = 20,
+        group_ids: Optional[Sequence[str]] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        sources: Optional[Sequence[str]] = None,
+        nprobe: Optional[int] = None,
+        ivf_min_candidates: Optional[int] = None
+    ) -> List[IndexHit]:
+        """
+        The k articles of a user most similar to the query vector.
+
+        Args:
+            user_id: Owner of the articles
+            query_vector: Embedding of the query (any length; it is normalized)
+            k: Number of hits
+            group_ids, year_from, year_to, sources: Optional filters
+            nprobe: IVF clusters to scan (defaults to ARTICLE_INDEX_IVF_NPROBE)
+            ivf_min_candidates: Candidate count from which IVF is used
+                (defaults to ARTICLE_INDEX_IVF_MIN_CANDIDATES)
+
+        Returns:
+            Hits ordered by descending cosine similarity
+        """
+        conditions = ["user_id = ?", "deleted = 0"]
+        params: List = [user_id]
+        if group_ids:
+            conditions.append(f"group_id IN ({','.join('?' * len(group_ids))})")
+            params.extend(group_ids)
+        if year_from is not None:
+            conditions.append("year >= ?")
+            params.append(year_from)
+        if year_to is not None:
+            conditions.append("year <= ?")
+            params.append(year_to)
+        if sources:
+            conditions.append(f"source IN ({','.join('?' * len(sources))})")
+            params.extend(sources)
+
+        with self.connect() as conn:
+            dim = self._info(conn, "dim")
+            generation = self._info(conn, "generation")
+            rows = conn.execute(
+                f"SELECT row, detail_id, group_id, list_id FROM entries WHERE {' AND '.join(conditions)} ORDER BY row",
+                params
+            ).fetchall()
+        if not rows or dim is None:
+            return []
+        vectors = self._vector_map(int(dim), generation)
+        if vectors is None:
+            return []
+
+        query = _normalize(query_vector)
+        row_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        candidates = np.arange(len(rows))
+
+        centroids = self._centroid_table()
+        ivf_min_candidates = ivf_min_candidates if ivf_min_candidates is not None else settings.ARTICLE_INDEX_IVF_MIN_CANDIDATES
+        if centroids is not None and len(rows) > ivf_min_candidates:
+            probe = np.argsort(-(centroids @ query))[:nprobe or settings.ARTICLE_INDEX_IVF_NPROBE]
+            list_ids = np.array([-1 if row[3] is None else row[3] for row in rows])
+            in_probe = np.flatnonzero(np.isin(list_ids, probe))
+            # Too few neighbours in the probed clusters: fall back to the exact scan
+            if len(in_probe) >= k:
+                candidates = in_probe
+
+        scores = np.empty(len(candidates), dtype=np.float32)
+        for start in range(0, len(candidates), SCORE_CHUNK_ROWS):
+            chunk = candidates[start:start + SCORE_CHUNK_ROWS]
+            scores[start:start + len(chunk)] = np.asarray(vectors[row_ids[chunk]]) @ query
+
+        top = np.argpartition(-scores, k - 1)[:k] if len(scores) > k else np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            IndexHit(detail_id=rows[candidates[i]][1], group_id=rows[candidates[i]][2], score=float(scores[i]))
+            for i in top
+        ]
+
+    def train_ivf(self, nlist: Optional[int] = None, iterations: int = 10, seed: int = 0) -> int:
+        """
+        Train the IVF centroids with spherical k-means over all live vectors and
+        assign every row to its nearest centroid.
+
+        Returns:
+            Number of clusters (0 if there are too few vectors to cluster)
+        """
+        with self.connect() as conn:
+            dim = self._info(conn, "dim")
+            generation = self._info(conn, "generation")
+            rows = [row for row, in conn.execute("SELECT row FROM entries WHERE deleted = 0 ORDER BY row")]
+        nlist = nlist or int(np.sqrt(len(rows)))
+        if dim is None or nlist < 2 or len(rows) < nlist:
+            return 0
+
+        data = np.asarray(self._vector_map(int(dim), generation)[rows])
+        rng = np.random.default_rng(seed)
+        centroids = data[rng.choice(len(data), nlist, replace=False)]
+        for _ in range(iterations):
+            assignment = self._nearest(data, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, data)
+            empty = np.bincount(assignment, minlength=nlist) == 0
+            sums[empty] = centroids[empty]
+            centroids = _normalize(sums)
+        assignment = self._nearest(data, centroids)
+
+        tmp_path = f"{self._centroids_path}.{os.getpid()}.tmp.npy"
+        np.save(tmp_path, centroids)
+        with self.transaction() as conn:
+            os.replace(tmp_path, self._centroids_path)
+            conn.executemany(
+                "UPDATE entries SET list_id = ? WHERE row = ?", zip(assignment.tolist(), rows)
+            )
+        return nlist
+
+    @staticmethod
+    def _nearest(data: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        assignment = np.empty(len(data), dtype=np.int64)
+        for start in range(0, len(data), SCORE_CHUNK_ROWS):
+            assignment[start:start + SCORE_CHUNK_ROWS] = np.argmax(data[start:start + SCORE_CHUNK_ROWS] @ centroids.T, axis=1)
+        return assignment
+
+    def clear(self):
+        """Drop everything, e.g. before a rebuild"""
+        with self.transaction() as conn:
+            generation = int(self._info(conn, "generation") or 0)
+            conn.execute("DELETE FROM entries")
+            conn.execute("DELETE FROM index_info")
+            # Survives the clear so other workers notice the new data file
+            self._set_info(conn, "generation", generation + 1)
+            for path in (self._vectors_path, self._centroids_path):
+                if os.path.exists(path):
+                    os.remove(path)
+        self._vectors = None
+        self._mapped_signature = None
+        self._centroids = None
+
+
+_article_index: Optional[ArticleVectorIndex] = None
+
+
+def get_article_vector_index(model: str) -> ArticleVectorIndex:
+    """Process-wide index in ARTICLE_INDEX_DIR for the given embedding model"""
+    global _article_index
+    if _article_index is None:
+        _article_index = ArticleVectorIndex(settings.ARTICLE_INDEX_DIR, model)
+    return _article_index
@@ -161,6 +161,23 @@ class AssetMappingService:
         except Exception as e:
             raise ValidationError(f"Failed to get hop assets: {str(e)}")
     
+    def get_hop_assets_for_hops(self, hop_ids: List[str]) -> Dict[str, Dict[str, AssetRole]]:
+        """Get asset mappings for several hops in one query as {hop_id: {asset_id: role}}"""
+        hop_assets: Dict[str, Dict[str, AssetRole]] = {hop_id: {} for hop_id in hop_ids}
+        if not hop_ids:
+            return hop_assets
+        try:
+            mappings = self.db.query(HopAsset).filter(
+                HopAsset.hop_id.in_(hop_ids)
+            ).all()
+            
+            for mapping in mappings:
+                hop_assets[mapping.hop_id][mapping.asset_id] = mapping.role
+            return hop_assets
+            
+        except Exception as e:
+            raise ValidationError(f"Failed to get hop assets: {str(e)}")
+    
     def get_hop_assets_by_role(self, hop_id: str, role: AssetRole) -> List[str]:
         """Get asset IDs for a hop with specific role"""
         try:
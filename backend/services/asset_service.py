@@ -1,11 +1,13 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Tuple
 from schemas.asset import Asset, DatabaseEntityMetadata
 from schemas.base import SchemaType
-from sqlalchemy import text
+from sqlalchemy import text, event
 from sqlalchemy.orm import Session
 from fastapi import Depends
 
 from datetime import datetime
+from functools import cached_property
+import json
 import tiktoken
 from services.db_entity_service import DatabaseEntityService
 from services.asset_mapping_service import AssetMappingService
@@ -17,13 +19,66 @@ from exceptions import AssetNotFoundError
 # In-memory storage for assets
 ASSET_DB: Dict[str, Asset] = {}
 
+# Session.info key of the per-session asset identity map
+ASSET_IDENTITY_MAP_KEY = "asset_identity_map"
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _clear_asset_identity_map(session: Session) -> None:
+    """Like ORM objects, identity-mapped assets are only trusted within one transaction"""
+    session.info.pop(ASSET_IDENTITY_MAP_KEY, None)
+
+
+_JSON_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+def iter_json_array(raw: str) -> Iterator[Any]:
+    """
+    Decode the elements of a JSON array one at a time, so only the element in
+    hand (not the whole array) exists as Python objects. Anything other than
+    an array is yielded as a single value.
+    """
+    position = len(raw) - len(raw.lstrip(_WHITESPACE))
+    if not raw.startswith("[", position):
+        yield json.loads(raw)
+        return
+    position += 1
+    while True:
+        while position < len(raw) and raw[position] in _WHITESPACE:
+            position += 1
+        if position >= len(raw) or raw[position] == "]":
+            return
+        value, position = _JSON_DECODER.raw_decode(raw, position)
+        yield value
+        while position < len(raw) and raw[position] in _WHITESPACE:
+            position += 1
+        if position < len(raw) and raw[position] == ",":
+            position += 1
+
+
 class AssetService:
     def __init__(self, db: Session):
         self.db = db
-        self.tokenizer = tiktoken.get_encoding("cl100k_base")
         self.db_entity_service = DatabaseEntityService(self.db)
         self.asset_mapping_service = AssetMappingService(self.db)
 
+    @cached_property
+    def tokenizer(self):
+        """Loaded on first use and kept; most services that hold an AssetService never count tokens"""
+        return tiktoken.get_encoding("cl100k_base")
+
+    @property
+    def _identity_map(self) -> Dict[Tuple[int, str], Asset]:
+        """
+        Assets already loaded in this session, keyed by (user_id, asset_id).
+        
+        Lives in Session.info, so every service sharing the request's session
+        sees the same map and an asset is loaded at most once per transaction.
+        """
+        return self.db.info.setdefault(ASSET_IDENTITY_MAP_KEY, {})
+
     def get_asset_with_details(self, asset_id: str) -> Asset:
         """Get an asset with all its details - throws AssetNotFoundError if not found"""
         result = self.db.execute(text("SELECT * FROM assets WHERE id = :id"), {"id": asset_id})
@@ -192,16 +247,49 @@ class AssetService:
             "status": new_asset.status
         }
         
-        return self._model_to_schema(asset_dict)
+        asset = self._model_to_schema(asset_dict)
+        self._identity_map[(user_id, asset_id)] = asset
+        return asset
 
     def get_asset(self, asset_id: str, user_id: int) -> Asset:
         """Get an asset by ID - throws AssetNotFoundError if not found"""
+        cached = self._identity_map.get((user_id, asset_id))
+        if cached:
+            return cached
         result = self.db.execute(text("SELECT * FROM assets WHERE id = :id AND user_id = :user_id"), 
                                {"id": asset_id, "user_id": user_id})
         asset_model = result.first()
         if not asset_model:
             raise AssetNotFoundError(asset_id)
-        return self._model_to_schema(dict(asset_model._mapping))
+        asset = self._model_to_schema(dict(asset_model._mapping))
+        self._identity_map[(user_id, asset_id)] = asset
+        return asset
+
+    def iter_content_items(self, asset_id: str, user_id: Optional[int] = None) -> Iterator[Any]:
+        """
+        Stream the items of an asset's stored content (a JSON array) without
+        materializing the whole collection - throws AssetNotFoundError if not found.
+        user_id scopes the lookup when the asset id didn't come from a server-side mapping.
+        """
+        query = "SELECT content FROM assets WHERE id = :id"
+        values = {"id": asset_id}
+        if user_id is not None:
+            query += " AND user_id = :user_id"
+            values["user_id"] = user_id
+        row = self.db.execute(text(query), values).first()
+        if not row:
+            raise AssetNotFoundError(asset_id)
+
+        content = row[0]
+        if content is None:
+            return
+        if isinstance(content, (bytes, str)):
+            # Raw JSON text from the driver: decode element by element
+            yield from iter_json_array(content.decode("utf-8") if isinstance(content, bytes) else content)
+        elif isinstance(content, list):
+            yield from content
+        else:
+            yield content
 
     def get_user_assets(
         self,
@@ -228,22 +316,34 @@ class AssetService:
     def get_assets_by_ids(
         self,
         user_id: int,
-        asset_ids: List[str]
+        asset_ids: Iterable[str]
     ) -> List[Asset]:
-        """Get multiple assets by their IDs"""
+        """
+        Get multiple assets by their IDs, in the order requested.
+        
+        Assets already in the session's identity map are not queried again;
+        the rest are loaded with a single query. Missing IDs are skipped.
+        """
+        asset_ids = list(dict.fromkeys(asset_ids))
         if not asset_ids:
             return []
         
-        placeholders = ", ".join(f":id_{i}" for i in range(len(asset_ids)))
-        query = f"SELECT * FROM assets WHERE user_id = :user_id AND id IN ({placeholders})"
-        
-        values = {"user_id": user_id}
-        for i, asset_id in enumerate(asset_ids):
-            values[f"id_{i}"] = asset_id
+        identity_map = self._identity_map
+        missing_ids = [asset_id for asset_id in asset_ids if (user_id, asset_id) not in identity_map]
+        if missing_ids:
+            placeholders = ", ".join(f":id_{i}" for i in range(len(missing_ids)))
+            query = f"SELECT * FROM assets WHERE user_id = :user_id AND id IN ({placeholders})"
+            
+            values = {"user_id": user_id}
+            for i, asset_id in enumerate(missing_ids):
+                values[f"id_{i}"] = asset_id
+            
+            result = self.db.execute(text(query), values)
+            for model in result.fetchall():
+                asset = self._model_to_schema(dict(model._mapping))
+                identity_map[(user_id, asset.id)] = asset
         
-        result = self.db.execute(text(query), values)
-        asset_models = result.fetchall()
-        return [self._model_to_schema(dict(model._mapping)) for model in asset_models]
+        return [identity_map[(user_id, asset_id)] for asset_id in asset_ids if (user_id, asset_id) in identity_map]
 
     def update_asset(
         self,
@@ -293,7 +393,9 @@ class AssetService:
             "status": asset.status
         }
         
-        return self._model_to_schema(asset_dict)
+        updated_asset = self._model_to_schema(asset_dict)
+        self._identity_map[(user_id, asset_id)] = updated_asset
+        return updated_asset
 
     def delete_asset(self, asset_id: str, user_id: int) -> None:
         """Delete an asset - throws AssetNotFoundError if not found"""
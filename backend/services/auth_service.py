@@ -13,9 +13,11 @@ from database import get_db
 import logging
 import time
 import traceback
+from uuid import uuid4
 
 # Import for session management
 from services.user_session_service import UserSessionService
+from services.principal_cache import principal_cache
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 SECRET_KEY = settings.JWT_SECRET_KEY
@@ -37,7 +39,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    # iat/jti let the principal cache key, invalidate and revoke individual tokens
+    to_encode.update({"exp": expire, "iat": datetime.utcnow(), "jti": uuid4().hex})
     logger.debug(f"Token payload: {to_encode}")
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     logger.info("Access token created successfully")
@@ -295,6 +298,19 @@ async def validate_token(
                 detail="Invalid token payload"
             )
 
+        if principal_cache.is_revoked(payload):
+            logger.warning(f"Revoked token presented for: {email}")
+            raise HTTPException(
+                status_code=401,
+                detail="Token has been revoked"
+            )
+
+        # Fast path: cached principal or trusted claims, no DB round trip
+        principal = principal_cache.lookup(payload)
+        if principal is not None:
+            logger.debug(f"Principal cache hit for user: {email}")
+            return principal.to_user(username)
+
         # Get database session
         if not isinstance(db, Session):
             logger.error(f"Invalid database session type: {type(db)}")
@@ -312,13 +328,13 @@ async def validate_token(
                 detail="User not found"
             )
 
-        # Add username and role to user object for convenience
-        user.username = username
         # role is already in the user object from database, but verify it matches token
         if role and hasattr(user, 'role') and user.role.value != role:
             logger.warning(f"Role mismatch: token has {role}, database has {user.role.value}")
+
+        principal = principal_cache.store(payload, user)
         logger.info(f"Successfully validated token for user: {email}")
-        return user
+        return principal.to_user(username)
 
     except JWTError as e:
         logger.error("############## JWT validation error ##############")
@@ -336,3 +352,25 @@ async def validate_token(
             status_code=401,
             detail=f"Invalid token: {str(e)}"
         )
+
+
+def invalidate_user_principal(user_id: int):
+    """
+    Drop cached principals for a user.
+
+    Call this whenever a user's role or status changes so the next request
+    re-reads the user from the database.
+    """
+    principal_cache.invalidate_user(user_id)
+
+
+def revoke_token(token: str):
+    """
+    Revoke an access token (logout).
+
+    Args:
+        token: Encoded JWT access token
+    """
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    principal_cache.revoke(payload)
+    logger.info(f"Revoked token for user: {payload.get('sub')}")
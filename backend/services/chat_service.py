@@ -10,11 +10,13 @@ This service handles all business logic for chat operations including:
 
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 from uuid import uuid4
 from fastapi import Depends
 
-from database import get_db
+from database import get_db, get_async_db
 from models import ChatMessage as ChatMessageModel
 
 from schemas.chat import ChatMessage
@@ -175,18 +177,131 @@ class ChatService:
     
     def _model_to_schema(self, message_model: ChatMessageModel) -> ChatMessage:
         """Convert database model to ChatMessage schema"""
-        return ChatMessage(
-            id=message_model.id,
-            chat_id=message_model.chat_id,
-            role=message_model.role,
-            content=message_model.content,
-            message_metadata=message_model.message_metadata or {},
-            created_at=message_model.created_at,
-            updated_at=message_model.created_at  # ChatMessage model doesn't have updated_at
-        )
+        return _message_model_to_schema(message_model)
+
+
+class AsyncChatService:
+    """
+    Async variant of ChatService for the chat hot path.
+    
+    Used from the SSE chat stream, where a blocking query would stall every
+    other in-flight stream in the worker.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def save_message(self, chat_id: str, user_id: int, message: ChatMessage) -> ChatMessage:
+        """
+        Save a chat message to the database
+        
+        Args:
+            chat_id: ID of the chat
+            user_id: ID of the user
+            message: ChatMessage object to save
+            
+        Returns:
+            Saved ChatMessage with populated database fields
+        """
+        try:
+            # Get current sequence order
+            existing_count = await self.db.scalar(
+                select(func.count()).select_from(ChatMessageModel).where(
+                    ChatMessageModel.chat_id == chat_id
+                )
+            )
+            
+            chat_message_model = ChatMessageModel(
+                id=str(uuid4()),
+                chat_id=chat_id,
+                user_id=user_id,
+                sequence_order=(existing_count or 0) + 1,
+                role=message.role,
+                content=message.content,
+                message_metadata=message.message_metadata or {},
+                created_at=datetime.utcnow()
+            )
+            
+            self.db.add(chat_message_model)
+            await self.db.commit()
+            
+            return _message_model_to_schema(chat_message_model)
+            
+        except Exception as e:
+            await self.db.rollback()
+            raise ValidationError(f"Failed to save message: {str(e)}")
+    
+    async def get_chat_messages(self, chat_id: str, user_id: int) -> List[ChatMessage]:
+        """
+        Get all messages for a specific chat
+        
+        Args:
+            chat_id: ID of the chat
+            user_id: ID of the user
+            
+        Returns:
+            List of ChatMessage objects ordered by sequence
+        """
+        try:
+            result = await self.db.scalars(
+                select(ChatMessageModel).where(
+                    ChatMessageModel.chat_id == chat_id,
+                    ChatMessageModel.user_id == user_id
+                ).order_by(ChatMessageModel.sequence_order)
+            )
+            
+            return [_message_model_to_schema(model) for model in result.all()]
+            
+        except Exception as e:
+            raise ValidationError(f"Failed to retrieve chat messages: {str(e)}")
+    
+    async def get_recent_messages(self, chat_id: str, user_id: int, limit: int = 50) -> List[ChatMessage]:
+        """
+        Get recent messages for a chat with limit
+        
+        Args:
+            chat_id: ID of the chat
+            user_id: ID of the user
+            limit: Maximum number of messages to return
+            
+        Returns:
+            List of recent ChatMessage objects in chronological order
+        """
+        try:
+            result = await self.db.scalars(
+                select(ChatMessageModel).where(
+                    ChatMessageModel.chat_id == chat_id,
+                    ChatMessageModel.user_id == user_id
+                ).order_by(ChatMessageModel.sequence_order.desc()).limit(limit)
+            )
+            message_models = list(result.all())
+            message_models.reverse()
+            
+            return [_message_model_to_schema(model) for model in message_models]
+            
+        except Exception as e:
+            raise ValidationError(f"Failed to retrieve recent messages: {str(e)}")
+
+
+def _message_model_to_schema(message_model: ChatMessageModel) -> ChatMessage:
+    """Convert database model to ChatMessage schema"""
+    return ChatMessage(
+        id=message_model.id,
+        chat_id=message_model.chat_id,
+        role=message_model.role,
+        content=message_model.content,
+        message_metadata=message_model.message_metadata or {},
+        created_at=message_model.created_at,
+        updated_at=message_model.created_at  # ChatMessage model doesn't have updated_at
+    )
 
 
 # Dependency injection function
 async def get_chat_service(db: Session = Depends(get_db)) -> ChatService:
     """Get ChatService instance for dependency injection"""
-    return ChatService(db) 
\ No newline at end of file
+    return ChatService(db) 
+
+
+async def get_async_chat_service(db: AsyncSession = Depends(get_async_db)) -> AsyncChatService:
+    """Get AsyncChatService instance for dependency injection"""
+    return AsyncChatService(db)
@@ -0,0 +1,114 @@
+"""
+DOI Abstract Cache
+
+Disk-backed cache of abstracts found for DOIs during Scholar enrichment,
+shared by every worker process on the host through a small SQLite file
+(SCHOLAR_ENRICHMENT_CACHE_DB_PATH).
+
+Found abstracts are kept for SCHOLAR_ENRICHMENT_CACHE_TTL_SECONDS. DOIs that
+neither Semantic Scholar nor Crossref has an abstract for are cached as
+misses for SCHOLAR_ENRICHMENT_NEGATIVE_TTL_SECONDS, so they aren't looked up
+again on every search. Lookups that failed (timeouts, rate limits, 5xx) are
+not cached.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from config.settings import settings
+from utils.sqlite_store import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS doi_abstracts (
+    doi TEXT PRIMARY KEY,
+    abstract TEXT,
+    source TEXT,
+    fetched_at REAL NOT NULL
+)
+"""
+
+
+def normalize_doi(doi: str) -> str:
+    return doi.strip().lower()
+
+
+@dataclass
+class CachedAbstract:
+    """A cached lookup; abstract is None for a known miss"""
+    abstract: Optional[str]
+    source: Optional[str]
+    age_seconds: float
+
+
+class DoiAbstractCache(SQLiteStore):
+    """DOI -> abstract cache with negative caching"""
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: int,
+        negative_ttl_seconds: int,
+        clock: Callable[[], float] = time.time
+    ):
+        super().__init__(path, [_SCHEMA])
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.clock = clock
+
+    def get(self, doi: str) -> Optional[CachedAbstract]:
+        """
+        Look up a DOI.
+
+        Returns:
+            None if the DOI has to be looked up, otherwise the cached abstract
+            or known miss
+        """
+        with self.connect() as conn:
+            row = conn.execute(
+                "SELECT abstract, source, fetched_at FROM doi_abstracts WHERE doi = ?", (normalize_doi(doi),)
+            ).fetchone()
+        if not row:
+            return None
+
+        abstract, source, fetched_at = row
+        age = max(0.0, self.clock() - fetched_at)
+        if age >= (self.ttl_seconds if abstract else self.negative_ttl_seconds):
+            return None
+        return CachedAbstract(abstract=abstract, source=source, age_seconds=age)
+
+    def set(self, doi: str, abstract: str, source: str):
+        self._store(doi, abstract, source)
+
+    def set_miss(self, doi: str):
+        """Remember that no source has an abstract for this DOI"""
+        self._store(doi, None, None)
+
+    def _store(self, doi: str, abstract: Optional[str], source: Optional[str]):
+        with self.connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO doi_abstracts (doi, abstract, source, fetched_at) VALUES (?, ?, ?, ?)",
+                (normalize_doi(doi), abstract, source, self.clock())
+            )
+
+    def clear(self):
+        with self.connect() as conn:
+            conn.execute("DELETE FROM doi_abstracts")
+
+
+_abstract_cache: Optional[DoiAbstractCache] = None
+
+
+def get_doi_abstract_cache() -> DoiAbstractCache:
+    """Process-wide DOI abstract cache backed by SCHOLAR_ENRICHMENT_CACHE_DB_PATH"""
+    global _abstract_cache
+    if _abstract_cache is None:
+        _abstract_cache = DoiAbstractCache(
+            settings.SCHOLAR_ENRICHMENT_CACHE_DB_PATH,
+            ttl_seconds=settings.SCHOLAR_ENRICHMENT_CACHE_TTL_SECONDS,
+            negative_ttl_seconds=settings.SCHOLAR_ENRICHMENT_NEGATIVE_TTL_SECONDS
+        )
+    return _abstract_cache
@@ -0,0 +1,371 @@
+"""
+Embedding Pre-filter
+
+Optional stage in front of LLM article filtering (FILTER_PREFILTER_ENABLED).
+The filter condition and each article's title and abstract are embedded, and
+articles are ranked by cosine similarity to the condition:
+
+- below FILTER_PREFILTER_REJECT_BELOW: rejected without an LLM call
+- above FILTER_PREFILTER_ACCEPT_ABOVE: accepted without an LLM call
+- in between: sent to the LLM as before
+
+Embeddings come from the OpenAI embeddings API (FILTER_PREFILTER_BACKEND=openai)
+or a local CPU sentence-transformers model (local; the package is not a
+dependency of the app and has to be installed separately). Either way they
+are cached on disk by model and text in a small SQLite file shared by all
+workers (FILTER_PREFILTER_CACHE_DB_PATH), so re-filtering a result set with a
+new condition only embeds the condition.
+
+Similarity scales differ between embedding models, so the thresholds are
+only meaningful for the model they were calibrated with; see
+calibrate_thresholds and scripts/calibrate_filter_prefilter.py.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from config.settings import settings
+from schemas.canonical_types import CanonicalResearchArticle
+from utils.sqlite_store import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+# Pre-filter verdicts
+ACCEPT = "accept"
+REJECT = "reject"
+LLM = "llm"
+
+# Reasoning of the articles the pre-filter decides starts with this
+REASONING_PREFIX = "Embedding pre-filter:"
+
+# Article text beyond this many characters is not embedded
+MAX_ARTICLE_TEXT_CHARS = 4000
+# Texts per embeddings API request
+EMBEDDING_BATCH_SIZE = 256
+
+_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS embeddings (
+        model TEXT NOT NULL,
+        text_hash TEXT NOT NULL,
+        vector BLOB NOT NULL,
+        created_at REAL NOT NULL,
+        PRIMARY KEY (model, text_hash)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_embeddings_created_at ON embeddings (created_at)",
+]
+
+
+def article_text(article: Union[CanonicalResearchArticle, Dict[str, Any]]) -> str:
+    """The text an article (or stored article_data dict) is embedded by"""
+    if isinstance(article, dict):
+        title, abstract = article.get("title") or "", article.get("abstract")
+    else:
+        title, abstract = article.title, article.abstract
+    return f"{title}\n{abstract or ''}".strip()[:MAX_ARTICLE_TEXT_CHARS]
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def cosine_similarities(query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """Cosine similarity of each row of matrix to query"""
+    query = query / max(float(np.linalg.norm(query)), 1e-12)
+    norms = np.linalg.norm(matrix, axis=1)
+    return (matrix @ query) / np.maximum(norms, 1e-12)
+
+
+class EmbeddingCache(SQLiteStore):
+    """(model, text) -> embedding cache"""
+
+    def __init__(self, path: str, ttl_seconds: int, clock: Callable[[], float] = time.time):
+        super().__init__(path, _SCHEMA)
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+
+    def get_many(self, model: str, texts: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Cached embeddings by text hash"""
+        hashes = list({_text_hash(text) for text in texts})
+        found: Dict[str, np.ndarray] = {}
+        min_created_at = self.clock() - self.ttl_seconds
+        with self.connect() as conn:
+            # Stay well below SQLite's bound parameter limit
+            for start in range(0, len(hashes), 500):
+                chunk = hashes[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND created_at >= ? "
+                    f"AND text_hash IN ({','.join('?' * len(chunk))})",
+                    (model, min_created_at, *chunk)
+                ).fetchall()
+                found.update((text_hash, np.frombuffer(vector, dtype=np.float32)) for text_hash, vector in rows)
+        return found
+
+    def set_many(self, model: str, texts: Sequence[str], vectors: np.ndarray):
+        """Store embeddings and drop expired ones"""
+        now = self.clock()
+        with self.connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector, created_at) VALUES (?, ?, ?, ?)",
+                [
+                    (model, _text_hash(text), np.asarray(vector, dtype=np.float32).tobytes(), now)
+                    for text, vector in zip(texts, vectors)
+                ]
+            )
+            conn.execute("DELETE FROM embeddings WHERE created_at < ?", (now - self.ttl_seconds,))
+
+    def clear(self):
+        with self.connect() as conn:
+            conn.execute("DELETE FROM embeddings")
+
+
+class OpenAIEmbedder:
+    """Embeddings from the OpenAI embeddings API"""
+
+    def __init__(self, model: str, client: Any = None):
+        self.model = model
+        self.client = client
+
+    @property
+    def name(self) -> str:
+        return f"openai:{self.model}"
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        from agents.prompts.base_prompt_caller import get_shared_openai_client
+
+        client = self.client or get_shared_openai_client()
+        vectors: List[List[float]] = []
+        for start in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+            response = await client.embeddings.create(model=self.model, input=texts[start:start + EMBEDDING_BATCH_SIZE])
+            vectors.extend(item.embedding for item in sorted(response.data, key=lambda item: item.index))
+        return np.asarray(vectors, dtype=np.float32)
+
+
+class LocalEmbedder:
+    """Embeddings from a local sentence-transformers model, computed on a worker thread"""
+
+    def __init__(self, model: str):
+        self.model = model
+        self._encoder = None
+        self._lock = Lock()
+
+    @property
+    def name(self) -> str:
+        return f"local:{self.model}"
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        with self._lock:
+            if self._encoder is None:
+                # Optional dependency, only needed for FILTER_PREFILTER_BACKEND=local
+                from sentence_transformers import SentenceTransformer
+                self._encoder = SentenceTransformer(self.model, device="cpu")
+            return np.asarray(self._encoder.encode(texts, batch_size=64), dtype=np.float32)
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        return await asyncio.to_thread(self._encode, texts)
+
+
+class CachedEmbedder:
+    """Embeds only the texts the cache doesn't have yet"""
+
+    def __init__(self, embedder: Any, cache: EmbeddingCache):
+        self.embedder = embedder
+        self.cache = cache
+
+    @property
+    def name(self) -> str:
+        return self.embedder.name
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        cached = await self.cache.run(self.cache.get_many, self.name, texts)
+        missing = list(dict.fromkeys(text for text in texts if _text_hash(text) not in cached))
+        if missing:
+            vectors = await self.embedder.embed(missing)
+            await self.cache.run(self.cache.set_many, self.name, missing, vectors)
+            cached.update((_text_hash(text), vector) for text, vector in zip(missing, vectors))
+        return np.stack([cached[_text_hash(text)] for text in texts])
+
+
+@dataclass
+class PrefilterReport:
+    """What the pre-filter decided for one filtering call"""
+    total: int
+    auto_accepted: int
+    auto_rejected: int
+    sent_to_llm: int
+    reject_below: float
+    accept_above: float
+    embedding_model: str
+    duration_seconds: float
+
+    @property
+    def llm_calls_saved(self) -> int:
+        return self.auto_accepted + self.auto_rejected
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "auto_accepted": self.auto_accepted,
+            "auto_rejected": self.auto_rejected,
+            "sent_to_llm": self.sent_to_llm,
+            "llm_calls_saved": self.llm_calls_saved,
+            "reject_below": self.reject_below,
+            "accept_above": self.accept_above,
+            "embedding_model": self.embedding_model,
+            "duration_seconds": round(self.duration_seconds, 3)
+        }
+
+
+@dataclass
+class PrefilterResult:
+    """Per-article similarities and verdicts, in the order of the articles"""
+    similarities: np.ndarray
+    verdicts: List[str]
+    report: PrefilterReport
+
+
+class EmbeddingPrefilter:
+    """Accepts or rejects articles by embedding similarity to the filter condition"""
+
+    def __init__(self, embedder: Any, reject_below: float, accept_above: float):
+        if accept_above < reject_below:
+            raise ValueError(f"accept_above ({accept_above}) must not be below reject_below ({reject_below})")
+        self.embedder = embedder
+        self.reject_below = reject_below
+        self.accept_above = accept_above
+
+    def classify(self, similarities: np.ndarray) -> List[str]:
+        verdicts = np.full(len(similarities), LLM, dtype=object)
+        verdicts[similarities < self.reject_below] = REJECT
+        verdicts[similarities > self.accept_above] = ACCEPT
+        return verdicts.tolist()
+
+    def reasoning(self, verdict: str, similarity: float) -> str:
+        if verdict == ACCEPT:
+            return f"{REASONING_PREFIX} accepted, similarity {similarity:.3f} above {self.accept_above:.3f}"
+        return f"{REASONING_PREFIX} rejected, similarity {similarity:.3f} below {self.reject_below:.3f}"
+
+    async def similarities(self, filter_condition: str, articles: List[CanonicalResearchArticle]) -> np.ndarray:
+        vectors = await self.embedder.embed([filter_condition.strip()] + [article_text(article) for article in articles])
+        return cosine_similarities(vectors[0], vectors[1:])
+
+    async def run(self, filter_condition: str, articles: List[CanonicalResearchArticle]) -> PrefilterResult:
+        start = time.monotonic()
+        similarities = await self.similarities(filter_condition, articles)
+        verdicts = self.classify(similarities)
+        report = PrefilterReport(
+            total=len(articles),
+            auto_accepted=verdicts.count(ACCEPT),
+            auto_rejected=verdicts.count(REJECT),
+            sent_to_llm=verdicts.count(LLM),
+            reject_below=self.reject_below,
+            accept_above=self.accept_above,
+            embedding_model=self.embedder.name,
+            duration_seconds=time.monotonic() - start
+        )
+        return PrefilterResult(similarities=similarities, verdicts=verdicts, report=report)
+
+
+@dataclass
+class Calibration:
+    """Thresholds chosen from historical LLM decisions, and how they would have done on them"""
+    reject_below: float
+    accept_above: float
+    samples: int
+    llm_accepted: int
+    auto_rejected: int
+    auto_accepted: int
+    missed_accepts: int  # LLM accepted, auto-rejected
+    false_accepts: int  # LLM rejected, auto-accepted
+
+    @property
+    def llm_calls_saved_fraction(self) -> float:
+        return (self.auto_rejected + self.auto_accepted) / self.samples if self.samples else 0.0
+
+
+def calibrate_thresholds(
+    similarities: Sequence[float],
+    passed: Sequence[bool],
+    max_missed_rate: float = 0.01,
+    max_false_accept_rate: float = 0.02
+) -> Calibration:
+    """
+    Choose pre-filter thresholds from historical similarities and LLM decisions.
+
+    Args:
+        similarities: Cosine similarity of each historical article to its filter condition
+        passed: Whether the LLM accepted the article
+        max_missed_rate: Largest share of LLM-accepted articles the reject threshold may reject
+        max_false_accept_rate: Largest share of LLM-rejected articles among the auto-accepted
+
+    Returns:
+        The highest reject threshold and the lowest accept threshold within those rates
+    """
+    similarities = np.asarray(similarities, dtype=np.float64)
+    passed = np.asarray(passed, dtype=bool)
+    if len(similarities) != len(passed):
+        raise ValueError("similarities and passed must have the same length")
+    if not passed.any():
+        raise ValueError("Calibration needs at least one article the LLM accepted")
+
+    # Reject below the k-th lowest accepted similarity: at most k accepted articles fall below it
+    accepted = np.sort(similarities[passed])
+    reject_below = float(accepted[int(max_missed_rate * len(accepted))])
+
+    # Accept the longest run of top-ranked articles whose share of LLM rejections stays within the rate
+    order = np.argsort(-similarities, kind="stable")
+    ranked = similarities[order]
+    false_accept_rate = np.cumsum(~passed[order]) / np.arange(1, len(order) + 1)
+    within = np.flatnonzero(false_accept_rate <= max_false_accept_rate)
+    accept_above = 1.0
+    if len(within):
+        last = within[-1]
+        accept_above = max(float(ranked[last + 1]) if last + 1 < len(ranked) else reject_below, reject_below)
+
+    prefilter = EmbeddingPrefilter(embedder=None, reject_below=reject_below, accept_above=accept_above)
+    verdicts = np.asarray(prefilter.classify(similarities), dtype=object)
+    return Calibration(
+        reject_below=reject_below,
+        accept_above=accept_above,
+        samples=len(similarities),
+        llm_accepted=int(passed.sum()),
+        auto_rejected=int((verdicts == REJECT).sum()),
+        auto_accepted=int((verdicts == ACCEPT).sum()),
+        missed_accepts=int(((verdicts == REJECT) & passed).sum()),
+        false_accepts=int(((verdicts == ACCEPT) & ~passed).sum())
+    )
+
+
+def create_embedder(backend: str, model: str) -> Any:
+    """Cached embedder for FILTER_PREFILTER_BACKEND / FILTER_PREFILTER_MODEL"""
+    if backend == "openai":
+        embedder = OpenAIEmbedder(model)
+    elif backend == "local":
+        embedder = LocalEmbedder(model)
+    else:
+        raise ValueError(f"Unknown embedding pre-filter backend: {backend}")
+    cache = EmbeddingCache(settings.FILTER_PREFILTER_CACHE_DB_PATH, settings.FILTER_PREFILTER_CACHE_TTL_SECONDS)
+    return CachedEmbedder(embedder, cache)
+
+
+_prefilter: Optional[EmbeddingPrefilter] = None
+
+
+def get_embedding_prefilter() -> EmbeddingPrefilter:
+    """Process-wide pre-filter configured by the FILTER_PREFILTER_* settings"""
+    global _prefilter
+    if _prefilter is None:
+        _prefilter = EmbeddingPrefilter(
+            create_embedder(settings.FILTER_PREFILTER_BACKEND, settings.FILTER_PREFILTER_MODEL),
+            reject_below=settings.FILTER_PREFILTER_REJECT_BELOW,
+            accept_above=settings.FILTER_PREFILTER_ACCEPT_ABOVE
+        )
+    return _prefilter
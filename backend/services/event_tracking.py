@@ -11,6 +11,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import and_, func
 
 from models import UserEvent, EventType
+from services.analytics_summary_service import AnalyticsSummaryService
 
 
 class EventTracker:
@@ -50,6 +51,12 @@ class EventTracker:
         )
 
         self.db.add(event)
+        try:
+            # Counters commit together with the event; a failure here must not lose the event
+            with self.db.begin_nested():
+                AnalyticsSummaryService(self.db).record_event(event)
+        except Exception as e:
+            print(f"[TRACKING ERROR] Failed to update analytics summary for {event_type}: {e}")
         self.db.commit()
 
         return event.event_id
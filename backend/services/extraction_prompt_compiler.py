@@ -0,0 +1,175 @@
+"""
+Extraction Prompt Compiler
+
+Compiles the messages for one ExtractionPromptCaller call with as few prompt
+tokens as possible:
+
+- The result schema already travels in the request as
+  response_format.json_schema, so it is not pasted into the prompt again
+  unless structured outputs aren't enforced (EXTRACTION_SCHEMA_IN_PROMPT).
+- Source items (and the schema, when included) are serialized as compact
+  JSON instead of indent=2.
+- Static text comes first: the system message holds the guidelines and the
+  field instructions, which are identical for every item of a batch, and the
+  source item follows in its own user message. Providers with automatic
+  prompt caching serve that shared prefix at a discount.
+
+Each compiled prompt carries a tiktoken estimate of its size and of the size
+of the uncompiled prompt (BASELINE_TEMPLATE), which callers report as
+LLMUsage.prompt_tokens_saved.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+import tiktoken
+
+logger = logging.getLogger(__name__)
+
+# Per-message formatting overhead in chat completion prompts
+MESSAGE_TOKEN_OVERHEAD = 4
+# Rough size of a token when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+STATIC_INSTRUCTIONS = """You are an extraction function that processes data according to specific instructions.
+
+## Your Task
+Given a source item and field instructions, extract the requested information according to the schema.
+
+## Guidelines
+- Follow field-specific instructions precisely
+- Use exact output format specified in schema
+- Return null/default for missing information
+- Maintain data types as specified in the schema (string, number, boolean, array, object)
+- Return the extraction in the specified schema format"""
+
+# The prompt as it was rendered before compilation; only used to measure savings
+BASELINE_TEMPLATE = """You are an extraction function that processes data according to specific instructions.
+
+        ## Your Task
+        Given a source item and field instructions, extract the requested information according to the schema.
+
+        ## Guidelines
+        - Follow field-specific instructions precisely
+        - Use exact output format specified in schema
+        - Return null/default for missing information
+        - Maintain data types as specified in the schema (string, number, boolean, array, object)
+
+        ## Schema
+        {result_schema}
+
+        ## Field Instructions
+        {extraction_instructions}
+
+        ## Source Item
+        {source_item}
+
+        Please extract the required information and return it in the specified schema format."""
+
+
+@lru_cache(maxsize=None)
+def _encoding_for_model(model: str) -> Optional[tiktoken.Encoding]:
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # The encodings are downloaded on first use; savings are only an estimate, so don't fail the extraction
+        logger.warning(f"No tokenizer for {model}, estimating prompt tokens from length: {e}")
+        return None
+
+
+def compact_json(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+@dataclass
+class ExtractionPrompt:
+    """Compiled messages for one extraction plus prompt size estimates"""
+    messages: List[Dict[str, str]]
+    prompt_tokens: int
+    baseline_prompt_tokens: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.baseline_prompt_tokens - self.prompt_tokens)
+
+
+class ExtractionPromptCompiler:
+    """Compiles token-lean, prefix-stable extraction prompts for one result schema"""
+
+    def __init__(
+        self,
+        result_schema: Dict[str, Any],
+        model: str,
+        schema_in_prompt: bool = False,
+        count_tokens: Optional[Callable[[str], int]] = None
+    ):
+        """
+        Args:
+            result_schema: The JSON schema for extraction results
+            model: Model the prompt is for (selects the tokenizer)
+            schema_in_prompt: Paste the schema into the prompt; only needed when
+                the schema isn't enforced through response_format
+            count_tokens: Token counter (defaults to the model's tiktoken encoding)
+        """
+        self.result_schema = result_schema
+        self.model = model
+        self.schema_in_prompt = schema_in_prompt
+        self._count_tokens = count_tokens
+        self._system_messages: Dict[str, str] = {}
+        self._static_tokens: Dict[str, int] = {}
+        self._baseline_tokens: Dict[str, int] = {}
+
+    def count_tokens(self, text: str) -> int:
+        if self._count_tokens is None:
+            encoding = _encoding_for_model(self.model)
+            if encoding is None:
+                self._count_tokens = lambda value: (len(value) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+            else:
+                self._count_tokens = lambda value: len(encoding.encode(value))
+        return self._count_tokens(text)
+
+    def compile(self, source_item: Dict[str, Any], extraction_instructions: str) -> ExtractionPrompt:
+        system_message = self.render_system_message(extraction_instructions)
+        user_message = f"## Source Item\n{compact_json(source_item)}"
+        return ExtractionPrompt(
+            messages=[
+                {"role": "system", "content": system_message},
+                {"role": "user", "content": user_message}
+            ],
+            prompt_tokens=(
+                self._static_tokens[extraction_instructions]
+                + self.count_tokens(user_message) + 2 * MESSAGE_TOKEN_OVERHEAD
+            ),
+            baseline_prompt_tokens=self.count_baseline_tokens(source_item, extraction_instructions)
+        )
+
+    def render_system_message(self, extraction_instructions: str) -> str:
+        """The static part of the prompt; rendered once per set of field instructions"""
+        system_message = self._system_messages.get(extraction_instructions)
+        if system_message is None:
+            parts = [STATIC_INSTRUCTIONS]
+            if self.schema_in_prompt:
+                parts.append(f"## Schema\n{compact_json(self.result_schema)}")
+            parts.append(f"## Field Instructions\n{extraction_instructions.strip()}")
+            system_message = "\n\n".join(parts)
+            self._system_messages[extraction_instructions] = system_message
+            self._static_tokens[extraction_instructions] = self.count_tokens(system_message)
+        return system_message
+
+    def count_baseline_tokens(self, source_item: Dict[str, Any], extraction_instructions: str) -> int:
+        """Size of the same prompt rendered by BASELINE_TEMPLATE (template and item counted separately)"""
+        template_tokens = self._baseline_tokens.get(extraction_instructions)
+        if template_tokens is None:
+            template_tokens = self.count_tokens(BASELINE_TEMPLATE.format(
+                result_schema=json.dumps(self.result_schema, indent=2),
+                extraction_instructions=extraction_instructions,
+                source_item=""
+            )) + MESSAGE_TOKEN_OVERHEAD
+            self._baseline_tokens[extraction_instructions] = template_tokens
+        return template_tokens + self.count_tokens(json.dumps(source_item, indent=2, default=str))
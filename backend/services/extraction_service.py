@@ -6,15 +6,19 @@ by various handlers including the generic extract handler and specific
 feature extraction handlers like Google Scholar feature extraction.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
 from datetime import datetime
+import asyncio
 import uuid
 import json
 from pydantic import BaseModel, Field
 from typing import Union
 
-from agents.prompts.base_prompt_caller import BasePromptCaller
+from agents.prompts.base_prompt_caller import BasePromptCaller, LLMResponse, LLMUsage
 from config.llm_models import get_task_config, supports_reasoning_effort
+from config.settings import settings
+from exceptions import ExtractionItemError
+from services.extraction_prompt_compiler import STATIC_INSTRUCTIONS, ExtractionPromptCompiler
 
 from schemas.entity_extraction import (
     EntityRelationshipAnalysis, 
@@ -32,6 +36,7 @@ class ExtractionResult(BaseModel):
     error: Optional[str] = Field(default=None, description="Error message if extraction failed")
     confidence_score: Optional[float] = Field(default=None, description="Confidence in extraction (0-1)")
     extraction_timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    usage: Optional[LLMUsage] = Field(default=None, description="Token usage of the extraction call")
 
 
 class ExtractionPromptCaller(BasePromptCaller):
@@ -44,29 +49,6 @@ class ExtractionPromptCaller(BasePromptCaller):
         Args:
             result_schema: The JSON schema for the expected result
         """
-        # Define the system message template
-        system_message = """You are an extraction function that processes data according to specific instructions.
-
-        ## Your Task
-        Given a source item and field instructions, extract the requested information according to the schema.
-
-        ## Guidelines
-        - Follow field-specific instructions precisely
-        - Use exact output format specified in schema
-        - Return null/default for missing information
-        - Maintain data types as specified in the schema (string, number, boolean, array, object)
-
-        ## Schema
-        {result_schema}
-
-        ## Field Instructions
-        {extraction_instructions}
-
-        ## Source Item
-        {source_item}
-
-        Please extract the required information and return it in the specified schema format."""
-        
         # Get model config for extraction
         model_config = get_task_config("extraction", "default")
         
@@ -74,47 +56,57 @@ class ExtractionPromptCaller(BasePromptCaller):
         # BasePromptCaller will handle the conversion to Pydantic model
         super().__init__(
             response_model=result_schema,  # Pass JSON schema directly
-            system_message=system_message,
+            system_message=STATIC_INSTRUCTIONS,
             messages_placeholder=False,  # We don't need conversation history for extraction
             model=model_config["model"],
             temperature=model_config.get("temperature", 0.0),
             reasoning_effort=model_config.get("reasoning_effort") if supports_reasoning_effort(model_config["model"]) else None
         )
+        
+        # The schema is enforced through response_format, so the compiler leaves it out of the prompt
+        self.compiler = ExtractionPromptCompiler(
+            result_schema=self.get_schema(),
+            model=self.model,
+            schema_in_prompt=settings.EXTRACTION_SCHEMA_IN_PROMPT
+        )
     
     async def invoke_extraction(
         self,
         source_item: Dict[str, Any],
-        extraction_instructions: str
-    ) -> Dict[str, Any]:
+        extraction_instructions: str,
+        return_usage: bool = False
+    ) -> Union[Dict[str, Any], LLMResponse]:
         """
         Invoke the extraction function.
         
         Args:
             source_item: The item to extract from
             extraction_instructions: Natural language instructions for extraction
+            return_usage: Whether to return usage information along with the result
             
         Returns:
-            The extracted result matching the schema
+            If return_usage=True: LLMResponse with the extracted dict and usage info,
+                including the prompt tokens saved by prompt compilation
+            If return_usage=False: The extracted result matching the schema
         """
-        # Format the source item as a readable string
-        source_item_str = json.dumps(source_item, indent=2, default=str)
+        prompt = self.compiler.compile(source_item, extraction_instructions)
         
-        # Call the base invoke method with our variables
-        response = await self.invoke(
-            source_item=source_item_str,
-            extraction_instructions=extraction_instructions,
-            messages=[],  # No conversation history needed
-            result_schema=json.dumps(self.get_schema(), indent=2)
-        )
+        response = await self.invoke(prompt_messages=prompt.messages, return_usage=True)
         
         # The response is the structured Pydantic model, convert to dict
-        if hasattr(response, 'model_dump'):
-            return response.model_dump()
-        elif hasattr(response, 'dict'):
-            return response.dict()
+        result = response.result
+        if hasattr(result, 'model_dump'):
+            extraction = result.model_dump()
+        elif hasattr(result, 'dict'):
+            extraction = result.dict()
         else:
             # Fallback - should not happen with proper Pydantic models
-            return dict(response) if hasattr(response, '__dict__') else response
+            extraction = dict(result) if hasattr(result, '__dict__') else result
+        
+        if not return_usage:
+            return extraction
+        response.usage.prompt_tokens_saved = prompt.tokens_saved
+        return LLMResponse(result=extraction, usage=response.usage)
 
 
 class ExtractionService:
@@ -173,16 +165,19 @@ class ExtractionService:
             prompt_caller = self._get_prompt_caller(schema_key, result_schema)
             
             # Perform the extraction
-            extraction_result = await prompt_caller.invoke_extraction(
+            response = await prompt_caller.invoke_extraction(
                 source_item=item,
-                extraction_instructions=extraction_instructions
+                extraction_instructions=extraction_instructions,
+                return_usage=True
             )
+            extraction_result = response.result
             
             return ExtractionResult(
                 item_id=item_id,
                 original_item=item,
                 extraction=extraction_result,
-                confidence_score=extraction_result.get("confidence_score")
+                confidence_score=extraction_result.get("confidence_score"),
+                usage=response.usage
             )
             
         except Exception as e:
@@ -199,48 +194,108 @@ class ExtractionService:
         result_schema: Dict[str, Any],
         extraction_instructions: str,
         schema_key: Optional[str] = None,
-        continue_on_error: bool = True
+        continue_on_error: bool = True,
+        max_concurrent: Optional[int] = None,
+        item_timeout: Optional[float] = None
     ) -> List[ExtractionResult]:
         """
         Extract information from multiple items using the same schema and instructions.
         
+        Items are extracted concurrently (see iter_extract_multiple_items);
+        results are returned in the order of the input items.
+        
         Args:
             items: List of source items to extract from
             result_schema: JSON schema defining the structure of extraction results
             extraction_instructions: Natural language instructions for extraction
             schema_key: Optional key for caching the prompt caller
             continue_on_error: Whether to continue processing if individual items fail
+            max_concurrent: Maximum extractions in flight (defaults to EXTRACTION_MAX_CONCURRENCY)
+            item_timeout: Seconds before an item gets a timeout error (defaults to EXTRACTION_ITEM_TIMEOUT_SECONDS)
             
         Returns:
             List of ExtractionResult objects
         """
-        results = []
-        
-        for item in items:
-            try:
-                result = await self.perform_extraction(
-                    item=item,
-                    result_schema=result_schema,
-                    extraction_instructions=extraction_instructions,
-                    schema_key=schema_key
-                )
-                results.append(result)
-                
-            except Exception as e:
-                if continue_on_error:
-                    # Create error result and continue
-                    item_id = item.get("id", str(uuid.uuid4()))
-                    results.append(ExtractionResult(
-                        item_id=item_id,
+        results: List[Optional[ExtractionResult]] = [None] * len(items)
+        async for index, result in self.iter_extract_multiple_items(
+            items=items,
+            result_schema=result_schema,
+            extraction_instructions=extraction_instructions,
+            schema_key=schema_key,
+            continue_on_error=continue_on_error,
+            max_concurrent=max_concurrent,
+            item_timeout=item_timeout
+        ):
+            results[index] = result
+        return results
+
+    async def iter_extract_multiple_items(
+        self,
+        items: List[Dict[str, Any]],
+        result_schema: Dict[str, Any],
+        extraction_instructions: str,
+        schema_key: Optional[str] = None,
+        continue_on_error: bool = True,
+        max_concurrent: Optional[int] = None,
+        item_timeout: Optional[float] = None
+    ) -> AsyncIterator[Tuple[int, ExtractionResult]]:
+        """
+        Extract from multiple items concurrently, yielding (index, result) as each item finishes.
+        
+        At most max_concurrent extractions run at once. An item whose extraction takes
+        longer than item_timeout seconds (not counting time spent waiting for a slot)
+        gets an error result. With continue_on_error=False the first failed item cancels
+        the remaining extractions and raises ExtractionItemError.
+        
+        Args:
+            Same as extract_multiple_items
+            
+        Yields:
+            (index of the item in items, ExtractionResult)
+        """
+        if not items:
+            return
+
+        if schema_key is None:
+            schema_key = str(hash(json.dumps(result_schema, sort_keys=True)))
+        max_concurrent = max_concurrent or settings.EXTRACTION_MAX_CONCURRENCY
+        if item_timeout is None:
+            item_timeout = settings.EXTRACTION_ITEM_TIMEOUT_SECONDS
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def extract(index: int, item: Dict[str, Any]) -> Tuple[int, ExtractionResult]:
+            async with semaphore:
+                try:
+                    result = await asyncio.wait_for(
+                        self.perform_extraction(
+                            item=item,
+                            result_schema=result_schema,
+                            extraction_instructions=extraction_instructions,
+                            schema_key=schema_key
+                        ),
+                        timeout=item_timeout or None
+                    )
+                except asyncio.TimeoutError:
+                    result = ExtractionResult(
+                        item_id=item.get("id", str(uuid.uuid4())),
                         original_item=item,
                         extraction=None,
-                        error=str(e)
-                    ))
-                else:
-                    # Re-raise the exception to stop processing
-                    raise
-        
-        return results
+                        error=f"Extraction timed out after {item_timeout:g}s"
+                    )
+            return index, result
+
+        tasks = [asyncio.create_task(extract(index, item)) for index, item in enumerate(items)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                index, result = await next_done
+                if result.error and not continue_on_error:
+                    raise ExtractionItemError(result.item_id, result.error)
+                yield index, result
+        finally:
+            # Stopped early: on error, or the caller stopped iterating
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
     
     async def extract_with_predefined_schema(
         self,
@@ -261,25 +316,40 @@ class ExtractionService:
         Returns:
             List of ExtractionResult objects
         """
+        results: List[Optional[ExtractionResult]] = [None] * len(items)
+        async for index, result in self.iter_extract_with_predefined_schema(
+            items, schema_name, predefined_schemas, predefined_instructions
+        ):
+            results[index] = result
+        return results
+
+    async def iter_extract_with_predefined_schema(
+        self,
+        items: List[Dict[str, Any]],
+        schema_name: str,
+        predefined_schemas: Dict[str, Dict[str, Any]],
+        predefined_instructions: Dict[str, str]
+    ) -> AsyncIterator[Tuple[int, ExtractionResult]]:
+        """
+        Streaming variant of extract_with_predefined_schema, yielding (index, result)
+        as each item finishes, post-processing included.
+        """
         if schema_name not in predefined_schemas:
             raise ValueError(f"Unknown schema: {schema_name}")
         
         if schema_name not in predefined_instructions:
             raise ValueError(f"No instructions defined for schema: {schema_name}")
         
-        # Perform the extraction
-        results = await self.extract_multiple_items(
+        async for index, result in self.iter_extract_multiple_items(
             items=items,
             result_schema=predefined_schemas[schema_name],
             extraction_instructions=predefined_instructions[schema_name],
             schema_key=schema_name
-        )
-        
-        # Apply post-processing based on schema type
-        if schema_name == "research_features":
-            results = self._apply_research_features_post_processing(results)
-        
-        return results
+        ):
+            # Apply post-processing based on schema type
+            if schema_name == "research_features":
+                result = self._score_research_features(result)
+            yield index, result
     
     def _apply_research_features_post_processing(self, results: List[ExtractionResult]) -> List[ExtractionResult]:
         """
@@ -291,34 +361,21 @@ class ExtractionService:
         Returns:
             List of extraction results with relevance scores added
         """
+        return [self._score_research_features(result) for result in results]
+
+    def _score_research_features(self, result: ExtractionResult) -> ExtractionResult:
+        """Add the relevance score to a research features extraction; failed results are returned as-is"""
         from schemas.research_features import calculate_relevance_score
         
-        processed_results = []
+        if not result.extraction:
+            return result
         
-        for result in results:
-            if result.extraction:
-                # Calculate relevance score and add to extraction
-                relevance_score = calculate_relevance_score(result.extraction)
-                
-                # Add score to the extraction data
-                enhanced_extraction = result.extraction.copy()
-                enhanced_extraction["relevance_score"] = relevance_score
-                
-                # Create new result with enhanced extraction
-                enhanced_result = ExtractionResult(
-                    item_id=result.item_id,
-                    original_item=result.original_item,
-                    extraction=enhanced_extraction,
-                    error=result.error,
-                    confidence_score=result.confidence_score,
-                    extraction_timestamp=result.extraction_timestamp
-                )
-                processed_results.append(enhanced_result)
-            else:
-                # Keep original result if extraction failed
-                processed_results.append(result)
-        
-        return processed_results
+        # Calculate relevance score and add to extraction
+        enhanced_extraction = result.extraction.copy()
+        enhanced_extraction["relevance_score"] = calculate_relevance_score(result.extraction)
+        
+        # Create new result with enhanced extraction
+        return result.model_copy(update={"extraction": enhanced_extraction})
     
     async def extract_article_archetype(self, article_id: str, title: str, abstract: str, full_text: Optional[str] = None) -> ArticleArchetype:
         """
@@ -3,6 +3,11 @@ Google Scholar Article Enrichment Service
 
 This module handles enrichment of Google Scholar articles with abstracts/summaries
 from various external sources including Semantic Scholar, Crossref, and web scraping.
+
+Async enrichment runs on the caller's event loop with one shared aiohttp session.
+DOI lookups go through a persistent abstract cache (see services.doi_abstract_cache);
+on a miss Semantic Scholar and Crossref are queried concurrently and the first
+abstract found wins.
 """
 
 import re
@@ -11,15 +16,53 @@ import asyncio
 import aiohttp
 import requests
 import logging
-from typing import Optional, List, TYPE_CHECKING
+from typing import Any, AsyncIterator, Dict, Optional, List, Tuple, TYPE_CHECKING
 from urllib.parse import quote
 
+from config.settings import settings
+from services.doi_abstract_cache import get_doi_abstract_cache
+
 if TYPE_CHECKING:
     from services.google_scholar_service import GoogleScholarArticle
 
 logger = logging.getLogger(__name__)
 
 
+class TransientLookupError(Exception):
+    """An abstract lookup failed in a way that may succeed later (rate limit, 5xx); never negatively cached"""
+
+
+# DOI abstract sources, raced against each other; ties go to the earlier one
+DOI_ABSTRACT_SOURCES = ("semantic_scholar", "crossref")
+
+_shared_session: Optional[aiohttp.ClientSession] = None
+_shared_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _new_session(limit: Optional[int] = None) -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(limit=limit or settings.SCHOLAR_ENRICHMENT_MAX_CONNECTIONS)
+    timeout = aiohttp.ClientTimeout(total=30, connect=5, sock_read=5)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+
+def get_shared_session() -> aiohttp.ClientSession:
+    """The enrichment HTTP session of the running event loop, reused across searches"""
+    global _shared_session, _shared_session_loop
+    loop = asyncio.get_running_loop()
+    if _shared_session is None or _shared_session.closed or _shared_session_loop is not loop:
+        _shared_session = _new_session()
+        _shared_session_loop = loop
+    return _shared_session
+
+
+async def close_shared_session():
+    """Close the shared enrichment session (call from app shutdown)"""
+    global _shared_session
+    if _shared_session is not None and not _shared_session.closed:
+        await _shared_session.close()
+    _shared_session = None
+
+
 class GoogleScholarEnrichmentService:
     """Service for enriching Google Scholar articles with abstracts from external sources."""
 
@@ -35,22 +78,23 @@ class GoogleScholarEnrichmentService:
         """Run async batch enrichment from sync context, safely in all environments.
 
         Creates a dedicated event loop when a loop is already running (e.g., inside FastAPI),
-        otherwise uses asyncio.run(). Articles are modified in-place.
+        otherwise uses asyncio.run(). Articles are modified in-place. Async callers should
+        await enrich_articles_batch_async instead, which reuses the shared session.
         """
         if not scholar_articles:
             return
 
+        async def run():
+            # The shared session belongs to the main loop; this loop gets its own
+            async with _new_session(limit=max_concurrent) as session:
+                await self.enrich_articles_batch_async(scholar_articles, max_concurrent=max_concurrent, session=session)
+
         try:
             # If a loop is already running, run enrichment in a dedicated loop
             asyncio.get_running_loop()
             loop = asyncio.new_event_loop()
             try:
-                loop.run_until_complete(
-                    self.enrich_articles_batch_async(
-                        scholar_articles,
-                        max_concurrent=max_concurrent
-                    )
-                )
+                loop.run_until_complete(run())
             finally:
                 try:
                     loop.stop()
@@ -59,64 +103,84 @@ class GoogleScholarEnrichmentService:
                 loop.close()
         except RuntimeError:
             # No running loop; safe to use asyncio.run
-            asyncio.run(
-                self.enrich_articles_batch_async(
-                    scholar_articles,
-                    max_concurrent=max_concurrent
-                )
-            )
+            asyncio.run(run())
 
     async def enrich_articles_batch_async(
         self,
         scholar_articles: List['GoogleScholarArticle'],
         max_concurrent: int = 5,
-        progress_callback: Optional[callable] = None
+        progress_callback: Optional[callable] = None,
+        session: Optional[aiohttp.ClientSession] = None
     ) -> None:
         """
         Enrich a batch of articles with abstracts using concurrent async requests.
 
         Args:
             scholar_articles: List of GoogleScholarArticle objects to enrich
-            max_concurrent: Maximum number of concurrent enrichment tasks
+            max_concurrent: Maximum number of articles enriched at once
             progress_callback: Optional async callback to report progress
+            session: HTTP session to use; defaults to the shared session
         """
-        if not scholar_articles:
-            return
+        completed = 0
+        async for _ in self.iter_enriched_articles(scholar_articles, max_concurrent=max_concurrent, session=session):
+            completed += 1
+            if progress_callback:
+                await progress_callback(completed, len(scholar_articles))
 
-        connector = aiohttp.TCPConnector(limit=max_concurrent)
-        timeout = aiohttp.ClientTimeout(total=30, connect=5, sock_read=5)
+    async def iter_enriched_articles(
+        self,
+        scholar_articles: List['GoogleScholarArticle'],
+        max_concurrent: int = 5,
+        session: Optional[aiohttp.ClientSession] = None
+    ) -> AsyncIterator[Tuple[int, 'GoogleScholarArticle']]:
+        """
+        Enrich articles concurrently, yielding (index, article) as each one finishes.
 
-        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
-            # Process articles in batches to avoid overwhelming the system
-            batch_size = max_concurrent
-            for i in range(0, len(scholar_articles), batch_size):
-                batch = scholar_articles[i:i + batch_size]
+        Articles are modified in-place; index is the article's position in
+        scholar_articles, so callers streaming results can restore the order.
+        """
+        if not scholar_articles:
+            return
 
-                # Create enrichment tasks for this batch
-                tasks = []
-                for article in batch:
-                    tasks.append(self.enrich_article_summary_async(article, session))
+        session = session or get_shared_session()
+        semaphore = asyncio.Semaphore(max_concurrent)
 
-                # Execute batch concurrently
-                if tasks:
-                    await asyncio.gather(*tasks, return_exceptions=True)
-                    # Articles are modified in-place, no need to process results
+        async def enrich(index: int, article: 'GoogleScholarArticle') -> Tuple[int, 'GoogleScholarArticle']:
+            async with semaphore:
+                try:
+                    await self.enrich_article_summary_async(article, session)
+                except Exception as e:
+                    logger.warning(f"Enrichment failed for '{article.title[:50]}': {e}")
+            return index, article
 
-                # Report progress if callback provided
-                if progress_callback:
-                    await progress_callback(i + len(batch), len(scholar_articles))
+        tasks = [asyncio.create_task(enrich(index, article)) for index, article in enumerate(scholar_articles)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # The caller stopped iterating early
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
 
-    async def enrich_article_summary_async(self, article: 'GoogleScholarArticle', session: aiohttp.ClientSession) -> None:
+    async def enrich_article_summary_async(
+        self,
+        article: 'GoogleScholarArticle',
+        session: Optional[aiohttp.ClientSession] = None
+    ) -> None:
         """
         Async version: Attempt to retrieve a fuller abstract/summary for a Scholar result.
-        Tries Semantic Scholar and Crossref via DOI, then page meta tags.
+        Looks the DOI up in the abstract cache, then races Semantic Scholar and Crossref,
+        then falls back to page meta tags.
 
         Sets article.abstract directly and stores enrichment metadata in article.metadata.
         """
+        session = session or get_shared_session()
         enrichment_metadata = {
             'semantic_scholar': {'called': False, 'success': False, 'error': None},
             'crossref': {'called': False, 'success': False, 'error': None},
             'meta_description': {'called': False, 'success': False, 'error': None},
+            'cache_hit': False,
             'successful_source': None
         }
 
@@ -127,31 +191,10 @@ class GoogleScholarEnrichmentService:
         try:
             # Try DOI-based services first
             if article.doi:
-                # Try Semantic Scholar
-                enrichment_metadata['semantic_scholar']['called'] = True
-                try:
-                    abstract_text = await self._try_semantic_scholar_abstract_async(article.doi, session)
-                    if abstract_text:
-                        enrichment_metadata['semantic_scholar']['success'] = True
-                        enrichment_metadata['successful_source'] = 'semantic_scholar'
-                        article.abstract = abstract_text
-                        article.metadata['enrichment'] = enrichment_metadata
-                        return
-                except Exception as e:
-                    enrichment_metadata['semantic_scholar']['error'] = str(e)
-
-                # Try Crossref
-                enrichment_metadata['crossref']['called'] = True
-                try:
-                    abstract_text = await self._try_crossref_abstract_async(article.doi, session)
-                    if abstract_text:
-                        enrichment_metadata['crossref']['success'] = True
-                        enrichment_metadata['successful_source'] = 'crossref'
-                        article.abstract = abstract_text
-                        article.metadata['enrichment'] = enrichment_metadata
-                        return
-                except Exception as e:
-                    enrichment_metadata['crossref']['error'] = str(e)
+                abstract_text = await self.lookup_doi_abstract_async(article.doi, session, enrichment_metadata)
+                if abstract_text:
+                    article.abstract = abstract_text
+                    return
 
             # Fallback to meta description from landing page
             # Check both 'link' and 'url' properties for compatibility
@@ -164,7 +207,6 @@ class GoogleScholarEnrichmentService:
                         enrichment_metadata['meta_description']['success'] = True
                         enrichment_metadata['successful_source'] = 'meta_description'
                         article.abstract = meta_desc
-                        article.metadata['enrichment'] = enrichment_metadata
                         return
                 except Exception as e:
                     enrichment_metadata['meta_description']['error'] = str(e)
@@ -177,6 +219,60 @@ class GoogleScholarEnrichmentService:
             if not article.abstract and article.snippet:
                 article.abstract = article.snippet
 
+    async def lookup_doi_abstract_async(
+        self,
+        doi: str,
+        session: aiohttp.ClientSession,
+        enrichment_metadata: Dict[str, Any]
+    ) -> Optional[str]:
+        """
+        Abstract for a DOI from the cache, or from whichever of Semantic Scholar
+        and Crossref answers first with one.
+
+        Caches found abstracts, and misses when every source answered without
+        one; failed lookups are left uncached so they are retried.
+        """
+        cache = get_doi_abstract_cache()
+        cached = await cache.run(cache.get, doi)
+        if cached:
+            enrichment_metadata['cache_hit'] = True
+            if cached.abstract:
+                enrichment_metadata['successful_source'] = cached.source
+            return cached.abstract
+
+        lookups = {
+            asyncio.create_task(self._try_semantic_scholar_abstract_async(doi, session)): 'semantic_scholar',
+            asyncio.create_task(self._try_crossref_abstract_async(doi, session)): 'crossref',
+        }
+        failed = False
+        pending = set(lookups)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=lambda t: DOI_ABSTRACT_SOURCES.index(lookups[t])):
+                    source = lookups[task]
+                    enrichment_metadata[source]['called'] = True
+                    try:
+                        abstract_text = task.result()
+                    except Exception as e:
+                        enrichment_metadata[source]['error'] = str(e) or type(e).__name__
+                        failed = True
+                        continue
+                    if abstract_text:
+                        enrichment_metadata[source]['success'] = True
+                        enrichment_metadata['successful_source'] = source
+                        await cache.run(cache.set, doi, abstract_text, source)
+                        return abstract_text
+        finally:
+            # First success wins; stop the slower lookup
+            for task in pending:
+                task.cancel()
+                enrichment_metadata[lookups[task]]['called'] = True
+
+        if not failed:
+            await cache.run(cache.set_miss, doi)
+        return None
+
     def enrich_article_summary(self, article: 'GoogleScholarArticle') -> Optional[str]:
         """
         Synchronous version: Attempt to retrieve a fuller abstract/summary for a Scholar result.
@@ -213,38 +309,36 @@ class GoogleScholarEnrichmentService:
     # === Async enrichment methods ===
 
     async def _try_semantic_scholar_abstract_async(self, doi: str, session: aiohttp.ClientSession) -> Optional[str]:
-        """Async: Fetch abstract via Semantic Scholar Graph API if available."""
+        """Async: Fetch abstract via Semantic Scholar Graph API; None if it has none, raises if the lookup failed."""
         url = f"https://api.semanticscholar.org/graph/v1/paper/DOI:{doi}?fields=title,abstract"
-        try:
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as resp:
-                if resp.status != 200:
-                    return None
-                data = await resp.json()
-                abstract = data.get('abstract') or data.get('paperAbstract')
-                if isinstance(abstract, str) and abstract.strip():
-                    return self._normalize_whitespace(abstract)
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as resp:
+            if resp.status == 404:
                 return None
-        except Exception:
+            if resp.status != 200:
+                raise TransientLookupError(f"Semantic Scholar returned HTTP {resp.status}")
+            data = await resp.json()
+            abstract = data.get('abstract') or data.get('paperAbstract')
+            if isinstance(abstract, str) and abstract.strip():
+                return self._normalize_whitespace(abstract)
             return None
 
     async def _try_crossref_abstract_async(self, doi: str, session: aiohttp.ClientSession) -> Optional[str]:
-        """Async: Fetch abstract via Crossref API if available (often JATS XML)."""
+        """Async: Fetch abstract via Crossref API (often JATS XML); None if it has none, raises if the lookup failed."""
         safe_doi = quote(doi, safe='')
         url = f"https://api.crossref.org/works/{safe_doi}"
         headers = {"Accept": "application/json"}
-        try:
-            async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=5)) as resp:
-                if resp.status != 200:
-                    return None
-                data = await resp.json()
-                message = data.get('message', {})
-                abstract = message.get('abstract')
-                if not abstract:
-                    return None
-                text = self._strip_html(abstract)
-                return self._normalize_whitespace(text)
-        except Exception:
-            return None
+        async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=5)) as resp:
+            if resp.status == 404:
+                return None
+            if resp.status != 200:
+                raise TransientLookupError(f"Crossref returned HTTP {resp.status}")
+            data = await resp.json()
+            message = data.get('message', {})
+            abstract = message.get('abstract')
+            if not abstract:
+                return None
+            text = self._strip_html(abstract)
+            return self._normalize_whitespace(text)
 
     async def _try_fetch_meta_description_async(self, url: str, session: aiohttp.ClientSession) -> Optional[str]:
         """Async: Fetch landing page and extract description/abstract-like meta tags."""
@@ -6,20 +6,79 @@ allowing users to search academic literature with various filtering options.
 Follows the same abstraction pattern as PubMed service with a proper Article class.
 """
 
+import asyncio
 import os
 import requests
 import re
-from typing import List, Dict, Any, Optional, Tuple, TYPE_CHECKING
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Dict, Any, Optional, Set, Tuple, TYPE_CHECKING
 from datetime import datetime
 import logging
 
+import httpx
+
 if TYPE_CHECKING:
     from schemas.canonical_types import CanonicalResearchArticle
 
+from config.settings import settings
+from exceptions import ProviderUnavailableError
 from services.google_scholar_enrichment import GoogleScholarEnrichmentService
+from services.search_providers.health import get_provider_health_service
+from services.serpapi_cache import CachedResponse, get_serpapi_response_cache
 
 logger = logging.getLogger(__name__)
 
+SCHOLAR_PROVIDER_ID = "scholar"
+# Substring of SerpAPI's error once the account has no searches left
+SERPAPI_QUOTA_ERROR = "run out of searches"
+# Substring of SerpAPI's "error" for a query (or a page past the end) with no results;
+# that is an answer, not a failure
+SERPAPI_NO_RESULTS_ERROR = "hasn't returned any results"
+
+# Background refreshes of stale cached responses still in flight
+_revalidation_tasks: Set[asyncio.Task] = set()
+
+
+class SerpApiRateBudget:
+    """
+    Per-process budget for SerpAPI calls made from async code.
+
+    At most max_concurrent calls are in flight, and call starts are spaced at
+    least min_interval_seconds apart. One instance is shared by every search in
+    the process, so concurrent page fetches can't burst past SerpAPI's limits.
+    """
+
+    def __init__(self, max_concurrent: int, min_interval_seconds: float):
+        self.max_concurrent = max_concurrent
+        self.min_interval_seconds = min_interval_seconds
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._next_start = 0.0
+
+    def _bind_to_running_loop(self):
+        # asyncio primitives belong to one event loop; a thread running its own loop gets fresh ones
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._start_lock = asyncio.Lock()
+            self._next_start = 0.0
+
+    @asynccontextmanager
+    async def slot(self):
+        """Wait until a call may start under the budget, and hold a concurrency slot while it runs"""
+        self._bind_to_running_loop()
+        async with self._semaphore:
+            async with self._start_lock:
+                now = time.monotonic()
+                if self._next_start > now:
+                    await asyncio.sleep(self._next_start - now)
+                self._next_start = max(now, self._next_start) + self.min_interval_seconds
+            yield
+
 
 class GoogleScholarArticle:
     """
@@ -320,7 +379,6 @@ class GoogleScholarService:
     
     def _get_max_results_per_call(self) -> int:
         """Get the maximum number of results this provider can return per API call."""
-        from config.settings import settings
         return settings.GOOGLE_SCHOLAR_MAX_RESULTS_PER_CALL
     
     def search_articles(
@@ -356,6 +414,7 @@ class GoogleScholarService:
         target_results = num_results
         all_articles = []
         total_api_calls = 0
+        page_cache = []  # Response cache outcome of each page
         current_start_index = start_index
         total_available = 0  # Track the actual total from the API
         
@@ -379,6 +438,7 @@ class GoogleScholarService:
                 )
                 
                 total_api_calls += 1
+                page_cache.append(batch_metadata.get("cache", {}))
                 logger.info(f"API call {total_api_calls}: Requested {current_batch_size} articles starting at index {current_start_index}, got {len(batch_articles)} articles back")
                 
                 # Capture total available results from the first API call
@@ -408,21 +468,140 @@ class GoogleScholarService:
                     break
                 
                 # Small delay between requests to be respectful to the API
-                if len(all_articles) < target_results:
-                    import time
+                if len(all_articles) < target_results and not page_cache[-1].get("hit"):
                     time.sleep(0.25)
                     
+            except ProviderUnavailableError:
+                if not all_articles:
+                    raise
+                logger.warning(f"Google Scholar became unavailable at start_index={current_start_index}, stopping pagination")
+                break
             except Exception as e:
                 logger.warning(f"Google Scholar API call {total_api_calls + 1} failed at start_index={current_start_index}: {e}")
                 # Don't throw away articles we've already retrieved - just stop pagination
                 logger.info(f"Stopping pagination. Retrieved {len(all_articles)} articles before error.")
                 break
         
-        # Build final metadata
-        initially_reported = total_available  # What the first API call said was available
-        actually_retrieved = len(all_articles)  # What we actually got
-        
-        # Check if Google Scholar gave us fewer than initially promised
+        final_metadata = self._build_final_metadata(total_available, len(all_articles), target_results, total_api_calls, page_cache)
+        return all_articles, final_metadata
+
+    async def search_articles_async(
+        self,
+        query: str,
+        num_results: int = 10,
+        year_low: Optional[int] = None,
+        year_high: Optional[int] = None,
+        sort_by: str = "relevance",
+        start_index: int = 0,
+        enrich_summaries: bool = False,
+        use_cache: bool = True
+    ) -> Tuple[List['CanonicalResearchArticle'], Dict[str, Any]]:
+        """
+        Search Google Scholar for academic articles without blocking the event loop.
+
+        Fetches the first page, then computes the start offsets of all remaining
+        pages from its total_results and fetches them concurrently under the
+        SerpAPI rate budget. Pages are reassembled in order; articles keep their
+        absolute positions. A failed or empty page ends the result list there,
+        as a failed call ends pagination in search_articles.
+
+        Args:
+            Same as search_articles, plus
+            use_cache: False to always call SerpAPI instead of serving pages from the response cache
+
+        Returns:
+            Tuple of (list of CanonicalResearchArticle objects, metadata dict)
+        """
+        if not self.api_key:
+            raise ValueError("No API key available. Please set SERPAPI_KEY environment variable.")
+
+        batch_size = self._get_max_results_per_call()
+        target_results = num_results
+        first_size = min(batch_size, target_results)
+        batch_params = dict(
+            query=query,
+            year_low=year_low,
+            year_high=year_high,
+            sort_by=sort_by,
+            enrich_summaries=enrich_summaries,
+            use_cache=use_cache
+        )
+
+        async with httpx.AsyncClient(timeout=30) as client:
+            try:
+                all_articles, first_metadata = await self._search_single_batch_async(
+                    client, num_results=first_size, start_index=start_index, **batch_params
+                )
+            except ProviderUnavailableError:
+                raise
+            except Exception as e:
+                logger.warning(f"Google Scholar API call 1 failed at start_index={start_index}: {e}")
+                return [], self._build_final_metadata(0, 0, target_results, 1, [])
+
+            total_available = first_metadata.get("total_results", 0)
+            logger.info(f"Total available results from API: {total_available}")
+
+            pages = []
+            # A short first page with no reported total means there is nothing more to fetch
+            if all_articles and (total_available > 0 or len(all_articles) >= first_size):
+                pages = self._plan_remaining_pages(start_index, target_results, batch_size, total_available)
+            if pages:
+                logger.info(f"Fetching {len(pages)} more Google Scholar pages concurrently: starts {[offset for offset, _ in pages]}")
+
+            page_results = await asyncio.gather(
+                *(
+                    self._search_single_batch_async(client, num_results=size, start_index=offset, **batch_params)
+                    for offset, size in pages
+                ),
+                return_exceptions=True
+            )
+
+        all_articles = list(all_articles)
+        page_cache = [first_metadata.get("cache", {})]
+        for (offset, _), result in zip(pages, page_results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Google Scholar page at start_index={offset} failed: {result}")
+                logger.info(f"Keeping the {len(all_articles)} articles retrieved before it.")
+                break
+            page_articles, page_metadata = result
+            page_cache.append(page_metadata.get("cache", {}))
+            if not page_articles:
+                logger.info(f"No more results available at start_index={offset}. Got {len(all_articles)} total articles.")
+                break
+            all_articles.extend(page_articles)
+
+        final_metadata = self._build_final_metadata(total_available, len(all_articles), target_results, 1 + len(pages), page_cache)
+        return all_articles, final_metadata
+
+    @staticmethod
+    def _plan_remaining_pages(
+        start_index: int,
+        target_results: int,
+        batch_size: int,
+        total_available: int
+    ) -> List[Tuple[int, int]]:
+        """(start, num) for every page after the first, stopping at the reported total"""
+        end = start_index + target_results
+        if total_available > 0:
+            end = min(end, total_available)
+        return [
+            (offset, min(batch_size, end - offset))
+            for offset in range(start_index + batch_size, end, batch_size)
+        ]
+
+    @staticmethod
+    def _build_final_metadata(
+        initially_reported: int,
+        actually_retrieved: int,
+        target_results: int,
+        pages_requested: int,
+        page_cache: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Search metadata, flagging when Scholar delivered fewer articles than it reported"""
+        cache_hits = sum(1 for cache in page_cache if cache.get("hit"))
+        stale_cache_hits = sum(1 for cache in page_cache if cache.get("stale"))
+        total_api_calls = pages_requested - cache_hits
+
         discrepancy_message = None
         if initially_reported > 0 and actually_retrieved < min(initially_reported, target_results):
             discrepancy_message = (
@@ -430,49 +609,43 @@ class GoogleScholarService:
                 f"but due to API limitations, only {actually_retrieved} articles could be retrieved."
             )
             logger.warning(discrepancy_message)
-        
-        final_metadata = {
-            "total_results": initially_reported,  # What was initially reported
+
+        logger.info(
+            f"Google Scholar search completed: {actually_retrieved} articles retrieved in {total_api_calls} API calls "
+            f"and {cache_hits} cached pages"
+        )
+        return {
+            "total_results": initially_reported,  # What the first API call said was available
             "returned_results": actually_retrieved,  # What we actually got
             "requested_results": target_results,
             "api_calls_made": total_api_calls,
+            "cache_hits": cache_hits,  # Pages served from the SerpAPI response cache
+            "stale_cache_hits": stale_cache_hits,  # Cached pages past their TTL, refreshed in the background
             "source": "google_scholar",
             "discrepancy_message": discrepancy_message  # Add message for user
         }
-        
-        logger.info(f"Google Scholar search completed: {actually_retrieved} articles retrieved in {total_api_calls} API calls")
-        return all_articles, final_metadata
 
-    def _search_single_batch(
+    def _build_search_params(
         self,
         query: str,
         num_results: int,
-        year_low: Optional[int] = None,
-        year_high: Optional[int] = None,
-        sort_by: str = "relevance",
-        start_index: int = 0,
-        enrich_summaries: bool = False
-    ) -> Tuple[List['CanonicalResearchArticle'], Dict[str, Any]]:
-        """
-        Make a single API call to Google Scholar.
-        This is the original search_articles logic broken out for pagination.
-        """
-        # Ensure this batch is within API bounds
-        max_per_call = self._get_max_results_per_call()
-        num_results = max(1, min(max_per_call, num_results))
-        
-        # Build API parameters
+        year_low: Optional[int],
+        year_high: Optional[int],
+        sort_by: str,
+        start_index: int
+    ) -> Dict[str, Any]:
+        """SerpAPI parameters for one page of results"""
         params = {
             "engine": "google_scholar",
             "q": query,
             "api_key": self.api_key,
             "num": num_results
         }
-        
+
         # Only add start parameter if we're not on the first page
         if start_index > 0:
             params["start"] = start_index
-        
+
         # Add optional parameters
         if year_low:
             params["as_ylo"] = year_low
@@ -480,34 +653,253 @@ class GoogleScholarService:
             params["as_yhi"] = year_high
         if sort_by == "date":
             params["scisbd"] = 1  # Sort by date
-            
+
         logger.debug(f"Single batch search: query='{query}' num_results={num_results} start_index={start_index}")
         logger.debug(f"Scholar API params: {params}")
-        
+
         # Add a unique identifier to help detect if we're getting cached results
         if start_index > 0:
             logger.info(f"PAGINATION REQUEST: start={start_index}, query hash={hash(query) % 10000}")
-        
-        # Make API request
+        return params
+
+    @staticmethod
+    def _check_available(health):
+        """Fail fast when SerpAPI is known to be down or out of searches"""
+        rejection = health.check(SCHOLAR_PROVIDER_ID)
+        if rejection:
+            raise ProviderUnavailableError(SCHOLAR_PROVIDER_ID, rejection)
+
+    @staticmethod
+    def _cached_page(params: Dict[str, Any]) -> Optional[CachedResponse]:
+        """Cached response for a page; cache-only mode turns a miss into an error"""
+        cache = get_serpapi_response_cache()
+        cached = cache.get(params)
+        if cached:
+            logger.info(
+                f"SerpAPI cache {'stale ' if cached.stale else ''}hit: start={params.get('start', 0)}, "
+                f"age={int(cached.age_seconds)}s"
+            )
+        elif cache.cache_only:
+            raise Exception(f"SerpAPI cache miss in cache-only mode for start={params.get('start', 0)}")
+        return cached
+
+    def _fetch_serpapi(self, params: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        """Call SerpAPI for one page, record the outcome and cache a successful response"""
+        health = get_provider_health_service()
+        self._check_available(health)
+
         start_time = datetime.now()
         try:
             response = requests.get(self.base_url, params=params, timeout=30)
             response.raise_for_status()
         except requests.exceptions.RequestException as e:
             logger.error(f"SerpAPI request failed: {e}")
+            self._record_serpapi_error(health, getattr(e.response, "text", None) or str(e))
             raise Exception(f"Failed to search Google Scholar: {str(e)}")
-            
         search_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
-        
-        data = response.json()
-        
+
+        data = self._without_no_results_error(response.json())
+        self._record_serpapi_response(health, params, data)
+        return data, search_time_ms
+
+    async def _fetch_serpapi_async(self, client: httpx.AsyncClient, params: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        """
+        Async counterpart of _fetch_serpapi; waits for a slot in the SerpAPI rate budget.
+        Health and cache bookkeeping (SQLite transactions) runs in worker threads.
+        """
+        health = get_provider_health_service()
+        await asyncio.to_thread(self._check_available, health)
+
+        async with serpapi_rate_budget.slot():
+            start_time = datetime.now()
+            try:
+                response = await client.get(self.base_url, params=params)
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                logger.error(f"SerpAPI request failed: {e}")
+                response_text = e.response.text if isinstance(e, httpx.HTTPStatusError) else None
+                await asyncio.to_thread(self._record_serpapi_error, health, response_text or str(e))
+                raise Exception(f"Failed to search Google Scholar: {str(e)}")
+            search_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+
+        data = self._without_no_results_error(response.json())
+        await asyncio.to_thread(self._record_serpapi_response, health, params, data)
+        return data, search_time_ms
+
+    def _record_serpapi_response(self, health, params: Dict[str, Any], data: Dict[str, Any]):
+        if "error" in data:
+            self._record_serpapi_error(health, data["error"])
+        else:
+            health.record_success(SCHOLAR_PROVIDER_ID)
+            health.consume_quota(SCHOLAR_PROVIDER_ID)
+            get_serpapi_response_cache().set(params, data)
+
+    def _revalidate_in_background(self, params: Dict[str, Any]):
+        """Refresh a stale cache entry without holding up the caller"""
+        cache = get_serpapi_response_cache()
+        if not cache.claim_revalidation(params):
+            return
+
+        def revalidate():
+            try:
+                self._fetch_serpapi(params)
+            except Exception as e:
+                logger.warning(f"Background refresh of cached SerpAPI response failed: {e}")
+            finally:
+                cache.release_revalidation(params)
+
+        threading.Thread(target=revalidate, name="serpapi-revalidate", daemon=True).start()
+
+    async def _revalidate_in_background_async(self, params: Dict[str, Any]):
+        """Refresh a stale cache entry from a task on the running event loop"""
+        cache = get_serpapi_response_cache()
+        if not await asyncio.to_thread(cache.claim_revalidation, params):
+            return
+
+        async def revalidate():
+            try:
+                async with httpx.AsyncClient(timeout=30) as client:
+                    await self._fetch_serpapi_async(client, params)
+            except Exception as e:
+                logger.warning(f"Background refresh of cached SerpAPI response failed: {e}")
+            finally:
+                await asyncio.to_thread(cache.release_revalidation, params)
+
+        task = asyncio.create_task(revalidate())
+        # Keep a reference so the task isn't garbage collected mid-flight
+        _revalidation_tasks.add(task)
+        task.add_done_callback(_revalidation_tasks.discard)
+
+    def _search_single_batch(
+        self,
+        query: str,
+        num_results: int,
+        year_low: Optional[int] = None,
+        year_high: Optional[int] = None,
+        sort_by: str = "relevance",
+        start_index: int = 0,
+        enrich_summaries: bool = False
+    ) -> Tuple[List['CanonicalResearchArticle'], Dict[str, Any]]:
+        """
+        Make a single API call to Google Scholar, or serve it from the response cache.
+        This is the original search_articles logic broken out for pagination.
+        """
+        # Ensure this batch is within API bounds
+        num_results = max(1, min(self._get_max_results_per_call(), num_results))
+        params = self._build_search_params(query, num_results, year_low, year_high, sort_by, start_index)
+
+        cached = self._cached_page(params)
+        if cached:
+            data, search_time_ms = cached.data, 0
+            if cached.stale and not get_serpapi_response_cache().cache_only:
+                self._revalidate_in_background(params)
+        else:
+            data, search_time_ms = self._fetch_serpapi(params)
+
+        scholar_articles, metadata = self._handle_search_response(data, query, num_results, search_time_ms)
+        metadata["cache"] = cached.to_metadata() if cached else {"hit": False}
+
+        # Enrich articles with better summaries/abstracts when requested
+        if enrich_summaries:
+            try:
+                # Use parallel async enrichment to speed up batch processing
+                self.enrichment_service.enrich_articles_in_parallel(
+                    scholar_articles, max_concurrent=self._max_concurrent_enrichment()
+                )
+            except Exception as e:
+                logger.warning(f"Summary enrichment step failed: {e}")
+        else:
+            self._use_snippets_as_abstracts(scholar_articles)
+
+        return self._to_canonical_articles(scholar_articles, start_index), metadata
+
+    async def _search_single_batch_async(
+        self,
+        client: httpx.AsyncClient,
+        query: str,
+        num_results: int,
+        year_low: Optional[int] = None,
+        year_high: Optional[int] = None,
+        sort_by: str = "relevance",
+        start_index: int = 0,
+        enrich_summaries: bool = False,
+        use_cache: bool = True
+    ) -> Tuple[List['CanonicalResearchArticle'], Dict[str, Any]]:
+        """Async counterpart of _search_single_batch"""
+        scholar_articles, metadata = await self.fetch_page_async(
+            client, query, num_results, year_low, year_high, sort_by, start_index, use_cache=use_cache
+        )
+
+        if enrich_summaries:
+            try:
+                await self.enrichment_service.enrich_articles_batch_async(
+                    scholar_articles, max_concurrent=self._max_concurrent_enrichment()
+                )
+            except Exception as e:
+                logger.warning(f"Summary enrichment step failed: {e}")
+        else:
+            self._use_snippets_as_abstracts(scholar_articles)
+
+        return self._to_canonical_articles(scholar_articles, start_index), metadata
+
+    async def fetch_page_async(
+        self,
+        client: httpx.AsyncClient,
+        query: str,
+        num_results: int,
+        year_low: Optional[int] = None,
+        year_high: Optional[int] = None,
+        sort_by: str = "relevance",
+        start_index: int = 0,
+        use_cache: bool = True
+    ) -> Tuple[List[GoogleScholarArticle], Dict[str, Any]]:
+        """
+        One page of un-enriched GoogleScholarArticle results, from the response cache
+        or SerpAPI (always SerpAPI when use_cache is False; the fresh page is still cached)
+        """
+        num_results = max(1, min(self._get_max_results_per_call(), num_results))
+        params = self._build_search_params(query, num_results, year_low, year_high, sort_by, start_index)
+
+        # Cache reads and revalidation claims are SQLite transactions: run them off the event loop
+        cached = await asyncio.to_thread(self._cached_page, params) if use_cache else None
+        if cached:
+            data, search_time_ms = cached.data, 0
+            if cached.stale and not get_serpapi_response_cache().cache_only:
+                await self._revalidate_in_background_async(params)
+        else:
+            data, search_time_ms = await self._fetch_serpapi_async(client, params)
+
+        scholar_articles, metadata = self._handle_search_response(data, query, num_results, search_time_ms)
+        metadata["cache"] = cached.to_metadata() if cached else {"hit": False}
+        return scholar_articles, metadata
+
+    async def iter_enriched_articles(
+        self,
+        scholar_articles: List[GoogleScholarArticle],
+        start_index: int = 0
+    ) -> AsyncIterator['CanonicalResearchArticle']:
+        """Enrich a page of results, yielding each article as soon as its enrichment finishes"""
+        from schemas.research_article_converters import scholar_to_research_article
+        async for index, article in self.enrichment_service.iter_enriched_articles(
+            scholar_articles, max_concurrent=self._max_concurrent_enrichment()
+        ):
+            yield scholar_to_research_article(article, position=start_index + index + 1)
+
+    def _handle_search_response(
+        self,
+        data: Dict[str, Any],
+        query: str,
+        num_results: int,
+        search_time_ms: int
+    ) -> Tuple[List[GoogleScholarArticle], Dict[str, Any]]:
+        """Log diagnostics and parse one page of SerpAPI results"""
         # Debug: Log SerpAPI response structure for pagination debugging
         logger.debug(f"SerpAPI response keys: {list(data.keys())}")
         if "search_metadata" in data:
             logger.info(f"Search metadata: {data['search_metadata']}")
         if "serpapi_pagination" in data:
             logger.debug(f"Pagination info: {data['serpapi_pagination']}")
-        
+
         # Debug: Log organic_results count vs requested
         organic_results = data.get("organic_results", [])
         logger.info(f"Google Scholar API returned {len(organic_results)} organic results (requested {num_results})")
@@ -528,7 +920,7 @@ class GoogleScholarService:
                 logger.info(f"Organic results state: {search_info['organic_results_state']}")
             if "total_results" in search_info:
                 logger.info(f"Total results available: {search_info['total_results']}")
-        
+
         # Check for API errors
         if "error" in data:
             raise Exception(f"SerpAPI error: {data['error']}")
@@ -536,42 +928,58 @@ class GoogleScholarService:
         # Parse results using our Article class
         scholar_articles = self._parse_search_results(data)
         metadata = self._extract_search_metadata(data, query, search_time_ms)
-        
-        # Enrich articles with better summaries/abstracts when requested
-        if enrich_summaries:
-            try:
-                # Use parallel async enrichment to speed up batch processing
-                from config.timeout_settings import get_streaming_config
-                stream_cfg = get_streaming_config()
-                max_concurrent = stream_cfg.get("max_concurrent_enrichment", 5)
-                self.enrichment_service.enrich_articles_in_parallel(scholar_articles, max_concurrent=max_concurrent)
-            except Exception as e:
-                logger.warning(f"Summary enrichment step failed: {e}")
-        else:
-            # Ensure abstract at least mirrors snippet for consistency
-            for article in scholar_articles:
-                if not getattr(article, 'abstract', None):
-                    article.abstract = article.snippet
+        return scholar_articles, metadata
+
+    @staticmethod
+    def _max_concurrent_enrichment() -> int:
+        from config.timeout_settings import get_streaming_config
+        return get_streaming_config().get("max_concurrent_enrichment", 5)
 
-        # Convert GoogleScholarArticle objects to CanonicalResearchArticle
+    @staticmethod
+    def _use_snippets_as_abstracts(scholar_articles: List[GoogleScholarArticle]):
+        """Ensure abstract at least mirrors snippet for consistency"""
+        for article in scholar_articles:
+            if not getattr(article, 'abstract', None):
+                article.abstract = article.snippet
+
+    @staticmethod
+    def _to_canonical_articles(
+        scholar_articles: List[GoogleScholarArticle],
+        start_index: int
+    ) -> List['CanonicalResearchArticle']:
+        """Convert a page of results, numbering positions from the page's start offset"""
         from schemas.research_article_converters import scholar_to_research_article
-        canonical_articles = []
-        for i, article in enumerate(scholar_articles):
-            canonical_article = scholar_to_research_article(article, position=start_index + i + 1)
-            canonical_articles.append(canonical_article)
-        
+        canonical_articles = [
+            scholar_to_research_article(article, position=start_index + i + 1)
+            for i, article in enumerate(scholar_articles)
+        ]
+
         # Log snippet availability for debugging
         articles_with_snippets = sum(1 for article in scholar_articles if article.snippet)
         logger.info(f"Found {len(scholar_articles)} articles from Google Scholar, {articles_with_snippets} with snippets")
-        
-        # Debug: Log first article title to verify pagination is working
-        if canonical_articles:
-            logger.debug(f"First article: {canonical_articles[0].title}")
-            if len(canonical_articles) > 1:
-                logger.debug(f"Second article: {canonical_articles[1].title}")
-        
-        return canonical_articles, metadata
-    
+        return canonical_articles
+
+    @staticmethod
+    def _without_no_results_error(data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        SerpAPI reports a query (or page) without results as an "error"; turn that
+        into an empty page so it is cached and recorded as a successful call
+        """
+        error = data.get("error")
+        if error is None or SERPAPI_NO_RESULTS_ERROR not in str(error).lower():
+            return data
+        data = {key: value for key, value in data.items() if key != "error"}
+        data.setdefault("organic_results", [])
+        return data
+
+    @staticmethod
+    def _record_serpapi_error(health, error: str):
+        """Report a failed SerpAPI call; quota errors mark the provider exhausted instead of tripping the breaker"""
+        if SERPAPI_QUOTA_ERROR in error.lower():
+            health.record_quota(SCHOLAR_PROVIDER_ID, 0)
+        else:
+            health.record_failure(SCHOLAR_PROVIDER_ID, error)
+
     def _parse_search_results(self, data: Dict[str, Any]) -> List[GoogleScholarArticle]:
         """Parse SerpAPI response into GoogleScholarArticle objects."""
         organic_results = data.get("organic_results", [])
@@ -682,6 +1090,11 @@ class GoogleScholarService:
 
 
 
+# Global SerpAPI rate budget shared by all async Scholar searches in the process
+serpapi_rate_budget = SerpApiRateBudget(
+    max_concurrent=settings.SERPAPI_MAX_CONCURRENT_REQUESTS,
+    min_interval_seconds=settings.SERPAPI_MIN_REQUEST_INTERVAL_SECONDS
+)
 
 
 # Module-level function to match PubMed pattern
@@ -705,3 +1118,25 @@ def search_articles(
         sort_by=sort_by,
         start_index=start_index
     )
+
+
+async def search_articles_async(
+    query: str,
+    num_results: int = 10,
+    year_low: Optional[int] = None,
+    year_high: Optional[int] = None,
+    sort_by: str = "relevance",
+    start_index: int = 0
+) -> Tuple[List['CanonicalResearchArticle'], Dict[str, Any]]:
+    """
+    Module-level async search function, fetching result pages concurrently.
+    """
+    service = GoogleScholarService()
+    return await service.search_articles_async(
+        query=query,
+        num_results=num_results,
+        year_low=year_low,
+        year_high=year_high,
+        sort_by=sort_by,
+        start_index=start_index
+    )
@@ -0,0 +1,500 @@
+"""
+Group Reduce Engine
+
+Streaming hash aggregation behind the group_reduce tool. Key and reduce
+expressions are parsed once; items are then consumed one at a time and only a
+small mergeable state per group and reducer is kept. Once more than
+GROUP_REDUCE_MAX_GROUPS_IN_MEMORY groups are open, the partial states are
+spilled to GROUP_REDUCE_SPILL_PARTITIONS files by key hash and merged back one
+partition at a time at the end. A partition that still holds too many groups
+is re-spilled into sub-partitions with a different hash, so at most
+GROUP_REDUCE_MAX_GROUPS_IN_MEMORY partial groups are open at any time.
+
+What each open group costs depends on the reducers: top_k keeps a count per
+distinct value, and include_items keeps up to GROUP_REDUCE_MAX_ITEMS_PER_GROUP
+whole items per group. The finished results (one per group) are returned as
+a list.
+
+Key expressions (comma separated for composite keys):
+
+    sender
+    metadata.category
+    date(timestamp), year(...), month(...), week(...), lower(...), upper(...)
+
+Reduce expressions (comma separated, each optionally "... as name"):
+
+    count, count(field)          items / items with a value
+    sum(field), avg(field)       numeric values only
+    min(field), max(field)
+    top_k(field, k)              most frequent values (list values count per element)
+    collect_sample(field, n)     first n values ("*" for whole items)
+"""
+
+import os
+import pickle
+from abc import ABC, abstractmethod
+import re
+import shutil
+import tempfile
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from config.settings import settings
+
+UNKNOWN_GROUP_KEY = "unknown"
+DEFAULT_TOP_K = 5
+DEFAULT_SAMPLE_SIZE = 5
+MAX_SPILL_DEPTH = 8
+ITEMS_FIELD = "items"
+
+_TERM = re.compile(r"^\s*([A-Za-z_]\w*)\s*(?:\((.*)\))?\s*$", re.DOTALL)
+_ALIAS = re.compile(r"^(.*?)\s+as\s+([A-Za-z_]\w*)\s*$", re.IGNORECASE | re.DOTALL)
+
+
+def _split_top_level(expression: str) -> List[str]:
+    """Split on commas that aren't inside parentheses"""
+    parts, depth, current = [], 0, []
+    for char in expression:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        if char == "," and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+        else:
+            current.append(char)
+    parts.append("".join(current).strip())
+    return [part for part in parts if part]
+
+
+def _path_getter(path: str) -> Callable[[Any], Any]:
+    """Value at a dotted path in dicts / objects; "*" is the item itself"""
+    path = path.strip()
+    if path in ("*", ""):
+        return lambda item: item
+    keys = path.split(".")
+
+    def get(item):
+        value = item
+        for key in keys:
+            if value is None:
+                return None
+            value = value.get(key) if isinstance(value, dict) else getattr(value, key, None)
+        return value
+    return get
+
+
+def _as_datetime(value: Any) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value.strip())
+        except ValueError:
+            return None
+    return None
+
+
+def _date_part(extract: Callable[[datetime], Any]) -> Callable[[Any], Any]:
+    def apply(value):
+        parsed = _as_datetime(value)
+        return extract(parsed) if parsed else None
+    return apply
+
+
+_KEY_FUNCTIONS: Dict[str, Callable[[Any], Any]] = {
+    "date": _date_part(lambda d: d.date().isoformat()),
+    "year": _date_part(lambda d: d.year),
+    "month": _date_part(lambda d: f"{d.year}-{d.month:02d}"),
+    "week": _date_part(lambda d: f"{d.isocalendar()[0]}-W{d.isocalendar()[1]:02d}"),
+    "lower": lambda value: value.lower() if isinstance(value, str) else value,
+    "upper": lambda value: value.upper() if isinstance(value, str) else value,
+}
+
+
+def _freeze(value: Any) -> Any:
+    """Hashable stand-in for list / dict values"""
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+def parse_key_expression(expression: str) -> Callable[[Any], Tuple]:
+    """Compile a key expression into item -> key tuple"""
+    if not expression or not expression.strip():
+        raise ValueError("key_func is required, e.g. 'sender' or 'date(timestamp)'")
+    getters = []
+    for term in _split_top_level(expression):
+        match = _TERM.match(term)
+        if match and match.group(2) is not None:
+            name = match.group(1).lower()
+            if name not in _KEY_FUNCTIONS:
+                raise ValueError(f"Unknown key function '{name}'. Available: {', '.join(sorted(_KEY_FUNCTIONS))}")
+            function, getter = _KEY_FUNCTIONS[name], _path_getter(match.group(2))
+            getters.append(lambda item, f=function, g=getter: f(g(item)))
+        else:
+            getters.append(_path_getter(term))
+    return lambda item: tuple(_freeze(getter(item)) for getter in getters)
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _less(a: Any, b: Any) -> bool:
+    try:
+        return a < b
+    except TypeError:
+        return str(a) < str(b)
+
+
+class Reducer(ABC):
+    """One aggregate over a group; states are plain picklable values that merge associatively"""
+
+    def __init__(self, name: str, getter: Callable[[Any], Any], limit: Optional[int] = None):
+        self.name = name
+        self.getter = getter
+        self.limit = limit
+
+    @abstractmethod
+    def init(self) -> Any:
+        """A fresh state for an empty group"""
+
+    @abstractmethod
+    def update(self, state: Any, item: Any) -> Any:
+        """The state after adding one item"""
+
+    @abstractmethod
+    def merge(self, state: Any, other: Any) -> Any:
+        """Two partial states of the same group combined"""
+
+    def result(self, state: Any) -> Any:
+        return state
+
+
+class CountReducer(Reducer):
+    def init(self):
+        return 0
+
+    def update(self, state, item):
+        return state + (1 if self.getter(item) is not None else 0)
+
+    def merge(self, state, other):
+        return state + other
+
+
+class SumReducer(Reducer):
+    def init(self):
+        return 0
+
+    def update(self, state, item):
+        value = _number(self.getter(item))
+        return state + value if value is not None else state
+
+    def merge(self, state, other):
+        return state + other
+
+
+class AvgReducer(Reducer):
+    def init(self):
+        return [0, 0]
+
+    def update(self, state, item):
+        value = _number(self.getter(item))
+        if value is not None:
+            state[0] += value
+            state[1] += 1
+        return state
+
+    def merge(self, state, other):
+        return [state[0] + other[0], state[1] + other[1]]
+
+    def result(self, state):
+        return state[0] / state[1] if state[1] else None
+
+
+class MinReducer(Reducer):
+    def init(self):
+        return None
+
+    def update(self, state, item):
+        return self.merge(state, self.getter(item))
+
+    def merge(self, state, other):
+        if other is None:
+            return state
+        return other if state is None or _less(other, state) else state
+
+
+class MaxReducer(MinReducer):
+    def merge(self, state, other):
+        if other is None:
+            return state
+        return other if state is None or _less(state, other) else state
+
+
+class TopKReducer(Reducer):
+    def init(self):
+        return Counter()
+
+    def update(self, state, item):
+        value = self.getter(item)
+        for element in (value if isinstance(value, list) else [value]):
+            if element is not None:
+                state[_freeze(element)] += 1
+        return state
+
+    def merge(self, state, other):
+        state.update(other)
+        return state
+
+    def result(self, state):
+        return [{"value": value, "count": count} for value, count in state.most_common(self.limit)]
+
+
+class CollectSampleReducer(Reducer):
+    """The first n values of the group, in input order"""
+
+    def init(self):
+        return []
+
+    def update(self, state, item):
+        if len(state) < self.limit:
+            value = self.getter(item)
+            if value is not None:
+                state.append(value)
+        return state
+
+    def merge(self, state, other):
+        return (state + other)[:self.limit]
+
+
+_REDUCERS = {
+    "count": (CountReducer, None),
+    "sum": (SumReducer, None),
+    "avg": (AvgReducer, None),
+    "average": (AvgReducer, None),
+    "mean": (AvgReducer, None),
+    "min": (MinReducer, None),
+    "max": (MaxReducer, None),
+    "top_k": (TopKReducer, DEFAULT_TOP_K),
+    "collect_sample": (CollectSampleReducer, DEFAULT_SAMPLE_SIZE),
+}
+
+
+def parse_reduce_expression(expression: str) -> List[Reducer]:
+    """Compile a reduce expression into its reducers, in output order"""
+    if not expression or not expression.strip():
+        return [CountReducer("count", lambda item: item)]
+    reducers = []
+    for term in _split_top_level(expression):
+        alias_match = _ALIAS.match(term)
+        body, alias = (alias_match.group(1), alias_match.group(2)) if alias_match else (term, None)
+        match = _TERM.match(body)
+        name = match.group(1).lower() if match else None
+        if name not in _REDUCERS:
+            raise ValueError(
+                f"Unknown reduce function '{body.strip()}'. Available: count, sum(field), avg(field), "
+                f"min(field), max(field), top_k(field, k), collect_sample(field, n)"
+            )
+        reducer_class, default_limit = _REDUCERS[name]
+        args = _split_top_level(match.group(2) or "")
+        if not args and name != "count":
+            raise ValueError(f"{name} needs a field, e.g. {name}(amount)")
+        limit = default_limit
+        if len(args) > 1:
+            if default_limit is None:
+                raise ValueError(f"{name} takes a single field")
+            try:
+                limit = int(args[1])
+            except ValueError:
+                raise ValueError(f"{name} limit must be an integer, got '{args[1]}'")
+        canonical = f"{name}({', '.join(args)})" if args else name
+        reducers.append(reducer_class(alias or canonical, _path_getter(args[0] if args else "*"), limit))
+    return reducers
+
+
+@dataclass
+class GroupReduceStats:
+    items_processed: int = 0
+    groups: int = 0
+    spills: int = 0
+    spilled_groups: int = 0
+
+
+@dataclass
+class GroupReduceResult:
+    grouped_results: List[Dict[str, Any]]
+    stats: GroupReduceStats = field(default_factory=GroupReduceStats)
+
+
+class GroupReduceEngine:
+    """Streaming group-by with mergeable reducers and hash-partitioned spill"""
+
+    def __init__(
+        self,
+        key_expression: str,
+        reduce_expression: str,
+        include_items: bool = False,
+        max_items_per_group: Optional[int] = None,
+        max_groups_in_memory: Optional[int] = None,
+        spill_partitions: Optional[int] = None,
+        spill_dir: Optional[str] = None
+    ):
+        self.key = parse_key_expression(key_expression)
+        self.reducers = parse_reduce_expression(reduce_expression)
+        self.include_items = include_items
+        if include_items:
+            if any(reducer.name == ITEMS_FIELD for reducer in self.reducers):
+                raise ValueError(f"'{ITEMS_FIELD}' is reserved when include_items is set; alias the reducer differently")
+            limit = max_items_per_group or settings.GROUP_REDUCE_MAX_ITEMS_PER_GROUP
+            self.reducers.append(CollectSampleReducer(ITEMS_FIELD, lambda item: item, limit))
+        self.max_groups_in_memory = max_groups_in_memory or settings.GROUP_REDUCE_MAX_GROUPS_IN_MEMORY
+        self.spill_partitions = spill_partitions or settings.GROUP_REDUCE_SPILL_PARTITIONS
+        self.spill_dir = spill_dir or settings.GROUP_REDUCE_SPILL_DIR
+
+    def _update(self, groups: Dict[Tuple, List[Any]], key: Tuple, item: Any):
+        states = groups.get(key)
+        if states is None:
+            states = groups[key] = [reducer.init() for reducer in self.reducers]
+        for i, reducer in enumerate(self.reducers):
+            states[i] = reducer.update(states[i], item)
+
+    def _merge(self, groups: Dict[Tuple, List[Any]], key: Tuple, states: List[Any]):
+        existing = groups.get(key)
+        if existing is None:
+            groups[key] = states
+        else:
+            groups[key] = [reducer.merge(a, b) for reducer, a, b in zip(self.reducers, existing, states)]
+
+    def _spill(self, groups: Dict[Tuple, List[Any]], spill_path: str, depth: int):
+        """Append the partial groups to spill_path's partitions; each depth uses the next digit of the key hash"""
+        files = [open(os.path.join(spill_path, f"partition-{i}.pkl"), "ab") for i in range(self.spill_partitions)]
+        try:
+            for key, states in groups.items():
+                partition = hash(key) // self.spill_partitions ** depth % self.spill_partitions
+                pickle.dump((key, states), files[partition], protocol=pickle.HIGHEST_PROTOCOL)
+        finally:
+            for f in files:
+                f.close()
+
+    def _merge_spilled(self, spill_path: str, depth: int, results: List[Dict[str, Any]], stats: GroupReduceStats):
+        """Merge each partition back, re-spilling any that holds more groups than fit in memory"""
+        can_split = self.spill_partitions > 1 and depth < MAX_SPILL_DEPTH
+        for i in range(self.spill_partitions):
+            path = os.path.join(spill_path, f"partition-{i}.pkl")
+            partition: Dict[Tuple, List[Any]] = {}
+            sub_path = None
+            with open(path, "rb") as f:
+                while True:
+                    try:
+                        key, states = pickle.load(f)
+                    except EOFError:
+                        break
+                    self._merge(partition, key, states)
+                    if can_split and len(partition) > self.max_groups_in_memory:
+                        if sub_path is None:
+                            sub_path = os.path.join(spill_path, f"partition-{i}")
+                            os.mkdir(sub_path)
+                        self._spill(partition, sub_path, depth + 1)
+                        stats.spills += 1
+                        stats.spilled_groups += len(partition)
+                        partition = {}
+            os.remove(path)
+
+            if sub_path is None:
+                results.extend(self._result(key, states) for key, states in partition.items())
+            else:
+                self._spill(partition, sub_path, depth + 1)
+                partition = {}
+                self._merge_spilled(sub_path, depth + 1, results, stats)
+
+    def _result(self, key: Tuple, states: List[Any]) -> Dict[str, Any]:
+        value = key[0] if len(key) == 1 else list(key)
+        if key == (None,):
+            group_key = UNKNOWN_GROUP_KEY
+        else:
+            group_key = str(value) if len(key) == 1 else " | ".join(str(part) for part in key)
+        aggregated = {reducer.name: reducer.result(state) for reducer, state in zip(self.reducers, states)}
+        items = aggregated.pop(ITEMS_FIELD) if self.include_items else None
+        return {"group_key": group_key, "group_value": value, "aggregated_data": aggregated, "items": items}
+
+    def run(self, items: Iterable[Any]) -> GroupReduceResult:
+        stats = GroupReduceStats()
+        groups: Dict[Tuple, List[Any]] = {}
+        spill_path = None
+        try:
+            for item in items:
+                stats.items_processed += 1
+                self._update(groups, self.key(item), item)
+                if len(groups) > self.max_groups_in_memory:
+                    if spill_path is None:
+                        spill_path = tempfile.mkdtemp(prefix="group_reduce_", dir=self.spill_dir)
+                    self._spill(groups, spill_path, 0)
+                    stats.spills += 1
+                    stats.spilled_groups += len(groups)
+                    groups = {}
+
+            if spill_path is None:
+                results = [self._result(key, states) for key, states in groups.items()]
+            else:
+                self._spill(groups, spill_path, 0)
+                groups = {}
+                results = []
+                self._merge_spilled(spill_path, 0, results, stats)
+        finally:
+            if spill_path is not None:
+                shutil.rmtree(spill_path, ignore_errors=True)
+
+        stats.groups = len(results)
+        return GroupReduceResult(grouped_results=results, stats=stats)
+
+
+def _sort_value(value: Any) -> Tuple:
+    """Sort numbers, then strings, then anything else"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, value)
+    if isinstance(value, str):
+        return (1, value)
+    return (2, str(value))
+
+
+def sort_grouped_results(results: List[Dict[str, Any]], sort_by: str = "group_key", sort_direction: str = "asc"):
+    """Sort in place by group_key, group_value or any aggregated_data field; groups without a value go last"""
+    if sort_by in ("group_key", "group_value"):
+        value = lambda result: result[sort_by]
+    else:
+        value = lambda result: result["aggregated_data"].get(sort_by)
+    present = [result for result in results if value(result) is not None]
+    missing = [result for result in results if value(result) is None]
+    present.sort(key=lambda result: _sort_value(value(result)), reverse=sort_direction == "desc")
+    results[:] = present + missing
+
+
+def group_reduce(
+    items: Iterable[Any],
+    key_expression: str,
+    reduce_expression: str,
+    sort_by: str = "group_key",
+    sort_direction: str = "asc",
+    include_items: bool = False,
+    **engine_options
+) -> GroupReduceResult:
+    """Group a stream of items and aggregate each group; see the module docstring for the expressions"""
+    result = GroupReduceEngine(key_expression, reduce_expression, include_items, **engine_options).run(items)
+    sort_grouped_results(result.grouped_results, sort_by, sort_direction)
+    return result
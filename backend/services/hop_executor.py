@@ -0,0 +1,181 @@
+"""
+Hop Step Executor
+
+Runs the tool steps of a hop as a dependency graph instead of a strict
+sequence. Dependencies come from the asset references in each step's
+parameter_mapping (reads) and result_mapping (writes): a step waits for every
+earlier step (by sequence_order) that
+
+- writes an asset it reads (read-after-write),
+- reads an asset it writes (write-after-read), or
+- writes an asset it also writes (write-after-write).
+
+Steps whose dependencies are satisfied run concurrently, up to max_parallel at
+a time. Execution is fail-fast: after the first failure no new steps are
+started; steps already running are allowed to finish, and the rest are
+reported as skipped. With max_parallel=1 steps run in sequence_order, exactly
+as before.
+"""
+
+import asyncio
+import inspect
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from schemas.workflow import ToolStep
+
+logger = logging.getLogger(__name__)
+
+StepRunner = Callable[[ToolStep], Awaitable[Dict[str, Any]]]
+StepEventHandler = Callable[[Dict[str, Any]], Any]
+
+
+@dataclass
+class HopExecutionOutcome:
+    """Result of running a hop's tool steps"""
+    executed_steps: int = 0
+    errors: List[str] = field(default_factory=list)
+    results: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    skipped_step_ids: List[str] = field(default_factory=list)
+
+
+def _asset_ids(mapping: Dict[str, Any]) -> Set[str]:
+    return {value.state_asset_id for value in mapping.values() if getattr(value, "type", None) == "asset_field"}
+
+
+def build_step_dependencies(tool_steps: List[ToolStep]) -> Dict[str, Set[str]]:
+    """Map each step id to the ids of the earlier steps it must wait for"""
+    dependencies: Dict[str, Set[str]] = {}
+    last_writer: Dict[str, str] = {}
+    readers_since_write: Dict[str, Set[str]] = {}
+
+    for step in sorted(tool_steps, key=lambda s: s.sequence_order):
+        reads = _asset_ids(step.parameter_mapping or {})
+        writes = _asset_ids(step.result_mapping or {})
+        depends_on: Set[str] = set()
+
+        for asset_id in reads:
+            if asset_id in last_writer:
+                depends_on.add(last_writer[asset_id])
+        for asset_id in writes:
+            if asset_id in last_writer:
+                depends_on.add(last_writer[asset_id])
+            depends_on |= readers_since_write.get(asset_id, set())
+
+        depends_on.discard(step.id)
+        dependencies[step.id] = depends_on
+
+        for asset_id in reads:
+            readers_since_write.setdefault(asset_id, set()).add(step.id)
+        for asset_id in writes:
+            last_writer[asset_id] = step.id
+            readers_since_write[asset_id] = set()
+
+    return dependencies
+
+
+class HopStepExecutor:
+    """Executes tool steps concurrently along their asset dependency graph"""
+
+    def __init__(
+        self,
+        run_step: StepRunner,
+        max_parallel: int = 1,
+        on_event: Optional[StepEventHandler] = None
+    ):
+        self.run_step = run_step
+        self.max_parallel = max(1, max_parallel)
+        self.on_event = on_event
+
+    async def _emit(self, event_type: str, step: ToolStep, **details):
+        if not self.on_event:
+            return
+        event = {
+            "type": event_type,
+            "tool_step_id": step.id,
+            "tool_id": step.tool_id,
+            "sequence_order": step.sequence_order,
+            **details
+        }
+        result = self.on_event(event)
+        if inspect.isawaitable(result):
+            await result
+
+    async def execute(self, tool_steps: List[ToolStep]) -> HopExecutionOutcome:
+        outcome = HopExecutionOutcome()
+        steps_by_id = {step.id: step for step in tool_steps}
+        pending = {step_id: set(deps) for step_id, deps in build_step_dependencies(tool_steps).items()}
+        dependents: Dict[str, Set[str]] = {step_id: set() for step_id in pending}
+        for step_id, deps in pending.items():
+            for dep in deps:
+                dependents[dep].add(step_id)
+
+        ready = sorted((steps_by_id[sid] for sid, deps in pending.items() if not deps), key=lambda s: s.sequence_order)
+        running: Dict[asyncio.Task, ToolStep] = {}
+        failed = False
+
+        try:
+            while ready or running:
+                while ready and not failed and len(running) < self.max_parallel:
+                    step = ready.pop(0)
+                    del pending[step.id]
+                    await self._emit("step_started", step)
+                    running[asyncio.create_task(self.run_step(step))] = step
+
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=lambda t: running[t].sequence_order):
+                    step = running.pop(task)
+                    error = self._step_error(step, task)
+                    if error:
+                        failed = True
+                        outcome.errors.append(error)
+                        await self._emit("step_failed", step, error=error)
+                        continue
+
+                    outcome.executed_steps += 1
+                    outcome.results[step.id] = task.result()
+                    await self._emit("step_completed", step)
+                    for dependent_id in dependents[step.id]:
+                        pending[dependent_id].discard(step.id)
+                        if not pending[dependent_id]:
+                            ready.append(steps_by_id[dependent_id])
+                    ready.sort(key=lambda s: s.sequence_order)
+        finally:
+            # Only reached with tasks still running if the caller was cancelled
+            for task in running:
+                task.cancel()
+
+        for step_id in sorted(pending, key=lambda sid: steps_by_id[sid].sequence_order):
+            outcome.skipped_step_ids.append(step_id)
+            await self._emit("step_skipped", steps_by_id[step_id])
+
+        return outcome
+
+    @staticmethod
+    def _step_error(step: ToolStep, task: asyncio.Task) -> Optional[str]:
+        """Return the error message for a finished step, or None if it succeeded"""
+        exception = task.exception()
+        if exception is not None:
+            logger.error(f"Tool step {step.id} execution error: {exception}", extra={
+                "tool_step_id": step.id,
+                "error": str(exception),
+                "exception_type": type(exception).__name__,
+                "tool_id": step.tool_id,
+                "parameter_mapping": step.parameter_mapping
+            })
+            return f"Tool step {step.id} execution error: {str(exception)}"
+
+        result = task.result()
+        if not result.get('success', False):
+            logger.error(f"Tool step {step.id} failed", extra={
+                "tool_step_id": step.id,
+                "result": result,
+                "error_details": result.get('error_details', {}),
+                "execution_metadata": result.get('metadata', {})
+            })
+            return f"Tool step {step.id} failed: {result.get('error', 'Unknown error')}"
+        return None
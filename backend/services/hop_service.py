@@ -1,4 +1,4 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, desc
 from datetime import datetime
@@ -7,11 +7,13 @@ import logging
 
 from models import Hop as HopModel, HopStatus
 
+from config.settings import settings
 from exceptions import HopNotFoundError
 from schemas.workflow import Hop, HopStatus as HopStatusSchema
 
 from services.asset_service import AssetService
 from services.asset_mapping_service import AssetMappingService
+from services.hop_executor import HopStepExecutor, StepEventHandler
 
 # Create logger for this module
 logger = logging.getLogger(__name__)
@@ -25,77 +27,88 @@ class HopService:
 
     async def _model_to_schema(self, hop_model: HopModel, load_assets: bool = True) -> Hop:
         """Convert database model to Hop schema with optional asset loading"""
-        hop_asset_map = {}
-        assets = []
-        tool_steps = []
+        return (await self._models_to_schemas([hop_model], load_assets=load_assets))[0]
+
+    async def _models_to_schemas(
+        self,
+        hop_models: List[HopModel],
+        load_assets: bool = True,
+        prefetch_asset_ids: Iterable[str] = ()
+    ) -> List[Hop]:
+        """
+        Convert database models to Hop schemas in batch.
+        
+        Loads the asset mappings of all hops in one query, their tool steps in
+        one query and every referenced asset (plus prefetch_asset_ids) in one
+        get_assets_by_ids call, instead of a round trip per hop and asset.
+        """
+        if not hop_models:
+            return []
+        
+        hop_ids = [hop_model.id for hop_model in hop_models]
+        user_id = hop_models[0].user_id
         
+        hop_asset_maps: Dict[str, Dict[str, Any]] = {hop_id: {} for hop_id in hop_ids}
         if load_assets:
-            # Get hop asset mapping
-            hop_asset_map = self.asset_mapping_service.get_hop_assets(hop_model.id)
-            logger.debug(
-                "Loading hop assets",
-                extra={
-                    "hop_id": hop_model.id,
-                    "asset_count": len(hop_asset_map),
-                    "asset_map": {k: v.value for k, v in hop_asset_map.items()}
-                }
-            )
-            
-            # Load full Asset objects for frontend compatibility
-            for asset_id in hop_asset_map.keys():
-                asset = self.asset_service.get_asset(asset_id, hop_model.user_id)
-                if asset:
-                    assets.append(asset)
-                    logger.debug(
-                        "Loaded asset for hop",
-                        extra={"hop_id": hop_model.id, "asset_id": asset_id}
-                    )
-                else:
-                    logger.warning(
-                        "Failed to load asset for hop",
-                        extra={"hop_id": hop_model.id, "asset_id": asset_id}
-                    )
-            
-            logger.debug(
-                "Hop asset loading complete",
-                extra={"hop_id": hop_model.id, "total_assets_loaded": len(assets)}
-            )
+            hop_asset_maps = self.asset_mapping_service.get_hop_assets_for_hops(hop_ids)
+            asset_ids = [asset_id for asset_map in hop_asset_maps.values() for asset_id in asset_map]
+            self.asset_service.get_assets_by_ids(user_id, [*asset_ids, *prefetch_asset_ids])
         
-        # Load tool steps for this hop
+        # Load tool steps for all hops
         from services.tool_step_service import ToolStepService
         tool_step_service = ToolStepService(self.db)
         try:
-            tool_steps = await tool_step_service.get_tool_steps_by_hop(hop_model.id, hop_model.user_id)
+            tool_steps_by_hop = await tool_step_service.get_tool_steps_by_hops(hop_ids, user_id)
         except Exception as e:
             logger.warning(
-                "Failed to load tool steps for hop",
+                "Failed to load tool steps for hops",
                 extra={
-                    "hop_id": hop_model.id,
-                    "user_id": hop_model.user_id,
+                    "hop_ids": hop_ids,
+                    "user_id": user_id,
                     "error": str(e)
                 }
             )
-            tool_steps = []
-        
-        return Hop(
-            id=hop_model.id,
-            name=hop_model.name,
-            description=hop_model.description or "",
-            goal=hop_model.goal,
-            success_criteria=hop_model.success_criteria or [],
-            sequence_order=hop_model.sequence_order,
-            status=HopStatusSchema(hop_model.status.value),
-            is_final=hop_model.is_final,
-            is_resolved=hop_model.is_resolved,
-            rationale=hop_model.rationale,
-            error_message=hop_model.error_message,
-            hop_metadata=hop_model.hop_metadata or {},
-            hop_asset_map=hop_asset_map,
-            assets=assets,
-            tool_steps=tool_steps,
-            created_at=hop_model.created_at,
-            updated_at=hop_model.updated_at
+            tool_steps_by_hop = {}
+        
+        hops = []
+        for hop_model in hop_models:
+            hop_asset_map = hop_asset_maps.get(hop_model.id, {})
+            # Served from the session's identity map populated above
+            assets = self.asset_service.get_assets_by_ids(user_id, hop_asset_map.keys()) if hop_asset_map else []
+            if len(assets) < len(hop_asset_map):
+                logger.warning(
+                    "Failed to load assets for hop",
+                    extra={
+                        "hop_id": hop_model.id,
+                        "missing_asset_ids": sorted(set(hop_asset_map) - {asset.id for asset in assets})
+                    }
+                )
+            
+            hops.append(Hop(
+                id=hop_model.id,
+                name=hop_model.name,
+                description=hop_model.description or "",
+                goal=hop_model.goal,
+                success_criteria=hop_model.success_criteria or [],
+                sequence_order=hop_model.sequence_order,
+                status=HopStatusSchema(hop_model.status.value),
+                is_final=hop_model.is_final,
+                is_resolved=hop_model.is_resolved,
+                rationale=hop_model.rationale,
+                error_message=hop_model.error_message,
+                hop_metadata=hop_model.hop_metadata or {},
+                hop_asset_map=hop_asset_map,
+                assets=assets,
+                tool_steps=tool_steps_by_hop.get(hop_model.id, []),
+                created_at=hop_model.created_at,
+                updated_at=hop_model.updated_at
+            ))
+        
+        logger.debug(
+            "Hop hydration complete",
+            extra={"hop_count": len(hops), "total_assets_loaded": sum(len(hop.assets) for hop in hops)}
         )
+        return hops
 
     async def create_hop(
         self,
@@ -155,18 +168,43 @@ class HopService:
         
         return await self._model_to_schema(hop_model)
 
-    async def get_hops_by_mission(self, mission_id: str, user_id: int) -> List[Hop]:
-        """Get all hops for a mission, ordered by sequence"""
+    async def get_hops_by_mission(
+        self,
+        mission_id: str,
+        user_id: int,
+        prefetch_asset_ids: Iterable[str] = ()
+    ) -> List[Hop]:
+        """
+        Get all hops for a mission, ordered by sequence.
+        
+        prefetch_asset_ids are loaded in the same asset query as the hops'
+        assets (e.g. the mission's own assets) so later lookups hit the
+        session's identity map.
+        """
         hop_models = self.db.query(HopModel).filter(
             and_(HopModel.mission_id == mission_id, HopModel.user_id == user_id)
         ).order_by(HopModel.sequence_order).all()
         
-        # Convert models to schemas using asyncio.gather for concurrent execution
-        import asyncio
-        return await asyncio.gather(*[self._model_to_schema(hop_model) for hop_model in hop_models])
+        return await self._models_to_schemas(hop_models, prefetch_asset_ids=prefetch_asset_ids)
 
-    async def execute_hop(self, hop_id: str, user_id: int) -> Dict[str, Any]:
-        """Execute all tool steps in a hop sequentially"""
+    async def execute_hop(
+        self,
+        hop_id: str,
+        user_id: int,
+        on_step_event: Optional[StepEventHandler] = None,
+        max_parallel: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Execute all tool steps in a hop.
+        
+        Steps that don't share assets run concurrently (up to max_parallel,
+        default HOP_MAX_PARALLEL_STEPS); execution stops starting new steps
+        after the first failure. on_step_event receives step_started,
+        step_completed, step_failed and step_skipped events.
+        """
+        if max_parallel is None:
+            max_parallel = settings.HOP_MAX_PARALLEL_STEPS
+        
         logger.info(f"Starting hop execution for hop {hop_id}", extra={"hop_id": hop_id, "user_id": user_id})
         
         # Get the hop (throws HopNotFoundError if not found)
@@ -204,58 +242,14 @@ class HopService:
         errors = []
         
         try:
-            # Execute tool steps in sequence order
-            from services.tool_execution_service import ToolExecutionService
-            tool_execution_service = ToolExecutionService(self.db)
-            
-            for step in sorted(tool_steps, key=lambda x: x.sequence_order):
-                try:
-                    logger.info(
-                        f"Executing tool step {step.id} (step {step.sequence_order})",
-                        extra={
-                            "hop_id": hop_id,
-                            "tool_step_id": step.id,
-                            "tool_id": step.tool_id,
-                            "sequence_order": step.sequence_order
-                        }
-                    )
-                    
-                    result = await tool_execution_service.execute_tool_step(
-                        step.id, 
-                        user_id
-                    )
-                    
-                    logger.info(f"Tool step {step.id} execution result", extra={
-                        "tool_step_id": step.id,
-                        "result": result,
-                        "success": result.get('success', False)
-                    })
-                    
-                    if result.get('success', False):
-                        executed_steps += 1
-                        logger.info(f"Tool step {step.id} completed successfully")
-                    else:
-                        error_msg = f"Tool step {step.id} failed: {result.get('error', 'Unknown error')}"
-                        errors.append(error_msg)
-                        logger.error(error_msg, extra={
-                            "tool_step_id": step.id,
-                            "result": result,
-                            "error_details": result.get('error_details', {}),
-                            "execution_metadata": result.get('metadata', {})
-                        })
-                        break  # Stop execution on first failure
-                        
-                except Exception as e:
-                    error_msg = f"Tool step {step.id} execution error: {str(e)}"
-                    errors.append(error_msg)
-                    logger.error(error_msg, extra={
-                        "tool_step_id": step.id, 
-                        "error": str(e),
-                        "exception_type": type(e).__name__,
-                        "tool_id": step.tool_id,
-                        "parameter_mapping": step.parameter_mapping
-                    })
-                    break  # Stop execution on first error
+            # Execute tool steps along their asset dependencies, independent steps concurrently
+            outcome = await HopStepExecutor(
+                run_step=lambda step: self._execute_step(step, user_id, parallel=max_parallel > 1),
+                max_parallel=max_parallel,
+                on_event=on_step_event
+            ).execute(tool_steps)
+            executed_steps = outcome.executed_steps
+            errors = outcome.errors
             
             # Determine final status
             if executed_steps == total_steps and not errors:
@@ -315,6 +309,29 @@ class HopService:
                 "total_steps": total_steps
             }
 
+    async def _execute_step(self, step, user_id: int, parallel: bool) -> Dict[str, Any]:
+        """Execute one tool step; concurrent steps each get their own session"""
+        from services.tool_execution_service import ToolExecutionService
+        
+        logger.info(
+            f"Executing tool step {step.id} (step {step.sequence_order})",
+            extra={
+                "hop_id": step.hop_id,
+                "tool_step_id": step.id,
+                "tool_id": step.tool_id,
+                "sequence_order": step.sequence_order
+            }
+        )
+        
+        if not parallel:
+            return await ToolExecutionService(self.db).execute_tool_step(step.id, user_id)
+        
+        step_db = Session(bind=self.db.get_bind(), autoflush=False)
+        try:
+            return await ToolExecutionService(step_db).execute_tool_step(step.id, user_id)
+        finally:
+            step_db.close()
+
     async def update_hop(
         self,
         hop_id: str,
@@ -452,9 +469,7 @@ class HopService:
             )
         ).order_by(HopModel.sequence_order).all()
         
-        # Convert models to schemas using asyncio.gather for concurrent execution
-        import asyncio
-        return await asyncio.gather(*[self._model_to_schema(hop_model) for hop_model in hop_models])
+        return await self._models_to_schemas(hop_models)
 
     async def reorder_hops(
         self,
@@ -463,7 +478,7 @@ class HopService:
         hop_id_order: List[str]
     ) -> List[Hop]:
         """Reorder hops by updating their sequence_order"""
-        updated_hops = []
+        reordered_models = []
         
         for i, hop_id in enumerate(hop_id_order):
             hop_model = self.db.query(HopModel).filter(
@@ -477,8 +492,9 @@ class HopService:
             if hop_model:
                 hop_model.sequence_order = i + 1
                 hop_model.updated_at = datetime.utcnow()
-                updated_hops.append(await self._model_to_schema(hop_model))
+                reordered_models.append(hop_model)
         
+        updated_hops = await self._models_to_schemas(reordered_models)
         self.db.commit()
         
         return updated_hops 
\ No newline at end of file
@@ -109,17 +109,29 @@ class MissionTransformer:
             current_hop = None
             hops = []
             
+            # Get mission asset mapping first so its assets load in the same query as the hops' assets
+            mission_asset_map = {}
+            assets = []
+            if self.asset_mapping_service and self.asset_service:
+                mission_asset_map = self.asset_mapping_service.get_mission_assets(mission_model.id)
+            
             if load_hops and self.asset_service:
                 # Load hops if requested
                 from services.hop_service import HopService
                 hop_service = HopService(self.asset_service.db)
                 
-                # Load all hops for the mission
-                hops = await hop_service.get_hops_by_mission(mission_model.id, mission_model.user_id)
+                # Load all hops for the mission, with their tool steps and assets, in batch
+                hops = await hop_service.get_hops_by_mission(
+                    mission_model.id,
+                    mission_model.user_id,
+                    prefetch_asset_ids=mission_asset_map.keys()
+                )
                 
-                # Load current hop if specified
+                # Current hop is normally one of the mission's hops; only query it separately if not
                 if mission_model.current_hop_id:
-                    current_hop = await hop_service.get_hop(mission_model.current_hop_id, mission_model.user_id)
+                    current_hop = next((hop for hop in hops if hop.id == mission_model.current_hop_id), None)
+                    if current_hop is None:
+                        current_hop = await hop_service.get_hop(mission_model.current_hop_id, mission_model.user_id)
                     logger.debug(
                         "Loaded current hop with tool steps",
                         extra={
@@ -129,17 +141,9 @@ class MissionTransformer:
                         }
                     )
             
-            # Get mission asset mapping
-            mission_asset_map = {}
-            assets = []
-            if self.asset_mapping_service and self.asset_service:
-                mission_asset_map = self.asset_mapping_service.get_mission_assets(mission_model.id)
-                
-                # Load full Asset objects for frontend compatibility
-                for asset_id in mission_asset_map.keys():
-                    asset = self.asset_service.get_asset(asset_id, mission_model.user_id)
-                    if asset:
-                        assets.append(asset)
+            # Load full Asset objects for frontend compatibility (identity map hits if prefetched above)
+            if mission_asset_map:
+                assets = self.asset_service.get_assets_by_ids(mission_model.user_id, mission_asset_map.keys())
             
             return Mission(
                 id=mission_model.id,
@@ -0,0 +1,344 @@
+"""
+Principal Cache
+
+Short-lived, size-bounded cache of authenticated principals so that
+validate_token doesn't need a users-table round trip on every request.
+
+Entries are keyed by the token's `jti` (falling back to its subject email).
+Two ways to skip the database:
+- a cached principal from a recent DB lookup for the same token
+- the token claims themselves, when they carry user_id and role and the
+  user has not been invalidated since the token was issued. Opt-in
+  (AUTH_TRUST_TOKEN_CLAIMS): claims don't say whether the user still exists
+  or is active, so a deleted or deactivated user's token is accepted until
+  it expires; only role changes (invalidate_user_principal) are enforced.
+
+Lookups only read process memory. Revocations (logout) and per-user
+invalidation markers (role changes) are written to the auth_revocations table
+in the shared database and kept in memory in every worker; a background task
+(run_revocation_sync) pulls the other workers' and hosts' entries every
+AUTH_REVOCATION_SYNC_SECONDS. A logout or demotion applies at once in the
+worker that made it and within one sync interval everywhere else.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from config.settings import settings
+from database import SessionLocal
+from models import AuthRevocation, User, UserRole
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Immutable snapshot of the fields request handlers read from the current user."""
+    user_id: int
+    email: str
+    role: UserRole
+    registration_date: Optional[datetime] = None
+    is_active: bool = True
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            user_id=user.user_id,
+            email=user.email,
+            role=user.role,
+            registration_date=user.registration_date,
+            is_active=user.is_active if user.is_active is not None else True
+        )
+
+    @classmethod
+    def from_claims(cls, payload: Dict[str, Any]) -> Optional["Principal"]:
+        """
+        Build a principal from token claims, or None if required claims are missing.
+
+        The user is assumed to exist and be active; nothing here checks the users table.
+        """
+        email = payload.get("sub")
+        user_id = payload.get("user_id")
+        role = payload.get("role")
+        if email is None or user_id is None or role is None:
+            return None
+        try:
+            return cls(user_id=int(user_id), email=email, role=UserRole(role))
+        except (ValueError, TypeError):
+            return None
+
+    def to_user(self, username: Optional[str] = None) -> User:
+        """
+        Materialize a transient User for the request.
+
+        A fresh instance is built per request so handlers can't mutate
+        shared cached state, and it is never attached to a DB session.
+        """
+        user = User(
+            user_id=self.user_id,
+            email=self.email,
+            role=self.role,
+            registration_date=self.registration_date,
+            is_active=self.is_active
+        )
+        user.username = username
+        return user
+
+
+class RevocationStore:
+    """Revoked tokens and user invalidation markers in the auth_revocations table"""
+
+    def __init__(self, session_factory: Callable[[], Session], retention_seconds: float):
+        """
+        Args:
+            session_factory: Creates sessions on the shared database
+            retention_seconds: How long an invalidation marker is kept; at least the
+                lifetime of an access token, after which every older token has expired
+        """
+        self.session_factory = session_factory
+        self.retention_seconds = retention_seconds
+
+    def revoke(self, jti: str, expires_at: float, now: float):
+        self._add(AuthRevocation(jti=jti, created_at=now, expires_at=expires_at), now)
+
+    def invalidate_user(self, user_id: int, now: float):
+        self._add(AuthRevocation(user_id=user_id, created_at=now, expires_at=now + self.retention_seconds), now)
+
+    def _add(self, entry: AuthRevocation, now: float):
+        db = self.session_factory()
+        try:
+            # Expired tokens are rejected by JWT validation anyway; stop tracking them
+            db.query(AuthRevocation).filter(AuthRevocation.expires_at < now).delete(synchronize_session=False)
+            db.add(entry)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def load_since(self, since: float, now: float) -> List[Tuple[Optional[str], Optional[int], float, float]]:
+        """Unexpired (jti, user_id, created_at, expires_at) entries created at or after since"""
+        db = self.session_factory()
+        try:
+            return [tuple(row) for row in db.query(
+                AuthRevocation.jti, AuthRevocation.user_id, AuthRevocation.created_at, AuthRevocation.expires_at
+            ).filter(AuthRevocation.created_at >= since, AuthRevocation.expires_at >= now).all()]
+        finally:
+            db.close()
+
+
+class PrincipalCache:
+    """
+    TTL + LRU cache of principals keyed by token.
+
+    Revoked tokens (until they expire) and per-user invalidation timestamps,
+    which disable cached principals and the claims fast path for older
+    tokens, are held in memory. When a RevocationStore is given, local
+    changes are written to it and sync_revocations merges everyone else's.
+    """
+
+    # Entries are re-read this far back on every sync, so rows committed late
+    # or stamped by a host with a slightly different clock are still picked up
+    SYNC_OVERLAP_SECONDS = 60
+
+    def __init__(self, ttl_seconds: int, max_size: int, trust_claims: bool, revocations: Optional[RevocationStore] = None):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.trust_claims = trust_claims
+        self.revocations = revocations
+        # key -> (principal, expires_at, cached_at)
+        self._entries: "OrderedDict[str, Tuple[Principal, float, float]]" = OrderedDict()
+        self._revoked: Dict[str, float] = {}
+        self._invalidated_at: Dict[int, float] = {}
+        self._synced_at: Optional[float] = None
+        self._lock = Lock()
+
+    @staticmethod
+    def cache_key(payload: Dict[str, Any]) -> Optional[str]:
+        jti = payload.get("jti")
+        if jti:
+            return f"jti:{jti}"
+        email = payload.get("sub")
+        return f"sub:{email}" if email else None
+
+    def is_revoked(self, payload: Dict[str, Any]) -> bool:
+        jti = payload.get("jti")
+        if not jti:
+            return False
+        now = time.time()
+        with self._lock:
+            expires_at = self._revoked.get(jti)
+            if expires_at is not None:
+                if expires_at >= now:
+                    return True
+                del self._revoked[jti]
+        return False
+
+    def _user_invalidated_at(self, user_id: int) -> Optional[float]:
+        """When the user's principals were last invalidated, as far as this worker has synced"""
+        with self._lock:
+            return self._invalidated_at.get(user_id)
+
+    def lookup(self, payload: Dict[str, Any]) -> Optional[Principal]:
+        """
+        Resolve a principal without touching the database.
+
+        Returns:
+            The principal, or None if the caller must load the user from the DB
+        """
+        key = self.cache_key(payload)
+        if key is None:
+            return None
+
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= now:
+                del self._entries[key]
+                entry = None
+
+        if entry is not None:
+            principal, _, cached_at = entry
+            # Principals cached before an invalidation must be re-read from the DB
+            invalidated_at = self._user_invalidated_at(principal.user_id)
+            if invalidated_at is None or cached_at > invalidated_at:
+                with self._lock:
+                    if key in self._entries:
+                        self._entries.move_to_end(key)
+                return principal
+            with self._lock:
+                self._entries.pop(key, None)
+            return None
+
+        if not self.trust_claims:
+            return None
+
+        principal = Principal.from_claims(payload)
+        if principal is None:
+            return None
+
+        # Tokens issued before an invalidation must be re-checked against the DB
+        invalidated_at = self._user_invalidated_at(principal.user_id)
+        if invalidated_at is not None:
+            issued_at = payload.get("iat")
+            if issued_at is None or issued_at <= invalidated_at:
+                return None
+
+        with self._lock:
+            self._store_locked(key, principal, now)
+        return principal
+
+    def store(self, payload: Dict[str, Any], user: User) -> Principal:
+        """Cache a principal loaded from the database and return it."""
+        principal = Principal.from_user(user)
+        key = self.cache_key(payload)
+        if key is not None:
+            with self._lock:
+                self._store_locked(key, principal, time.time())
+        return principal
+
+    def _store_locked(self, key: str, principal: Principal, now: float):
+        self._entries[key] = (principal, now + self.ttl_seconds, now)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int):
+        """Drop every cached principal for a user, in every worker, e.g. after a role change."""
+        now = time.time()
+        self._apply_invalidation(user_id, now)
+        if self.revocations is not None:
+            self.revocations.invalidate_user(user_id, now)
+
+    def _apply_invalidation(self, user_id: int, invalidated_at: float):
+        with self._lock:
+            if invalidated_at <= self._invalidated_at.get(user_id, 0):
+                return
+            self._invalidated_at[user_id] = invalidated_at
+            stale = [
+                key for key, (principal, _, cached_at) in self._entries.items()
+                if principal.user_id == user_id and cached_at <= invalidated_at
+            ]
+            for key in stale:
+                del self._entries[key]
+        logger.info(f"Invalidated {len(stale)} cached principal(s) for user {user_id}")
+
+    def revoke(self, payload: Dict[str, Any]):
+        """Revoke a single token in every worker, e.g. on logout."""
+        key = self.cache_key(payload)
+        now = time.time()
+        jti = payload.get("jti")
+        expires_at = float(payload.get("exp") or now + self.ttl_seconds)
+        with self._lock:
+            if jti:
+                self._revoked[jti] = expires_at
+            if key is not None:
+                self._entries.pop(key, None)
+        if jti and self.revocations is not None:
+            self.revocations.revoke(jti, expires_at, now)
+
+    def sync_revocations(self):
+        """
+        Merge revocations and invalidations recorded by other workers and hosts.
+
+        Blocking database read; run it in a worker thread (see run_revocation_sync).
+        """
+        if self.revocations is None:
+            return
+        now = time.time()
+        since = self._synced_at - self.SYNC_OVERLAP_SECONDS if self._synced_at is not None else 0.0
+        entries = self.revocations.load_since(since, now)
+        for jti, user_id, created_at, expires_at in entries:
+            if user_id is not None:
+                self._apply_invalidation(user_id, created_at)
+            if jti:
+                with self._lock:
+                    self._revoked[jti] = expires_at
+                    self._entries.pop(f"jti:{jti}", None)
+        with self._lock:
+            # Expired tokens are rejected by JWT validation anyway; stop tracking them
+            for expired in [j for j, revoked_until in self._revoked.items() if revoked_until < now]:
+                del self._revoked[expired]
+            retention = self.revocations.retention_seconds
+            for user_id in [u for u, at in self._invalidated_at.items() if at < now - retention]:
+                del self._invalidated_at[user_id]
+            self._synced_at = now
+
+    async def run_revocation_sync(self, interval: Optional[float] = None):
+        """Sync revocations forever, off the event loop (start from app startup)"""
+        interval = interval or settings.AUTH_REVOCATION_SYNC_SECONDS
+        while True:
+            try:
+                await asyncio.to_thread(self.sync_revocations)
+            except Exception as e:
+                logger.warning(f"Revocation sync failed, keeping the last known state: {e}")
+            await asyncio.sleep(interval)
+
+    def clear(self):
+        """Forget everything held in this process (the shared table is left alone)"""
+        with self._lock:
+            self._entries.clear()
+            self._revoked.clear()
+            self._invalidated_at.clear()
+            self._synced_at = None
+
+
+# Global cache instance
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS,
+    max_size=settings.AUTH_PRINCIPAL_CACHE_MAX_SIZE,
+    trust_claims=settings.AUTH_TRUST_TOKEN_CLAIMS,
+    revocations=RevocationStore(
+        SessionLocal,
+        retention_seconds=max(settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60, settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS)
+    )
+)
@@ -0,0 +1,180 @@
+"""
+PubMed Coverage Service
+
+Answers "which of these target PMIDs would this search phrase find?" for the
+PubMed search designer without downloading the phrase's full result set.
+
+NCBI is asked directly with `(<phrase>) AND (<pmid>[uid] OR ...)`, so each
+response only carries the covered target IDs. PMID lists are split into as
+few queries as PubMed's URL length limit allows, and the total result count
+comes from a separate count-only (retmax=0) query.
+
+Results are cached per (phrase, pmid), and counts per phrase, for a short
+TTL. While a user iterates on a phrase against the same targets, only the
+phrase/PMID pairs that have not been checked yet go back to NCBI. The cache
+is per process.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from config.settings import settings
+from services.pubmed_service import PubMedService
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_phrase(search_phrase: str) -> str:
+    """Collapse whitespace so cosmetic edits to a phrase reuse its cache entries"""
+    return " ".join(search_phrase.split())
+
+
+def coverage_term(search_phrase: str, pmids: List[str]) -> str:
+    """Search term matching the given PMIDs that are also found by the phrase"""
+    id_clause = " OR ".join(f"{pmid}[uid]" for pmid in pmids)
+    return f"({search_phrase}) AND ({id_clause})"
+
+
+@dataclass
+class CoverageResult:
+    """Coverage of target PMIDs by a search phrase"""
+    estimated_count: int
+    covered_ids: List[str] = field(default_factory=list)
+    not_covered_ids: List[str] = field(default_factory=list)
+    queried_ids: int = 0
+    cached_ids: int = 0
+
+    @property
+    def coverage_percentage(self) -> float:
+        total = len(self.covered_ids) + len(self.not_covered_ids)
+        return round(len(self.covered_ids) / total * 100, 1) if total > 0 else 0.0
+
+
+class CoverageCache:
+    """TTL + LRU cache of coverage answers keyed by (phrase, pmid); pmid None holds the phrase's count"""
+
+    def __init__(self, ttl_seconds: int, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[str, Optional[str]], Tuple[Hashable, float]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, phrase: str, pmid: Optional[str] = None):
+        key = (phrase, pmid)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, phrase: str, pmid: Optional[str], value: Hashable):
+        key = (phrase, pmid)
+        with self._lock:
+            self._entries[key] = (value, time.time() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class PubMedCoverageService:
+    """Checks search phrase coverage of target PMIDs with ID-restricted PubMed queries"""
+
+    def __init__(self, pubmed_service: Optional[PubMedService] = None, cache: Optional["CoverageCache"] = None):
+        self.pubmed_service = pubmed_service or PubMedService()
+        self.cache = cache if cache is not None else coverage_cache
+
+    def get_count(self, search_phrase: str) -> int:
+        """Total result count for a phrase, from a count-only query"""
+        phrase = normalize_phrase(search_phrase)
+        count = self.cache.get(phrase)
+        if count is None:
+            _, count = self.pubmed_service._get_article_ids(phrase, max_results=0)
+            self.cache.set(phrase, None, count)
+        return count
+
+    def check_coverage(self, search_phrase: str, pmids: List[str]) -> CoverageResult:
+        """
+        Determine which target PMIDs the phrase would find.
+
+        Args:
+            search_phrase: PubMed search phrase being designed
+            pmids: Target PubMed IDs; non-numeric entries are reported as not covered
+
+        Returns:
+            CoverageResult with covered/not covered IDs in request order
+        """
+        phrase = normalize_phrase(search_phrase)
+        result = CoverageResult(estimated_count=self.get_count(phrase))
+
+        covered: Dict[str, bool] = {}
+        to_query: List[str] = []
+        for pmid in dict.fromkeys(p.strip() for p in pmids):
+            if not pmid.isdigit():
+                covered[pmid] = False
+                continue
+            cached = self.cache.get(phrase, pmid)
+            if cached is None:
+                to_query.append(pmid)
+            else:
+                covered[pmid] = cached
+                result.cached_ids += 1
+
+        for chunk in self._chunk_pmids(phrase, to_query):
+            found_ids, _ = self.pubmed_service._get_article_ids(coverage_term(phrase, chunk), max_results=len(chunk))
+            found = set(found_ids)
+            for pmid in chunk:
+                covered[pmid] = pmid in found
+                self.cache.set(phrase, pmid, covered[pmid])
+        result.queried_ids = len(to_query)
+
+        for pmid in pmids:
+            if covered[pmid.strip()]:
+                result.covered_ids.append(pmid)
+            else:
+                result.not_covered_ids.append(pmid)
+
+        logger.info(
+            f"Coverage for '{phrase}': {len(result.covered_ids)}/{len(pmids)} "
+            f"({result.queried_ids} queried, {result.cached_ids} cached)"
+        )
+        return result
+
+    def _chunk_pmids(self, phrase: str, pmids: List[str]) -> List[List[str]]:
+        """Split PMIDs into the fewest ID-restricted queries that fit PubMed's URL limit"""
+        chunks: List[List[str]] = []
+        chunk: List[str] = []
+        for pmid in pmids:
+            candidate = chunk + [pmid]
+            if self.pubmed_service.search_term_fits(coverage_term(phrase, candidate), len(candidate)):
+                chunk = candidate
+                continue
+            if not chunk:
+                raise ValueError(
+                    "Search phrase is too long to check coverage within PubMed's URL length limit. "
+                    "Please simplify your search by reducing the number of terms."
+                )
+            chunks.append(chunk)
+            chunk = [pmid]
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+
+# Global cache instance
+coverage_cache = CoverageCache(
+    ttl_seconds=settings.PUBMED_COVERAGE_CACHE_TTL_SECONDS,
+    max_size=settings.PUBMED_COVERAGE_CACHE_MAX_SIZE
+)
@@ -0,0 +1,277 @@
+"""
+PubMed Article Scoring
+
+Columnar scoring and ranking behind the pubmed_score_articles and
+pubmed_filter_rank tools. Extracted features are read out of the articles
+once and packed into NumPy arrays; component scores, weighted totals,
+percentile ranks and normalization are then whole-array operations, and all
+filters of a ranking request are combined into one boolean mask before a
+single sort.
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from schemas.canonical_types import CanonicalPubMedExtraction, CanonicalScoredArticle
+
+DEFAULT_SCORING_CRITERIA: Dict[str, Dict[str, Any]] = {
+    "clinical_relevance": {"weight": 0.3, "max_score": 5},
+    "innovation_score": {"weight": 0.25, "max_score": 5},
+    "study_quality": {"weight": 0.2, "max_score": 5},
+    "sample_size": {"weight": 0.15, "max_score": 5, "thresholds": {"high": 1000, "medium": 100, "low": 10}},
+    "recency": {"weight": 0.1, "max_score": 5}
+}
+
+DEFAULT_WEIGHT = 0.1
+DEFAULT_MAX_SCORE = 5
+DEFAULT_SAMPLE_SIZE_THRESHOLDS = {"high": 1000, "medium": 100, "low": 10}
+
+# Each indicator found in quality_indicators adds 0.5 to the base study quality of 3
+QUALITY_INDICATORS = ("randomized", "blinded", "controlled", "peer-reviewed")
+
+# Numeric 1-5 ratings used when the extraction has no number
+DEFAULT_RATING = 3.0
+DEFAULT_UNKNOWN_SCORE = 2.0
+
+_FIRST_NUMBER = re.compile(r"\d+")
+
+
+def _rating(value: Any) -> float:
+    """A 1-5 rating feature as a number, NaN when it isn't one"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str) and value.isdigit():
+        return float(value)
+    return np.nan
+
+
+def _first_number(value: Any) -> int:
+    match = _FIRST_NUMBER.search(str(value))
+    return int(match.group()) if match else 0
+
+
+def publication_year(publication_date: Optional[str]) -> float:
+    """Year of a "YYYY[-MM[-DD]]" date, NaN when missing or unparsable"""
+    if not publication_date:
+        return np.nan
+    try:
+        return float(int(str(publication_date).split("-")[0]))
+    except ValueError:
+        return np.nan
+
+
+@dataclass
+class FeatureColumns:
+    """The features scoring looks at, one array entry per article"""
+    clinical_relevance: np.ndarray  # float, NaN when not numeric
+    innovation_score: np.ndarray  # float, NaN when not numeric
+    quality_indicator_hits: np.ndarray  # int, QUALITY_INDICATORS found in quality_indicators
+    sample_size: np.ndarray  # int, first number in sample_size (0 when none)
+    publication_year: np.ndarray  # float, NaN when unknown
+
+    @classmethod
+    def from_extractions(cls, extractions: Sequence[CanonicalPubMedExtraction]) -> "FeatureColumns":
+        n = len(extractions)
+        clinical = np.empty(n)
+        innovation = np.empty(n)
+        quality_hits = np.zeros(n, dtype=np.int64)
+        sample_size = np.zeros(n, dtype=np.int64)
+        year = np.empty(n)
+        for i, extraction in enumerate(extractions):
+            features = extraction.extraction or {}
+            clinical[i] = _rating(features.get("clinical_relevance"))
+            innovation[i] = _rating(features.get("innovation_score"))
+            indicators = str(features.get("quality_indicators") or "").lower()
+            quality_hits[i] = sum(indicator in indicators for indicator in QUALITY_INDICATORS)
+            sample_size[i] = _first_number(features.get("sample_size", "0"))
+            year[i] = publication_year(extraction.original_article.publication_date)
+        return cls(clinical, innovation, quality_hits, sample_size, year)
+
+
+def component_scores(
+    columns: FeatureColumns,
+    scoring_criteria: Dict[str, Dict[str, Any]],
+    current_year: Optional[int] = None
+) -> Dict[str, np.ndarray]:
+    """Raw (unweighted) score of every criterion for every article; unknown criteria score 0"""
+    current_year = current_year or datetime.now().year
+    n = len(columns.sample_size)
+    scores = {}
+    for criterion, config in scoring_criteria.items():
+        if criterion == "clinical_relevance":
+            raw = np.where(np.isnan(columns.clinical_relevance), DEFAULT_RATING, columns.clinical_relevance)
+        elif criterion == "innovation_score":
+            raw = np.where(np.isnan(columns.innovation_score), DEFAULT_RATING, columns.innovation_score)
+        elif criterion == "study_quality":
+            raw = np.minimum(3.0 + 0.5 * columns.quality_indicator_hits, config.get("max_score", DEFAULT_MAX_SCORE))
+        elif criterion == "sample_size":
+            thresholds = config.get("thresholds", DEFAULT_SAMPLE_SIZE_THRESHOLDS)
+            size = columns.sample_size
+            raw = np.select(
+                [size >= thresholds["high"], size >= thresholds["medium"], size >= thresholds["low"]],
+                [5.0, 4.0, 3.0],
+                default=2.0
+            )
+        elif criterion == "recency":
+            years_old = current_year - columns.publication_year
+            raw = np.select(
+                [np.isnan(years_old), years_old <= 1, years_old <= 3, years_old <= 5, years_old <= 10],
+                [DEFAULT_UNKNOWN_SCORE, 5.0, 4.0, 3.0, 2.0],
+                default=1.0
+            )
+        else:
+            raw = np.zeros(n)
+        scores[criterion] = raw.astype(np.float64)
+    return scores
+
+
+def percentile_ranks(scores: np.ndarray) -> np.ndarray:
+    """Share of scores strictly below each score, in percent (rankdata "min" - 1, over n)"""
+    if len(scores) == 0:
+        return np.zeros(0)
+    ordered = np.sort(scores)
+    return np.searchsorted(ordered, scores, side="left") / len(scores) * 100
+
+
+@dataclass
+class ArticleScores:
+    raw_scores: Dict[str, np.ndarray]  # criterion -> raw score per article
+    weights: Dict[str, float]
+    total: np.ndarray  # weighted total before normalization
+    percentile: np.ndarray  # NaN where no percentile is assigned
+    final: np.ndarray  # total after optional normalization
+
+
+def score_columns(
+    columns: FeatureColumns,
+    scoring_criteria: Dict[str, Dict[str, Any]],
+    normalize_scores: bool = True,
+    current_year: Optional[int] = None
+) -> ArticleScores:
+    """
+    Weighted totals, percentile ranks and optionally 0-100 normalized totals.
+
+    Articles with a total of 0 get no percentile and are not normalized, and
+    percentiles need at least two articles.
+    """
+    raw_scores = component_scores(columns, scoring_criteria, current_year)
+    weights = {criterion: float(config.get("weight", DEFAULT_WEIGHT)) for criterion, config in scoring_criteria.items()}
+    total = np.zeros(len(columns.sample_size))
+    for criterion, raw in raw_scores.items():
+        total += raw * weights[criterion]
+
+    positive = total > 0
+    percentile = np.full(len(total), np.nan)
+    if len(total) > 1:
+        percentile[positive] = percentile_ranks(total)[positive]
+
+    final = total.copy()
+    if normalize_scores and len(total):
+        low, high = total.min(), total.max()
+        score_range = high - low if high > low else 1
+        final[positive] = (total[positive] - low) / score_range * 100
+
+    return ArticleScores(raw_scores, weights, total, percentile, final)
+
+
+def build_scored_articles(
+    extractions: Sequence[CanonicalPubMedExtraction],
+    scores: ArticleScores,
+    scoring_metadata: Dict[str, Any]
+) -> List[CanonicalScoredArticle]:
+    """CanonicalScoredArticle per extraction, with the per-criterion breakdown"""
+    criteria = list(scores.raw_scores)
+    raw = np.column_stack([scores.raw_scores[c] for c in criteria]).tolist() if criteria else [[]] * len(extractions)
+    weights = [scores.weights[c] for c in criteria]
+    percentiles = [None if np.isnan(p) else float(p) for p in scores.percentile]
+    final = scores.final.tolist()
+
+    scored = []
+    for i, extraction in enumerate(extractions):
+        breakdown = {
+            criterion: {"raw_score": raw[i][j], "weight": weights[j], "weighted_score": raw[i][j] * weights[j]}
+            for j, criterion in enumerate(criteria)
+        }
+        scored.append(CanonicalScoredArticle(
+            article_with_features=extraction,
+            total_score=final[i],
+            score_breakdown=breakdown,
+            percentile_rank=percentiles[i],
+            scoring_metadata=scoring_metadata
+        ))
+    return scored
+
+
+def _as_list(value: Any) -> List[Any]:
+    return value if isinstance(value, list) else [value]
+
+
+def filter_rank(
+    articles: Sequence[CanonicalScoredArticle],
+    min_score_threshold: float = 0.0,
+    additional_filters: Optional[Dict[str, Any]] = None,
+    sort_by: str = "total_score",
+    sort_order: str = "desc",
+    max_results: Optional[int] = None
+) -> List[int]:
+    """
+    Indices of the articles that pass the score threshold and every additional
+    filter, in ranking order and cut to max_results.
+
+    additional_filters: journal_filter, author_filter, study_type (a value or
+    list of values) and year_range ({"start", "end"}; articles without a
+    publication year are excluded).
+    Unknown sort_by keeps the input order; ties keep the input order.
+    """
+    n = len(articles)
+    total = np.fromiter((a.total_score for a in articles), dtype=np.float64, count=n)
+    mask = total >= min_score_threshold
+
+    for filter_key, filter_value in (additional_filters or {}).items():
+        if filter_key == "journal_filter":
+            journals = np.array([a.article_with_features.original_article.journal for a in articles], dtype=object)
+            mask &= np.isin(journals, _as_list(filter_value))
+        elif filter_key == "author_filter":
+            target_authors = set(_as_list(filter_value))
+            mask &= np.fromiter(
+                (not target_authors.isdisjoint(a.article_with_features.original_article.authors) for a in articles),
+                dtype=bool, count=n
+            )
+        elif filter_key == "year_range":
+            years = np.fromiter(
+                (publication_year(a.article_with_features.original_article.publication_date) for a in articles),
+                dtype=np.float64, count=n
+            )
+            start, end = filter_value.get("start", 1900), filter_value.get("end", 2030)
+            mask &= (years >= start) & (years <= end)
+        elif filter_key == "study_type":
+            allowed = np.array([str(t).lower() for t in _as_list(filter_value)], dtype=object)
+            study_types = np.array(
+                [str(a.article_with_features.extraction.get("study_type") or "").lower() for a in articles], dtype=object
+            )
+            mask &= np.isin(study_types, allowed)
+
+    selected = np.flatnonzero(mask)
+    descending = sort_order == "desc"
+    key = None
+    if sort_by == "total_score":
+        key = total[selected]
+    elif sort_by == "percentile":
+        key = np.array([articles[i].percentile_rank or 0 for i in selected], dtype=np.float64)
+    elif sort_by == "publication_date":
+        dates = np.array(
+            [articles[i].article_with_features.original_article.publication_date or "1900-01-01" for i in selected],
+            dtype=object
+        )
+        # Sort string dates by their rank so descending order can be a negation
+        key = np.unique(dates, return_inverse=True)[1] if len(dates) else np.zeros(0)
+    if key is not None:
+        selected = selected[np.argsort(-key if descending else key, kind="stable")]
+
+    if max_results is not None:
+        selected = selected[:max_results]
+    return selected.tolist()
@@ -6,8 +6,13 @@ import time
 import os
 from typing import List, Dict, Any, Optional
 
+from exceptions import ProviderUnavailableError
+from services.search_providers.health import get_provider_health_service
+
 logger = logging.getLogger(__name__)
 
+PUBMED_PROVIDER_ID = "pubmed"
+
 """
 DOCS
 https://www.ncbi.nlm.nih.gov/books/NBK25501/
@@ -22,6 +27,10 @@ https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi?db=pubmed&id=38004229&
 PUBMED_API_SEARCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
 PUBMED_API_FETCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
 # RETMAX moved to settings.py - use settings.PUBMED_MAX_RESULTS_PER_CALL
+PUBMED_MAX_URL_LENGTH = 2000
+PUBMED_REQUEST_HEADERS = {
+    'User-Agent': 'JamBot/1.0 (Research Assistant; Contact: admin@example.com)'
+}
 FILTER_TERM = "(melanocortin) OR (natriuretic) OR (Dry eye) OR (Ulcerative colitis) OR (Crohn's disease) OR (Retinopathy) OR (Retinal disease)"
 
 def _get_pubmed_max_results() -> int:
@@ -422,59 +431,73 @@ class PubMedService:
         clause = f'AND (("{start_date}"[{field}] : "{end_date}"[{field}]))'
         return clause
     
-    def _get_article_ids(
-        self,
-        search_term: str, 
-        max_results: int = 100, 
-        sort_by: str = "relevance",
-        start_date: Optional[str] = None,
-        end_date: Optional[str] = None,
-        date_type: str = "publication"
-    ) -> tuple[List[str], int]:
-        """Search PubMed for article IDs with optional date filtering."""
-        url = self.search_url
-        
-        # Build search term with optional date clause
-        if start_date and end_date:
-            full_term = f'({search_term}){self._get_date_clause(start_date, end_date, date_type)}'
-        else:
-            full_term = search_term
-        
+    def _build_search_params(self, full_term: str, max_results: int, sort_by: str = "relevance") -> Dict[str, Any]:
+        """Build esearch query parameters for a complete search term."""
         params = {
             'db': 'pubmed',
             'term': full_term,
             'retmax': min(max_results, self._get_max_results_per_call()),
             'retmode': 'json'
         }
-        
+
         # Map unified sort values to PubMed API sort values
         sort_mapping = {
             'relevance': None,  # Default, don't need to specify
             'date': 'pub_date'  # Sort by publication date
         }
-        
+
         pubmed_sort = sort_mapping.get(sort_by)
         if pubmed_sort:
             params['sort'] = pubmed_sort
-        
-        headers = {
-            'User-Agent': 'JamBot/1.0 (Research Assistant; Contact: admin@example.com)'
-        }
-        
+
         # Add NCBI API key if available
         if self.api_key:
             params['api_key'] = self.api_key
+
+        return params
+
+    def _search_url_length(self, params: Dict[str, Any]) -> int:
+        """Length of the esearch GET URL for the given parameters."""
+        return len(f"{self.search_url}?{urllib.parse.urlencode(params)}")
+
+    def search_term_fits(self, full_term: str, max_results: int) -> bool:
+        """Whether an esearch for this term stays within PubMed's URL length limit."""
+        return self._search_url_length(self._build_search_params(full_term, max_results)) <= PUBMED_MAX_URL_LENGTH
+
+    def _get_article_ids(
+        self,
+        search_term: str, 
+        max_results: int = 100, 
+        sort_by: str = "relevance",
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        date_type: str = "publication"
+    ) -> tuple[List[str], int]:
+        """Search PubMed for article IDs with optional date filtering."""
+        url = self.search_url
         
+        # Build search term with optional date clause
+        if start_date and end_date:
+            full_term = f'({search_term}){self._get_date_clause(start_date, end_date, date_type)}'
+        else:
+            full_term = search_term
+        
+        params = self._build_search_params(full_term, max_results, sort_by)
+
         logger.info(f'Retrieving article IDs for query: {search_term}')
         logger.debug(f'Parameters: {params}')
 
         # Check if the URL is too long (PubMed has a limit of about 2000-3000 characters)
-        # Build the full URL to check its length
-        from urllib.parse import urlencode
-        full_url = f"{url}?{urlencode(params)}"
-        if len(full_url) > 2000:
-            logger.error(f"URL too long ({len(full_url)} characters): Query is too complex")
-            raise ValueError(f"Search query is too long ({len(full_url)} characters). PubMed has a URL length limit. Please simplify your search by reducing the number of terms.")
+        url_length = self._search_url_length(params)
+        if url_length > PUBMED_MAX_URL_LENGTH:
+            logger.error(f"URL too long ({url_length} characters): Query is too complex")
+            raise ValueError(f"Search query is too long ({url_length} characters). PubMed has a URL length limit. Please simplify your search by reducing the number of terms.")
+
+        # Fail fast when E-utilities is known to be down
+        health = get_provider_health_service()
+        rejection = health.check(PUBMED_PROVIDER_ID)
+        if rejection:
+            raise ProviderUnavailableError(PUBMED_PROVIDER_ID, rejection)
 
         # Retry logic with exponential backoff
         max_retries = 3
@@ -482,7 +505,7 @@ class PubMedService:
 
         for attempt in range(max_retries):
             try:
-                response = requests.get(url, params, headers=headers, timeout=30)
+                response = requests.get(url, params, headers=PUBMED_REQUEST_HEADERS, timeout=30)
                 break
             except requests.exceptions.RequestException as e:
                 if attempt < max_retries - 1:
@@ -491,7 +514,14 @@ class PubMedService:
                     retry_delay *= 2
                 else:
                     logger.error(f"Request failed after {max_retries} attempts: {e}")
+                    health.record_failure(PUBMED_PROVIDER_ID, str(e))
                     raise
+
+        # Server errors count against the breaker; 4xx means a bad query, not an unhealthy provider
+        if response.status_code >= 500:
+            health.record_failure(PUBMED_PROVIDER_ID, f"HTTP {response.status_code}")
+        else:
+            health.record_success(PUBMED_PROVIDER_ID)
         
         try:
             response.raise_for_status()
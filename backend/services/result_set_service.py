@@ -0,0 +1,307 @@
+"""
+Result Set Service
+
+Server-side storage for search results so SmartSearch2 clients can refer to
+a result set by handle instead of uploading every article again for the
+filter and feature-extraction steps.
+
+Result sets are only registered when a client asks for one (or appends to
+an existing one), so plain searches don't pay for them.
+
+Result sets are held as validated CanonicalResearchArticle objects in a
+per-worker LRU cache. Sets evicted from the cache are spilled to the
+search_result_sets table and reloaded (and re-cached) on demand. When
+several gunicorn workers are running, sets are also persisted at creation
+so that a follow-up request served by another worker can resolve the handle.
+The stored row then is the source of truth: every append bumps its version
+with a compare-and-swap UPDATE (retried on conflict), and a cached copy is
+only used while its version matches the row's.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Optional
+from uuid import uuid4
+
+from fastapi import Depends
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.settings import settings
+from database import get_async_db
+from exceptions import ResultSetNotFoundError, ValidationError
+from models import SearchResultSet
+from schemas.canonical_types import CanonicalResearchArticle
+
+logger = logging.getLogger(__name__)
+
+# Compare-and-swap attempts for an append racing appends in other workers
+APPEND_ATTEMPTS = 5
+
+
+@dataclass
+class ResultSet:
+    """A registered set of search results"""
+    id: str
+    user_id: int
+    source: Optional[str]
+    query: Optional[str]
+    articles: List[CanonicalResearchArticle]
+    expires_at: float
+    persisted: bool = False
+    version: int = 0
+
+    @property
+    def is_expired(self) -> bool:
+        return self.expires_at <= time.time()
+
+    def select(self, article_ids: Optional[List[str]] = None) -> List[CanonicalResearchArticle]:
+        """
+        Return the articles in the set, optionally restricted to a subset of IDs.
+
+        Raises:
+            ValidationError: If any requested ID is not part of the set
+        """
+        if article_ids is None:
+            return list(self.articles)
+        by_id = {article.id: article for article in self.articles}
+        missing = [article_id for article_id in article_ids if article_id not in by_id]
+        if missing:
+            raise ValidationError(f"Articles not in result set {self.id}: {', '.join(missing[:10])}")
+        return [by_id[article_id] for article_id in article_ids]
+
+
+class ResultSetCache:
+    """
+    LRU cache of result sets for one worker process.
+
+    Only touched from the event loop, so no locking is needed.
+    """
+
+    def __init__(self, max_sets: int):
+        self.max_sets = max_sets
+        self._entries: "OrderedDict[str, ResultSet]" = OrderedDict()
+
+    def get(self, result_set_id: str) -> Optional[ResultSet]:
+        result_set = self._entries.get(result_set_id)
+        if result_set is None:
+            return None
+        if result_set.is_expired:
+            del self._entries[result_set_id]
+            return None
+        self._entries.move_to_end(result_set_id)
+        return result_set
+
+    def put(self, result_set: ResultSet) -> List[ResultSet]:
+        """Add or refresh a result set and return the sets evicted to make room."""
+        self._entries[result_set.id] = result_set
+        self._entries.move_to_end(result_set.id)
+        evicted = []
+        while len(self._entries) > self.max_sets:
+            _, oldest = self._entries.popitem(last=False)
+            if not oldest.is_expired:
+                evicted.append(oldest)
+        return evicted
+
+    def clear(self):
+        self._entries.clear()
+
+
+# Global per-worker cache
+result_set_cache = ResultSetCache(max_sets=settings.RESULT_SET_CACHE_MAX_SETS)
+
+
+class ResultSetService:
+    """Service for registering and resolving search result set handles"""
+
+    def __init__(self, db: AsyncSession, cache: ResultSetCache = result_set_cache):
+        self.db = db
+        self.cache = cache
+        self.persist_on_create = settings.WEB_CONCURRENCY > 1
+
+    async def create(
+        self,
+        user_id: int,
+        articles: List[CanonicalResearchArticle],
+        source: Optional[str] = None,
+        query: Optional[str] = None
+    ) -> ResultSet:
+        """Register a new result set and return it"""
+        result_set = ResultSet(
+            id=str(uuid4()),
+            user_id=user_id,
+            source=source,
+            query=query,
+            articles=list(articles),
+            expires_at=time.time() + settings.RESULT_SET_TTL_SECONDS
+        )
+        await self._cache(result_set)
+        return result_set
+
+    async def append(
+        self,
+        result_set_id: str,
+        user_id: int,
+        articles: List[CanonicalResearchArticle]
+    ) -> ResultSet:
+        """Add articles (e.g. the next search page) to an existing result set"""
+        if self.persist_on_create:
+            return await self._append_persisted(result_set_id, user_id, articles)
+
+        # Single worker: the cached set is the only live copy, and nothing awaits between read and write
+        result_set = await self.get(result_set_id, user_id)
+        result_set.articles = _merge_articles(result_set.articles, articles)
+        result_set.expires_at = time.time() + settings.RESULT_SET_TTL_SECONDS
+        result_set.version += 1
+        result_set.persisted = False
+        await self._cache(result_set)
+        return result_set
+
+    async def _append_persisted(
+        self,
+        result_set_id: str,
+        user_id: int,
+        articles: List[CanonicalResearchArticle]
+    ) -> ResultSet:
+        """Append to the stored row with a compare-and-swap on its version, so concurrent appends all land"""
+        for _ in range(APPEND_ATTEMPTS):
+            current = await self._load(result_set_id)
+            if current is None or current.user_id != user_id:
+                raise ResultSetNotFoundError(result_set_id)
+
+            merged = _merge_articles(current.articles, articles)
+            expires_at = time.time() + settings.RESULT_SET_TTL_SECONDS
+            result = await self.db.execute(
+                update(SearchResultSet)
+                .where(SearchResultSet.id == result_set_id, SearchResultSet.version == current.version)
+                .values(
+                    articles=[article.model_dump(mode="json") for article in merged],
+                    article_count=len(merged),
+                    expires_at=datetime.utcfromtimestamp(expires_at),
+                    version=current.version + 1
+                )
+            )
+            if result.rowcount == 1:
+                await self.db.commit()
+                current.articles = merged
+                current.expires_at = expires_at
+                current.version += 1
+                await self._cache(current)
+                return current
+            # Another worker appended in between: start over from its version
+            await self.db.rollback()
+        raise ValidationError(f"Result set {result_set_id} is being updated concurrently, try again")
+
+    async def get(self, result_set_id: str, user_id: int) -> ResultSet:
+        """
+        Resolve a result set handle for a user.
+
+        Raises:
+            ResultSetNotFoundError: If the handle is unknown, expired or owned by another user
+        """
+        result_set = self.cache.get(result_set_id)
+        if result_set is not None and self.persist_on_create and not await self._is_current(result_set):
+            result_set = None
+        if result_set is None:
+            result_set = await self._load(result_set_id)
+            if result_set is not None:
+                # Another request may have cached the set while this one was loading it
+                cached = self.cache.get(result_set_id)
+                if cached is not None and cached.version >= result_set.version:
+                    result_set = cached
+                else:
+                    await self._cache(result_set)
+        if result_set is None or result_set.user_id != user_id:
+            raise ResultSetNotFoundError(result_set_id)
+        return result_set
+
+    async def _is_current(self, result_set: ResultSet) -> bool:
+        """Whether a cached set still matches the stored row (another worker may have appended)"""
+        if not result_set.persisted:
+            return True
+        stored_version = await self.db.scalar(
+            select(SearchResultSet.version).where(SearchResultSet.id == result_set.id)
+        )
+        return stored_version is None or stored_version == result_set.version
+
+    async def get_articles(
+        self,
+        result_set_id: str,
+        user_id: int,
+        article_ids: Optional[List[str]] = None
+    ) -> List[CanonicalResearchArticle]:
+        """Resolve a handle to its articles, optionally restricted to a subset of IDs"""
+        result_set = await self.get(result_set_id, user_id)
+        return result_set.select(article_ids)
+
+    async def _cache(self, result_set: ResultSet):
+        evicted = self.cache.put(result_set)
+        to_persist = [rs for rs in evicted if not rs.persisted]
+        if self.persist_on_create and not result_set.persisted:
+            to_persist.append(result_set)
+        if to_persist:
+            await self._persist(to_persist)
+
+    async def _persist(self, result_sets: List[ResultSet]):
+        """Write result sets to the database, replacing earlier copies"""
+        try:
+            for result_set in result_sets:
+                await self.db.merge(SearchResultSet(
+                    id=result_set.id,
+                    user_id=result_set.user_id,
+                    source=result_set.source,
+                    query=result_set.query,
+                    articles=[article.model_dump(mode="json") for article in result_set.articles],
+                    article_count=len(result_set.articles),
+                    version=result_set.version,
+                    expires_at=datetime.utcfromtimestamp(result_set.expires_at)
+                ))
+            # Piggyback cleanup of expired sets on spills
+            await self.db.execute(
+                delete(SearchResultSet).where(SearchResultSet.expires_at < datetime.utcnow())
+            )
+            await self.db.commit()
+            for result_set in result_sets:
+                result_set.persisted = True
+            logger.debug(f"Persisted {len(result_sets)} result set(s)")
+        except Exception as e:
+            await self.db.rollback()
+            # Sets still in memory stay usable; evicted ones are lost
+            logger.error(f"Failed to persist result sets: {e}", exc_info=True)
+
+    async def _load(self, result_set_id: str) -> Optional[ResultSet]:
+        row = await self.db.scalar(
+            select(SearchResultSet).where(
+                SearchResultSet.id == result_set_id,
+                SearchResultSet.expires_at > datetime.utcnow()
+            ).execution_options(populate_existing=True)
+        )
+        if row is None:
+            return None
+        return ResultSet(
+            id=row.id,
+            user_id=row.user_id,
+            source=row.source,
+            query=row.query,
+            articles=[CanonicalResearchArticle.model_validate(article) for article in row.articles or []],
+            expires_at=(row.expires_at - datetime(1970, 1, 1)) / timedelta(seconds=1),
+            persisted=True,
+            version=row.version or 0
+        )
+
+
+def _merge_articles(
+    existing: List[CanonicalResearchArticle],
+    new: List[CanonicalResearchArticle]
+) -> List[CanonicalResearchArticle]:
+    """existing followed by the new articles it doesn't contain yet"""
+    known_ids = {article.id for article in existing}
+    return list(existing) + [article for article in new if article.id not in known_ids]
+
+
+async def get_result_set_service(db: AsyncSession = Depends(get_async_db)) -> ResultSetService:
+    """Get ResultSetService instance for dependency injection"""
+    return ResultSetService(db)
@@ -10,6 +10,7 @@ from services.search_providers.base import (
     UnifiedSearchParams,
     SearchResponse,
     SearchMetadata,
+    MergedSearchResponse,
     ProviderInfo
 )
 
@@ -20,6 +21,12 @@ from services.search_providers.registry import (
     register_provider
 )
 
+from services.search_providers.fanout import (
+    fan_out_search,
+    merged_search,
+    merge_articles
+)
+
 from services.search_providers.pubmed_adapter import PubMedAdapter
 from services.search_providers.scholar_adapter import GoogleScholarAdapter
 
@@ -29,6 +36,7 @@ __all__ = [
     "UnifiedSearchParams",
     "SearchResponse",
     "SearchMetadata",
+    "MergedSearchResponse",
     "ProviderInfo",
     
     # Registry functions
@@ -37,6 +45,11 @@ __all__ = [
     "get_available_providers",
     "register_provider",
     
+    # Multi-provider search
+    "fan_out_search",
+    "merged_search",
+    "merge_articles",
+    
     # Provider implementations
     "PubMedAdapter",
     "GoogleScholarAdapter"
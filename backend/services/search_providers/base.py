@@ -63,6 +63,15 @@ class SearchResponse(BaseModel):
     error: Optional[str] = Field(default=None, description="Error message if search failed")
 
 
+class MergedSearchResponse(BaseModel):
+    """Articles from several providers merged into a single deduplicated list."""
+    articles: List[CanonicalResearchArticle] = Field(..., description="Deduplicated articles across all providers")
+    provider_results: List[SearchMetadata] = Field(..., description="Search metadata for each provider queried")
+    provider_errors: Dict[str, str] = Field(default_factory=dict, description="Error messages keyed by provider ID")
+    duplicates_removed: int = Field(default=0, description="Number of duplicate articles merged away")
+    search_time: float = Field(..., description="Wall-clock time for the whole fan-out (seconds)")
+
+
 class ProviderInfo(BaseModel):
     """Information about a search provider."""
     id: str = Field(..., description="Unique provider identifier")
@@ -118,6 +127,31 @@ class SearchProvider(ABC):
         """
         pass
     
+    async def probe_health(self) -> "ProbeResult":
+        """
+        Check the provider's health without blocking the event loop.
+        
+        Called by the shared provider health service; override this in
+        providers that can also report remaining quota.
+        
+        Returns:
+            ProbeResult with availability and, if known, remaining quota
+        """
+        from services.search_providers.health import ProbeResult
+        return ProbeResult(available=await self.is_available())
+    
+    def cached_availability(self) -> Optional[bool]:
+        """
+        Get the last known availability without probing the provider.
+        
+        Override this in providers that cache their health checks so callers
+        can make routing decisions without paying for a probe.
+        
+        Returns:
+            Cached availability, or None if unknown or expired
+        """
+        return None
+    
     async def validate_params(self, params: UnifiedSearchParams) -> UnifiedSearchParams:
         """
         Validate and adjust parameters for this provider.
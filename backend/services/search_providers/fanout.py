@@ -0,0 +1,238 @@
+"""
+Search Provider Fan-out
+
+Runs a search against several providers concurrently, each under its own
+deadline, and merges the results into a single deduplicated article list.
+
+Availability probes never sit on the request path: a provider whose cached
+health is known-bad is skipped immediately, and stale health entries are
+refreshed by a background task while the search itself proceeds.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from config.timeout_settings import get_timeout_for_operation
+from schemas.canonical_types import CanonicalResearchArticle
+from services.search_providers.base import (
+    SearchProvider, UnifiedSearchParams, SearchResponse,
+    SearchMetadata, MergedSearchResponse
+)
+from services.search_providers.registry import get_provider
+
+logger = logging.getLogger(__name__)
+
+# In-flight background availability probes, keyed by provider ID
+_probe_tasks: Dict[str, asyncio.Task] = {}
+
+# Fields copied from a duplicate into the kept article when the kept one lacks them
+_MERGEABLE_FIELDS = (
+    "abstract", "doi", "pmid", "pdf_url", "citation_count", "cited_by_url",
+    "journal", "publication_year", "publication_date", "url"
+)
+
+
+def get_provider_timeout(provider_id: str) -> float:
+    """Get the per-provider search deadline in seconds."""
+    return float(get_timeout_for_operation(f"{provider_id}_search"))
+
+
+def schedule_availability_probe(provider: SearchProvider) -> None:
+    """
+    Refresh a provider's availability in the background.
+
+    At most one probe per provider is in flight at a time; the result lands
+    in the provider's own availability cache.
+    """
+    provider_id = provider.provider_id
+    existing = _probe_tasks.get(provider_id)
+    if existing and not existing.done():
+        return
+
+    async def _probe():
+        try:
+            await provider.is_available()
+        except Exception as e:
+            logger.warning(f"Background availability probe failed for {provider_id}: {e}")
+        finally:
+            _probe_tasks.pop(provider_id, None)
+
+    _probe_tasks[provider_id] = asyncio.create_task(_probe())
+
+
+def _error_response(provider_id: str, error: str, search_time: float = 0.0) -> SearchResponse:
+    """Build a failed SearchResponse for a single provider."""
+    return SearchResponse(
+        articles=[],
+        metadata=SearchMetadata(
+            total_results=0,
+            returned_results=0,
+            search_time=search_time,
+            provider=provider_id
+        ),
+        success=False,
+        error=error
+    )
+
+
+async def _search_with_deadline(
+    provider_id: str,
+    params: UnifiedSearchParams,
+    timeout: Optional[float]
+) -> SearchResponse:
+    """Search a single provider, converting every failure into an error response."""
+    provider = get_provider(provider_id)
+    if not provider:
+        return _error_response(provider_id, f"Unknown provider: {provider_id}")
+
+    # Shared health state lives in SQLite; keep its lock waits off the event loop
+    cached = await asyncio.to_thread(provider.cached_availability)
+    if cached is False:
+        logger.warning(f"Provider {provider_id} is unavailable (cached)")
+        return _error_response(provider_id, f"Provider {provider_id} is currently unavailable")
+    if cached is None:
+        schedule_availability_probe(provider)
+
+    deadline = timeout if timeout is not None else get_provider_timeout(provider_id)
+    start_time = time.monotonic()
+    try:
+        # Each provider gets its own copy since validate_params mutates in place
+        return await asyncio.wait_for(provider.search(params.model_copy()), timeout=deadline)
+    except asyncio.TimeoutError:
+        elapsed = time.monotonic() - start_time
+        logger.warning(f"Provider {provider_id} exceeded its {deadline:.1f}s deadline")
+        return _error_response(provider_id, f"Provider {provider_id} timed out after {deadline:.1f}s", elapsed)
+    except Exception as e:
+        elapsed = time.monotonic() - start_time
+        logger.error(f"Error searching {provider_id}: {e}")
+        return _error_response(provider_id, str(e), elapsed)
+
+
+async def fan_out_search(
+    provider_ids: List[str],
+    params: UnifiedSearchParams,
+    timeout: Optional[float] = None
+) -> List[SearchResponse]:
+    """
+    Search several providers concurrently.
+
+    Every provider runs under its own deadline. A provider that fails or
+    times out contributes an error response instead of failing the batch,
+    so callers always get partial results from the providers that answered.
+
+    Args:
+        provider_ids: Providers to query (duplicates are ignored)
+        params: Search parameters shared by all providers
+        timeout: Deadline in seconds applied to every provider; defaults to
+            the per-provider value from timeout settings
+
+    Returns:
+        One SearchResponse per provider, in the order requested
+    """
+    unique_ids = list(dict.fromkeys(provider_ids))
+    return list(await asyncio.gather(
+        *(_search_with_deadline(provider_id, params, timeout) for provider_id in unique_ids)
+    ))
+
+
+def _normalize_doi(doi: Optional[str]) -> Optional[str]:
+    if not doi:
+        return None
+    doi = doi.strip().lower()
+    for prefix in ("https://doi.org/", "http://doi.org/", "https://dx.doi.org/", "http://dx.doi.org/", "doi:"):
+        if doi.startswith(prefix):
+            doi = doi[len(prefix):]
+    return doi or None
+
+
+def _article_pmid(article: CanonicalResearchArticle) -> Optional[str]:
+    if article.pmid:
+        return str(article.pmid).strip()
+    if article.id and article.id.startswith("pubmed_"):
+        return article.id[len("pubmed_"):]
+    return None
+
+
+def _dedup_keys(article: CanonicalResearchArticle) -> List[str]:
+    keys = []
+    doi = _normalize_doi(article.doi)
+    if doi:
+        keys.append(f"doi:{doi}")
+    pmid = _article_pmid(article)
+    if pmid:
+        keys.append(f"pmid:{pmid}")
+    return keys
+
+
+def merge_articles(
+    responses: List[SearchResponse]
+) -> Tuple[List[CanonicalResearchArticle], int]:
+    """
+    Merge articles from several responses, deduplicating by DOI and PMID.
+
+    The first occurrence of an article wins its position; missing fields on
+    it are filled in from later duplicates. Articles without a DOI or PMID
+    are always kept.
+
+    Returns:
+        Tuple of (merged articles, number of duplicates removed)
+    """
+    merged: List[CanonicalResearchArticle] = []
+    index_by_key: Dict[str, int] = {}
+    duplicates = 0
+
+    for response in responses:
+        for article in response.articles:
+            keys = _dedup_keys(article)
+            existing_index = next((index_by_key[k] for k in keys if k in index_by_key), None)
+
+            if existing_index is None:
+                merged.append(article)
+                existing_index = len(merged) - 1
+            else:
+                duplicates += 1
+                kept = merged[existing_index]
+                updates = {
+                    field: getattr(article, field)
+                    for field in _MERGEABLE_FIELDS
+                    if getattr(kept, field) in (None, "") and getattr(article, field) not in (None, "")
+                }
+                if updates:
+                    merged[existing_index] = kept.model_copy(update=updates)
+
+            # Register every key so a DOI-only match can later be found by PMID too
+            for key in _dedup_keys(merged[existing_index]):
+                index_by_key.setdefault(key, existing_index)
+
+    return merged, duplicates
+
+
+async def merged_search(
+    provider_ids: List[str],
+    params: UnifiedSearchParams,
+    timeout: Optional[float] = None
+) -> MergedSearchResponse:
+    """
+    Fan out a search and merge the results into one deduplicated list.
+
+    Args:
+        provider_ids: Providers to query
+        params: Search parameters shared by all providers
+        timeout: Optional per-provider deadline override in seconds
+
+    Returns:
+        MergedSearchResponse with articles, per-provider metadata and errors
+    """
+    start_time = time.monotonic()
+    responses = await fan_out_search(provider_ids, params, timeout)
+    articles, duplicates = merge_articles([r for r in responses if r.success])
+
+    return MergedSearchResponse(
+        articles=articles,
+        provider_results=[r.metadata for r in responses],
+        provider_errors={r.metadata.provider: r.error or "Unknown error" for r in responses if not r.success},
+        duplicates_removed=duplicates,
+        search_time=time.monotonic() - start_time
+    )
@@ -0,0 +1,453 @@
+"""
+Search Provider Health
+
+Availability, circuit breaker and quota state for search providers, shared by
+every worker process on the host through a small SQLite file
+(PROVIDER_HEALTH_DB_PATH), so one worker's probe or tripped breaker is
+immediately visible to the others.
+
+Store reads and writes are short SQLite transactions (see utils.sqlite_store)
+that can wait on another worker's write lock; async callers run them with
+asyncio.to_thread. Once the
+background sync is running (run_background_sync, started with the probes),
+the per-call path stays in memory: the gate reads a snapshot of each record
+that the sync refreshes every PROVIDER_HEALTH_SYNC_SECONDS, and call outcomes
+are counted locally and written in one transaction per sync. Only breaker
+transitions (claiming or settling the half-open trial) go to the store
+directly. Without the sync every call reads and writes the store.
+
+Three things decide whether a provider may be called:
+
+- Probes: a background task (one per process, coordinated through a lease row
+  so only one worker probes each provider per interval) asks each provider
+  for its health without blocking the event loop. Results older than
+  PROVIDER_HEALTH_TTL_SECONDS count as unknown.
+- Circuit breaker: every real call reports success or failure. When at least
+  PROVIDER_BREAKER_MIN_REQUESTS calls in the current window fail at
+  PROVIDER_BREAKER_FAILURE_RATE or more, the breaker opens and calls fail
+  fast. After PROVIDER_BREAKER_COOLDOWN_SECONDS one trial call is let through
+  (half-open); its outcome closes or re-opens the breaker.
+- Quota: providers that bill per search (SerpAPI) report their remaining
+  searches; at or below SERPAPI_QUOTA_RESERVE the provider is treated as
+  exhausted until a probe reports fresh quota.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
+from threading import Lock
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Tuple
+
+from config.settings import settings
+from utils.sqlite_store import SQLiteStore
+
+if TYPE_CHECKING:
+    from services.search_providers.base import SearchProvider
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS provider_health (
+    provider_id TEXT PRIMARY KEY,
+    available INTEGER,
+    checked_at REAL NOT NULL DEFAULT 0,
+    breaker_state TEXT NOT NULL DEFAULT 'closed',
+    opened_at REAL NOT NULL DEFAULT 0,
+    window_started_at REAL NOT NULL DEFAULT 0,
+    window_requests INTEGER NOT NULL DEFAULT 0,
+    window_failures INTEGER NOT NULL DEFAULT 0,
+    quota_remaining INTEGER,
+    quota_checked_at REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    probe_lease_until REAL NOT NULL DEFAULT 0
+)
+"""
+
+
+@dataclass
+class ProviderHealth:
+    """Shared health record for one provider"""
+    provider_id: str
+    available: Optional[bool] = None
+    checked_at: float = 0.0
+    breaker_state: str = CLOSED
+    opened_at: float = 0.0
+    window_started_at: float = 0.0
+    window_requests: int = 0
+    window_failures: int = 0
+    quota_remaining: Optional[int] = None
+    quota_checked_at: float = 0.0
+    last_error: Optional[str] = None
+    probe_lease_until: float = 0.0
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of a provider health probe"""
+    available: bool
+    quota_remaining: Optional[int] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class _PendingOutcomes:
+    """Call outcomes counted in memory until the next sync writes them"""
+    requests: int = 0
+    failures: int = 0
+    last_error: Optional[str] = None
+    quota_used: int = 0
+
+
+_COLUMNS = [f.name for f in fields(ProviderHealth)]
+
+
+class ProviderHealthStore(SQLiteStore):
+    """ProviderHealth records, one row per provider"""
+
+    def __init__(self, path: str):
+        super().__init__(path, [_SCHEMA])
+
+    @staticmethod
+    def _from_row(row) -> ProviderHealth:
+        health = ProviderHealth(**dict(zip(_COLUMNS, row)))
+        if health.available is not None:
+            health.available = bool(health.available)
+        return health
+
+    def get(self, provider_id: str) -> ProviderHealth:
+        with self.connect() as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM provider_health WHERE provider_id = ?", (provider_id,)
+            ).fetchone()
+        return self._from_row(row) if row else ProviderHealth(provider_id=provider_id)
+
+    @contextmanager
+    def update(self, provider_id: str) -> Iterator[ProviderHealth]:
+        """Read-modify-write a record under an exclusive write lock"""
+        with self.transaction() as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM provider_health WHERE provider_id = ?", (provider_id,)
+            ).fetchone()
+            health = self._from_row(row) if row else ProviderHealth(provider_id=provider_id)
+            yield health
+            values = [getattr(health, column) for column in _COLUMNS]
+            conn.execute(
+                f"INSERT OR REPLACE INTO provider_health ({', '.join(_COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in _COLUMNS)})",
+                values
+            )
+
+
+class ProviderHealthService:
+    """Shared availability checks, circuit breakers and quota tracking for search providers"""
+
+    def __init__(self, store: ProviderHealthStore, clock: Callable[[], float] = time.time):
+        self.store = store
+        self.clock = clock
+        self.syncing = False  # Set while run_background_sync runs
+        self.sync_interval = settings.PROVIDER_HEALTH_SYNC_SECONDS
+        self._lock = Lock()
+        # provider_id -> (record, time.monotonic() when read)
+        self._snapshots: Dict[str, Tuple[ProviderHealth, float]] = {}
+        self._pending: Dict[str, _PendingOutcomes] = {}
+
+    # --- Local state ------------------------------------------------------
+
+    def _read(self, provider_id: str) -> ProviderHealth:
+        """The record from the in-memory snapshot while syncing, otherwise from the store"""
+        if self.syncing:
+            with self._lock:
+                snapshot = self._snapshots.get(provider_id)
+            # Fall back to the store if the sync has stalled
+            if snapshot and time.monotonic() - snapshot[1] < 3 * self.sync_interval:
+                return snapshot[0]
+        health = self.store.get(provider_id)
+        self._remember(health)
+        return health
+
+    def _remember(self, health: ProviderHealth):
+        if self.syncing:
+            with self._lock:
+                self._snapshots[health.provider_id] = (health, time.monotonic())
+
+    def _defer(self, provider_id: str, requests: int = 0, failures: int = 0,
+               error: Optional[str] = None, quota_used: int = 0) -> bool:
+        """
+        Count an outcome in memory instead of writing it now. Only done while the
+        breaker is closed; outcomes that can close or re-open it are written at once.
+
+        Returns:
+            True if the outcome was deferred to the next sync
+        """
+        if not self.syncing:
+            return False
+        with self._lock:
+            snapshot = self._snapshots.get(provider_id)
+            if snapshot is None or snapshot[0].breaker_state != CLOSED:
+                return False
+            pending = self._pending.setdefault(provider_id, _PendingOutcomes())
+            pending.requests += requests
+            pending.failures += failures
+            pending.last_error = error[:500] if error else pending.last_error
+            pending.quota_used += quota_used
+        return True
+
+    def sync(self):
+        """Write the deferred outcomes and refresh the snapshots (blocking; run in a worker thread)"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            provider_ids = set(self._snapshots) | set(pending)
+        for provider_id in provider_ids:
+            outcomes = pending.get(provider_id)
+            if outcomes is None:
+                self._remember(self.store.get(provider_id))
+                continue
+            now = self.clock()
+            with self.store.update(provider_id) as health:
+                if outcomes.requests:
+                    self._roll_window(health, now)
+                    health.window_requests += outcomes.requests
+                    health.window_failures += outcomes.failures
+                    if outcomes.last_error:
+                        health.last_error = outcomes.last_error
+                    self._maybe_open(health, now)
+                if outcomes.quota_used and health.quota_remaining is not None:
+                    health.quota_remaining = max(0, health.quota_remaining - outcomes.quota_used)
+            self._remember(health)
+
+    async def run_background_sync(self, interval: Optional[float] = None):
+        """Keep the in-memory state in step with the shared store forever"""
+        self.sync_interval = interval or settings.PROVIDER_HEALTH_SYNC_SECONDS
+        self.syncing = True
+        try:
+            while True:
+                await asyncio.sleep(self.sync_interval)
+                try:
+                    await asyncio.to_thread(self.sync)
+                except Exception as e:
+                    logger.warning(f"Provider health sync failed: {e}")
+        finally:
+            self.syncing = False
+            # Don't lose outcomes counted since the last sync
+            await asyncio.to_thread(self.sync)
+
+    # --- Gate -------------------------------------------------------------
+
+    def check(self, provider_id: str) -> Optional[str]:
+        """
+        Decide whether a call to the provider may go ahead.
+
+        Claims the half-open trial slot when the breaker's cooldown is over.
+
+        Returns:
+            None if the call may proceed, otherwise the reason to fail fast
+        """
+        now = self.clock()
+        health = self._read(provider_id)
+        reason = self._static_rejection(health, now)
+        if reason:
+            return reason
+        if health.breaker_state == CLOSED:
+            return None
+
+        with self.store.update(provider_id) as health:
+            reason = self._claim_trial(health, now)
+        self._remember(health)
+        return reason
+
+    def _claim_trial(self, health: ProviderHealth, now: float) -> Optional[str]:
+        if health.breaker_state == CLOSED:
+            return None
+        if now - health.opened_at < settings.PROVIDER_BREAKER_COOLDOWN_SECONDS:
+            if health.breaker_state == HALF_OPEN:
+                return "circuit half-open, trial request in flight"
+            return f"circuit open after repeated failures ({health.last_error or 'unknown error'})"
+        # Cooldown over: this caller makes the single trial request
+        health.breaker_state = HALF_OPEN
+        health.opened_at = now
+        logger.info(f"Provider {health.provider_id} circuit half-open, allowing a trial request")
+        return None
+
+    def _static_rejection(self, health: ProviderHealth, now: float) -> Optional[str]:
+        if health.available is False and now - health.checked_at < settings.PROVIDER_HEALTH_TTL_SECONDS:
+            return f"health probe failed ({health.last_error or 'unavailable'})"
+        if health.quota_remaining is not None and health.quota_remaining <= settings.SERPAPI_QUOTA_RESERVE:
+            return "search quota exhausted"
+        return None
+
+    def cached_availability(self, provider_id: str) -> Optional[bool]:
+        """
+        Last known availability without probing or claiming a trial slot.
+
+        Returns:
+            False if the provider should be skipped, True if a fresh probe
+            found it healthy, None if unknown or stale
+        """
+        now = self.clock()
+        health = self._read(provider_id)
+        if self._static_rejection(health, now):
+            return False
+        if health.breaker_state == OPEN and now - health.opened_at < settings.PROVIDER_BREAKER_COOLDOWN_SECONDS:
+            return False
+        if health.available is None or now - health.checked_at >= settings.PROVIDER_HEALTH_TTL_SECONDS:
+            return None
+        return True
+
+    def get_status(self, provider_id: str) -> ProviderHealth:
+        return self.store.get(provider_id)
+
+    # --- Outcomes ---------------------------------------------------------
+
+    def record_success(self, provider_id: str):
+        if self._defer(provider_id, requests=1):
+            return
+        now = self.clock()
+        with self.store.update(provider_id) as health:
+            self._roll_window(health, now)
+            health.window_requests += 1
+            if health.breaker_state != CLOSED:
+                logger.info(f"Provider {provider_id} circuit closed after a successful trial request")
+                self._close(health, now)
+        self._remember(health)
+
+    def record_failure(self, provider_id: str, error: str):
+        if self._defer(provider_id, requests=1, failures=1, error=error):
+            return
+        now = self.clock()
+        with self.store.update(provider_id) as health:
+            self._roll_window(health, now)
+            health.window_requests += 1
+            health.window_failures += 1
+            health.last_error = error[:500]
+
+            if health.breaker_state == HALF_OPEN:
+                health.breaker_state = OPEN
+                health.opened_at = now
+                logger.warning(f"Provider {provider_id} trial request failed, circuit re-opened: {error}")
+            else:
+                self._maybe_open(health, now)
+        self._remember(health)
+
+    def record_quota(self, provider_id: str, remaining: int):
+        with self.store.update(provider_id) as health:
+            health.quota_remaining = remaining
+            health.quota_checked_at = self.clock()
+        self._remember(health)
+
+    def consume_quota(self, provider_id: str, searches: int = 1):
+        """Count searches against the last reported quota until the next probe refreshes it"""
+        if self._defer(provider_id, quota_used=searches):
+            return
+        with self.store.update(provider_id) as health:
+            if health.quota_remaining is not None:
+                health.quota_remaining = max(0, health.quota_remaining - searches)
+        self._remember(health)
+
+    def record_probe(self, provider_id: str, result: ProbeResult):
+        now = self.clock()
+        with self.store.update(provider_id) as health:
+            health.available = result.available
+            health.checked_at = now
+            if result.error:
+                health.last_error = result.error[:500]
+            if result.quota_remaining is not None:
+                health.quota_remaining = result.quota_remaining
+                health.quota_checked_at = now
+        self._remember(health)
+
+    @staticmethod
+    def _maybe_open(health: ProviderHealth, now: float):
+        """Open a closed breaker once the window's failure rate is too high"""
+        if (health.breaker_state == CLOSED
+                and health.window_requests >= settings.PROVIDER_BREAKER_MIN_REQUESTS
+                and health.window_failures / health.window_requests >= settings.PROVIDER_BREAKER_FAILURE_RATE):
+            health.breaker_state = OPEN
+            health.opened_at = now
+            logger.warning(
+                f"Provider {health.provider_id} circuit opened: {health.window_failures}/{health.window_requests} "
+                f"calls failed in the last {settings.PROVIDER_BREAKER_WINDOW_SECONDS}s"
+            )
+
+    @staticmethod
+    def _roll_window(health: ProviderHealth, now: float):
+        if now - health.window_started_at >= settings.PROVIDER_BREAKER_WINDOW_SECONDS:
+            health.window_started_at = now
+            health.window_requests = 0
+            health.window_failures = 0
+
+    @staticmethod
+    def _close(health: ProviderHealth, now: float):
+        health.breaker_state = CLOSED
+        health.opened_at = 0.0
+        health.window_started_at = now
+        health.window_requests = 0
+        health.window_failures = 0
+
+    # --- Probes -----------------------------------------------------------
+
+    def try_acquire_probe_lease(self, provider_id: str, lease_seconds: float) -> bool:
+        """Claim the right to probe a provider; at most one worker holds it per lease period"""
+        now = self.clock()
+        with self.store.update(provider_id) as health:
+            if health.probe_lease_until > now:
+                return False
+            health.probe_lease_until = now + lease_seconds
+            return True
+
+    async def probe(self, provider: "SearchProvider") -> ProbeResult:
+        """Probe a provider now and store the result"""
+        try:
+            result = await provider.probe_health()
+        except Exception as e:
+            result = ProbeResult(available=False, error=str(e))
+        await asyncio.to_thread(self.record_probe, provider.provider_id, result)
+        if not result.available:
+            logger.warning(f"Provider {provider.provider_id} health probe failed: {result.error}")
+        return result
+
+    async def is_available(self, provider: "SearchProvider") -> bool:
+        """Availability from shared state, probing only when it is unknown or stale"""
+        cached = await asyncio.to_thread(self.cached_availability, provider.provider_id)
+        if cached is not None:
+            return cached
+        return (await self.probe(provider)).available
+
+    async def run_background_probes(self, providers: List["SearchProvider"], interval: Optional[float] = None):
+        """Probe providers forever; every worker runs this, the lease keeps it to one probe per interval"""
+        interval = interval or settings.PROVIDER_HEALTH_PROBE_INTERVAL_SECONDS
+        while True:
+            for provider in providers:
+                try:
+                    if await asyncio.to_thread(self.try_acquire_probe_lease, provider.provider_id, interval):
+                        await self.probe(provider)
+                except Exception as e:
+                    logger.warning(f"Background probe of {provider.provider_id} failed: {e}")
+            await asyncio.sleep(interval)
+
+
+_health_service: Optional[ProviderHealthService] = None
+
+
+def get_provider_health_service() -> ProviderHealthService:
+    """Process-wide health service backed by PROVIDER_HEALTH_DB_PATH"""
+    global _health_service
+    if _health_service is None:
+        _health_service = ProviderHealthService(ProviderHealthStore(settings.PROVIDER_HEALTH_DB_PATH))
+    return _health_service
+
+
+def start_provider_health_probes(provider_ids: List[str]) -> List[asyncio.Task]:
+    """Start the background probe and sync loops for the given providers (call from app startup)"""
+    from services.search_providers.registry import get_provider
+    providers = [p for p in (get_provider(provider_id) for provider_id in provider_ids) if p]
+    service = get_provider_health_service()
+    return [
+        asyncio.create_task(service.run_background_probes(providers), name="provider-health-probes"),
+        asyncio.create_task(service.run_background_sync(), name="provider-health-sync")
+    ]
@@ -4,15 +4,17 @@ PubMed Search Provider Adapter
 Implements the SearchProvider interface for PubMed searches.
 """
 
+import asyncio
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-import requests
+import httpx
 
 from services.search_providers.base import (
     SearchProvider, UnifiedSearchParams, SearchResponse, 
     SearchMetadata, ProviderInfo
 )
+from services.search_providers.health import ProbeResult, get_provider_health_service
 
 logger = logging.getLogger(__name__)
 
@@ -22,9 +24,6 @@ class PubMedAdapter(SearchProvider):
     
     def __init__(self):
         self._base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
-        self._last_availability_check = None
-        self._is_available_cache = None
-        self._cache_duration = 300  # 5 minutes
     
     @property
     def provider_id(self) -> str:
@@ -86,7 +85,8 @@ class PubMedAdapter(SearchProvider):
             
             # Call the unified PubMed service
             from services.pubmed_service import search_articles
-            articles, service_metadata = search_articles(
+            articles, service_metadata = await asyncio.to_thread(
+                search_articles,
                 query=params.query,
                 max_results=params.num_results,
                 offset=offset,
@@ -151,42 +151,29 @@ class PubMedAdapter(SearchProvider):
                 error=str(e)
             )
     
+    async def probe_health(self) -> ProbeResult:
+        """Fetch a known summary from E-utilities"""
+        async with httpx.AsyncClient(timeout=5) as client:
+            response = await client.get(f"{self._base_url}esummary.fcgi", params={"db": "pubmed", "id": "1"})
+        if response.status_code != 200:
+            return ProbeResult(available=False, error=f"HTTP {response.status_code}")
+        return ProbeResult(available=True)
+    
     async def is_available(self) -> bool:
         """
         Check if PubMed API is available.
         
+        Uses the health state shared by all workers and only probes when it
+        is unknown or stale.
+        
         Returns:
             True if PubMed is accessible, False otherwise
         """
-        # Use cached result if recent
-        if self._last_availability_check:
-            time_since_check = (datetime.utcnow() - self._last_availability_check).total_seconds()
-            if time_since_check < self._cache_duration and self._is_available_cache is not None:
-                return self._is_available_cache
-        
-        try:
-            # Simple health check - search for a known PMID
-            response = requests.get(
-                f"{self._base_url}esummary.fcgi",
-                params={"db": "pubmed", "id": "1"},
-                timeout=5
-            )
-            
-            is_available = response.status_code == 200
-            
-            # Cache the result
-            self._is_available_cache = is_available
-            self._last_availability_check = datetime.utcnow()
-            
-            return is_available
-            
-        except Exception as e:
-            print("ERROR")
-            print(e)
-            logger.warning(f"PubMed availability check failed: {e}")
-            self._is_available_cache = False
-            self._last_availability_check = datetime.utcnow()
-            return False
+        return await get_provider_health_service().is_available(self)
+    
+    def cached_availability(self) -> Optional[bool]:
+        """Return the shared availability if it is still fresh, without probing."""
+        return get_provider_health_service().cached_availability(self.provider_id)
     
     async def validate_params(self, params: UnifiedSearchParams) -> UnifiedSearchParams:
         """
@@ -4,6 +4,7 @@ Search Provider Registry
 Manages registration and retrieval of search providers.
 """
 
+import asyncio
 import logging
 from typing import Dict, List, Optional, Type
 from threading import Lock
@@ -93,23 +94,26 @@ class SearchProviderRegistry:
         """
         Get list of currently available providers.
         
-        This checks each provider's availability.
+        This checks each provider's availability concurrently.
         
         Returns:
             List of available provider identifiers
         """
-        available = []
+        provider_ids = self.list_providers()
         
-        for provider_id in self.list_providers():
+        async def _check(provider_id: str) -> bool:
             provider = self.get_provider(provider_id)
-            if provider:
-                try:
-                    if await provider.is_available():
-                        available.append(provider_id)
-                except Exception as e:
-                    logger.warning(f"Error checking availability for {provider_id}: {e}")
+            if not provider:
+                return False
+            try:
+                return await provider.is_available()
+            except Exception as e:
+                logger.warning(f"Error checking availability for {provider_id}: {e}")
+                return False
         
-        return available
+        # Probe all providers concurrently
+        results = await asyncio.gather(*(_check(provider_id) for provider_id in provider_ids))
+        return [provider_id for provider_id, ok in zip(provider_ids, results) if ok]
     
     def clear_cache(self):
         """Clear all cached provider instances."""
@@ -8,24 +8,25 @@ import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
+import httpx
+
+from config.settings import settings
 # Converter no longer needed - GoogleScholarService returns CanonicalResearchArticle directly
 
 from services.search_providers.base import (
     SearchProvider, UnifiedSearchParams, SearchResponse, 
     SearchMetadata, ProviderInfo
 )
+from services.search_providers.health import ProbeResult, get_provider_health_service
 
 logger = logging.getLogger(__name__)
 
+SERPAPI_ACCOUNT_URL = "https://serpapi.com/account.json"
+
 
 class GoogleScholarAdapter(SearchProvider):
     """Google Scholar search provider implementation."""
     
-    def __init__(self):
-        self._last_availability_check = None
-        self._is_available_cache = None
-        self._cache_duration = 300  # 5 minutes
-    
     @property
     def provider_id(self) -> str:
         return "scholar"
@@ -77,7 +78,7 @@ class GoogleScholarAdapter(SearchProvider):
             start_index = params.offset or 0
             
             # Perform the search using the service directly
-            articles, search_metadata = service.search_articles(
+            articles, search_metadata = await service.search_articles_async(
                 query=params.query,
                 num_results=params.num_results,
                 year_low=params.year_low,
@@ -156,38 +157,37 @@ class GoogleScholarAdapter(SearchProvider):
                 error=str(e)
             )
     
+    async def probe_health(self) -> ProbeResult:
+        """
+        Query the SerpAPI account endpoint, which doesn't count against the
+        search quota, for key validity and remaining searches.
+        """
+        api_key = settings.SERPAPI_KEY
+        if not api_key:
+            return ProbeResult(available=False, error="SERPAPI_KEY is not configured")
+        async with httpx.AsyncClient(timeout=5) as client:
+            response = await client.get(SERPAPI_ACCOUNT_URL, params={"api_key": api_key})
+        if response.status_code != 200:
+            return ProbeResult(available=False, error=f"SerpAPI account check returned HTTP {response.status_code}")
+        account = response.json()
+        remaining = account.get("total_searches_left", account.get("plan_searches_left"))
+        return ProbeResult(available=True, quota_remaining=int(remaining) if remaining is not None else None)
+    
     async def is_available(self) -> bool:
         """
-        Check if Google Scholar is available.
+        Check if Google Scholar (via SerpAPI) is available.
         
-        Note: This is a basic check. Scholar may still block requests
-        due to rate limiting or anti-scraping measures.
+        Uses the health state shared by all workers and only probes when it
+        is unknown or stale. An exhausted SerpAPI quota counts as unavailable.
         
         Returns:
             True if Scholar appears accessible, False otherwise
         """
-        # Use cached result if recent
-        if self._last_availability_check:
-            time_since_check = (datetime.utcnow() - self._last_availability_check).total_seconds()
-            if time_since_check < self._cache_duration and self._is_available_cache is not None:
-                return self._is_available_cache
-        
-        try:
-            # For now, we'll assume Scholar is available
-            # In production, you might want to do a test query
-            is_available = True
-            
-            # Cache the result
-            self._is_available_cache = is_available
-            self._last_availability_check = datetime.utcnow()
-            
-            return is_available
-            
-        except Exception as e:
-            logger.warning(f"Scholar availability check failed: {e}")
-            self._is_available_cache = False
-            self._last_availability_check = datetime.utcnow()
-            return False
+        return await get_provider_health_service().is_available(self)
+    
+    def cached_availability(self) -> Optional[bool]:
+        """Return the shared availability if it is still fresh, without probing."""
+        return get_provider_health_service().cached_availability(self.provider_id)
     
     async def validate_params(self, params: UnifiedSearchParams) -> UnifiedSearchParams:
         """
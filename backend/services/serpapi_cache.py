@@ -0,0 +1,181 @@
+"""
+SerpAPI Response Cache
+
+Disk-backed cache of raw SerpAPI JSON responses, shared by every worker
+process on the host through a small SQLite file (SERPAPI_CACHE_DB_PATH).
+
+Entries are keyed by the request parameters that decide the result page
+(engine, query, start, num, year range, sort), never by the API key. An entry
+is fresh for SERPAPI_CACHE_TTL_SECONDS; for SERPAPI_CACHE_STALE_SECONDS after
+that it is still served, and the caller refreshes it in the background
+(stale-while-revalidate). Only successful responses are stored.
+
+SERPAPI_CACHE_MODE:
+- read_write: serve hits, call SerpAPI on misses and store the responses
+- cache_only: serve any stored entry regardless of age and never call
+  SerpAPI; a miss is an error (for tests and offline replays)
+- off: bypass the cache
+"""
+
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, Dict, Optional, Set
+
+from config.settings import settings
+from utils.sqlite_store import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+READ_WRITE = "read_write"
+CACHE_ONLY = "cache_only"
+OFF = "off"
+
+# Request parameters that don't change the response
+_IGNORED_PARAMS = {"api_key", "no_cache", "output"}
+
+_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS serpapi_responses (
+        cache_key TEXT PRIMARY KEY,
+        params TEXT NOT NULL,
+        response TEXT NOT NULL,
+        fetched_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_serpapi_responses_fetched_at ON serpapi_responses (fetched_at)",
+]
+
+
+def cache_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """The parameters an entry is keyed by, in canonical form"""
+    return {key: str(value) for key, value in sorted(params.items()) if key not in _IGNORED_PARAMS}
+
+
+def cache_key(params: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(cache_params(params), sort_keys=True).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedResponse:
+    """A stored SerpAPI response"""
+    data: Dict[str, Any]
+    fetched_at: float
+    age_seconds: float
+    stale: bool
+
+    def to_metadata(self) -> Dict[str, Any]:
+        return {"hit": True, "stale": self.stale, "age_seconds": int(self.age_seconds)}
+
+
+class SerpApiResponseCache(SQLiteStore):
+    """SerpAPI responses keyed by the parameters that decide the result page"""
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: int,
+        stale_seconds: int,
+        mode: str = READ_WRITE,
+        clock: Callable[[], float] = time.time
+    ):
+        if mode not in (READ_WRITE, CACHE_ONLY, OFF):
+            raise ValueError(f"Unknown SerpAPI cache mode: {mode}")
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.mode = mode
+        self.clock = clock
+        self._revalidating: Set[str] = set()
+        self._lock = Lock()
+        if mode == OFF:
+            # Never touched, so don't create the file
+            self.path = path
+        else:
+            super().__init__(path, _SCHEMA)
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != OFF
+
+    @property
+    def cache_only(self) -> bool:
+        return self.mode == CACHE_ONLY
+
+    def get(self, params: Dict[str, Any]) -> Optional[CachedResponse]:
+        """
+        Look up the response for a request.
+
+        Returns:
+            The stored response if it is fresh or within the stale window
+            (any age in cache-only mode), otherwise None
+        """
+        if not self.enabled:
+            return None
+        with self.connect() as conn:
+            row = conn.execute(
+                "SELECT response, fetched_at FROM serpapi_responses WHERE cache_key = ?", (cache_key(params),)
+            ).fetchone()
+        if not row:
+            return None
+
+        response, fetched_at = row
+        age = max(0.0, self.clock() - fetched_at)
+        if not self.cache_only and age >= self.ttl_seconds + self.stale_seconds:
+            return None
+        return CachedResponse(
+            data=json.loads(response),
+            fetched_at=fetched_at,
+            age_seconds=age,
+            stale=age >= self.ttl_seconds
+        )
+
+    def set(self, params: Dict[str, Any], data: Dict[str, Any]):
+        """Store a successful response and drop entries past their stale window"""
+        if self.mode != READ_WRITE or "error" in data:
+            return
+        now = self.clock()
+        with self.connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO serpapi_responses (cache_key, params, response, fetched_at) VALUES (?, ?, ?, ?)",
+                (cache_key(params), json.dumps(cache_params(params)), json.dumps(data), now)
+            )
+            conn.execute(
+                "DELETE FROM serpapi_responses WHERE fetched_at < ?", (now - self.ttl_seconds - self.stale_seconds,)
+            )
+
+    def claim_revalidation(self, params: Dict[str, Any]) -> bool:
+        """Claim the background refresh of a stale entry; only one per entry runs at a time in this process"""
+        key = cache_key(params)
+        with self._lock:
+            if key in self._revalidating:
+                return False
+            self._revalidating.add(key)
+            return True
+
+    def release_revalidation(self, params: Dict[str, Any]):
+        with self._lock:
+            self._revalidating.discard(cache_key(params))
+
+    def clear(self):
+        if self.enabled:
+            with self.connect() as conn:
+                conn.execute("DELETE FROM serpapi_responses")
+
+
+_response_cache: Optional[SerpApiResponseCache] = None
+
+
+def get_serpapi_response_cache() -> SerpApiResponseCache:
+    """Process-wide response cache backed by SERPAPI_CACHE_DB_PATH"""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = SerpApiResponseCache(
+            settings.SERPAPI_CACHE_DB_PATH,
+            ttl_seconds=settings.SERPAPI_CACHE_TTL_SECONDS,
+            stale_seconds=settings.SERPAPI_CACHE_STALE_SECONDS,
+            mode=settings.SERPAPI_CACHE_MODE
+        )
+    return _response_cache
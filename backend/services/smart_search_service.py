@@ -23,8 +23,16 @@ from schemas.chat import ChatMessage, MessageRole
 
 from agents.prompts.base_prompt_caller import BasePromptCaller, LLMUsage
 from config.llm_models import get_task_config, supports_reasoning_effort
-
-from services.google_scholar_service import search_articles as search_scholar_articles
+from config.settings import settings
+
+from services.embedding_prefilter import (
+    ACCEPT as PREFILTER_ACCEPT,
+    LLM as PREFILTER_LLM,
+    EmbeddingPrefilter,
+    PrefilterReport,
+    get_embedding_prefilter
+)
+from services.google_scholar_service import search_articles_async as search_scholar_articles
 from services.pubmed_service import search_articles as search_pubmed_articles
 
 logger = logging.getLogger(__name__)
@@ -607,19 +615,13 @@ class SmartSearchService:
     async def _search_google_scholar(self, search_query: str, max_results: int, offset: int, count_only: bool) -> SearchServiceResult:
         """Search Google Scholar and return results."""
         try:
-            loop = asyncio.get_event_loop()
             # Google Scholar service handles pagination internally to get the requested number of results
             results_to_fetch = 1 if count_only else max_results
             
-            scholar_articles, metadata = await loop.run_in_executor(
-                None,
-                search_scholar_articles,
+            scholar_articles, metadata = await search_scholar_articles(
                 search_query,
                 results_to_fetch,
-                None,  # year_low
-                None,  # year_high
-                "relevance",  # sort_by
-                offset  # start_index - this was missing!
+                start_index=offset
             )
             
             total_available = metadata.get('total_results', 0)
@@ -846,6 +848,8 @@ class SmartSearchService:
         """
         Clean filtering method for SmartSearch2 - uses direct filter condition without discriminator generation.
 
+        Runs the embedding pre-filter first when FILTER_PREFILTER_ENABLED is set.
+
         Args:
             articles: List of articles to filter
             filter_condition: The research criteria to filter against
@@ -853,11 +857,80 @@ class SmartSearchService:
         Returns:
             Tuple of (filtered articles list, aggregated token usage)
         """
+        filtered_articles, usage, _ = await self.filter_articles_with_prefilter(articles, filter_condition)
+        return filtered_articles, usage
+
+    async def filter_articles_with_prefilter(
+        self,
+        articles: List[CanonicalResearchArticle],
+        filter_condition: str,
+        prefilter: Optional[EmbeddingPrefilter] = None
+    ) -> Tuple[List[FilteredArticle], LLMUsage, Optional[PrefilterReport]]:
+        """
+        Filter articles, deciding the clear-cut ones by embedding similarity and
+        only sending the ambiguous ones to the LLM.
+
+        Args:
+            articles: List of articles to filter
+            filter_condition: The research criteria to filter against
+            prefilter: Pre-filter to use (defaults to the configured one if FILTER_PREFILTER_ENABLED)
+
+        Returns:
+            Tuple of (filtered articles list in input order, aggregated token usage,
+            pre-filter report or None if no pre-filter ran)
+        """
         logger.info(f"Starting clean filtering of {len(articles)} articles with criteria: {filter_condition[:100]}...")
 
         if not filter_condition.strip():
             raise ValueError("Filter condition is required for filtering")
 
+        if not articles:
+            return [], LLMUsage(), None
+
+        if prefilter is None and settings.FILTER_PREFILTER_ENABLED:
+            prefilter = get_embedding_prefilter()
+        if prefilter is None:
+            filtered_articles, usage = await self._filter_articles_with_llm(articles, filter_condition)
+            return filtered_articles, usage, None
+
+        try:
+            prefiltered = await prefilter.run(filter_condition, articles)
+        except Exception as e:
+            logger.warning(f"Embedding pre-filter failed, sending all articles to the LLM: {e}", exc_info=True)
+            filtered_articles, usage = await self._filter_articles_with_llm(articles, filter_condition)
+            return filtered_articles, usage, None
+
+        report = prefiltered.report
+        logger.info(
+            f"Embedding pre-filter: {report.auto_accepted} accepted, {report.auto_rejected} rejected, "
+            f"{report.sent_to_llm} sent to the LLM ({report.llm_calls_saved} LLM calls saved)"
+        )
+
+        ambiguous = [i for i, verdict in enumerate(prefiltered.verdicts) if verdict == PREFILTER_LLM]
+        llm_filtered, usage = await self._filter_articles_with_llm([articles[i] for i in ambiguous], filter_condition)
+        llm_results = dict(zip(ambiguous, llm_filtered))
+
+        filtered_articles = []
+        for i, (article, verdict) in enumerate(zip(articles, prefiltered.verdicts)):
+            if verdict == PREFILTER_LLM:
+                filtered_articles.append(llm_results[i])
+                continue
+            similarity = float(prefiltered.similarities[i])
+            filtered_articles.append(FilteredArticle(
+                article=article,
+                passed=verdict == PREFILTER_ACCEPT,
+                confidence=round(min(max(similarity, 0.0), 1.0), 3),
+                reasoning=prefilter.reasoning(verdict, similarity)
+            ))
+
+        return filtered_articles, usage, report
+
+    async def _filter_articles_with_llm(
+        self,
+        articles: List[CanonicalResearchArticle],
+        filter_condition: str
+    ) -> Tuple[List[FilteredArticle], LLMUsage]:
+        """Evaluate every article against the filter condition with the LLM"""
         if not articles:
             return [], LLMUsage()
 
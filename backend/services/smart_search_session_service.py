@@ -9,14 +9,47 @@ from typing import Optional, List, Dict, Any
 from datetime import datetime
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import func
+from sqlalchemy import select, delete, null
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 from sqlalchemy.orm.attributes import flag_modified
 
-from models import SmartSearchSession
+from models import SmartSearchSession, SmartSearchFilteredArticle
 from schemas.smart_search import SessionListResponse, SmartSearchSessionDict
 
 logger = logging.getLogger(__name__)
 
 
+def build_filtered_article_rows(session_id: str, filtered_articles: List[Dict[str, Any]]) -> List[SmartSearchFilteredArticle]:
+    """Convert FilteredArticle dictionaries into per-article rows, preserving order"""
+    rows = []
+    seen_ids = set()
+    for position, article_data in enumerate(filtered_articles):
+        article = dict(article_data.get('article') or {})
+        extracted_features = article.pop('extracted_features', None) or {}
+        article_id = str(article.get('id') or article.get('url') or f"position-{position}")
+        if article_id in seen_ids:
+            article_id = f"{article_id}#{position}"
+        seen_ids.add(article_id)
+        rows.append(SmartSearchFilteredArticle(
+            session_id=session_id,
+            article_id=article_id,
+            position=position,
+            passed=bool(article_data.get('passed', False)),
+            confidence=float(article_data.get('confidence') or 0.0),
+            reasoning=article_data.get('reasoning'),
+            article=article,
+            extracted_features=extracted_features
+        ))
+    return rows
+
+
+def source_article_id(article_id: str, position: int) -> str:
+    """Strip the position suffix build_filtered_article_rows gives duplicate article ids"""
+    suffix = f"#{position}"
+    return article_id[:-len(suffix)] if article_id.endswith(suffix) else article_id
+
+
 class SmartSearchSessionService:
     """Service for managing smart search session operations"""
     
@@ -250,9 +283,9 @@ class SmartSearchSessionService:
             
             session.filtering_metadata = filtering_metadata
             
-            # Store the actual filtered articles if provided
+            # Store the actual filtered articles if provided, one row per article
             if filtered_articles is not None:
-                session.filtered_articles = filtered_articles
+                self._replace_filtered_articles(session, filtered_articles)
             
             session.last_step_completed = "filtering"
             session.status = "completed"
@@ -280,6 +313,56 @@ class SmartSearchSessionService:
             self.db.rollback()
             raise
     
+    def get_filtered_articles(self, session: SmartSearchSession, passed_only: bool = False) -> List[Dict[str, Any]]:
+        """
+        Get a session's filtered articles as FilteredArticle dictionaries.
+
+        Sessions saved before per-article rows existed fall back to the legacy blob.
+        """
+        query = self.db.query(SmartSearchFilteredArticle).filter(
+            SmartSearchFilteredArticle.session_id == session.id
+        )
+        if passed_only:
+            query = query.filter(SmartSearchFilteredArticle.passed.is_(True))
+        rows = query.order_by(SmartSearchFilteredArticle.position).all()
+        if rows:
+            return [row.to_dict() for row in rows]
+
+        legacy = self.db.query(SmartSearchSession.filtered_articles).filter(
+            SmartSearchSession.id == session.id
+        ).scalar() or []
+        if passed_only:
+            legacy = [fa for fa in legacy if fa.get('passed', False)]
+        return legacy
+
+    def session_to_dict(self, session: SmartSearchSession) -> Dict[str, Any]:
+        """Full session dictionary including filtered articles"""
+        return session.to_dict(filtered_articles=self.get_filtered_articles(session))
+
+    def _replace_filtered_articles(self, session: SmartSearchSession, filtered_articles: List[Dict[str, Any]]):
+        """Replace all filtered article rows for a session (caller commits)"""
+        self.db.execute(
+            delete(SmartSearchFilteredArticle).where(SmartSearchFilteredArticle.session_id == session.id)
+        )
+        self.db.add_all(build_filtered_article_rows(session.id, filtered_articles))
+        # SQL NULL rather than a JSON null so the blob no longer counts as legacy data
+        session.filtered_articles = null()
+
+    def _migrate_legacy_filtered_articles(self, session: SmartSearchSession):
+        """Move a session's legacy filtered_articles blob into per-article rows (caller commits)"""
+        has_rows = self.db.query(SmartSearchFilteredArticle.id).filter(
+            SmartSearchFilteredArticle.session_id == session.id
+        ).first() is not None
+        if has_rows:
+            return
+        legacy = self.db.query(SmartSearchSession.filtered_articles).filter(
+            SmartSearchSession.id == session.id
+        ).scalar()
+        if legacy:
+            self._replace_filtered_articles(session, legacy)
+            self.db.flush()
+            logger.info(f"Migrated {len(legacy)} legacy filtered articles for session {session.id}")
+
     def mark_session_abandoned(self, session_id: str, user_id: str) -> Optional[SmartSearchSession]:
         """Mark a session as abandoned"""
         try:
@@ -304,7 +387,7 @@ class SmartSearchSessionService:
             raise
     
     def get_user_sessions(self, user_id: str, limit: int = 50, offset: int = 0) -> SessionListResponse:
-        """Get user's search session history"""
+        """Get user's search session history (filtered articles are not loaded)"""
         try:
             sessions = self.db.query(SmartSearchSession).filter(
                 SmartSearchSession.user_id == user_id
@@ -324,7 +407,7 @@ class SmartSearchSessionService:
             raise
     
     def get_all_sessions(self, limit: int = 50, offset: int = 0) -> SessionListResponse:
-        """Get all users' search session history (admin only)"""
+        """Get all users' search session history (admin only, filtered articles are not loaded)"""
         try:
             sessions = self.db.query(SmartSearchSession).order_by(
                 SmartSearchSession.created_at.desc()
@@ -342,7 +425,13 @@ class SmartSearchSessionService:
             raise
 
     def update_custom_columns_and_features(self, session_id: str, user_id: str, custom_columns: List[Dict[str, Any]], extracted_features: Dict[str, Dict[str, Any]]) -> Optional[SmartSearchSession]:
-        """Update both custom column metadata and feature values atomically"""
+        """
+        Update both custom column metadata and feature values atomically.
+
+        Feature values are matched to rows by the article's own id (ignoring the
+        position suffix given to duplicates). Only the feature column of each row is
+        loaded, and only rows whose features change are written.
+        """
         try:
             session = self.get_session(session_id, user_id)
             if not session:
@@ -364,33 +453,30 @@ class SmartSearchSessionService:
             
             # Update metadata with all columns (existing + new)
             session.filtering_metadata['custom_columns'] = list(existing_by_id.values())
-            
-            # Update filtered articles with extracted features
-            if session.filtered_articles:
-                current_feature_ids = set(existing_by_id.keys())
-                updated_articles = []
-                
-                for article_data in session.filtered_articles:
-                    article_id = article_data['article']['id']
-                    
-                    # Initialize extracted_features if it doesn't exist or is None
-                    if 'extracted_features' not in article_data['article'] or article_data['article']['extracted_features'] is None:
-                        article_data['article']['extracted_features'] = {}
-                    
-                    # Add new extracted features
-                    if article_id in extracted_features and extracted_features[article_id] is not None:
-                        article_data['article']['extracted_features'].update(extracted_features[article_id])
-                    
-                    # Clean up features that are no longer in the custom columns
-                    filtered_features = {
-                        k: v for k, v in article_data['article']['extracted_features'].items()
-                        if k in current_feature_ids
-                    }
-                    article_data['article']['extracted_features'] = filtered_features
-                    
-                    updated_articles.append(article_data)
-                
-                session.filtered_articles = updated_articles
+            flag_modified(session, 'filtering_metadata')
+            
+            # Merge the new feature values and drop removed columns on every row,
+            # writing only the rows whose features actually change
+            self._migrate_legacy_filtered_articles(session)
+            current_feature_ids = set(existing_by_id.keys())
+            updates = {str(article_id): values for article_id, values in extracted_features.items() if values is not None}
+            rows = self.db.query(SmartSearchFilteredArticle).options(
+                load_only(
+                    SmartSearchFilteredArticle.id,
+                    SmartSearchFilteredArticle.article_id,
+                    SmartSearchFilteredArticle.position,
+                    SmartSearchFilteredArticle.extracted_features
+                )
+            ).filter(SmartSearchFilteredArticle.session_id == session_id).all()
+            
+            for row in rows:
+                existing_features = row.extracted_features or {}
+                features = dict(existing_features)
+                features.update(updates.get(source_article_id(row.article_id, row.position)) or {})
+                # Drop features that are no longer in the custom columns
+                features = {k: v for k, v in features.items() if k in current_feature_ids}
+                if features != existing_features:
+                    row.extracted_features = features
             
             self.db.commit()
             logger.info(f"Updated {len(custom_columns)} new custom columns and feature values for session {session_id}")
@@ -498,3 +584,100 @@ class SmartSearchSessionService:
             logger.error(f"Failed to update search keyword history for session {session_id}: {e}")
             self.db.rollback()
             raise
+
+
+class AsyncSmartSearchSessionService:
+    """
+    Async variant of SmartSearchSessionService for session reads.
+    
+    Session history and resume are the hottest smart-search queries; they
+    run on an AsyncSession so they never block the event loop.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_session(self, session_id: str, user_id: str) -> Optional[SmartSearchSession]:
+        """Get an existing session by ID and user"""
+        try:
+            session = await self.db.scalar(
+                select(SmartSearchSession).where(
+                    SmartSearchSession.id == session_id,
+                    SmartSearchSession.user_id == user_id
+                )
+            )
+            
+            if not session:
+                logger.warning(f"Session {session_id} not found for user {user_id}")
+            
+            return session
+            
+        except Exception as e:
+            logger.error(f"Failed to get session {session_id} for user {user_id}: {e}")
+            raise
+    
+    async def get_filtered_articles(self, session: SmartSearchSession) -> List[Dict[str, Any]]:
+        """Get a session's filtered articles, falling back to the legacy blob"""
+        result = await self.db.scalars(
+            select(SmartSearchFilteredArticle).where(
+                SmartSearchFilteredArticle.session_id == session.id
+            ).order_by(SmartSearchFilteredArticle.position)
+        )
+        rows = result.all()
+        if rows:
+            return [row.to_dict() for row in rows]
+        
+        legacy = await self.db.scalar(
+            select(SmartSearchSession.filtered_articles).where(SmartSearchSession.id == session.id)
+        )
+        return legacy or []
+    
+    async def session_to_dict(self, session: SmartSearchSession) -> Dict[str, Any]:
+        """Full session dictionary including filtered articles"""
+        return session.to_dict(filtered_articles=await self.get_filtered_articles(session))
+    
+    async def get_user_sessions(self, user_id: str, limit: int = 50, offset: int = 0) -> SessionListResponse:
+        """Get user's search session history (filtered articles are not loaded)"""
+        try:
+            result = await self.db.scalars(
+                select(SmartSearchSession).where(
+                    SmartSearchSession.user_id == user_id
+                ).order_by(SmartSearchSession.created_at.desc()).offset(offset).limit(limit)
+            )
+            
+            total = await self.db.scalar(
+                select(func.count()).select_from(SmartSearchSession).where(
+                    SmartSearchSession.user_id == user_id
+                )
+            )
+            
+            return SessionListResponse(
+                sessions=[SmartSearchSessionDict(**session.to_dict()) for session in result.all()],
+                total=total or 0
+            )
+            
+        except Exception as e:
+            logger.error(f"Failed to get sessions for user {user_id}: {e}")
+            raise
+    
+    async def get_all_sessions(self, limit: int = 50, offset: int = 0) -> SessionListResponse:
+        """Get all users' search session history (admin only, filtered articles are not loaded)"""
+        try:
+            result = await self.db.scalars(
+                select(SmartSearchSession).order_by(
+                    SmartSearchSession.created_at.desc()
+                ).offset(offset).limit(limit)
+            )
+            
+            total = await self.db.scalar(
+                select(func.count()).select_from(SmartSearchSession)
+            )
+            
+            return SessionListResponse(
+                sessions=[SmartSearchSessionDict(**session.to_dict()) for session in result.all()],
+                total=total or 0
+            )
+            
+        except Exception as e:
+            logger.error(f"Failed to get all sessions: {e}")
+            raise
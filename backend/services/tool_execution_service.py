@@ -16,6 +16,7 @@ from schemas.resource import ResourceConfig
 from schemas.tool_execution import ToolExecutionResponse
 
 from tools.tool_registry import get_tool_definition
+from tools.tool_stubbing import should_stub_tool, execute_stub
 
 """
 Tool Execution Service - Orchestrates tool step execution with proper service delegation.
@@ -207,7 +208,10 @@ class ToolExecutionService:
         try:
             # Execute the tool
             print(f"Executing tool {step.tool_id}")
-            result = await tool_def.execution_handler(execution_input)
+            if should_stub_tool(tool_def):
+                result = await execute_stub(tool_def, execution_input)
+            else:
+                result = await tool_def.execution_handler(execution_input)
             
             print("Tool execution completed")
             
@@ -256,7 +260,8 @@ class ToolExecutionService:
                 params[param_name] = ToolParameterValue(
                     value=value,
                     parameter_name=param_name,
-                    parameter_type="asset"
+                    parameter_type="asset",
+                    asset_id=asset_id
                 )
         
         return params
@@ -167,6 +167,20 @@ class ToolStepService:
         
         return [self._model_to_schema(tool_step_model) for tool_step_model in tool_step_models]
 
+    async def get_tool_steps_by_hops(self, hop_ids: List[str], user_id: int) -> Dict[str, List[ToolStep]]:
+        """Get the tool steps of several hops in one query as {hop_id: [steps ordered by sequence]}"""
+        tool_steps: Dict[str, List[ToolStep]] = {hop_id: [] for hop_id in hop_ids}
+        if not hop_ids:
+            return tool_steps
+        
+        tool_step_models = self.db.query(ToolStepModel).filter(
+            and_(ToolStepModel.hop_id.in_(hop_ids), ToolStepModel.user_id == user_id)
+        ).order_by(ToolStepModel.hop_id, ToolStepModel.sequence_order).all()
+        
+        for tool_step_model in tool_step_models:
+            tool_steps[tool_step_model.hop_id].append(self._model_to_schema(tool_step_model))
+        return tool_steps
+
     async def update_tool_step(
         self,
         tool_step_id: str,
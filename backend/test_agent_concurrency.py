@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Stress test for concurrent chat streams through the primary agent graph.
+
+This script tests that:
+1. Many simultaneous graph invocations in one process each use their own
+   services and user id, even while they interleave at every await
+2. Each stream's output only refers to its own user's mission
+"""
+
+import asyncio
+import random
+import sys
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+# Add the backend directory to the path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from agents import primary_agent
+from agents.primary_agent import graph, State
+from agents.prompts.mission_prompt_simple import MissionDefinitionResponse
+from schemas.chat import ChatMessage, MessageRole
+from schemas.lite_models import MissionLite
+from schemas.workflow import Mission
+from services.state_transition_service import TransactionResult
+
+STREAM_COUNT = 50
+
+
+async def _yield_randomly():
+    await asyncio.sleep(random.uniform(0, 0.01))
+
+
+class FakeMissionPromptCaller:
+    """Stands in for the LLM: proposes a mission named after the user's message"""
+
+    async def invoke(self, mission, messages, on_token=None, **kwargs):
+        user_label = messages[0].content
+        for token in ("Proposing ", "a ", "mission"):
+            await _yield_randomly()
+            if on_token:
+                on_token(token)
+        return MissionDefinitionResponse(
+            response_type="MISSION_DEFINITION",
+            response_content="Proposing a mission",
+            mission_proposal=MissionLite(
+                name=f"Mission for {user_label}",
+                description="d",
+                goal="g",
+                success_criteria=["c"],
+                inputs=[],
+                outputs=[],
+                scope="s"
+            )
+        )
+
+
+class FakeStateTransitionService:
+    def __init__(self):
+        self.user_ids = set()
+
+    async def updateState(self, transaction_type, data):
+        self.user_ids.add(data["user_id"])
+        await _yield_randomly()
+        mission_name = data["mission_lite"].name
+        return TransactionResult(success=True, entity_id=mission_name, status="ok", message="")
+
+
+class FakeMissionService:
+    def __init__(self):
+        self.user_ids = set()
+
+    async def get_mission(self, mission_id, user_id):
+        self.user_ids.add(user_id)
+        await _yield_randomly()
+        return Mission(id=mission_id, name=mission_id)
+
+    async def update_mission(self, mission_id, user_id, mission):
+        self.user_ids.add(user_id)
+
+
+async def _run_stream(user_id: int):
+    mission_service = FakeMissionService()
+    transition_service = FakeStateTransitionService()
+    state = State(
+        messages=[ChatMessage(
+            id=str(uuid.uuid4()), chat_id="c", role=MessageRole.USER, content=f"user {user_id}",
+            created_at=datetime.utcnow(), updated_at=datetime.utcnow()
+        )],
+        next_node="supervisor_node"
+    )
+    config = {
+        "configurable": {
+            "mission_service": mission_service,
+            "session_service": None,
+            "state_transition_service": transition_service,
+            "user_id": user_id,
+            "request_id": f"request-{user_id}"
+        }
+    }
+    outputs = [output async for output in graph.astream(state, stream_mode="custom", config=config)]
+    return user_id, mission_service, transition_service, outputs
+
+
+async def test_concurrent_streams_are_isolated(monkeypatch):
+    monkeypatch.setattr(primary_agent, "MissionDefinitionPromptCaller", FakeMissionPromptCaller)
+
+    results = await asyncio.gather(*(_run_stream(user_id) for user_id in range(1, STREAM_COUNT + 1)))
+
+    for user_id, mission_service, transition_service, outputs in results:
+        assert transition_service.user_ids == {user_id}
+        assert mission_service.user_ids == {user_id}
+
+        errors = [output["error"] for output in outputs if output.get("error")]
+        assert not errors
+
+        completed = [output for output in outputs if output.get("status") == "mission_specialist_completed"]
+        assert len(completed) == 1
+        assert f"Mission for user {user_id}" in completed[0]["response_text"]
+        streamed = [output["token"] for output in outputs if output.get("token") and not output.get("status")]
+        assert "".join(streamed) == "Proposing a mission"
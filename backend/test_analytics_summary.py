@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test script for the incrementally maintained analytics counters.
+
+This script tests that:
+1. Tracking events updates the per-user and per-journey counters, including token usage
+2. The backfill recomputes the same counters from user_events
+3. Events older than 30 days are left out of the recent event count
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add the backend directory to the path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from models import EventType, UserAnalyticsSummary, UserEvent, UserJourneySummary
+from services.analytics_summary_service import AnalyticsSummaryService
+from services.event_tracking import EventTracker
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'analytics.db'}")
+    for model in (UserEvent, UserAnalyticsSummary, UserJourneySummary):
+        model.__table__.create(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _track_history(db):
+    tracker = EventTracker(db)
+    tracker.track_event("1", "j1", EventType.JOURNEY_START, {"source": "pubmed"})
+    tracker.track_event("1", "j1", EventType.SEARCH_EXECUTE, {"query": "mc4r"})
+    tracker.track_event("1", "j1", EventType.FILTER_APPLY, {
+        "token_usage": {"prompt_tokens": 900, "completion_tokens": 100, "total_tokens": 1000}
+    })
+    tracker.track_event("1", "j2", EventType.SEARCH_EXECUTE, {})
+    tracker.track_event("1", "j2", EventType.COLUMNS_ADD, {"token_usage": "n/a"})
+    tracker.track_event("2", "j3", EventType.SEARCH_EXECUTE, {})
+
+
+def test_tracking_updates_counters(db):
+    _track_history(db)
+    service = AnalyticsSummaryService(db)
+
+    summary = service.get_user_summary("1")
+    assert summary["total_events"] == 5
+    assert summary["total_journeys"] == 2
+    assert summary["recent_events_30d"] == 5
+    assert summary["event_type_breakdown"] == {
+        "journey_start": 1, "search_execute": 2, "filter_apply": 1, "columns_add": 1
+    }
+    assert (summary["searches"], summary["filters"], summary["extractions"]) == (2, 1, 1)
+    assert summary["token_usage"] == {"prompt_tokens": 900, "completion_tokens": 100, "total_tokens": 1000}
+
+    journeys = service.get_recent_journeys("1")
+    assert [(j.journey_id, j.event_count, j.last_event_type) for j in journeys] == [
+        ("j2", 2, EventType.COLUMNS_ADD), ("j1", 3, EventType.FILTER_APPLY)
+    ]
+    assert service.get_user_summary("2")["total_events"] == 1
+    assert service.get_user_summary("3")["total_events"] == 0
+
+
+def test_backfill_matches_incremental_counters(db):
+    _track_history(db)
+    service = AnalyticsSummaryService(db)
+    incremental = service.get_user_summary("1")
+    incremental_journeys = [(j.journey_id, j.event_count, j.start_time, j.end_time) for j in service.get_recent_journeys("1")]
+
+    db.query(UserAnalyticsSummary).delete()
+    db.query(UserJourneySummary).delete()
+    db.commit()
+    assert service.get_user_summary("1")["total_events"] == 0
+
+    assert service.rebuild_user("1") == 5
+    db.commit()
+    db.expire_all()
+
+    assert service.get_user_summary("1") == incremental
+    assert [(j.journey_id, j.event_count, j.start_time, j.end_time) for j in service.get_recent_journeys("1")] == incremental_journeys
+
+
+def test_old_events_not_counted_as_recent(db):
+    db.add(UserEvent(user_id="1", journey_id="old", event_type=EventType.SEARCH_EXECUTE,
+                     timestamp=datetime.utcnow() - timedelta(days=45), event_data={}))
+    db.commit()
+    EventTracker(db).track_event("1", "new", EventType.SEARCH_EXECUTE, {})
+
+    service = AnalyticsSummaryService(db)
+    service.rebuild_user("1")
+    db.commit()
+
+    summary = service.get_user_summary("1")
+    assert summary["total_events"] == 2
+    assert summary["total_journeys"] == 2
+    assert summary["recent_events_30d"] == 1
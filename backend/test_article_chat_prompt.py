@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script for the article chat prompt builder.
+
+This script tests that:
+1. Consecutive turns about the same article share their prompt prefix
+2. History is trimmed by token budget, in steps that keep the prefix stable
+3. Rendered company context is cached per user and invalidated on demand
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# Add the backend directory to the path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from routers.article_chat import ArticleContext
+from services.article_chat_prompt_builder import (
+    ArticleChatPromptBuilder, CompanyContext, CompanyContextCache, HISTORY_TRIM_STEP, MESSAGE_TOKEN_OVERHEAD
+)
+
+ARTICLE = ArticleContext(
+    id="pmid:1",
+    title="Melanocortin agonists in dry eye",
+    authors=["A. Author", "B. Author"],
+    abstract="Abstract text",
+    extracted_features={"study_type": "RCT"},
+    source="pubmed"
+)
+COMPANY = CompanyContext(company_context="You work for Acme.", analysis_instructions="1. Be useful")
+
+
+def _word_count(text: str) -> int:
+    return len(text.split())
+
+
+def _history(turns: int):
+    history = []
+    for turn in range(turns):
+        history.append({"role": "user", "content": f"question {turn} " + "word " * 8})
+        history.append({"role": "assistant", "content": f"answer {turn} " + "word " * 8})
+    return history
+
+
+def _builder(budget: int) -> ArticleChatPromptBuilder:
+    return ArticleChatPromptBuilder("gpt-4.1", history_token_budget=budget, count_tokens=_word_count)
+
+
+def test_follow_up_turns_extend_the_previous_prompt():
+    builder = _builder(budget=10_000)
+    history = _history(2)
+
+    first = builder.build(COMPANY, ARTICLE, history, "next question").messages
+    follow_up = builder.build(
+        COMPANY, ARTICLE, history + [first[-1], {"role": "assistant", "content": "reply"}], "another"
+    ).messages
+
+    assert [m["role"] for m in first[:2]] == ["system", "system"]
+    assert "Acme" in first[0]["content"] and ARTICLE.title not in first[0]["content"]
+    assert ARTICLE.title in first[1]["content"]
+    assert follow_up[:len(first)] == first
+    assert follow_up[-1] == {"role": "user", "content": "another"}
+
+
+def test_history_is_trimmed_by_tokens_in_stable_steps():
+    message_tokens = 10 + MESSAGE_TOKEN_OVERHEAD
+    builder = _builder(budget=message_tokens * 10)
+
+    assert builder.build(COMPANY, ARTICLE, _history(5), "q").history_messages_dropped == 0
+
+    # Over budget: oldest messages go in HISTORY_TRIM_STEP chunks
+    starts = []
+    for turns in range(6, 9):
+        prompt = builder.build(COMPANY, ARTICLE, _history(turns), "q")
+        assert prompt.history_tokens <= builder.history_token_budget
+        assert prompt.history_messages_dropped % HISTORY_TRIM_STEP == 0
+        starts.append(prompt.messages[2]["content"])
+
+    # The first kept message, and so the cached prefix, survives consecutive turns
+    assert starts[0] == starts[1]
+
+
+def test_company_context_is_cached_per_user():
+    profile = MagicMock()
+    profile.generate_company_context.return_value = "You work for Acme."
+    profile.generate_analysis_instructions.return_value = "1. Be useful"
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = profile
+    cache = CompanyContextCache(ttl_seconds=60)
+
+    assert cache.get(db, 1) == COMPANY
+    assert cache.get(db, 1) == COMPANY
+    assert db.query.call_count == 1
+
+    cache.invalidate_user(1)
+    db.query.return_value.filter.return_value.first.return_value = None
+    assert cache.get(db, 1) == CompanyContext()
+    assert db.query.call_count == 2
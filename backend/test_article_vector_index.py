@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Test script for the local article embedding index behind workbench search.
+
+This script tests that:
+1. Searches return a user's nearest articles and honour group/year/source filters
+2. Re-indexed and removed articles are replaced or tombstoned, and a second instance sees appends
+   and rebuilds of the same file size
+3. IVF search after training finds the same neighbours as the exact scan
+4. ArticleSearchService embeds only group articles that aren't indexed yet and have text,
+   and only when syncing, never inside a search
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add the backend directory to the path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from services.article_search_service import ArticleSearchService
+from services.article_vector_index import ArticleVectorIndex, IndexEntry
+
+
+def _unit(angle_degrees: float) -> np.ndarray:
+    angle = np.radians(angle_degrees)
+    return np.array([np.cos(angle), np.sin(angle), 0.0], dtype=np.float32)
+
+
+def _index(tmp_path) -> ArticleVectorIndex:
+    index = ArticleVectorIndex(str(tmp_path / "index"), model="fake")
+    entries = [
+        IndexEntry("d0", 1, "g1", 2020, "pubmed"),
+        IndexEntry("d10", 1, "g1", 2022, "pubmed"),
+        IndexEntry("d20", 1, "g2", 2024, "scholar"),
+        IndexEntry("d5", 2, "g3", 2024, "pubmed"),
+    ]
+    index.add(entries, np.stack([_unit(0), _unit(10), _unit(20), _unit(5)]))
+    return index
+
+
+def test_search_with_filters(tmp_path):
+    index = _index(tmp_path)
+    query = _unit(12)
+
+    assert [hit.detail_id for hit in index.search(1, query, k=3)] == ["d10", "d20", "d0"]
+    assert [hit.detail_id for hit in index.search(1, query, k=1)] == ["d10"]
+    assert [hit.detail_id for hit in index.search(1, query, group_ids=["g2"])] == ["d20"]
+    assert [hit.detail_id for hit in index.search(1, query, year_to=2022)] == ["d10", "d0"]
+    assert [hit.detail_id for hit in index.search(1, query, sources=["scholar"])] == ["d20"]
+    assert [hit.detail_id for hit in index.search(2, query)] == ["d5"]
+    assert index.search(1, query, k=1)[0].score > 0.99
+
+
+def test_replace_remove_and_reopen(tmp_path):
+    index = _index(tmp_path)
+    index.add([IndexEntry("d0", 1, "g1", 2020, "pubmed")], _unit(90)[None, :])
+    index.remove(["d20"])
+
+    reopened = ArticleVectorIndex(str(tmp_path / "index"), model="fake")
+    assert reopened.indexed_ids(1) == {"d0": "g1", "d10": "g1"}
+    assert [hit.detail_id for hit in reopened.search(1, _unit(80))] == ["d0", "d10"]
+
+    reopened.add([IndexEntry("d30", 1, "g2", 2025, "pubmed")], _unit(80)[None, :])
+    assert index.search(1, _unit(80), k=1)[0].detail_id == "d30"
+
+    assert ArticleVectorIndex(str(tmp_path / "index"), model="other").indexed_ids(1) == {}
+
+
+def test_other_instance_sees_rebuild(tmp_path):
+    index = _index(tmp_path)
+    worker = ArticleVectorIndex(str(tmp_path / "index"), model="fake")
+    assert worker.search(1, _unit(60), k=1)[0].detail_id == "d20"
+
+    # Same row count, so the new data file has the same size as the old one
+    index.clear()
+    index.add(
+        [IndexEntry(f"d{i}", 1, "g1") for i in range(4)],
+        np.stack([_unit(90), _unit(80), _unit(70), _unit(60)])
+    )
+
+    hit = worker.search(1, _unit(60), k=1)[0]
+    assert hit.detail_id == "d3"
+    assert hit.score > 0.99
+
+
+def test_ivf_matches_exact_scan(tmp_path):
+    rng = np.random.default_rng(3)
+    centers = rng.normal(size=(16, 32))
+    vectors = np.concatenate([center + 0.1 * rng.normal(size=(100, 32)) for center in centers])
+    index = ArticleVectorIndex(str(tmp_path / "index"), model="fake")
+    index.add([IndexEntry(f"d{i}", 1, "g1") for i in range(len(vectors))], vectors)
+
+    assert index.train_ivf(nlist=16) == 16
+
+    recalls = []
+    for query in centers[:8] + 0.1 * rng.normal(size=(8, 32)):
+        exact = {hit.detail_id for hit in index.search(1, query, k=10, ivf_min_candidates=10**9)}
+        approximate = {hit.detail_id for hit in index.search(1, query, k=10, nprobe=2, ivf_min_candidates=100)}
+        recalls.append(len(exact & approximate) / 10)
+    assert np.mean(recalls) >= 0.9
+
+
+class FakeEmbedder:
+    name = "fake"
+
+    def __init__(self):
+        self.embedded = []
+
+    async def embed(self, texts):
+        if not all(texts):
+            raise ValueError("Embedding input must not be empty")
+        self.embedded.extend(texts)
+        return np.stack([_unit(float(text.split("\n")[0])) for text in texts])
+
+
+def test_service_indexes_only_new_articles(tmp_path):
+    db_articles = {
+        "d10": ("g1", {"title": "10", "abstract": "", "source": "pubmed", "publication_year": 2022}),
+        "d40": ("g1", {"title": "40", "abstract": "", "source": "pubmed", "year": "2023"}),
+    }
+    embedder = FakeEmbedder()
+    service = ArticleSearchService(db=None, index=ArticleVectorIndex(str(tmp_path / "index"), "fake"), embedder=embedder)
+
+    async def user_article_ids(user_id):
+        return {detail_id: group_id for detail_id, (group_id, _) in db_articles.items()}
+
+    async def load_articles(detail_ids):
+        return {detail_id: (db_articles[detail_id][1], "Group") for detail_id in detail_ids if detail_id in db_articles}
+
+    service._user_article_ids = user_article_ids
+    service._load_articles = load_articles
+
+    # Search doesn't index inline: nothing is found until the sync has run
+    assert asyncio.run(service.search(1, "35", limit=1)) == []
+    assert embedder.embedded == ["35"]
+    assert asyncio.run(service.sync_user(1)) == {"added": 2, "removed": 0}
+
+    results = asyncio.run(service.search(1, "35", limit=1))
+    assert [result["detail_id"] for result in results] == ["d40"]
+    assert results[0]["group_name"] == "Group"
+
+    del db_articles["d40"]
+    db_articles["d80"] = ("g2", {"title": "80", "abstract": "", "source": "scholar"})
+    db_articles["d-empty"] = ("g2", {"title": "", "abstract": None, "source": "scholar"})
+    assert asyncio.run(service.sync_user(1)) == {"added": 1, "removed": 1}
+    assert embedder.embedded == ["35", "10", "40", "35", "80"]
+
+    results = asyncio.run(service.search(1, "35", year_from=2020))
+    assert [result["detail_id"] for result in results] == ["d10"]
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script for database pool telemetry and leak detection.
+
+This script tests that:
+1. Checkouts, pool timeouts and overflow usage are recorded
+2. Connections held past the threshold are reported as leaks, with the checkout
+   site only when stack capture is enabled
+3. Pool sizing is derived from the worker connection budget
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, exc as sa_exc
+
+# Add the backend directory to the path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+import database
+from utils.db_pool_monitor import InstrumentedQueuePool, attach_leak_detection, get_pool_metrics
+
+
+class _TestPool(InstrumentedQueuePool):
+    metrics_name = "test"
+
+
+def _engine(tmp_path, **kwargs):
+    return create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=_TestPool, **kwargs)
+
+
+def test_checkout_and_timeout_metrics(tmp_path):
+    engine = _engine(tmp_path, pool_size=1, max_overflow=1, pool_timeout=0.1)
+    metrics = get_pool_metrics("test")
+
+    first = engine.connect()
+    second = engine.connect()
+    with pytest.raises(sa_exc.TimeoutError):
+        engine.connect()
+    first.close()
+    second.close()
+
+    snapshot = metrics.snapshot(engine.pool)
+    assert snapshot["checkouts"] >= 2
+    assert snapshot["timeouts"] == 1
+    assert snapshot["max_overflow_used"] == 1
+    assert snapshot["waiting"] == 0
+    engine.dispose()
+
+
+def test_long_held_connection_is_reported(tmp_path):
+    engine = _engine(tmp_path, pool_size=1, max_overflow=0)
+    attach_leak_detection(engine, "test", threshold_seconds=0.05, capture_sites=True)
+    metrics = get_pool_metrics("test")
+
+    conn = engine.connect()
+    time.sleep(0.1)
+    leaks = metrics.find_leaks()
+    assert len(leaks) == 1
+    assert "test_db_pool_monitor.py" in leaks[0]["site"]
+
+    long_holds = metrics.long_holds
+    conn.close()
+    assert metrics.long_holds == long_holds + 1
+    assert metrics.find_leaks() == []
+    engine.dispose()
+
+
+def test_checkout_site_is_not_captured_by_default(tmp_path, monkeypatch):
+    engine = _engine(tmp_path, pool_size=1, max_overflow=0)
+    attach_leak_detection(engine, "test", threshold_seconds=0.05)
+    metrics = get_pool_metrics("test")
+    monkeypatch.setattr("utils.db_pool_monitor._checkout_site", lambda: pytest.fail("stack captured"))
+
+    conn = engine.connect()
+    time.sleep(0.1)
+    leaks = metrics.find_leaks()
+    assert len(leaks) == 1
+    assert "DB_LEAK_CAPTURE_STACKS" in leaks[0]["site"]
+    conn.close()
+    engine.dispose()
+
+
+def test_pool_config_divides_budget_across_workers(monkeypatch):
+    monkeypatch.setattr(database.settings, "DB_MAX_CONNECTIONS", 60)
+    monkeypatch.setattr(database.settings, "DB_POOL_SIZE", 0)
+    monkeypatch.setattr(database.settings, "DB_MAX_OVERFLOW", -1)
+
+    monkeypatch.setattr(database.settings, "WEB_CONCURRENCY", 1)
+    single = database.get_pool_config()
+    monkeypatch.setattr(database.settings, "WEB_CONCURRENCY", 4)
+    multi = database.get_pool_config()
+
+    # sync + async engines across all workers stay within the budget
+    assert 2 * (single["pool_size"] + single["max_overflow"]) <= 60
+    assert 4 * 2 * (multi["pool_size"] + multi["max_overflow"]) <= 60
+    assert multi["pool_size"] < single["pool_size"]
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test script for the embedding pre-filter in front of LLM article filtering.
+
+This script tests that:
+1. Clear-cut articles are decided by similarity and only the ambiguous band goes to the LLM
+2. A failing pre-filter falls back to sending every article to the LLM
+3. Embeddings are cached by model and text
+4. Calibration picks thresholds within the allowed miss and false accept rates
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add the backend directory to the path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from agents.prompts.base_prompt_caller import LLMUsage
+from schemas.canonical_types import CanonicalResearchArticle
+from schemas.smart_search import FilteredArticle
+from services.embedding_prefilter import (
+    CachedEmbedder,
+    EmbeddingCache,
+    EmbeddingPrefilter,
+    calibrate_thresholds
+)
+from services.smart_search_service import SmartSearchService
+
+CONDITION = "Melanocortin receptor agonists in obesity"
+
+
+class FakeEmbedder:
+    """2-d embeddings: the condition is (1, 0); an article titled "<angle>" points that many degrees away"""
+
+    name = "fake:angles"
+
+    def __init__(self):
+        self.embedded = []
+
+    async def embed(self, texts):
+        self.embedded.extend(texts)
+        vectors = []
+        for text in texts:
+            angle = 0.0 if text == CONDITION else np.radians(float(text.split("\n")[0]))
+            vectors.append([np.cos(angle), np.sin(angle)])
+        return np.asarray(vectors, dtype=np.float32)
+
+
+class BrokenEmbedder:
+    name = "fake:broken"
+
+    async def embed(self, texts):
+        raise RuntimeError("embedding service down")
+
+
+def _article(angle: int) -> CanonicalResearchArticle:
+    return CanonicalResearchArticle(id=f"a{angle}", source="pubmed", title=str(angle), abstract="...")
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = SmartSearchService()
+    service.evaluated = []
+
+    async def evaluate(article, filter_criteria):
+        service.evaluated.append(article.id)
+        return FilteredArticle(article=article, passed=True, confidence=0.9, reasoning="LLM"), LLMUsage(prompt_tokens=100)
+
+    monkeypatch.setattr(service, "_evaluate_article", evaluate)
+    return service
+
+
+def test_only_ambiguous_articles_go_to_the_llm(service):
+    # cos(10°)=0.98, cos(45°)=0.71, cos(60°)=0.5, cos(85°)=0.09
+    articles = [_article(angle) for angle in (85, 45, 10, 60)]
+    prefilter = EmbeddingPrefilter(FakeEmbedder(), reject_below=0.2, accept_above=0.9)
+
+    filtered, usage, report = asyncio.run(service.filter_articles_with_prefilter(articles, CONDITION, prefilter))
+
+    assert [fa.article.id for fa in filtered] == ["a85", "a45", "a10", "a60"]
+    assert [fa.passed for fa in filtered] == [False, True, True, True]
+    assert filtered[0].reasoning.startswith("Embedding pre-filter: rejected")
+    assert filtered[2].reasoning.startswith("Embedding pre-filter: accepted")
+    assert sorted(service.evaluated) == ["a45", "a60"]
+    assert usage.prompt_tokens == 200
+    assert report.auto_rejected == 1 and report.auto_accepted == 1 and report.sent_to_llm == 2
+    assert report.llm_calls_saved == 2
+
+
+def test_failing_prefilter_falls_back_to_llm(service):
+    articles = [_article(angle) for angle in (85, 10)]
+    prefilter = EmbeddingPrefilter(BrokenEmbedder(), reject_below=0.2, accept_above=0.9)
+
+    filtered, _, report = asyncio.run(service.filter_articles_with_prefilter(articles, CONDITION, prefilter))
+
+    assert report is None
+    assert sorted(service.evaluated) == ["a10", "a85"]
+    assert all(fa.reasoning == "LLM" for fa in filtered)
+
+
+def test_embeddings_are_cached(tmp_path):
+    fake = FakeEmbedder()
+    embedder = CachedEmbedder(fake, EmbeddingCache(str(tmp_path / "embeddings.sqlite3"), ttl_seconds=3600))
+
+    first = asyncio.run(embedder.embed([CONDITION, "30", "60"]))
+    second = asyncio.run(embedder.embed(["60", "45", CONDITION]))
+
+    assert fake.embedded == [CONDITION, "30", "60", "45"]
+    np.testing.assert_allclose(second[0], first[2])
+    np.testing.assert_allclose(second[2], first[0])
+
+
+def test_calibration_respects_rates():
+    rng = np.random.default_rng(7)
+    accepted = rng.normal(0.6, 0.08, 500)
+    rejected = rng.normal(0.3, 0.08, 1500)
+    similarities = np.concatenate([accepted, rejected])
+    passed = np.concatenate([np.ones(500, dtype=bool), np.zeros(1500, dtype=bool)])
+
+    calibration = calibrate_thresholds(similarities, passed, max_missed_rate=0.01, max_false_accept_rate=0.02)
+
+    assert calibration.reject_below < calibration.accept_above
+    assert calibration.missed_accepts <= 0.01 * 500
+    assert calibration.false_accepts <= 0.02 * calibration.auto_accepted
+    assert calibration.llm_calls_saved_fraction > 0.3
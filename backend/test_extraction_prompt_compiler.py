@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test script for token-lean extraction prompt compilation.
+
+This script tests that:
+1. The schema is left out of the prompt unless structured outputs aren't enforced
+2. Source items are serialized compactly after a static, item-independent prefix
+3. invoke_extraction sends the compiled messages and reports prompt_tokens_saved in LLMUsage
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add the backend directory to the path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from services.extraction_prompt_compiler import ExtractionPromptCompiler
+from services.extraction_service import ExtractionPromptCaller
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "study_type": {"type": "string", "description": "Design of the study, e.g. randomized controlled trial"},
+        "sample_size": {"type": "integer", "description": "Number of participants enrolled"},
+        "population": {"type": "string", "description": "Population or organism studied"}
+    },
+    "required": ["study_type"]
+}
+INSTRUCTIONS = "study_type: classify the study design\nsample_size: total enrolled, null if not stated"
+ITEMS = [
+    {"id": "1", "title": "Melanocortin agonists in obesity", "abstract": "A trial in 120 adults...", "authors": ["A", "B"]},
+    {"id": "2", "title": "MC4R signalling in mice", "abstract": "We studied knockout mice...", "authors": ["C"]},
+]
+
+
+def _compiler(schema_in_prompt: bool = False) -> ExtractionPromptCompiler:
+    return ExtractionPromptCompiler(
+        SCHEMA, model="gpt-5-mini", schema_in_prompt=schema_in_prompt, count_tokens=lambda text: len(text) // 4
+    )
+
+
+def test_schema_left_out_unless_requested():
+    lean = _compiler().compile(ITEMS[0], INSTRUCTIONS)
+    prompt_text = "".join(message["content"] for message in lean.messages)
+    assert "Number of participants enrolled" not in prompt_text
+
+    with_schema = _compiler(schema_in_prompt=True).compile(ITEMS[0], INSTRUCTIONS)
+    assert json.dumps(SCHEMA, separators=(",", ":")) in with_schema.messages[0]["content"]
+    assert lean.prompt_tokens < with_schema.prompt_tokens < with_schema.baseline_prompt_tokens
+
+
+def test_static_prefix_and_compact_items():
+    compiler = _compiler()
+    first, second = (compiler.compile(item, INSTRUCTIONS) for item in ITEMS)
+
+    assert first.messages[0] == second.messages[0]
+    assert INSTRUCTIONS in first.messages[0]["content"]
+    assert first.messages[1] == {
+        "role": "user",
+        "content": "## Source Item\n" + json.dumps(ITEMS[0], separators=(",", ":"))
+    }
+    assert first.tokens_saved > 0
+
+
+def test_invoke_extraction_reports_savings():
+    caller = ExtractionPromptCaller(SCHEMA)
+    caller.compiler = _compiler()
+    sent = []
+
+    async def create(**params):
+        sent.append(params)
+        usage = SimpleNamespace(
+            prompt_tokens=150, completion_tokens=20, total_tokens=170,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=128)
+        )
+        message = SimpleNamespace(content=json.dumps({"study_type": "RCT", "sample_size": 120}))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+    caller.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    response = asyncio.run(caller.invoke_extraction(ITEMS[0], INSTRUCTIONS, return_usage=True))
+
+    expected = caller.compiler.compile(ITEMS[0], INSTRUCTIONS)
+    assert sent[0]["messages"] == expected.messages
+    assert sent[0]["response_format"]["json_schema"]["schema"] == SCHEMA
+    assert response.result["study_type"] == "RCT"
+    assert response.usage.prompt_tokens_saved == expected.tokens_saved > 0
+    assert response.usage.cached_prompt_tokens == 128
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test script for concurrent Google Scholar page fetching.
+
+This script tests that:
+1. Pages after the first are fetched concurrently, within the SerpAPI rate budget
+2. Pages are reassembled in order with their absolute positions
+3. Offsets stop at the total reported by the first page
+4. A failed page ends the results there and the discrepancy is still reported
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+# Add the backend directory to the path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from services import google_scholar_service
+from services.google_scholar_service import GoogleScholarService, SerpApiRateBudget
+from services.search_providers import health as health_module
+from services.search_providers.health import ProviderHealthService, ProviderHealthStore
+from services import serpapi_cache
+from services.serpapi_cache import OFF, SerpApiResponseCache
+
+MAX_CONCURRENT = 3
+
+
+class FakeSerpApi:
+    """SerpAPI stand-in serving numbered results and tracking concurrent requests"""
+
+    def __init__(self, total_results: int, failing_start: int = None):
+        self.total_results = total_results
+        self.failing_start = failing_start
+        self.starts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        start = int(request.url.params.get("start", 0))
+        num = int(request.url.params["num"])
+        self.starts.append(start)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.02)
+        finally:
+            self.in_flight -= 1
+
+        if start == self.failing_start:
+            return httpx.Response(500, text="upstream error")
+        results = [
+            {"title": f"Result {n}", "link": f"https://example.org/{n}", "position": n - start - 1}
+            for n in range(start + 1, min(start + num, self.total_results) + 1)
+        ]
+        return httpx.Response(200, json={
+            "organic_results": results,
+            "search_information": {"total_results": self.total_results}
+        })
+
+
+@pytest.fixture
+def serpapi(tmp_path, monkeypatch):
+    async_client = httpx.AsyncClient
+
+    def install(fake: FakeSerpApi) -> FakeSerpApi:
+        transport = httpx.MockTransport(fake.handle)
+        monkeypatch.setattr(httpx, "AsyncClient", lambda **kwargs: async_client(transport=transport, **kwargs))
+        return fake
+
+    store = ProviderHealthStore(str(tmp_path / "health.sqlite3"))
+    monkeypatch.setattr(health_module, "_health_service", ProviderHealthService(store))
+    monkeypatch.setattr(google_scholar_service, "serpapi_rate_budget", SerpApiRateBudget(MAX_CONCURRENT, 0))
+    monkeypatch.setattr(serpapi_cache, "_response_cache", SerpApiResponseCache("", 0, 0, mode=OFF))
+    return install
+
+
+def _search(num_results: int, start_index: int = 0):
+    service = GoogleScholarService(api_key="test")
+    return asyncio.run(service.search_articles_async("melanocortin", num_results=num_results, start_index=start_index))
+
+
+def test_pages_fetched_concurrently_and_reassembled_in_order(serpapi):
+    fake = serpapi(FakeSerpApi(total_results=1000))
+
+    articles, metadata = _search(100)
+
+    assert fake.starts[0] == 0
+    assert sorted(fake.starts[1:]) == [20, 40, 60, 80]
+    assert 1 < fake.max_in_flight <= MAX_CONCURRENT
+    assert [a.title for a in articles] == [f"Result {n}" for n in range(1, 101)]
+    assert [a.search_position for a in articles] == list(range(1, 101))
+    assert metadata["api_calls_made"] == 5
+    assert metadata["discrepancy_message"] is None
+
+
+def test_offsets_stop_at_reported_total(serpapi):
+    fake = serpapi(FakeSerpApi(total_results=45))
+
+    articles, metadata = _search(100)
+
+    assert sorted(fake.starts) == [0, 20, 40]
+    assert len(articles) == 45
+    assert metadata["total_results"] == 45 and metadata["returned_results"] == 45
+
+
+def test_failed_page_truncates_results_and_reports_discrepancy(serpapi):
+    serpapi(FakeSerpApi(total_results=1000, failing_start=60))
+
+    articles, metadata = _search(100)
+
+    assert [a.search_position for a in articles] == list(range(1, 61))
+    assert metadata["returned_results"] == 60
+    assert "only 60 articles could be retrieved" in metadata["discrepancy_message"]
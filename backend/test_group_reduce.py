@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Test script for the streaming group_reduce engine.
+
+This script tests that:
+1. Key and reduce expressions parse into the expected groups and aggregates, and
+   reducers missing an operation can't be created
+2. Spilling partial groups to disk gives the same results as aggregating in memory,
+   and oversized spill partitions are re-partitioned instead of loaded whole
+3. Results sort by any aggregate, include_items is capped per group and its
+   "items" field can't be shadowed by a reducer
+4. Asset content is streamed element by element from the asset store
+5. The group_reduce handler accepts executor-wrapped parameters
+"""
+
+import asyncio
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+# Add the backend directory to the path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from exceptions import AssetNotFoundError
+from schemas.tool_handler_schema import ToolHandlerInput, ToolParameterValue
+from services.asset_service import AssetService, iter_json_array
+from services.group_reduce import GroupReduceEngine, Reducer, group_reduce, parse_reduce_expression
+from tools.handlers.map_reduce_handlers import handle_map_reduce_rollup
+
+EMAILS = [
+    {"sender": "ann", "timestamp": "2024-03-01T09:00:00", "size": 10, "tags": ["work", "urgent"]},
+    {"sender": "bob", "timestamp": "2024-03-01T17:30:00", "size": 4, "tags": ["home"]},
+    {"sender": "ann", "timestamp": "2024-03-02T08:15:00", "size": 6, "tags": ["work"]},
+    {"sender": "ann", "timestamp": "2024-03-02T12:00:00", "size": "n/a", "tags": []},
+    {"timestamp": None, "size": 1},
+]
+
+
+def test_expressions():
+    result = group_reduce(
+        EMAILS, "sender", "count, sum(size), avg(size) as mean_size, max(timestamp), top_k(tags, 1)"
+    )
+    by_key = {r["group_key"]: r["aggregated_data"] for r in result.grouped_results}
+
+    assert [r["group_key"] for r in result.grouped_results] == ["ann", "bob", "unknown"]
+    assert by_key["ann"] == {
+        "count": 3, "sum(size)": 16, "mean_size": 8, "max(timestamp)": "2024-03-02T12:00:00",
+        "top_k(tags, 1)": [{"value": "work", "count": 2}]
+    }
+    assert by_key["unknown"]["count"] == 1
+    assert result.stats.items_processed == 5
+
+    by_day = group_reduce(EMAILS, "date(timestamp)", "count")
+    assert [(r["group_key"], r["aggregated_data"]["count"]) for r in by_day.grouped_results] == [
+        ("2024-03-01", 2), ("2024-03-02", 2), ("unknown", 1)
+    ]
+
+    composite = group_reduce(EMAILS[:3], "sender, date(timestamp)", "")
+    assert [r["group_key"] for r in composite.grouped_results] == [
+        "ann | 2024-03-01", "ann | 2024-03-02", "bob | 2024-03-01"
+    ]
+
+    with pytest.raises(ValueError):
+        parse_reduce_expression("sum")
+
+    class IncompleteReducer(Reducer):
+        def init(self):
+            return 0
+
+    with pytest.raises(TypeError):
+        IncompleteReducer("incomplete", lambda item: item)
+
+
+def test_spill_matches_in_memory():
+    rng = random.Random(7)
+    items = [
+        {"group": f"g{rng.randint(0, 299)}", "value": rng.randint(0, 1000), "tag": rng.choice("abcde")}
+        for _ in range(5000)
+    ]
+    expression = "count, sum(value), avg(value), min(value), max(value), top_k(tag, 2), collect_sample(value, 3)"
+
+    in_memory = group_reduce(items, "group", expression, max_groups_in_memory=10000)
+    spilled = group_reduce(items, "group", expression, max_groups_in_memory=20, spill_partitions=4)
+
+    assert in_memory.stats.spills == 0
+    assert spilled.stats.spills > 0
+    assert spilled.grouped_results == in_memory.grouped_results
+    assert spilled.stats.groups == in_memory.stats.groups == len({i["group"] for i in items})
+
+
+def test_oversized_partitions_are_repartitioned(monkeypatch):
+    items = [{"group": f"g{i % 500}", "value": i} for i in range(3000)]
+    peak = [0]
+    merge = GroupReduceEngine._merge
+
+    def tracking_merge(self, groups, key, states):
+        merge(self, groups, key, states)
+        peak[0] = max(peak[0], len(groups))
+    monkeypatch.setattr(GroupReduceEngine, "_merge", tracking_merge)
+
+    in_memory = group_reduce(items, "group", "count, sum(value)", max_groups_in_memory=10000)
+    peak[0] = 0
+    spilled = group_reduce(items, "group", "count, sum(value)", max_groups_in_memory=20, spill_partitions=2)
+
+    # Each of the two top-level partitions holds ~250 groups; merging never holds more than the cap
+    assert peak[0] <= 21
+    assert spilled.grouped_results == in_memory.grouped_results
+    assert spilled.stats.groups == 500
+
+
+def test_sorting_and_item_cap():
+    items = [{"k": k, "v": v} for k, v in [("a", 1), ("b", 5), ("b", 7), ("c", None), ("a", 2), ("b", 1)]]
+
+    result = group_reduce(
+        items, "k", "count, max(v)", sort_by="max(v)", sort_direction="desc",
+        include_items=True, max_items_per_group=2
+    )
+
+    assert [r["group_key"] for r in result.grouped_results] == ["b", "a", "c"]
+    assert result.grouped_results[0]["items"] == [{"k": "b", "v": 5}, {"k": "b", "v": 7}]
+    assert result.grouped_results[0]["aggregated_data"]["count"] == 3
+
+    with pytest.raises(ValueError):
+        group_reduce(items, "k", "count as items", include_items=True)
+    assert group_reduce(items, "k", "count as items").grouped_results[0]["aggregated_data"]["items"] == 2
+
+
+def test_asset_content_is_streamed():
+    assert list(iter_json_array(' [ {"a": [1, 2]} , "x", 3 ,null] ')) == [{"a": [1, 2]}, "x", 3, None]
+    assert list(iter_json_array("[]")) == []
+    assert list(iter_json_array('{"a": 1}')) == [{"a": 1}]
+
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE assets (id TEXT PRIMARY KEY, user_id INTEGER, content TEXT)"))
+        conn.execute(
+            text("INSERT INTO assets VALUES ('emails', 1, :content)"), {"content": json.dumps(EMAILS)}
+        )
+    db = sessionmaker(bind=engine)()
+    try:
+        service = AssetService(db)
+        assert list(service.iter_content_items("emails")) == EMAILS
+        assert list(service.iter_content_items("emails", user_id=1)) == EMAILS
+        with pytest.raises(AssetNotFoundError):
+            list(service.iter_content_items("emails", user_id=2))
+    finally:
+        db.close()
+
+
+def test_handler_accepts_wrapped_parameters():
+    result = asyncio.run(handle_map_reduce_rollup(ToolHandlerInput(params={
+        "items": ToolParameterValue(value=EMAILS),
+        "key_func": ToolParameterValue(value="sender"),
+        "reduce_func": ToolParameterValue(value="count"),
+        "sort_by": ToolParameterValue(value="count"),
+        "sort_direction": ToolParameterValue(value="desc")
+    })))
+
+    grouped = result.outputs["grouped_results"]
+    assert [(r["group_key"], r["aggregated_data"]["count"]) for r in grouped] == [
+        ("ann", 3), ("bob", 1), ("unknown", 1)
+    ]
+    assert result.metadata["items_processed"] == 5
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script for dependency-aware hop step execution.
+
+This script tests that:
+1. Step dependencies are derived from parameter/result asset mappings
+2. Independent steps run concurrently, up to the parallelism cap
+3. Execution is fail-fast: no new steps start after a failure
+4. Per-step progress events are emitted
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from typing import List
+
+# Add the backend directory to the path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from schemas.workflow import ToolStep, AssetFieldMapping, LiteralMapping
+from services.hop_executor import HopStepExecutor, build_step_dependencies
+
+
+def _step(step_id: str, order: int, reads: List[str] = (), writes: List[str] = ()) -> ToolStep:
+    parameter_mapping = {f"in_{a}": AssetFieldMapping(state_asset_id=a) for a in reads}
+    parameter_mapping["limit"] = LiteralMapping(value=10)
+    return ToolStep(
+        id=step_id,
+        tool_id="tool",
+        sequence_order=order,
+        name=step_id,
+        hop_id="hop",
+        parameter_mapping=parameter_mapping,
+        result_mapping={f"out_{a}": AssetFieldMapping(state_asset_id=a) for a in writes}
+    )
+
+
+# pubmed and web search are independent and only meet in extract
+STEPS = [
+    _step("pubmed", 0, writes=["pubmed_results"]),
+    _step("web", 1, writes=["web_results"]),
+    _step("extract", 2, reads=["pubmed_results", "web_results"], writes=["features"]),
+    _step("rewrite", 3, reads=["features"], writes=["web_results"]),
+]
+
+
+def test_dependencies_from_asset_mappings():
+    dependencies = build_step_dependencies(STEPS)
+    assert dependencies["pubmed"] == set()
+    assert dependencies["web"] == set()
+    assert dependencies["extract"] == {"pubmed", "web"}
+    # Reads extract's output and overwrites an asset extract read
+    assert dependencies["rewrite"] == {"extract", "web"}
+
+
+class _Recorder:
+    def __init__(self, fail: str = None):
+        self.fail = fail
+        self.running = 0
+        self.max_running = 0
+        self.started = []
+
+    async def run(self, step: ToolStep):
+        self.started.append(step.id)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.02)
+        self.running -= 1
+        if step.id == self.fail:
+            return {"success": False, "error": "boom"}
+        return {"success": True}
+
+
+async def test_independent_steps_run_concurrently():
+    recorder = _Recorder()
+    events = []
+    outcome = await HopStepExecutor(recorder.run, max_parallel=4, on_event=events.append).execute(STEPS)
+
+    assert outcome.executed_steps == 4 and not outcome.errors
+    assert recorder.max_running == 2
+    assert recorder.started == ["pubmed", "web", "extract", "rewrite"]
+    assert [e["type"] for e in events if e["tool_step_id"] == "extract"] == ["step_started", "step_completed"]
+
+
+async def test_parallelism_cap_of_one_is_sequential():
+    recorder = _Recorder()
+    await HopStepExecutor(recorder.run, max_parallel=1).execute(STEPS)
+    assert recorder.max_running == 1
+    assert recorder.started == ["pubmed", "web", "extract", "rewrite"]
+
+
+async def test_fail_fast_skips_remaining_steps():
+    recorder = _Recorder(fail="pubmed")
+    events = []
+    outcome = await HopStepExecutor(recorder.run, max_parallel=4, on_event=events.append).execute(STEPS)
+
+    # web was already running alongside pubmed and finishes; nothing new starts
+    assert recorder.started == ["pubmed", "web"]
+    assert outcome.executed_steps == 1
+    assert outcome.errors == ["Tool step pubmed failed: boom"]
+    assert outcome.skipped_step_ids == ["extract", "rewrite"]
+    assert [e["tool_step_id"] for e in events if e["type"] == "step_skipped"] == ["extract", "rewrite"]
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test script for streaming structured-output responses.
+
+This script tests that:
+1. The target string field is decoded incrementally, whatever the chunking
+2. Escapes split across chunks decode correctly
+3. Nested keys with the same name are ignored
+4. Streaming prompt calls forward tokens and still validate the full object
+"""
+
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Optional
+
+from pydantic import BaseModel
+
+# Add the backend directory to the path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from utils.partial_json import JsonFieldStreamer
+from agents.prompts.base_prompt_caller import BasePromptCaller, LLMResponse
+
+RESPONSE = {
+    "response_type": "MISSION_DEFINITION",
+    "nested": {"response_content": "not this one"},
+    "response_content": "Hello \"world\"\né \U0001F600 done",
+    "mission_proposal": {"name": "m", "outputs": [1, 2]},
+}
+
+
+def _stream(text: str, chunk_size: int) -> str:
+    streamer = JsonFieldStreamer("response_content")
+    out = "".join(streamer.feed(text[i:i + chunk_size]) for i in range(0, len(text), chunk_size))
+    assert streamer.complete
+    return out
+
+
+def test_field_decoded_for_any_chunking():
+    for ensure_ascii in (True, False):
+        text = json.dumps(RESPONSE, ensure_ascii=ensure_ascii)
+        for chunk_size in (1, 2, 5, 13, len(text)):
+            assert _stream(text, chunk_size) == RESPONSE["response_content"]
+
+
+def test_text_emitted_before_object_completes():
+    streamer = JsonFieldStreamer("response_content")
+    assert streamer.feed('{"response_type": "X", "response_content": "Hel') == "Hel"
+    assert streamer.feed('lo\\') == "lo"
+    assert streamer.feed('n wor') == "\n wor"
+    assert not streamer.complete
+
+
+class _Response(BaseModel):
+    response_content: str
+    extra: Optional[int] = None
+
+
+class _FakeStream:
+    def __init__(self, text: str):
+        self.chunks = [
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text[i:i + 4]))], usage=None)
+            for i in range(0, len(text), 4)
+        ]
+        usage = SimpleNamespace(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+        self.chunks.append(SimpleNamespace(choices=[], usage=usage))
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+async def test_streaming_invoke_forwards_tokens_and_validates():
+    caller = BasePromptCaller(response_model=_Response, system_message="test", messages_placeholder=False)
+    text = json.dumps({"response_content": "streamed answer", "extra": 3})
+    calls = []
+
+    async def create(**params):
+        calls.append(params)
+        return _FakeStream(text)
+
+    caller.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    tokens = []
+    response = await caller.invoke(log_prompt=False, return_usage=True, on_token=tokens.append)
+
+    assert calls[0]["stream"] is True
+    assert len(tokens) > 1 and "".join(tokens) == "streamed answer"
+    assert isinstance(response, LLMResponse)
+    assert response.result.extra == 3
+    assert response.usage.total_tokens == 15
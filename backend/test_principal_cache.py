@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Test script for the authenticated-principal cache used by validate_token.
+
+This script tests that:
+1. Tokens carrying user_id/role claims validate without a DB query
+2. DB-loaded principals are cached per token until the TTL expires
+3. Role-change invalidation forces older tokens back to the DB
+4. Revoked tokens are rejected
+5. Revocations and invalidations made in one worker apply in the others after a sync
+6. Lookups never query the revocation store
+"""
+
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+# Add the backend directory to the path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from models import AuthRevocation, User, UserRole
+from services import auth_service
+from services.principal_cache import PrincipalCache, RevocationStore, principal_cache
+
+
+def _credentials(token: str) -> HTTPAuthorizationCredentials:
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+def _mock_db(user: User) -> MagicMock:
+    db = MagicMock(spec=Session)
+    db.query.return_value.filter.return_value.first.return_value = user
+    return db
+
+
+@pytest.fixture
+def revocation_db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'revocations.db'}")
+    AuthRevocation.__table__.create(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def _reset_cache(revocation_db, monkeypatch):
+    monkeypatch.setattr(principal_cache, "revocations", RevocationStore(sessionmaker(bind=revocation_db), 3600))
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
+async def test_claims_fast_path_skips_db(monkeypatch):
+    monkeypatch.setattr(principal_cache, "trust_claims", True)
+    token = auth_service.create_access_token(
+        {"sub": "a@example.com", "user_id": 7, "username": "a", "role": "user"}
+    )
+    db = _mock_db(None)
+
+    user = await auth_service.validate_token(_credentials(token), db)
+
+    assert user.user_id == 7
+    assert user.role == UserRole.USER
+    assert user.username == "a"
+    db.query.assert_not_called()
+
+
+async def test_role_change_invalidation_forces_db_lookup():
+    token = auth_service.create_access_token(
+        {"sub": "b@example.com", "user_id": 8, "username": "b", "role": "user"}
+    )
+    time.sleep(0.01)
+    auth_service.invalidate_user_principal(8)
+
+    db_user = User(user_id=8, email="b@example.com", role=UserRole.ADMIN, is_active=True)
+    db = _mock_db(db_user)
+
+    user = await auth_service.validate_token(_credentials(token), db)
+    assert user.role == UserRole.ADMIN
+    assert db.query.call_count == 1
+
+    # Second request for the same token is served from the cache
+    user = await auth_service.validate_token(_credentials(token), db)
+    assert user.role == UserRole.ADMIN
+    assert db.query.call_count == 1
+
+
+async def test_revoked_token_is_rejected():
+    token = auth_service.create_access_token(
+        {"sub": "c@example.com", "user_id": 9, "username": "c", "role": "user"}
+    )
+    auth_service.revoke_token(token)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await auth_service.validate_token(_credentials(token), _mock_db(None))
+    assert exc_info.value.status_code == 401
+
+
+def test_cache_is_size_bounded_and_expires():
+    cache = PrincipalCache(ttl_seconds=0, max_size=2, trust_claims=False)
+    for i in range(3):
+        cache.store({"jti": f"t{i}"}, User(user_id=i, email=f"{i}@x", role=UserRole.USER, is_active=True))
+    assert len(cache._entries) == 2
+    # ttl=0 means entries are already expired
+    assert cache.lookup({"jti": "t2"}) is None
+
+
+def test_revocation_and_invalidation_are_shared_between_workers(revocation_db):
+    worker_a, worker_b = (
+        PrincipalCache(
+            ttl_seconds=60, max_size=10, trust_claims=True,
+            revocations=RevocationStore(sessionmaker(bind=revocation_db), 3600)
+        )
+        for _ in range(2)
+    )
+    now = time.time()
+    claims = {"sub": "d@example.com", "user_id": 10, "role": "user", "jti": "t1", "iat": int(now) - 5, "exp": now + 600}
+    db_loaded = {"sub": "d@example.com", "jti": "t2", "exp": now + 600}
+    assert worker_b.lookup(claims) is not None
+    worker_b.store(db_loaded, User(user_id=10, email="d@example.com", role=UserRole.USER, is_active=True))
+    assert worker_b.lookup(db_loaded) is not None
+
+    # A role change in worker A sends both of worker B's tokens back to the DB once B syncs
+    worker_a.invalidate_user(10)
+    assert worker_a.lookup(claims) is None
+    worker_b.sync_revocations()
+    assert worker_b.lookup(claims) is None
+    assert worker_b.lookup(db_loaded) is None
+
+    # Logout in worker A is enforced by worker B after its next sync
+    worker_a.revoke(claims)
+    assert worker_a.is_revoked(claims)
+    assert not worker_b.is_revoked(claims)
+    worker_b.sync_revocations()
+    assert worker_b.is_revoked(claims)
+
+    # A new worker picks up everything that hasn't expired
+    worker_c = PrincipalCache(
+        ttl_seconds=60, max_size=10, trust_claims=True,
+        revocations=RevocationStore(sessionmaker(bind=revocation_db), 3600)
+    )
+    worker_c.sync_revocations()
+    assert worker_c.is_revoked(claims)
+    assert worker_c.lookup(db_loaded) is None
+
+
+def test_lookups_do_not_query_the_store(revocation_db):
+    cache = PrincipalCache(
+        ttl_seconds=60, max_size=10, trust_claims=True,
+        revocations=RevocationStore(sessionmaker(bind=revocation_db), 3600)
+    )
+    cache.sync_revocations()
+    statements = []
+    event.listen(revocation_db, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    claims = {"sub": "e@example.com", "user_id": 11, "role": "user", "jti": "t3", "iat": int(time.time()), "exp": time.time() + 600}
+    for _ in range(3):
+        assert not cache.is_revoked(claims)
+        assert cache.lookup(claims) is not None
+    assert statements == []
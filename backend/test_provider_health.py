@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared search provider health service.
+
+This script tests that:
+1. Health state written by one worker is visible to another through the shared store
+2. The circuit breaker opens on the failure rate, then allows one trial after the cooldown
+3. Exhausted quota and failed probes make searches fail fast
+4. Only one worker at a time holds the probe lease
+5. While syncing in the background, calls through a closed breaker don't touch the store
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the backend directory to the path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from config.settings import settings
+from exceptions import ProviderUnavailableError
+from services.google_scholar_service import GoogleScholarService
+from services.search_providers import health as health_module
+from services import serpapi_cache
+from services.serpapi_cache import OFF, SerpApiResponseCache
+from services.search_providers.health import (
+    CLOSED, HALF_OPEN, OPEN, ProbeResult, ProviderHealthService, ProviderHealthStore
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def workers(tmp_path, clock):
+    """Two services over the same file, as two gunicorn workers would have"""
+    path = str(tmp_path / "health.sqlite3")
+    return ProviderHealthService(ProviderHealthStore(path), clock), ProviderHealthService(ProviderHealthStore(path), clock)
+
+
+def test_breaker_trips_on_failure_rate_and_is_shared(workers, clock):
+    worker_a, worker_b = workers
+    for _ in range(settings.PROVIDER_BREAKER_MIN_REQUESTS - 1):
+        worker_a.record_failure("scholar", "HTTP 503")
+    assert worker_b.check("scholar") is None
+
+    worker_b.record_failure("scholar", "HTTP 503")
+    assert worker_a.get_status("scholar").breaker_state == OPEN
+    assert "circuit open" in worker_a.check("scholar")
+    assert worker_b.cached_availability("scholar") is False
+
+    # After the cooldown exactly one caller gets the trial request
+    clock.now += settings.PROVIDER_BREAKER_COOLDOWN_SECONDS
+    assert worker_a.check("scholar") is None
+    assert worker_b.get_status("scholar").breaker_state == HALF_OPEN
+    assert "trial request in flight" in worker_b.check("scholar")
+
+    worker_a.record_success("scholar")
+    assert worker_b.get_status("scholar").breaker_state == CLOSED
+    assert worker_b.check("scholar") is None
+
+
+def test_failed_trial_reopens_breaker(workers, clock):
+    worker_a, _ = workers
+    for _ in range(settings.PROVIDER_BREAKER_MIN_REQUESTS):
+        worker_a.record_failure("pubmed", "timeout")
+    clock.now += settings.PROVIDER_BREAKER_COOLDOWN_SECONDS
+    assert worker_a.check("pubmed") is None
+
+    worker_a.record_failure("pubmed", "timeout")
+    assert worker_a.get_status("pubmed").breaker_state == OPEN
+    assert worker_a.check("pubmed") is not None
+
+
+def test_quota_and_probe_results_fail_fast(workers, clock):
+    worker_a, worker_b = workers
+    worker_a.record_probe("scholar", ProbeResult(available=True, quota_remaining=settings.SERPAPI_QUOTA_RESERVE + 2))
+    assert worker_b.cached_availability("scholar") is True
+
+    worker_b.consume_quota("scholar")
+    assert worker_a.check("scholar") is None
+    worker_b.consume_quota("scholar")
+    assert worker_a.check("scholar") == "search quota exhausted"
+
+    worker_a.record_probe("pubmed", ProbeResult(available=False, error="HTTP 502"))
+    assert "health probe failed" in worker_b.check("pubmed")
+    # Stale probe results no longer block
+    clock.now += settings.PROVIDER_HEALTH_TTL_SECONDS
+    assert worker_b.check("pubmed") is None
+    assert worker_b.cached_availability("pubmed") is None
+
+
+def test_probe_lease_is_exclusive(workers, clock):
+    worker_a, worker_b = workers
+    assert worker_a.try_acquire_probe_lease("pubmed", 60)
+    assert not worker_b.try_acquire_probe_lease("pubmed", 60)
+    clock.now += 60
+    assert worker_b.try_acquire_probe_lease("pubmed", 60)
+
+
+def test_scholar_search_fails_fast_when_exhausted(workers, monkeypatch):
+    worker_a, _ = workers
+    worker_a.record_quota("scholar", 0)
+    monkeypatch.setattr(health_module, "_health_service", worker_a)
+    monkeypatch.setattr(serpapi_cache, "_response_cache", SerpApiResponseCache("", 0, 0, mode=OFF))
+
+    def _no_network(*args, **kwargs):
+        raise AssertionError("SerpAPI must not be called")
+
+    monkeypatch.setattr("services.google_scholar_service.requests.get", _no_network)
+    with pytest.raises(ProviderUnavailableError):
+        GoogleScholarService(api_key="test").search_articles("melanocortin", num_results=20)
+
+
+def test_background_sync_keeps_calls_in_memory(workers, monkeypatch):
+    worker_a, worker_b = workers
+    worker_a.syncing = True
+    worker_a.record_probe("scholar", ProbeResult(available=True, quota_remaining=100))
+    assert worker_a.check("scholar") is None
+
+    store_calls = []
+    for name in ("get", "update"):
+        original = getattr(worker_a.store, name)
+        monkeypatch.setattr(
+            worker_a.store, name, lambda *args, _original=original, _name=name: store_calls.append(_name) or _original(*args)
+        )
+
+    for _ in range(settings.PROVIDER_BREAKER_MIN_REQUESTS):
+        assert worker_a.check("scholar") is None
+        worker_a.record_failure("scholar", "HTTP 503")
+        worker_a.consume_quota("scholar")
+    assert store_calls == []
+    assert worker_b.get_status("scholar").breaker_state == CLOSED
+
+    # One sync writes the counted outcomes, which trips the shared breaker
+    worker_a.sync()
+    status = worker_b.get_status("scholar")
+    assert status.breaker_state == OPEN
+    assert status.quota_remaining == 100 - settings.PROVIDER_BREAKER_MIN_REQUESTS
+    assert "circuit open" in worker_a.check("scholar")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test script for the PubMed search designer coverage check.
+
+This script tests that:
+1. Coverage is asked of PubMed with ID-restricted queries plus one count query
+2. Large PMID lists are chunked to stay within the URL length limit
+3. Repeated checks only query phrase/PMID pairs that are not cached
+"""
+
+import re
+import sys
+from pathlib import Path
+
+# Add the backend directory to the path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from services.pubmed_coverage_service import CoverageCache, PubMedCoverageService
+from services.pubmed_service import PUBMED_MAX_URL_LENGTH, PubMedService
+
+
+class FakePubMedService(PubMedService):
+    """Answers esearch calls from an in-memory index instead of NCBI"""
+
+    def __init__(self, index):
+        super().__init__(api_key=None)
+        self.index = index
+        self.calls = []
+
+    def _get_article_ids(self, search_term, max_results=100, **kwargs):
+        params = self._build_search_params(search_term, max_results)
+        assert self._search_url_length(params) <= PUBMED_MAX_URL_LENGTH
+        self.calls.append((search_term, params['retmax']))
+
+        match = re.fullmatch(r"\((.*)\) AND \((.*)\)", search_term)
+        if match is None:
+            return [], len(self.index.get(search_term, ()))
+        phrase, id_clause = match.groups()
+        requested = re.findall(r"(\d+)\[uid\]", id_clause)
+        found = [pmid for pmid in requested if pmid in self.index.get(phrase, ())]
+        return found[:params['retmax']], len(found)
+
+
+def _service(index):
+    pubmed = FakePubMedService(index)
+    return PubMedCoverageService(pubmed, CoverageCache(ttl_seconds=60, max_size=1000)), pubmed
+
+
+def test_coverage_uses_count_and_id_restricted_queries():
+    service, pubmed = _service({"melanocortin": {"111", "333"}})
+
+    result = service.check_coverage("melanocortin", ["111", "222", "333", "abc"])
+
+    assert result.estimated_count == 2
+    assert result.covered_ids == ["111", "333"]
+    assert result.not_covered_ids == ["222", "abc"]
+    assert result.coverage_percentage == 50.0
+    assert pubmed.calls == [
+        ("melanocortin", 0),
+        ("(melanocortin) AND (111[uid] OR 222[uid] OR 333[uid])", 3),
+    ]
+
+
+def test_large_pmid_lists_are_chunked():
+    pmids = [str(30000000 + i) for i in range(300)]
+    service, pubmed = _service({"retinopathy": set(pmids[::7])})
+
+    result = service.check_coverage("retinopathy", pmids)
+
+    assert result.covered_ids == pmids[::7]
+    id_queries = pubmed.calls[1:]
+    assert len(id_queries) > 1
+    assert sum(retmax for _, retmax in id_queries) == len(pmids)
+
+
+def test_phrase_edits_only_requery_uncached_pairs():
+    service, pubmed = _service({"dry eye": {"111"}, "dry eye OR keratitis": {"111", "222"}})
+
+    service.check_coverage("dry eye", ["111", "222"])
+    pubmed.calls.clear()
+
+    # Same phrase modulo whitespace, one new target: only the new PMID is queried
+    result = service.check_coverage("dry   eye", ["111", "222", "333"])
+    assert pubmed.calls == [("(dry eye) AND (333[uid])", 1)]
+    assert (result.queried_ids, result.cached_ids) == (1, 2)
+
+    # Edited phrase: its pairs are checked afresh
+    pubmed.calls.clear()
+    result = service.check_coverage("dry eye OR keratitis", ["111", "222"])
+    assert result.covered_ids == ["111", "222"]
+    assert len(pubmed.calls) == 2
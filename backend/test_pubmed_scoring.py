@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Test script for columnar PubMed article scoring and ranking.
+
+This script tests that:
+1. Vectorized component scores, totals, percentiles and normalization match per-article scoring
+2. All ranking filters are combined and the result is sorted and cut once
+3. The pubmed_score_articles handler accepts executor-wrapped parameters and counts
+   extractions without usable features as failed
+"""
+
+import asyncio
+import random
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add the backend directory to the path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from schemas.canonical_types import CanonicalPubMedExtraction, CanonicalScoredArticle
+from schemas.tool_handler_schema import ToolHandlerInput, ToolParameterValue
+from services.pubmed_scoring import DEFAULT_SCORING_CRITERIA, FeatureColumns, filter_rank, score_columns
+from tools.handlers.pubmed_handlers import handle_pubmed_score_articles
+
+CURRENT_YEAR = 2026
+
+
+def _extraction(i: int, rng: random.Random) -> CanonicalPubMedExtraction:
+    return CanonicalPubMedExtraction(
+        item_id=str(i),
+        original_article={
+            "pmid": str(i), "title": f"Article {i}", "abstract": "...", "journal": rng.choice(["Nature", "Cell", "JAMA"]),
+            "authors": rng.sample(["Smith", "Jones", "Lee", "Garcia"], 2),
+            "publication_date": rng.choice([f"{rng.randint(2005, 2026)}-03-01", "", None, "unknown"])
+        },
+        extraction={
+            "clinical_relevance": rng.choice([1, 4.5, "5", "high", None]),
+            "innovation_score": rng.choice([2, "3", "n/a"]),
+            "quality_indicators": rng.choice(["Randomized, blinded", "controlled peer-reviewed randomized", "", None]),
+            "sample_size": rng.choice(["n=1500", "250 patients", "12", "unknown", 7]),
+            "study_type": rng.choice(["RCT", "cohort", "Review"])
+        }
+    )
+
+
+def _reference_scores(extractions, criteria):
+    """Per-article scoring as the handler did it before the columnar engine"""
+    totals = []
+    for extraction in extractions:
+        features, article = extraction.extraction, extraction.original_article
+        total = 0.0
+        for criterion, config in criteria.items():
+            if criterion in ("clinical_relevance", "innovation_score"):
+                value = features.get(criterion)
+                score = float(value) if isinstance(value, (int, float)) or (isinstance(value, str) and value.isdigit()) else 3.0
+            elif criterion == "study_quality":
+                indicators = (features.get("quality_indicators") or "").lower()
+                score = min(3.0 + 0.5 * sum(k in indicators for k in ("randomized", "blinded", "controlled", "peer-reviewed")), config["max_score"])
+            elif criterion == "sample_size":
+                numbers = re.findall(r"\d+", str(features.get("sample_size", "0")))
+                size = int(numbers[0]) if numbers else 0
+                thresholds = config["thresholds"]
+                score = 5.0 if size >= thresholds["high"] else 4.0 if size >= thresholds["medium"] else 3.0 if size >= thresholds["low"] else 2.0
+            else:
+                try:
+                    years_old = CURRENT_YEAR - int(article.publication_date.split("-")[0])
+                    score = 5.0 if years_old <= 1 else 4.0 if years_old <= 3 else 3.0 if years_old <= 5 else 2.0 if years_old <= 10 else 1.0
+                except (AttributeError, ValueError):
+                    score = 2.0
+            total += score * config["weight"]
+        totals.append(total)
+
+    percentiles = [len([s for s in totals if s < t]) / len(totals) * 100 for t in totals]
+    low, high = min(totals), max(totals)
+    normalized = [(t - low) / ((high - low) or 1) * 100 for t in totals]
+    return totals, percentiles, normalized
+
+
+def test_columnar_scores_match_per_article_scoring():
+    rng = random.Random(11)
+    extractions = [_extraction(i, rng) for i in range(400)]
+
+    scores = score_columns(FeatureColumns.from_extractions(extractions), DEFAULT_SCORING_CRITERIA, current_year=CURRENT_YEAR)
+    totals, percentiles, normalized = _reference_scores(extractions, DEFAULT_SCORING_CRITERIA)
+
+    np.testing.assert_allclose(scores.total, totals)
+    np.testing.assert_allclose(scores.percentile, percentiles)
+    np.testing.assert_allclose(scores.final, normalized)
+
+
+def _scored(i, score, journal, authors, date, study_type, percentile=None):
+    return CanonicalScoredArticle(
+        article_with_features={
+            "item_id": str(i),
+            "original_article": {"pmid": str(i), "title": "t", "abstract": "a", "journal": journal,
+                                 "authors": authors, "publication_date": date},
+            "extraction": {"study_type": study_type}
+        },
+        total_score=score,
+        score_breakdown={},
+        percentile_rank=percentile
+    )
+
+
+def test_filters_combined_then_ranked():
+    articles = [
+        _scored(0, 80, "Nature", ["Smith"], "2021-01-01", "RCT", 70),
+        _scored(1, 95, "Nature", ["Jones"], "2019-05-01", "rct", 90),
+        _scored(2, 40, "Nature", ["Smith"], "2022-01-01", "RCT", 10),
+        _scored(3, 70, "Cell", ["Smith"], "2023-01-01", "RCT", 50),
+        _scored(4, 85, "Nature", ["Lee", "Smith"], None, "RCT", 80),
+        _scored(5, 90, "Nature", ["Smith"], "2024-02-01", "Cohort", 85),
+        _scored(6, 75, "JAMA", ["Smith"], "2020-01-01", "RCT", None),
+    ]
+    filters = {
+        "journal_filter": ["Nature", "JAMA"],
+        "author_filter": "Smith",
+        "study_type": ["rct"],
+        "year_range": {"start": 2020, "end": 2023}
+    }
+
+    assert filter_rank(articles, 50, filters) == [0, 6]
+    assert filter_rank(articles, 50, filters, sort_order="asc") == [6, 0]
+    assert filter_rank(articles, 0, {"author_filter": ["Smith"]}, sort_by="publication_date") == [5, 3, 2, 0, 6, 4]
+    assert filter_rank(articles, 0, {}, sort_by="percentile", max_results=3) == [1, 5, 4]
+    assert filter_rank(articles, 0, {}, sort_by="unknown", max_results=2) == [0, 1]
+
+
+def test_handler_accepts_wrapped_parameters():
+    rng = random.Random(5)
+    extractions = [_extraction(i, rng).model_dump() for i in range(5)]
+    extractions.append({**extractions[0], "item_id": "failed", "extraction": {"error": "Extraction failed: timeout"}})
+
+    result = asyncio.run(handle_pubmed_score_articles(ToolHandlerInput(params={
+        "extractions": ToolParameterValue(value=extractions),
+        "normalize_scores": ToolParameterValue(value=False)
+    })))
+
+    scored = result.outputs["scored_articles"]
+    assert [a.article_with_features.item_id for a in scored] == ["0", "1", "2", "3", "4", "failed"]
+    assert set(scored[0].score_breakdown) == set(DEFAULT_SCORING_CRITERIA)
+    assert scored[0].total_score == sum(c["weighted_score"] for c in scored[0].score_breakdown.values())
+    assert result.outputs["scoring_summary"]["successfully_scored"] == 5
+    assert result.outputs["scoring_summary"]["failed_scoring"] == 1
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test script for server-side search result sets.
+
+This script tests that:
+1. Registered result sets resolve by handle, optionally to an ID subset
+2. Handles are scoped to the user that created them
+3. Sets evicted from the in-memory cache are spilled to the database
+4. With several workers, cached copies are refreshed after another worker appends,
+   and concurrent appends are all kept
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add the backend directory to the path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from exceptions import ResultSetNotFoundError, ValidationError
+from models import SearchResultSet
+from schemas.canonical_types import CanonicalResearchArticle
+from services.result_set_service import ResultSetCache, ResultSetService
+
+
+def _articles(count: int):
+    return [
+        CanonicalResearchArticle(id=str(i), source="pubmed", title=f"Article {i}", abstract="...")
+        for i in range(count)
+    ]
+
+
+def _service(max_sets: int = 10) -> ResultSetService:
+    service = ResultSetService(db=AsyncMock(), cache=ResultSetCache(max_sets=max_sets))
+    service.persist_on_create = False
+    return service
+
+
+async def test_handle_resolves_to_articles_and_subsets():
+    service = _service()
+    result_set = await service.create(1, _articles(5), source="pubmed", query="q")
+
+    assert len(await service.get_articles(result_set.id, 1)) == 5
+    subset = await service.get_articles(result_set.id, 1, article_ids=["3", "1"])
+    assert [a.id for a in subset] == ["3", "1"]
+
+    with pytest.raises(ValidationError):
+        await service.get_articles(result_set.id, 1, article_ids=["99"])
+
+
+async def test_append_extends_set_without_duplicates():
+    service = _service()
+    result_set = await service.create(1, _articles(3))
+    await service.append(result_set.id, 1, _articles(5))
+
+    assert [a.id for a in await service.get_articles(result_set.id, 1)] == ["0", "1", "2", "3", "4"]
+
+
+async def test_handle_is_scoped_to_owner():
+    service = _service()
+    service.db.scalar.return_value = None
+    result_set = await service.create(1, _articles(2))
+
+    with pytest.raises(ResultSetNotFoundError):
+        await service.get(result_set.id, 2)
+
+
+async def test_eviction_spills_to_database():
+    service = _service(max_sets=1)
+    first = await service.create(1, _articles(2))
+    service.db.merge.assert_not_called()
+
+    await service.create(1, _articles(1))
+
+    service.db.merge.assert_awaited_once()
+    spilled = service.db.merge.await_args.args[0]
+    assert spilled.id == first.id
+    assert spilled.article_count == 2
+    assert first.persisted
+
+
+class _AsyncSession:
+    """The AsyncSession calls ResultSetService makes, run on a sync session (no async SQLite driver here)"""
+
+    def __init__(self, session):
+        self.session = session
+
+    async def scalar(self, statement):
+        return self.session.scalar(statement)
+
+    async def execute(self, statement):
+        return self.session.execute(statement)
+
+    async def merge(self, instance):
+        return self.session.merge(instance)
+
+    async def commit(self):
+        self.session.commit()
+
+    async def rollback(self):
+        self.session.rollback()
+
+
+def _workers(tmp_path):
+    """Two services with their own caches and sessions over one database, as two workers would have"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'result_sets.db'}")
+    SearchResultSet.__table__.create(engine)
+    session_factory = sessionmaker(bind=engine, expire_on_commit=False)
+    workers = []
+    for _ in range(2):
+        service = ResultSetService(db=_AsyncSession(session_factory()), cache=ResultSetCache(max_sets=10))
+        service.persist_on_create = True
+        workers.append(service)
+    return workers
+
+
+async def test_cached_copy_refreshed_after_other_worker_appends(tmp_path):
+    worker_a, worker_b = _workers(tmp_path)
+    result_set = await worker_a.create(1, _articles(2))
+    assert len(await worker_b.get_articles(result_set.id, 1)) == 2
+
+    await worker_a.append(result_set.id, 1, _articles(4))
+
+    assert [a.id for a in await worker_b.get_articles(result_set.id, 1)] == ["0", "1", "2", "3"]
+
+
+async def test_concurrent_appends_are_not_lost(tmp_path):
+    worker_a, worker_b = _workers(tmp_path)
+    result_set = await worker_a.create(1, _articles(1))
+    page_a = [CanonicalResearchArticle(id="a", source="pubmed", title="A", abstract="...")]
+    page_b = [CanonicalResearchArticle(id="b", source="pubmed", title="B", abstract="...")]
+
+    # Worker B appends between worker A reading the set and writing it back
+    load = worker_a._load
+    interleaved = []
+
+    async def load_then_race(result_set_id):
+        current = await load(result_set_id)
+        if not interleaved:
+            interleaved.append(True)
+            await worker_b.append(result_set_id, 1, page_b)
+        return current
+
+    worker_a._load = load_then_race
+    await worker_a.append(result_set.id, 1, page_a)
+
+    assert [a.id for a in await worker_b.get_articles(result_set.id, 1)] == ["0", "b", "a"]
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test script for async Google Scholar abstract enrichment.
+
+This script tests that:
+1. Semantic Scholar and Crossref are raced and the first abstract found wins
+2. Found abstracts and definite misses are cached by DOI; failed lookups are retried
+3. Enriched articles are yielded as they complete, with their original index
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the backend directory to the path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from services import doi_abstract_cache
+from services.doi_abstract_cache import DoiAbstractCache
+from services.google_scholar_enrichment import GoogleScholarEnrichmentService
+from services.google_scholar_service import GoogleScholarArticle
+
+
+class FakeResponse:
+    def __init__(self, status: int, payload: dict):
+        self.status = status
+        self.payload = payload
+        self.headers = {}
+
+    async def json(self):
+        return self.payload
+
+
+class FakeSession:
+    """Routes requests by host to (delay, status, payload); records what was requested"""
+
+    def __init__(self, routes: dict):
+        self.routes = routes
+        self.requested = []
+
+    def get(self, url: str, **kwargs):
+        host = "semantic_scholar" if "semanticscholar" in url else "crossref" if "crossref" in url else "page"
+        self.requested.append((host, url))
+        delay, status, payload = self.routes[host](url) if callable(self.routes[host]) else self.routes[host]
+
+        class Request:
+            async def __aenter__(self):
+                await asyncio.sleep(delay)
+                return FakeResponse(status, payload)
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return Request()
+
+
+def _article(doi: str = None, title: str = "Article") -> GoogleScholarArticle:
+    return GoogleScholarArticle(title=title, link="", authors=[], snippet="snippet", abstract="", doi=doi, position=0)
+
+
+@pytest.fixture(autouse=True)
+def abstract_cache(tmp_path, monkeypatch):
+    cache = DoiAbstractCache(str(tmp_path / "doi.sqlite3"), ttl_seconds=3600, negative_ttl_seconds=60)
+    monkeypatch.setattr(doi_abstract_cache, "_abstract_cache", cache)
+    return cache
+
+
+def test_first_abstract_wins_and_is_cached():
+    session = FakeSession({
+        "semantic_scholar": (0.5, 200, {"abstract": "From Semantic Scholar"}),
+        "crossref": (0.01, 200, {"message": {"abstract": "<jats:p>From Crossref</jats:p>"}}),
+    })
+    service = GoogleScholarEnrichmentService()
+
+    article = _article(doi="10.1000/ABC")
+    asyncio.run(service.enrich_article_summary_async(article, session))
+    assert article.abstract == "From Crossref"
+    assert article.metadata["enrichment"]["successful_source"] == "crossref"
+
+    cached = _article(doi="10.1000/abc")
+    session.requested.clear()
+    asyncio.run(service.enrich_article_summary_async(cached, session))
+    assert cached.abstract == "From Crossref"
+    assert cached.metadata["enrichment"]["cache_hit"] is True
+    assert session.requested == []
+
+
+def test_misses_are_cached_but_failures_are_retried():
+    service = GoogleScholarEnrichmentService()
+    missing = FakeSession({"semantic_scholar": (0, 404, {}), "crossref": (0, 200, {"message": {}})})
+
+    for _ in range(2):
+        article = _article(doi="10.1000/missing")
+        asyncio.run(service.enrich_article_summary_async(article, missing))
+        assert article.abstract == "snippet"
+    assert len(missing.requested) == 2
+
+    failing = FakeSession({"semantic_scholar": (0, 429, {}), "crossref": (0, 404, {})})
+    for _ in range(2):
+        article = _article(doi="10.1000/rate-limited")
+        asyncio.run(service.enrich_article_summary_async(article, failing))
+        assert "429" in article.metadata["enrichment"]["semantic_scholar"]["error"]
+    assert len(failing.requested) == 4
+
+
+def test_articles_are_yielded_as_they_complete():
+    delays = {"10.1000/slow": 0.2, "10.1000/medium": 0.1, "10.1000/fast": 0.0}
+    session = FakeSession({
+        "semantic_scholar": lambda url: (delays[url.split("DOI:")[1].split("?")[0]], 200, {"abstract": url}),
+        "crossref": (1, 404, {}),
+    })
+    articles = [_article(doi=doi, title=doi) for doi in delays]
+
+    async def collect():
+        return [
+            (index, article.title)
+            async for index, article in GoogleScholarEnrichmentService().iter_enriched_articles(articles, session=session)
+        ]
+
+    assert asyncio.run(collect()) == [(2, "10.1000/fast"), (1, "10.1000/medium"), (0, "10.1000/slow")]
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test script for the multi-provider search fan-out.
+
+This script tests that:
+1. Providers are searched concurrently (latency ~ slowest provider)
+2. A provider that misses its deadline yields a partial-result error entry
+3. Articles are merged and deduplicated across providers by DOI/PMID
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add the backend directory to the path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from schemas.canonical_types import CanonicalResearchArticle
+from services.search_providers import (
+    SearchProvider, UnifiedSearchParams, SearchResponse, SearchMetadata,
+    ProviderInfo, register_provider, fan_out_search, merged_search
+)
+
+
+def _make_provider(provider_id: str, delay: float, articles):
+    class FakeProvider(SearchProvider):
+        @property
+        def provider_id(self) -> str:
+            return provider_id
+
+        @property
+        def provider_info(self) -> ProviderInfo:
+            return ProviderInfo(id=provider_id, name=provider_id, description="fake", supported_features=[])
+
+        async def search(self, params: UnifiedSearchParams) -> SearchResponse:
+            await asyncio.sleep(delay)
+            return SearchResponse(
+                articles=articles,
+                metadata=SearchMetadata(
+                    total_results=len(articles),
+                    returned_results=len(articles),
+                    search_time=delay,
+                    provider=provider_id
+                )
+            )
+
+        async def is_available(self) -> bool:
+            return True
+
+    return FakeProvider
+
+
+register_provider("fake_a", _make_provider("fake_a", 0.2, [
+    CanonicalResearchArticle(id="pubmed_1", source="pubmed", title="One", pmid="1", doi="10.1/ABC"),
+    CanonicalResearchArticle(id="pubmed_2", source="pubmed", title="Two", pmid="2"),
+]))
+register_provider("fake_b", _make_provider("fake_b", 0.2, [
+    CanonicalResearchArticle(id="s1", source="google_scholar", title="One", doi="https://doi.org/10.1/abc",
+                             citation_count=7),
+    CanonicalResearchArticle(id="s3", source="google_scholar", title="Three"),
+]))
+register_provider("fake_slow", _make_provider("fake_slow", 5.0, []))
+
+
+async def test_fan_out_is_concurrent():
+    params = UnifiedSearchParams(query="test")
+    start = time.monotonic()
+    responses = await fan_out_search(["fake_a", "fake_b"], params)
+    elapsed = time.monotonic() - start
+
+    assert [r.metadata.provider for r in responses] == ["fake_a", "fake_b"]
+    assert all(r.success for r in responses)
+    assert elapsed < 0.35, f"Fan-out took {elapsed:.2f}s, expected ~0.2s"
+
+
+async def test_fan_out_deadline_returns_partial_results():
+    params = UnifiedSearchParams(query="test")
+    start = time.monotonic()
+    responses = await fan_out_search(["fake_a", "fake_slow"], params, timeout=0.5)
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 1.0
+    assert responses[0].success and len(responses[0].articles) == 2
+    assert not responses[1].success
+    assert "timed out" in responses[1].error
+
+
+async def test_merged_search_deduplicates_by_doi():
+    params = UnifiedSearchParams(query="test")
+    result = await merged_search(["fake_a", "fake_b", "fake_slow"], params, timeout=0.5)
+
+    assert [a.title for a in result.articles] == ["One", "Two", "Three"]
+    assert result.duplicates_removed == 1
+    # Missing fields on the kept record are filled from the duplicate
+    assert result.articles[0].citation_count == 7
+    assert "fake_slow" in result.provider_errors
+
+
+if __name__ == "__main__":
+    asyncio.run(test_fan_out_is_concurrent())
+    asyncio.run(test_fan_out_deadline_returns_partial_results())
+    asyncio.run(test_merged_search_deduplicates_by_doi())
+    print("All fan-out tests passed")
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Test script for the persistent SerpAPI response cache.
+
+This script tests that:
+1. Repeated Scholar searches are served from the cache and reported in search_metadata,
+   unless the caller bypasses it
+2. Stale entries are served immediately and refreshed in the background
+3. Cache-only mode never calls SerpAPI and treats a miss as an error
+4. SerpAPI's "no results" reply is cached as an empty page and doesn't count as a provider failure
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+# Add the backend directory to the path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from services import google_scholar_service, serpapi_cache
+from services.google_scholar_service import GoogleScholarService, SerpApiRateBudget
+from services.search_providers import health as health_module
+from config.settings import settings
+from services.search_providers.health import CLOSED, ProviderHealthService, ProviderHealthStore
+from services.serpapi_cache import CACHE_ONLY, READ_WRITE, SerpApiResponseCache
+
+TTL = 3600
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeSerpApi:
+    """SerpAPI stand-in whose result titles carry a version, to tell cached from fresh responses"""
+
+    def __init__(self):
+        self.calls = 0
+        self.version = 1
+        self.no_results = False
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        if self.no_results:
+            return httpx.Response(200, json={"error": "Google hasn't returned any results for this query."})
+        start = int(request.url.params.get("start", 0))
+        num = int(request.url.params["num"])
+        results = [
+            {"title": f"Result {n} v{self.version}", "link": f"https://example.org/{n}"}
+            for n in range(start + 1, start + num + 1)
+        ]
+        return httpx.Response(200, json={"organic_results": results, "search_information": {"total_results": 40}})
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def serpapi(tmp_path, monkeypatch, clock):
+    fake = FakeSerpApi()
+    transport = httpx.MockTransport(fake.handle)
+    async_client = httpx.AsyncClient
+    monkeypatch.setattr(httpx, "AsyncClient", lambda **kwargs: async_client(transport=transport, **kwargs))
+
+    store = ProviderHealthStore(str(tmp_path / "health.sqlite3"))
+    monkeypatch.setattr(health_module, "_health_service", ProviderHealthService(store))
+    monkeypatch.setattr(google_scholar_service, "serpapi_rate_budget", SerpApiRateBudget(4, 0))
+    return fake
+
+
+def _use_cache(monkeypatch, tmp_path, clock, mode=READ_WRITE) -> SerpApiResponseCache:
+    cache = SerpApiResponseCache(str(tmp_path / "serpapi.sqlite3"), TTL, TTL * 24, mode=mode, clock=clock)
+    monkeypatch.setattr(serpapi_cache, "_response_cache", cache)
+    return cache
+
+
+async def _search(api_key: str = "key-1", num_results: int = 40):
+    service = GoogleScholarService(api_key=api_key)
+    result = await service.search_articles_async("melanocortin", num_results=num_results)
+    await asyncio.gather(*google_scholar_service._revalidation_tasks)
+    return result
+
+
+def test_repeated_search_served_from_cache(serpapi, monkeypatch, tmp_path, clock):
+    _use_cache(monkeypatch, tmp_path, clock)
+
+    articles, metadata = asyncio.run(_search())
+    assert serpapi.calls == 2
+    assert metadata["api_calls_made"] == 2 and metadata["cache_hits"] == 0
+
+    # The API key isn't part of the cache key
+    cached_articles, cached_metadata = asyncio.run(_search(api_key="key-2"))
+    assert serpapi.calls == 2
+    assert cached_metadata["cache_hits"] == 2 and cached_metadata["api_calls_made"] == 0
+    assert [a.title for a in cached_articles] == [a.title for a in articles]
+    assert [a.search_position for a in cached_articles] == list(range(1, 41))
+
+    # Bypassing the cache (as the connection test does) always reaches SerpAPI
+    _, fresh_metadata = asyncio.run(
+        GoogleScholarService(api_key="key-1").search_articles_async("melanocortin", num_results=20, use_cache=False)
+    )
+    assert serpapi.calls == 3
+    assert fresh_metadata["cache_hits"] == 0 and fresh_metadata["api_calls_made"] == 1
+
+
+def test_stale_entries_served_then_refreshed(serpapi, monkeypatch, tmp_path, clock):
+    _use_cache(monkeypatch, tmp_path, clock)
+    asyncio.run(_search(num_results=20))
+
+    clock.now += TTL + 1
+    serpapi.version = 2
+    articles, metadata = asyncio.run(_search(num_results=20))
+
+    assert articles[0].title == "Result 1 v1"
+    assert metadata["cache_hits"] == 1 and metadata["stale_cache_hits"] == 1
+    assert serpapi.calls == 2  # The background refresh
+
+    articles, metadata = asyncio.run(_search(num_results=20))
+    assert articles[0].title == "Result 1 v2"
+    assert metadata["stale_cache_hits"] == 0
+    assert serpapi.calls == 2
+
+
+def test_cache_only_mode_never_calls_serpapi(serpapi, monkeypatch, tmp_path, clock):
+    _use_cache(monkeypatch, tmp_path, clock)
+    asyncio.run(_search(num_results=20))
+    _use_cache(monkeypatch, tmp_path, clock, mode=CACHE_ONLY)
+
+    clock.now += TTL * 1000
+    articles, metadata = asyncio.run(_search(num_results=20))
+    assert len(articles) == 20 and metadata["cache_hits"] == 1
+
+    articles, metadata = asyncio.run(_search(num_results=40))
+    assert len(articles) == 20  # The uncached second page is a miss
+    assert serpapi.calls == 1
+
+
+def test_no_results_is_an_empty_cached_page(serpapi, monkeypatch, tmp_path, clock):
+    _use_cache(monkeypatch, tmp_path, clock)
+    serpapi.no_results = True
+
+    for _ in range(settings.PROVIDER_BREAKER_MIN_REQUESTS + 1):
+        articles, metadata = asyncio.run(_search(num_results=20))
+        assert articles == []
+    # Cached, so only the first search reaches SerpAPI
+    assert serpapi.calls == 1
+    assert health_module.get_provider_health_service().get_status("scholar").breaker_state == CLOSED
+
+    # Distinct empty queries don't trip the breaker either
+    service = GoogleScholarService(api_key="key-1")
+    for n in range(settings.PROVIDER_BREAKER_MIN_REQUESTS + 1):
+        articles, _ = asyncio.run(service.search_articles_async(f"nothing {n}", num_results=20))
+        assert articles == []
+    assert health_module.get_provider_health_service().check("scholar") is None
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test script for per-article smart search filter results.
+
+This script tests that:
+1. Filtering results are stored as one row per article and read back in order
+2. Session listings don't load filtered articles
+3. Feature writes only touch the affected rows
+4. Removed feature columns are dropped from every row, and duplicate ids still match
+5. Sessions holding the legacy JSON blob keep working and migrate on write
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+# Add the backend directory to the path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from models import SmartSearchSession, SmartSearchFilteredArticle
+from services.smart_search_session_service import SmartSearchSessionService
+
+
+def _filtered(article_id: str, passed: bool = True):
+    return {
+        "article": {"id": article_id, "source": "pubmed", "title": f"Title {article_id}", "abstract": "..."},
+        "passed": passed,
+        "confidence": 0.9,
+        "reasoning": "ok"
+    }
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'smart_search.db'}")
+    SmartSearchSession.__table__.create(bind=engine)
+    SmartSearchFilteredArticle.__table__.create(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def test_filtering_results_stored_per_article(db):
+    service = SmartSearchSessionService(db)
+    session = service.create_session("1", "question")
+    service.update_filtering_step(
+        session.id, "1", total_filtered=3, accepted=2, rejected=1, average_confidence=0.9,
+        duration_seconds=1, filtered_articles=[_filtered("b"), _filtered("a", passed=False), _filtered("c")]
+    )
+
+    assert db.query(SmartSearchFilteredArticle).count() == 3
+    articles = service.get_filtered_articles(session)
+    assert [fa["article"]["id"] for fa in articles] == ["b", "a", "c"]
+    assert [fa["article"]["id"] for fa in service.get_filtered_articles(session, passed_only=True)] == ["b", "c"]
+
+    listing = service.get_user_sessions("1")
+    assert listing.total == 1
+    assert listing.sessions[0].filtered_articles is None
+
+
+def test_feature_write_updates_only_affected_rows(db):
+    service = SmartSearchSessionService(db)
+    session = service.create_session("1", "question")
+    service.update_filtering_step(
+        session.id, "1", total_filtered=2, accepted=2, rejected=0, average_confidence=0.9,
+        duration_seconds=1, filtered_articles=[_filtered("a"), _filtered("b")]
+    )
+
+    statements = []
+    event.listen(db.bind, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    service.update_custom_columns_and_features(
+        session.id, "1",
+        custom_columns=[{"id": "f1", "name": "F1", "description": "", "type": "text", "options": {}}],
+        extracted_features={"a": {"f1": "yes", "unknown": "dropped"}}
+    )
+
+    updates = [s for s in statements if s.startswith("UPDATE smart_search_filtered_articles")]
+    assert len(updates) == 1
+    by_id = {fa["article"]["id"]: fa for fa in service.get_filtered_articles(session)}
+    assert by_id["a"]["article"]["extracted_features"] == {"f1": "yes"}
+    assert by_id["b"]["article"]["extracted_features"] == {}
+
+
+def test_feature_write_prunes_all_rows_and_matches_duplicates(db):
+    service = SmartSearchSessionService(db)
+    session = service.create_session("1", "question")
+    service.update_filtering_step(
+        session.id, "1", total_filtered=3, accepted=3, rejected=0, average_confidence=0.9,
+        duration_seconds=1, filtered_articles=[_filtered("a"), _filtered("b"), _filtered("a")]
+    )
+    columns = [
+        {"id": "f1", "name": "F1", "description": "", "type": "text", "options": {}},
+        {"id": "f2", "name": "F2", "description": "", "type": "text", "options": {}}
+    ]
+    service.update_custom_columns_and_features(
+        session.id, "1", custom_columns=columns,
+        extracted_features={"a": {"f1": "a1", "f2": "a2"}, "b": {"f1": "b1", "f2": "b2"}}
+    )
+
+    # Column f2 is removed; only "a" gets new values
+    session.filtering_metadata = {"custom_columns": columns[:1]}
+    db.commit()
+    service.update_custom_columns_and_features(
+        session.id, "1", custom_columns=[], extracted_features={"a": {"f1": "a1-new"}}
+    )
+
+    features = [fa["article"]["extracted_features"] for fa in service.get_filtered_articles(session)]
+    assert features == [{"f1": "a1-new"}, {"f1": "b1"}, {"f1": "a1-new"}]
+
+
+def test_legacy_blob_is_read_and_migrated_on_write(db):
+    service = SmartSearchSessionService(db)
+    session = service.create_session("1", "question")
+    session.filtered_articles = [_filtered("x"), _filtered("y")]
+    db.commit()
+
+    assert [fa["article"]["id"] for fa in service.get_filtered_articles(session)] == ["x", "y"]
+
+    service.update_custom_columns_and_features(
+        session.id, "1",
+        custom_columns=[{"id": "f1", "name": "F1", "description": "", "type": "text", "options": {}}],
+        extracted_features={"y": {"f1": "value"}}
+    )
+
+    assert db.query(SmartSearchFilteredArticle).count() == 2
+    assert db.query(SmartSearchSession.filtered_articles).scalar() is None
+    by_id = {fa["article"]["id"]: fa for fa in service.get_filtered_articles(session)}
+    assert by_id["y"]["article"]["extracted_features"] == {"f1": "value"}
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test script for delta-encoded agent state events.
+
+This script tests that:
+1. The first state is sent as a snapshot and later ones as versioned deltas
+2. Applying the deltas in order reproduces each state
+3. Unchanged states and non-state payloads produce no state data
+"""
+
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import jsonpatch
+from pydantic import BaseModel
+
+# Add the backend directory to the path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from utils.state_delta import StateDeltaEncoder, dumps, state_payload
+
+
+class _State(BaseModel):
+    messages: List[str]
+    mission: Optional[Dict[str, str]] = None
+    updated_at: datetime
+    next_node: str
+
+
+def _wire(event):
+    """Round-trip through the SSE serializer like the client sees it"""
+    return json.loads(dumps(event))
+
+
+def test_snapshot_then_deltas_reproduce_states():
+    encoder = StateDeltaEncoder()
+    states = [
+        _State(messages=["hi"], updated_at=datetime(2025, 1, 1), next_node="supervisor_node"),
+        _State(messages=["hi", "hello"], updated_at=datetime(2025, 1, 1), next_node="mission_specialist_node"),
+        _State(messages=["hi", "hello"], mission={"name": "m"}, updated_at=datetime(2025, 1, 2), next_node="__end__"),
+    ]
+
+    snapshot = _wire(encoder.encode(states[0]))
+    assert snapshot["type"] == "snapshot" and snapshot["version"] == 1
+    client_state, client_version = snapshot["state"], snapshot["version"]
+
+    for state in states[1:]:
+        delta = _wire(encoder.encode_payload(state_payload(state)))
+        assert delta["type"] == "delta"
+        assert delta["base_version"] == client_version
+        client_state = jsonpatch.apply_patch(client_state, delta["ops"])
+        client_version = delta["version"]
+        assert client_state == _wire(state.model_dump())
+
+
+def test_unchanged_state_and_other_payloads():
+    encoder = StateDeltaEncoder()
+    state = _State(messages=["hi"], updated_at=datetime(2025, 1, 1), next_node="supervisor_node")
+    encoder.encode(state)
+
+    assert encoder.encode_payload(state_payload(state)) is None
+    assert encoder.version == 1
+    assert encoder.encode_payload({}) == {}
+    assert encoder.encode_payload(None) is None
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test script for the cached tool catalog used in agent prompts.
+
+This script tests that:
+1. Rendered views are reused until the tool registry is refreshed
+2. Relevant-tools mode ranks tools by tags/categories and respects the token budget
+3. Tools left out of the relevant rendering are still listed by ID
+"""
+
+import sys
+from pathlib import Path
+
+# Add the backend directory to the path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from tools import tool_registry
+from tools.tool_catalog import HOP_DESIGN, MISSION_DESIGN, ToolCatalog
+
+QUERY = "Find pubmed articles on melanocortin and score them"
+
+
+def _catalog() -> ToolCatalog:
+    return ToolCatalog(count_tokens=lambda text: len(text) // 4)
+
+
+def test_views_are_cached_until_registry_refresh(monkeypatch):
+    catalog = _catalog()
+    first = catalog.render(MISSION_DESIGN)
+    assert catalog.render(MISSION_DESIGN) is first
+    assert "(ID: pubmed_search)" in first
+
+    # What refresh_tool_registry() does, without dropping the registered handlers
+    web_search = tool_registry.TOOL_REGISTRY["web_search"]
+    monkeypatch.setattr(tool_registry, "TOOL_REGISTRY", {"web_search": web_search})
+    monkeypatch.setattr(tool_registry, "_REGISTRY_VERSION", tool_registry.get_registry_version() + 1)
+
+    refreshed = catalog.render(MISSION_DESIGN)
+    assert "(ID: web_search)" in refreshed and "(ID: pubmed_search)" not in refreshed
+
+
+def test_relevant_tools_ranked_by_tags_and_categories():
+    ranked = _catalog().rank_tools(QUERY)
+    assert ranked[0] == "pubmed_score_articles"
+    assert "pubmed_search" in ranked[:3]
+    # Deprecated tools only rank when a query clearly asks for them
+    assert "pubmed_extract_features" not in ranked
+    assert "email_search" not in ranked
+
+
+def test_relevant_rendering_respects_token_budget():
+    catalog = _catalog()
+    full = catalog.render(HOP_DESIGN)
+    budget = len(full) // 4 // 4
+
+    relevant = catalog.render(HOP_DESIGN, relevant_to=QUERY, token_budget=budget)
+
+    described = relevant.split("Other available tools")[0]
+    assert catalog.count_tokens(described) <= budget + 1
+    assert "(ID: pubmed_score_articles)" in described
+    assert "(ID: email_search)" not in described
+    assert "email_search" in relevant.split("Other available tools")[1]
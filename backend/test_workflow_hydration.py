@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test script for batched mission and hop hydration.
+
+This script tests that:
+1. Loading a mission with hops, tool steps and assets takes a fixed number of
+   queries, independent of how many hops and assets it has
+2. Each asset is loaded once per transaction, even when referenced by the
+   mission and several hops
+3. The identity map is dropped on commit so later reads see fresh data
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+# Add the backend directory to the path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from models import (
+    Asset as AssetModel, Mission as MissionModel, Hop as HopModel, ToolStep as ToolStepModel,
+    MissionAsset, HopAsset, AssetRole, AssetScopeType, HopStatus
+)
+from services.asset_service import AssetService
+from services.mission_service import MissionService
+
+USER_ID = 1
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'workflow.db'}")
+    for model in (AssetModel, MissionModel, HopModel, ToolStepModel, MissionAsset, HopAsset):
+        model.__table__.create(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _seed_mission(db, hop_count: int, assets_per_hop: int) -> str:
+    db.add(MissionModel(id="m1", user_id=USER_ID, name="Mission", current_hop_id="h0"))
+    for h in range(hop_count):
+        db.add(HopModel(id=f"h{h}", mission_id="m1", user_id=USER_ID, sequence_order=h, name=f"Hop {h}",
+                        status=HopStatus.HOP_IMPL_READY))
+        for t in range(2):
+            db.add(ToolStepModel(id=f"h{h}-t{t}", hop_id=f"h{h}", tool_id="tool", user_id=USER_ID,
+                                 sequence_order=t, name=f"Step {t}"))
+        for a in range(assets_per_hop):
+            asset_id = f"h{h}-a{a}"
+            db.add(AssetModel(id=asset_id, user_id=USER_ID, name=asset_id, description="",
+                              schema_definition={"type": "string"}, scope_type=AssetScopeType.MISSION,
+                              scope_id="m1", role=AssetRole.INTERMEDIATE))
+            db.add(HopAsset(hop_id=f"h{h}", asset_id=asset_id, role=AssetRole.INTERMEDIATE))
+            # Every hop asset is also a mission asset
+            db.add(MissionAsset(mission_id="m1", asset_id=asset_id, role=AssetRole.INTERMEDIATE))
+    db.commit()
+    return "m1"
+
+
+def _count_queries(db):
+    statements = []
+    event.listen(db.bind, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+@pytest.mark.parametrize("hop_count,assets_per_hop", [(2, 2), (8, 5)])
+async def test_mission_hydration_query_count_is_constant(db, hop_count, assets_per_hop):
+    mission_id = _seed_mission(db, hop_count, assets_per_hop)
+    statements = _count_queries(db)
+
+    mission = await MissionService(db).get_mission(mission_id, USER_ID)
+
+    assert len(mission.hops) == hop_count
+    assert all(len(hop.tool_steps) == 2 and len(hop.assets) == assets_per_hop for hop in mission.hops)
+    assert len(mission.assets) == hop_count * assets_per_hop
+    assert mission.current_hop.id == "h0"
+
+    # mission, mission_assets, hops, hop_assets, tool_steps, assets
+    assert len(statements) == 6
+    assert len([s for s in statements if "FROM assets" in s]) == 1
+
+
+async def test_identity_map_is_per_transaction(db):
+    _seed_mission(db, hop_count=1, assets_per_hop=1)
+    asset_service = AssetService(db)
+    statements = _count_queries(db)
+
+    first = asset_service.get_asset("h0-a0", USER_ID)
+    assert AssetService(db).get_asset("h0-a0", USER_ID) is first
+    assert len(statements) == 1
+
+    db.commit()
+    assert AssetService(db).get_asset("h0-a0", USER_ID) is not first
+    assert len(statements) == 2
@@ -49,7 +49,7 @@ async def handle_google_scholar_search(input: ToolHandlerInput) -> ToolHandlerRe
         service = GoogleScholarService(api_key)
         
         # Perform search
-        articles, search_metadata = service.search_articles(
+        articles, search_metadata = await service.search_articles_async(
             query=query,
             num_results=num_results,
             year_low=year_low,
@@ -2,88 +2,92 @@
 Handler implementation for the map_reduce_rollup tool.
 
 This tool groups objects by rules and applies rollup functions to create aggregated results.
-It supports various grouping rules and aggregation functions.
+Grouping and aggregation run on the streaming engine in services/group_reduce.py; when the
+items come from an asset, they are streamed from the asset store rather than taken from the
+parameter payload.
 """
 
-from typing import List, Dict, Any
-from schemas.tool_handler_schema import ToolHandlerInput, ToolHandlerResult, ToolExecutionHandler
+import asyncio
+from typing import Any, Iterable
+
+from database import SessionLocal
+from schemas.tool_handler_schema import ToolHandlerInput, ToolHandlerResult, ToolExecutionHandler, ToolParameterValue
+from services.asset_service import AssetService
+from services.group_reduce import group_reduce
 from tools.tool_registry import register_tool_handler
 
-async def handle_map_reduce_rollup(input: ToolHandlerInput) -> Dict[str, Any]:
+
+def _param(input: ToolHandlerInput, name: str, default: Any) -> Any:
+    value = input.params.get(name, default)
+    return value.value if isinstance(value, ToolParameterValue) else value
+
+
+def _run_group_reduce(items_param: Any, **options) -> dict:
+    """Group and reduce in a worker thread, streaming the items from the asset store when possible"""
+    if isinstance(items_param, ToolParameterValue) and items_param.asset_id:
+        db = SessionLocal()
+        try:
+            result = group_reduce(AssetService(db).iter_content_items(items_param.asset_id), **options)
+        finally:
+            db.close()
+    else:
+        items = items_param.value if isinstance(items_param, ToolParameterValue) else items_param
+        if items is None:
+            items = []
+        elif not isinstance(items, Iterable) or isinstance(items, (str, dict)):
+            items = [items]
+        result = group_reduce(items, **options)
+    return {"grouped_results": result.grouped_results, "stats": result.stats}
+
+
+async def handle_map_reduce_rollup(input: ToolHandlerInput) -> ToolHandlerResult:
     """
     Group objects by rules and apply reduce functions to create aggregated results.
-    
+
     Args:
         input: ToolHandlerInput containing:
-            - items: List of objects to group
-            - key_func: Function to extract grouping key from each item
-            - reduce_func: Function to aggregate items in each group
-            - sort_by: Optional field to sort results by
+            - items: Objects to group (streamed from the asset store when mapped from an asset)
+            - key_func: Key expression, e.g. 'sender', 'date(timestamp)', 'category, year(date)'
+            - reduce_func: Reduce expression, e.g. 'count, avg(score) as mean_score, top_k(tags, 3)'
+            - sort_by: Optional field to sort results by (group_key, group_value or an aggregate)
             - sort_direction: Optional sort direction ('asc' or 'desc')
-            - include_items: Whether to include original items in results
-            
+            - include_items: Whether to include (up to GROUP_REDUCE_MAX_ITEMS_PER_GROUP) original items
+
     Returns:
-        Dict containing:
+        ToolHandlerResult containing:
             - grouped_results: Aggregated results for each group
     """
     # Extract parameters
-    items = input.params.get("items", [])
-    key_func = input.params.get("key_func")
-    reduce_func = input.params.get("reduce_func")
-    sort_by = input.params.get("sort_by", "group_key")
-    sort_direction = input.params.get("sort_direction", "asc")
-    include_items = input.params.get("include_items", False)
-    
-    # TODO: Implement grouping and reduce logic
-    # This is where you would:
-    # 1. Parse and validate the key_func
-    # 2. Group items according to the key function
-    # 3. Apply reduce function to each group
-    # 4. Sort results if requested
-    
-    # Placeholder implementation
-    grouped_results = []
-    
-    # Simple grouping by key function
-    # TODO: Implement proper key function parsing and grouping
-    groups = {}
-    for item in items:
-        # Simple implementation - extract field name from key_func
-        if "(" in key_func:
-            field_name = key_func.split("(")[1].split(")")[0]
-        else:
-            field_name = key_func
-        
-        group_key = str(item.get(field_name, "unknown"))
-        if group_key not in groups:
-            groups[group_key] = []
-        groups[group_key].append(item)
-    
-    # Apply reduce function
-    for group_key, group_items in groups.items():
-        # TODO: Implement actual reduce function parsing and execution
-        # For now, just count items and basic aggregation
-        aggregated_data = {
-            "count": len(group_items),
-            "items": group_items if include_items else []
+    items_param = input.params.get("items")
+    key_func = _param(input, "key_func", None)
+    reduce_func = _param(input, "reduce_func", "count")
+    sort_by = _param(input, "sort_by", "group_key")
+    sort_direction = _param(input, "sort_direction", "asc")
+    include_items = _param(input, "include_items", False)
+
+    # Parsing, aggregation and any spilling are CPU/disk work: keep them off the event loop
+    result = await asyncio.to_thread(
+        _run_group_reduce,
+        items_param,
+        key_expression=key_func,
+        reduce_expression=reduce_func,
+        sort_by=sort_by or "group_key",
+        sort_direction=sort_direction or "asc",
+        include_items=bool(include_items)
+    )
+    stats = result["stats"]
+
+    return ToolHandlerResult(
+        outputs={
+            "grouped_results": result["grouped_results"]
+        },
+        metadata={
+            "tool_id": "group_reduce",
+            "items_processed": stats.items_processed,
+            "groups": stats.groups,
+            "spills": stats.spills
         }
-        
-        grouped_results.append({
-            "group_key": group_key,
-            "group_value": group_key,
-            "aggregated_data": aggregated_data,
-            "items": group_items if include_items else None
-        })
-    
-    # Sort results
-    if sort_direction == "desc":
-        grouped_results.sort(key=lambda x: x[sort_by], reverse=True)
-    else:
-        grouped_results.sort(key=lambda x: x[sort_by])
-    
-    return {
-        "grouped_results": grouped_results
-    }
+    )
 
 # Register the handler
 register_tool_handler(
@@ -92,4 +96,4 @@ register_tool_handler(
         handler=handle_map_reduce_rollup,
         description="Groups objects by rules and applies rollup functions to create aggregated results"
     )
-) 
\ No newline at end of file
+)
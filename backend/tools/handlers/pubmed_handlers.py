@@ -13,12 +13,27 @@ import json
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
-from schemas.tool_handler_schema import ToolHandlerInput, ToolExecutionHandler, ToolHandlerResult
+import numpy as np
+
+from schemas.tool_handler_schema import ToolHandlerInput, ToolExecutionHandler, ToolHandlerResult, ToolParameterValue
 from schemas.canonical_types import CanonicalPubMedArticle, CanonicalPubMedExtraction, CanonicalScoredArticle
 from schemas.schema_utils import create_typed_response
 from tools.tool_registry import register_tool_handler
 from services.pubmed_service import PubMedService, PubMedArticle
 from agents.prompts.base_prompt_caller import BasePromptCaller
+from services.pubmed_scoring import (
+    DEFAULT_SCORING_CRITERIA,
+    FeatureColumns,
+    build_scored_articles,
+    filter_rank,
+    score_columns
+)
+
+
+def _param(input: ToolHandlerInput, name: str, default: Any) -> Any:
+    """Parameter value, unwrapped from ToolParameterValue when the executor wrapped it"""
+    value = input.params.get(name, default)
+    return value.value if isinstance(value, ToolParameterValue) else value
 
 
 # ===== Tool 1: PubMed Query Generator =====
@@ -374,181 +389,32 @@ async def handle_pubmed_score_articles(input: ToolHandlerInput) -> ToolHandlerRe
             - scoring_summary: Summary of scoring process
     """
     # Extract parameters
-    extractions = input.params.get("extractions", [])
-    scoring_criteria = input.params.get("scoring_criteria", {})
-    weights = input.params.get("weights", {})
-    normalize_scores = input.params.get("normalize_scores", True)
+    extractions = _param(input, "extractions", [])
+    scoring_criteria = _param(input, "scoring_criteria", {})
+    weights = _param(input, "weights", {})
+    normalize_scores = _param(input, "normalize_scores", True)
     
     if not extractions:
         raise ValueError("extractions list is required")
     
     # Default scoring criteria
     if not scoring_criteria:
-        scoring_criteria = {
-            "clinical_relevance": {"weight": 0.3, "max_score": 5},
-            "innovation_score": {"weight": 0.25, "max_score": 5},
-            "study_quality": {"weight": 0.2, "max_score": 5},
-            "sample_size": {"weight": 0.15, "max_score": 5, "thresholds": {"high": 1000, "medium": 100, "low": 10}},
-            "recency": {"weight": 0.1, "max_score": 5}
-        }
-    
-    scored_articles = []
-    all_scores = []
-    
-    for extraction in extractions:
-        try:
-            score_breakdown = {}
-            total_score = 0.0
-            
-            # Extract features for scoring
-            features = extraction.get('extraction', {}) if isinstance(extraction, dict) else extraction.extraction
-            article = extraction.get('original_article', {}) if isinstance(extraction, dict) else extraction.original_article
-            
-            # Score each component
-            for criterion, config in scoring_criteria.items():
-                component_score = 0.0
-                weight = config.get("weight", 0.1)
-                max_score = config.get("max_score", 5)
-                
-                if criterion == "clinical_relevance":
-                    # Look for clinical relevance in extracted features
-                    relevance = features.get("clinical_relevance", "Not specified")
-                    if isinstance(relevance, (int, float)):
-                        component_score = float(relevance)
-                    elif isinstance(relevance, str) and relevance.isdigit():
-                        component_score = float(relevance)
-                    else:
-                        component_score = 3.0  # Default middle score
-                
-                elif criterion == "innovation_score":
-                    # Look for innovation score in extracted features
-                    innovation = features.get("innovation_score", "Not specified")
-                    if isinstance(innovation, (int, float)):
-                        component_score = float(innovation)
-                    elif isinstance(innovation, str) and innovation.isdigit():
-                        component_score = float(innovation)
-                    else:
-                        component_score = 3.0  # Default middle score
-                
-                elif criterion == "study_quality":
-                    # Assess study quality based on methodology and quality indicators
-                    quality_indicators = features.get("quality_indicators", "")
-                    methodology = features.get("methodology", "")
-                    
-                    quality_score = 3.0  # Base score
-                    if "randomized" in quality_indicators.lower():
-                        quality_score += 0.5
-                    if "blinded" in quality_indicators.lower():
-                        quality_score += 0.5
-                    if "controlled" in quality_indicators.lower():
-                        quality_score += 0.5
-                    if "peer-reviewed" in quality_indicators.lower():
-                        quality_score += 0.5
-                    
-                    component_score = min(quality_score, max_score)
-                
-                elif criterion == "sample_size":
-                    # Score based on sample size
-                    sample_size_str = features.get("sample_size", "0")
-                    try:
-                        # Extract number from sample size string
-                        import re
-                        numbers = re.findall(r'\d+', str(sample_size_str))
-                        sample_size = int(numbers[0]) if numbers else 0
-                        
-                        thresholds = config.get("thresholds", {"high": 1000, "medium": 100, "low": 10})
-                        if sample_size >= thresholds["high"]:
-                            component_score = 5.0
-                        elif sample_size >= thresholds["medium"]:
-                            component_score = 4.0
-                        elif sample_size >= thresholds["low"]:
-                            component_score = 3.0
-                        else:
-                            component_score = 2.0
-                    except:
-                        component_score = 2.0  # Default for unknown sample size
-                
-                elif criterion == "recency":
-                    # Score based on publication recency
-                    pub_date = article.get("publication_date", "") if isinstance(article, dict) else getattr(article, 'publication_date', '')
-                    try:
-                        if pub_date:
-                            from datetime import datetime
-                            pub_year = int(pub_date.split('-')[0])
-                            current_year = datetime.now().year
-                            years_old = current_year - pub_year
-                            
-                            if years_old <= 1:
-                                component_score = 5.0
-                            elif years_old <= 3:
-                                component_score = 4.0
-                            elif years_old <= 5:
-                                component_score = 3.0
-                            elif years_old <= 10:
-                                component_score = 2.0
-                            else:
-                                component_score = 1.0
-                        else:
-                            component_score = 2.0  # Default for unknown date
-                    except:
-                        component_score = 2.0
-                
-                # Apply weight and add to total
-                weighted_score = component_score * weight
-                score_breakdown[criterion] = {
-                    "raw_score": component_score,
-                    "weight": weight,
-                    "weighted_score": weighted_score
-                }
-                total_score += weighted_score
-            
-            all_scores.append(total_score)
-            
-            # Create scored article
-            scored_article = CanonicalScoredArticle(
-                article_with_features=CanonicalPubMedExtraction(**extraction) if isinstance(extraction, dict) else extraction,
-                total_score=total_score,
-                score_breakdown=score_breakdown,
-                scoring_metadata={
-                    "scoring_criteria_used": scoring_criteria,
-                    "timestamp": datetime.now().isoformat(),
-                    "normalization_applied": normalize_scores
-                }
-            )
-            
-            scored_articles.append(scored_article)
-            
-        except Exception as e:
-            # Create failed scoring record
-            failed_scored = CanonicalScoredArticle(
-                article_with_features=CanonicalPubMedExtraction(**extraction) if isinstance(extraction, dict) else extraction,
-                total_score=0.0,
-                score_breakdown={"error": f"Scoring failed: {str(e)}"},
-                scoring_metadata={"error": str(e), "timestamp": datetime.now().isoformat()}
-            )
-            scored_articles.append(failed_scored)
-    
-    # Calculate percentile ranks
-    if all_scores and len(all_scores) > 1:
-        import statistics
-        for i, scored_article in enumerate(scored_articles):
-            if hasattr(scored_article, 'total_score') and scored_article.total_score > 0:
-                # Calculate percentile rank
-                score = scored_article.total_score
-                lower_scores = len([s for s in all_scores if s < score])
-                percentile = (lower_scores / len(all_scores)) * 100
-                scored_article.percentile_rank = percentile
-    
-    # Normalize scores if requested
-    if normalize_scores and all_scores:
-        max_score = max(all_scores)
-        min_score = min(all_scores)
-        score_range = max_score - min_score if max_score > min_score else 1
-        
-        for scored_article in scored_articles:
-            if hasattr(scored_article, 'total_score') and scored_article.total_score > 0:
-                normalized_score = ((scored_article.total_score - min_score) / score_range) * 100
-                scored_article.total_score = normalized_score
+        scoring_criteria = DEFAULT_SCORING_CRITERIA
+    
+    # Pack the features once, then score all articles column-wise
+    extractions = [
+        extraction if isinstance(extraction, CanonicalPubMedExtraction) else CanonicalPubMedExtraction(**extraction)
+        for extraction in extractions
+    ]
+    scores = score_columns(FeatureColumns.from_extractions(extractions), scoring_criteria, normalize_scores)
+    scored_articles = build_scored_articles(extractions, scores, {
+        "scoring_criteria_used": scoring_criteria,
+        "timestamp": datetime.now().isoformat(),
+        "normalization_applied": normalize_scores
+    })
+    all_scores = scores.total
+    # Extractions that failed upstream or carry no features only get the default component scores
+    failed_scoring = sum(1 for extraction in extractions if not extraction.extraction or "error" in extraction.extraction)
     
     return ToolHandlerResult(
         success=True,
@@ -556,21 +422,18 @@ async def handle_pubmed_score_articles(input: ToolHandlerInput) -> ToolHandlerRe
             "scored_articles": scored_articles,
             "scoring_summary": {
                 "total_articles": len(extractions),
-                "successfully_scored": len([a for a in scored_articles if not isinstance(a.score_breakdown.get("error"), str)]),
-                "failed_scoring": len([a for a in scored_articles if isinstance(a.score_breakdown.get("error"), str)]),
+                "successfully_scored": len(scored_articles) - failed_scoring,
+                "failed_scoring": failed_scoring,
                 "score_statistics": {
-                    "mean_score": statistics.mean(all_scores) if all_scores else 0,
-                    "median_score": statistics.median(all_scores) if all_scores else 0,
-                    "max_score": max(all_scores) if all_scores else 0,
-                    "min_score": min(all_scores) if all_scores else 0
-                } if all_scores else {},
+                    "mean_score": float(np.mean(all_scores)),
+                    "median_score": float(np.median(all_scores)),
+                    "max_score": float(np.max(all_scores)),
+                    "min_score": float(np.min(all_scores))
+                },
                 "criteria_used": scoring_criteria,
                 "timestamp": datetime.now().isoformat()
             }
         },
-        canonical_outputs={
-            "scored_articles": create_typed_response(scored_articles, "scored_article", is_array=True)
-        },
         metadata={
             "tool_id": "pubmed_score_articles",
             "articles_scored": len(scored_articles),
@@ -600,93 +463,37 @@ async def handle_pubmed_filter_rank(input: ToolHandlerInput) -> ToolHandlerResul
             - filter_summary: Summary of filtering process
     """
     # Extract parameters
-    scored_articles = input.params.get("scored_articles", [])
-    min_score_threshold = input.params.get("min_score_threshold", 0.0)
-    max_results = input.params.get("max_results", 20)
-    sort_by = input.params.get("sort_by", "total_score")
-    sort_order = input.params.get("sort_order", "desc")
-    additional_filters = input.params.get("additional_filters", {})
+    scored_articles = _param(input, "scored_articles", [])
+    min_score_threshold = _param(input, "min_score_threshold", 0.0)
+    max_results = _param(input, "max_results", 20)
+    sort_by = _param(input, "sort_by", "total_score")
+    sort_order = _param(input, "sort_order", "desc")
+    additional_filters = _param(input, "additional_filters", {})
     
     if not scored_articles:
         raise ValueError("scored_articles list is required")
     
     try:
-        # Start with all articles
-        filtered_articles = list(scored_articles)
-        
-        # Apply score threshold filter
-        filtered_articles = [
-            article for article in filtered_articles 
-            if hasattr(article, 'total_score') and article.total_score >= min_score_threshold
+        scored_articles = [
+            article if isinstance(article, CanonicalScoredArticle) else CanonicalScoredArticle(**article)
+            for article in scored_articles
         ]
         
-        # Apply additional filters
-        for filter_key, filter_value in additional_filters.items():
-            if filter_key == "journal_filter":
-                # Filter by journal names
-                allowed_journals = filter_value if isinstance(filter_value, list) else [filter_value]
-                filtered_articles = [
-                    article for article in filtered_articles
-                    if hasattr(article, 'article_with_features') and 
-                       hasattr(article.article_with_features, 'original_article') and
-                       getattr(article.article_with_features.original_article, 'journal', '') in allowed_journals
-                ]
-            
-            elif filter_key == "author_filter":
-                # Filter by author names
-                target_authors = filter_value if isinstance(filter_value, list) else [filter_value]
-                filtered_articles = [
-                    article for article in filtered_articles
-                    if hasattr(article, 'article_with_features') and 
-                       hasattr(article.article_with_features, 'original_article') and
-                       any(author in getattr(article.article_with_features.original_article, 'authors', []) 
-                           for author in target_authors)
-                ]
-            
-            elif filter_key == "year_range":
-                # Filter by publication year range
-                start_year, end_year = filter_value.get("start", 1900), filter_value.get("end", 2030)
-                filtered_articles = [
-                    article for article in filtered_articles
-                    if hasattr(article, 'article_with_features') and 
-                       hasattr(article.article_with_features, 'original_article')
-                ]
-                # Implementation would need to parse publication dates
-            
-            elif filter_key == "study_type":
-                # Filter by study type
-                allowed_types = filter_value if isinstance(filter_value, list) else [filter_value]
-                filtered_articles = [
-                    article for article in filtered_articles
-                    if hasattr(article, 'article_with_features') and 
-                       hasattr(article.article_with_features, 'extraction') and
-                       article.article_with_features.extraction.get('study_type', '').lower() in [t.lower() for t in allowed_types]
-                ]
-        
-        # Sort articles
-        if sort_by == "total_score":
-            filtered_articles.sort(
-                key=lambda x: getattr(x, 'total_score', 0), 
-                reverse=(sort_order == "desc")
-            )
-        elif sort_by == "percentile":
-            filtered_articles.sort(
-                key=lambda x: getattr(x, 'percentile_rank', 0), 
-                reverse=(sort_order == "desc")
-            )
-        elif sort_by == "publication_date":
-            filtered_articles.sort(
-                key=lambda x: getattr(getattr(getattr(x, 'article_with_features', None), 'original_article', None), 'publication_date', '1900-01-01') or '1900-01-01',
-                reverse=(sort_order == "desc")
-            )
-        
-        # Limit results
-        filtered_articles = filtered_articles[:max_results]
+        # All filters are applied as one combined mask, then sorted once
+        ranked = filter_rank(
+            scored_articles,
+            min_score_threshold=min_score_threshold,
+            additional_filters=additional_filters,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            max_results=max_results
+        )
+        filtered_articles = [scored_articles[i] for i in ranked]
         
         # Create summary
         filter_summary = {
             "input_articles": len(scored_articles),
-            "after_score_filter": len([a for a in scored_articles if hasattr(a, 'total_score') and a.total_score >= min_score_threshold]),
+            "after_score_filter": sum(1 for a in scored_articles if a.total_score >= min_score_threshold),
             "final_results": len(filtered_articles),
             "filters_applied": {
                 "min_score_threshold": min_score_threshold,
@@ -696,8 +503,8 @@ async def handle_pubmed_filter_rank(input: ToolHandlerInput) -> ToolHandlerResul
                 "max_results": max_results
             },
             "score_range": {
-                "highest": max([getattr(a, 'total_score', 0) for a in filtered_articles]) if filtered_articles else 0,
-                "lowest": min([getattr(a, 'total_score', 0) for a in filtered_articles]) if filtered_articles else 0
+                "highest": max(a.total_score for a in filtered_articles) if filtered_articles else 0,
+                "lowest": min(a.total_score for a in filtered_articles) if filtered_articles else 0
             },
             "timestamp": datetime.now().isoformat()
         }
@@ -708,9 +515,6 @@ async def handle_pubmed_filter_rank(input: ToolHandlerInput) -> ToolHandlerResul
                 "filtered_articles": filtered_articles,
                 "filter_summary": filter_summary
             },
-            canonical_outputs={
-                "filtered_articles": create_typed_response(filtered_articles, "scored_article", is_array=True)
-            },
             metadata={
                 "tool_id": "pubmed_filter_rank",
                 "input_count": len(scored_articles),
@@ -0,0 +1,254 @@
+"""
+Tool Catalog
+
+Precomputed renderings of the tool registry for agent prompts.
+
+The mission designer, hop designer and hop implementer prompts each describe
+the available tools in their own view. The catalog renders each view once
+per registry version (see tools.tool_registry.get_registry_version) instead
+of rebuilding the strings on every agent invocation; refresh_tool_registry()
+bumps the version, which invalidates everything rendered before.
+
+Besides the full catalog, a view can be rendered in "relevant tools only"
+mode: tools are ranked by how well their tags and categories from tools.json
+match a free-text query (e.g. the mission goal), and the best matches are
+described in full until a token budget is reached. Tools that don't make the
+cut are still listed by ID so the model knows they exist. Selected tools keep
+their registry order, so the rendering is stable for a given query.
+"""
+
+import logging
+import re
+from threading import Lock
+from typing import Callable, Dict, List, Optional, Set
+
+import tiktoken
+
+from schemas.tool import ToolDefinition
+from tools import tool_registry
+
+logger = logging.getLogger(__name__)
+
+EMPTY_REGISTRY_MESSAGE = "No tools available - tool registry not loaded. Call refresh_tool_registry() first."
+
+MISSION_DESIGN = "mission_design"
+HOP_DESIGN = "hop_design"
+IMPLEMENTATION = "implementation"
+
+# Tools that aren't specific to a domain (extract, summarize, ...) rank ahead of non-matching tools
+GENERAL_PURPOSE_BONUS = 0.5
+DEPRECATED_PENALTY = 1.0
+
+
+def _type_label(schema) -> str:
+    type_name = schema.type if schema else "object"
+    is_array = schema.is_array if schema else False
+    return f"Array<{type_name}>" if is_array else type_name
+
+
+def _render_parameters(tool_def: ToolDefinition) -> str:
+    if not tool_def.parameters:
+        return "  No input parameters\n"
+
+    text = ""
+    for param in tool_def.parameters:
+        line = f"  - {param.name} ({_type_label(param.schema_definition)}): {param.description}"
+        if not param.required:
+            line += " [Optional]"
+        text += line + "\n"
+
+        # Add nested field details for object types
+        if param.schema_definition and param.schema_definition.fields:
+            for field_name, field_schema in param.schema_definition.fields.items():
+                text += f"    - {field_name} ({_type_label(field_schema)}): {field_schema.description or 'No description'}\n"
+    return text
+
+
+def _render_outputs(tool_def: ToolDefinition) -> str:
+    if not tool_def.outputs:
+        return "  No outputs defined\n"
+    return "".join(
+        f"  - {output.name} ({_type_label(output.schema_definition)}): {output.description}\n"
+        for output in tool_def.outputs
+    )
+
+
+def render_for_mission_design(tool_def: ToolDefinition) -> str:
+    """Tool summary: purpose, category, key inputs and outputs."""
+    desc = f"### {tool_def.name} (ID: {tool_def.id})\n"
+    desc += f"**Purpose**: {tool_def.description}\n"
+    desc += f"**Category**: {tool_def.category}\n"
+
+    key_inputs = [param.name for param in tool_def.parameters if param.required]
+    if key_inputs:
+        desc += f"**Key Capabilities**: {', '.join(key_inputs)}\n"
+
+    outputs = [output.name for output in tool_def.outputs]
+    if outputs:
+        desc += f"**Produces**: {', '.join(outputs)}\n"
+
+    return desc + "\n"
+
+
+def render_for_hop_design(tool_def: ToolDefinition) -> str:
+    """Tool description with full input schemas and typed outputs."""
+    desc = f"### {tool_def.name} (ID: {tool_def.id})\n"
+    desc += f"**Purpose**: {tool_def.description}\n"
+    desc += f"**Category**: {tool_def.category}\n"
+    desc += "**Input Parameters**:\n" + _render_parameters(tool_def)
+    desc += "**Outputs**:\n" + _render_outputs(tool_def)
+    return desc + "\n"
+
+
+def render_for_implementation(tool_def: ToolDefinition) -> str:
+    """Tool description with full input schemas, as used when implementing a hop."""
+    desc = f"### Tool Name: {tool_def.name} (ID: {tool_def.id})\n"
+    desc += f"Description: {tool_def.description}\n"
+    desc += "Input Parameters:\n" + _render_parameters(tool_def)
+    desc += "Outputs:\n" + _render_outputs(tool_def)
+    return desc + "\n"
+
+
+VIEW_RENDERERS: Dict[str, Callable[[ToolDefinition], str]] = {
+    MISSION_DESIGN: render_for_mission_design,
+    HOP_DESIGN: render_for_hop_design,
+    IMPLEMENTATION: render_for_implementation,
+}
+
+
+def _words(text: str) -> Set[str]:
+    """Lowercase words with a naive plural strip, so 'articles' matches 'article'"""
+    words = set()
+    for word in re.findall(r"[a-z0-9]+", text.lower()):
+        if len(word) > 3 and word.endswith("s"):
+            word = word[:-1]
+        words.add(word)
+    return words
+
+
+def tool_keywords(tool_def: ToolDefinition) -> Set[str]:
+    """Words a query is matched against: tags, categories and the tool ID"""
+    sources = [tool_def.id, tool_def.category, tool_def.functional_category or "", tool_def.domain_category or ""]
+    sources.extend(tool_def.tags or [])
+    return _words(" ".join(sources))
+
+
+class ToolCatalog:
+    """Per-registry-version cache of rendered tool descriptions"""
+
+    def __init__(self, count_tokens: Optional[Callable[[str], int]] = None):
+        self._count_tokens = count_tokens
+        self._version: Optional[int] = None
+        self._entries: Dict[str, Dict[str, str]] = {}
+        self._full: Dict[str, str] = {}
+        self._token_counts: Dict[str, Dict[str, int]] = {}
+        self._keywords: Dict[str, Set[str]] = {}
+        self._lock = Lock()
+
+    def count_tokens(self, text: str) -> int:
+        if self._count_tokens is None:
+            encoding = tiktoken.get_encoding("cl100k_base")
+            self._count_tokens = lambda value: len(encoding.encode(value))
+        return self._count_tokens(text)
+
+    def _sync_locked(self):
+        version = tool_registry.get_registry_version()
+        if version != self._version:
+            if self._version is not None:
+                logger.info(f"Tool registry changed (v{self._version} -> v{version}), dropping rendered catalog")
+            self._version = version
+            self._entries.clear()
+            self._full.clear()
+            self._token_counts.clear()
+            self._keywords = {
+                tool_id: tool_keywords(tool_def) for tool_id, tool_def in tool_registry.TOOL_REGISTRY.items()
+            }
+
+    def _view_entries_locked(self, view: str) -> Dict[str, str]:
+        entries = self._entries.get(view)
+        if entries is None:
+            renderer = VIEW_RENDERERS[view]
+            entries = {tool_id: renderer(tool_def) for tool_id, tool_def in tool_registry.TOOL_REGISTRY.items()}
+            self._entries[view] = entries
+        return entries
+
+    def render(self, view: str, relevant_to: Optional[str] = None, token_budget: Optional[int] = None) -> str:
+        """
+        Render the tool catalog for a prompt.
+
+        Args:
+            view: MISSION_DESIGN, HOP_DESIGN or IMPLEMENTATION
+            relevant_to: Query text; when given, only tools relevant to it are described
+            token_budget: Maximum tokens for described tools in relevant mode
+
+        Returns:
+            The rendered catalog
+        """
+        with self._lock:
+            self._sync_locked()
+            if not tool_registry.TOOL_REGISTRY:
+                return EMPTY_REGISTRY_MESSAGE
+
+            entries = self._view_entries_locked(view)
+            if relevant_to is None:
+                if view not in self._full:
+                    self._full[view] = "\n".join(entries.values())
+                return self._full[view]
+
+            selected = self._select_relevant_locked(view, entries, relevant_to, token_budget)
+
+        described = [entries[tool_id] for tool_id in entries if tool_id in selected]
+        omitted = [tool_id for tool_id in entries if tool_id not in selected]
+        text = "\n".join(described)
+        if omitted:
+            text += f"\nOther available tools (not described here): {', '.join(omitted)}\n"
+        return text
+
+    def rank_tools(self, query: str) -> List[str]:
+        """IDs of tools relevant to the query, best first (registry order breaks ties)"""
+        with self._lock:
+            self._sync_locked()
+            return self._rank_locked(query)
+
+    def _rank_locked(self, query: str) -> List[str]:
+        query_words = _words(query)
+        scores: Dict[str, float] = {}
+        for tool_id, tool_def in tool_registry.TOOL_REGISTRY.items():
+            keywords = self._keywords[tool_id]
+            score = float(len(query_words & keywords))
+            if tool_def.domain_category == "general_purpose":
+                score += GENERAL_PURPOSE_BONUS
+            if "deprecated" in keywords:
+                score -= DEPRECATED_PENALTY
+            if score > 0:
+                scores[tool_id] = score
+        order = list(tool_registry.TOOL_REGISTRY)
+        return sorted(scores, key=lambda tool_id: (-scores[tool_id], order.index(tool_id)))
+
+    def _select_relevant_locked(
+        self,
+        view: str,
+        entries: Dict[str, str],
+        query: str,
+        token_budget: Optional[int]
+    ) -> Set[str]:
+        token_counts = self._token_counts.get(view)
+        if token_counts is None and token_budget is not None:
+            token_counts = {tool_id: self.count_tokens(entry) for tool_id, entry in entries.items()}
+            self._token_counts[view] = token_counts
+
+        # Nothing matched: fill the budget in registry order rather than describing no tools
+        candidates = self._rank_locked(query) or list(entries)
+        selected: Set[str] = set()
+        used = 0
+        for tool_id in candidates:
+            if token_budget is not None:
+                if used + token_counts[tool_id] > token_budget:
+                    continue
+                used += token_counts[tool_id]
+            selected.add(tool_id)
+        return selected
+
+
+# Global catalog instance
+tool_catalog = ToolCatalog()
@@ -27,6 +27,9 @@ logger = logging.getLogger(__name__)
 # Global registry – keeps all ToolDefinition objects keyed by their tool_id
 # ---------------------------------------------------------------------------
 TOOL_REGISTRY: Dict[str, "ToolDefinition"] = {}
+# Bumped on every refresh so derived caches (e.g. tools.tool_catalog) can tell
+# when the registry they were built from is stale
+_REGISTRY_VERSION = 0
 
 # ---------------------------------------------------------------------------
 # Internal helpers
@@ -187,12 +190,18 @@ def load_tools_from_file() -> Dict[str, "ToolDefinition"]:
 
 def refresh_tool_registry() -> None:
     """Refresh the in-memory registry by re-reading *tools.json*."""
-    global TOOL_REGISTRY
+    global TOOL_REGISTRY, _REGISTRY_VERSION
     logger.info("Refreshing tool registry")
     TOOL_REGISTRY = load_tools_from_file()
+    _REGISTRY_VERSION += 1
     logger.info(f"Loaded {len(TOOL_REGISTRY)} tool definitions")
 
 
+def get_registry_version() -> int:
+    """Return the registry version, which changes whenever the registry is refreshed."""
+    return _REGISTRY_VERSION
+
+
 def get_available_tools() -> List[str]:
     """Return a list of all loaded *tool_id*s."""
     return list(TOOL_REGISTRY.keys())
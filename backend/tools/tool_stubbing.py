@@ -0,0 +1,88 @@
+"""
+Tool Stubbing
+
+Replaces real tool handlers with simulated ones, driven by the TOOL_STUBBING_*
+settings, so hop execution can be exercised and timed without calling external
+services:
+
+- TOOL_STUBBING_ENABLED: master switch (can be overridden at runtime with
+  enable_stubbing() / disable_stubbing())
+- TOOL_STUBBING_MODE: "all" stubs every tool, "external_only" only tools with
+  resource dependencies, "none" disables stubbing
+- TOOL_STUBBING_DELAY_MS: simulated handler latency
+- TOOL_STUBBING_FAILURE_RATE: probability (0.0-1.0) that a stubbed call fails
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from typing import Any, Optional, TYPE_CHECKING
+
+from config.settings import settings
+from schemas.tool_handler_schema import ToolHandlerInput, ToolHandlerResult
+
+if TYPE_CHECKING:
+    from schemas.base import SchemaType
+    from schemas.tool import ToolDefinition
+
+# Runtime override of TOOL_STUBBING_ENABLED (None = use settings)
+_stubbing_override: Optional[bool] = None
+
+_PLACEHOLDER_VALUES = {
+    "string": "stub",
+    "markdown": "stub",
+    "number": 0,
+    "boolean": False,
+}
+
+
+def enable_stubbing() -> None:
+    """Force tool stubbing on for this process"""
+    global _stubbing_override
+    _stubbing_override = True
+
+
+def disable_stubbing() -> None:
+    """Force tool stubbing off for this process"""
+    global _stubbing_override
+    _stubbing_override = False
+
+
+def is_stubbing_enabled() -> bool:
+    if _stubbing_override is not None:
+        return _stubbing_override
+    return settings.TOOL_STUBBING_ENABLED
+
+
+def should_stub_tool(tool_def: "ToolDefinition") -> bool:
+    """Whether calls to this tool should go to the stub instead of its handler"""
+    if not is_stubbing_enabled():
+        return False
+    mode = settings.TOOL_STUBBING_MODE
+    if mode == "all":
+        return True
+    if mode == "external_only":
+        return tool_def.requires_resources()
+    return False
+
+
+def _placeholder(schema: "SchemaType") -> Any:
+    if schema.is_array:
+        return []
+    if schema.type == "object":
+        return {}
+    return _PLACEHOLDER_VALUES.get(schema.type)
+
+
+async def execute_stub(tool_def: "ToolDefinition", execution_input: ToolHandlerInput) -> ToolHandlerResult:
+    """Simulate a tool call: wait TOOL_STUBBING_DELAY_MS, then fail or return placeholder outputs"""
+    await asyncio.sleep(settings.TOOL_STUBBING_DELAY_MS / 1000)
+
+    if random.random() < settings.TOOL_STUBBING_FAILURE_RATE:
+        raise Exception(f"Stubbed failure for tool {tool_def.id}")
+
+    return ToolHandlerResult(
+        outputs={output.id: _placeholder(output.schema_definition) for output in tool_def.outputs},
+        metadata={"stubbed": True, "step_id": execution_input.step_id}
+    )
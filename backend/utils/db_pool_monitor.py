@@ -0,0 +1,243 @@
+"""
+Database connection pool telemetry and leak detection.
+
+Provides instrumented pool classes that record checkout latency, the number
+of callers waiting for a connection, pool timeouts and overflow usage, plus
+pool event hooks that report connections held longer than a threshold.
+
+A connection that stays checked out while the event loop keeps running is,
+by construction, being held across an await point (or by a worker thread) -
+typically a sync Session kept open around an LLM call. The background
+monitor reports those while they are still held. Capturing the code location
+that checked each connection out walks the stack on every checkout, so it is
+only done when explicitly enabled (DB_LEAK_CAPTURE_STACKS) while hunting a leak.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import traceback
+from collections import deque
+from threading import Lock
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy import event, exc as sa_exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+logger = logging.getLogger(__name__)
+
+_THIS_FILE = os.path.abspath(__file__)
+_BACKEND_DIR = os.path.dirname(os.path.dirname(_THIS_FILE))
+
+
+_UNTRACKED_SITE = "unknown (set DB_LEAK_CAPTURE_STACKS=true to record checkout sites)"
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _checkout_site() -> str:
+    """Summarize the application frames that requested a connection."""
+    frames = [
+        f for f in traceback.extract_stack(limit=60)
+        if f.filename.startswith(_BACKEND_DIR) and f.filename != _THIS_FILE
+    ]
+    return " <- ".join(
+        f"{os.path.relpath(f.filename, _BACKEND_DIR)}:{f.lineno} {f.name}" for f in reversed(frames[-4:])
+    ) or "unknown"
+
+
+class PoolMetrics:
+    """Thread-safe counters for a single connection pool."""
+
+    def __init__(self, name: str, sample_size: int = 1000):
+        self.name = name
+        self._lock = Lock()
+        self._latencies: Deque[float] = deque(maxlen=sample_size)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.max_overflow_used = 0
+        self.long_holds = 0
+        self.leak_threshold_seconds = 0.0
+        self.capture_sites = False
+        # id(connection_record) -> {"checked_out_at", "site", "reported"}
+        self._held: Dict[int, Dict[str, Any]] = {}
+
+    def wait_started(self):
+        with self._lock:
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+
+    def wait_finished(self, latency: float, overflow: int, timed_out: bool):
+        with self._lock:
+            self.waiting -= 1
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                self._latencies.append(latency)
+            self.max_overflow_used = max(self.max_overflow_used, overflow)
+
+    def connection_checked_out(self, record_id: int):
+        entry = {"checked_out_at": time.monotonic(), "site": _UNTRACKED_SITE, "reported": False}
+        if self.leak_threshold_seconds > 0 and self.capture_sites:
+            entry["site"] = _checkout_site()
+        with self._lock:
+            self._held[record_id] = entry
+
+    def connection_checked_in(self, record_id: int):
+        with self._lock:
+            entry = self._held.pop(record_id, None)
+        if entry is None or self.leak_threshold_seconds <= 0:
+            return
+        held_for = time.monotonic() - entry["checked_out_at"]
+        if held_for > self.leak_threshold_seconds:
+            with self._lock:
+                self.long_holds += 1
+            logger.warning(
+                f"DB connection ({self.name} pool) held for {held_for:.1f}s "
+                f"(threshold {self.leak_threshold_seconds:.1f}s), checked out at: {entry['site']}"
+            )
+
+    def find_leaks(self) -> List[Dict[str, Any]]:
+        """Return connections currently held longer than the leak threshold."""
+        if self.leak_threshold_seconds <= 0:
+            return []
+        now = time.monotonic()
+        leaks = []
+        with self._lock:
+            for entry in self._held.values():
+                held_for = now - entry["checked_out_at"]
+                if held_for > self.leak_threshold_seconds:
+                    leaks.append({"held_seconds": round(held_for, 2), "site": entry["site"], "entry": entry})
+        return leaks
+
+    def snapshot(self, pool: Optional[QueuePool] = None) -> Dict[str, Any]:
+        with self._lock:
+            ordered = sorted(self._latencies)
+            data = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "waiting": self.waiting,
+                "max_waiting": self.max_waiting,
+                "max_overflow_used": self.max_overflow_used,
+                "currently_held": len(self._held),
+                "long_holds": self.long_holds,
+                "checkout_latency_ms": {
+                    "p50": round(_percentile(ordered, 50) * 1000, 2),
+                    "p95": round(_percentile(ordered, 95) * 1000, 2),
+                    "p99": round(_percentile(ordered, 99) * 1000, 2),
+                    "max": round((ordered[-1] if ordered else 0.0) * 1000, 2)
+                }
+            }
+        if pool is not None:
+            data.update({
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+                "checked_in": pool.checkedin()
+            })
+        data["leaks"] = [{k: v for k, v in leak.items() if k != "entry"} for leak in self.find_leaks()]
+        return data
+
+
+# Metrics registry, keyed by pool class metrics name
+_pool_metrics: Dict[str, PoolMetrics] = {}
+
+
+def get_pool_metrics(name: str) -> PoolMetrics:
+    if name not in _pool_metrics:
+        _pool_metrics[name] = PoolMetrics(name)
+    return _pool_metrics[name]
+
+
+def _timed_get(pool, do_get):
+    metrics = get_pool_metrics(pool.metrics_name)
+    metrics.wait_started()
+    start = time.monotonic()
+    timed_out = False
+    try:
+        return do_get()
+    except sa_exc.TimeoutError:
+        timed_out = True
+        logger.error(
+            f"DB pool '{pool.metrics_name}' exhausted: waited {time.monotonic() - start:.1f}s "
+            f"({pool.checkedout()} checked out, overflow {pool.overflow()})"
+        )
+        raise
+    finally:
+        metrics.wait_finished(time.monotonic() - start, max(0, pool.overflow()), timed_out)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records checkout latency and wait-queue depth."""
+    metrics_name = "sync"
+
+    def _do_get(self):
+        return _timed_get(self, super()._do_get)
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout latency and wait-queue depth."""
+    metrics_name = "async"
+
+    def _do_get(self):
+        return _timed_get(self, super()._do_get)
+
+
+def attach_leak_detection(engine: Engine, metrics_name: str, threshold_seconds: float, capture_sites: bool = False):
+    """
+    Track how long each connection stays checked out from an engine's pool.
+
+    Args:
+        engine: Sync engine (use AsyncEngine.sync_engine for async engines)
+        metrics_name: Metrics registry key for the engine's pool
+        threshold_seconds: Hold time above which a checkout is reported; 0 disables reporting
+        capture_sites: Record the calling code location on every checkout (costly; debugging only)
+    """
+    metrics = get_pool_metrics(metrics_name)
+    metrics.leak_threshold_seconds = threshold_seconds
+    metrics.capture_sites = capture_sites
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.connection_checked_out(id(connection_record))
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        metrics.connection_checked_in(id(connection_record))
+
+
+def get_pool_status(engines: Dict[str, Engine]) -> Dict[str, Any]:
+    """Snapshot metrics for the given engines, keyed by metrics name."""
+    return {
+        name: get_pool_metrics(name).snapshot(engine.pool)
+        for name, engine in engines.items()
+    }
+
+
+async def monitor_connection_leaks(interval_seconds: float = 5.0):
+    """
+    Periodically report connections that are still checked out past the
+    leak threshold. Each held connection is reported once.
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        for metrics in list(_pool_metrics.values()):
+            for leak in metrics.find_leaks():
+                if leak["entry"]["reported"]:
+                    continue
+                leak["entry"]["reported"] = True
+                logger.warning(
+                    f"Possible DB session leak ({metrics.name} pool): connection held for "
+                    f"{leak['held_seconds']:.1f}s while the event loop kept running, "
+                    f"checked out at: {leak['site']}"
+                )
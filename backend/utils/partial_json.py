@@ -0,0 +1,122 @@
+"""
+Incremental extraction of a string field from a streaming JSON object.
+
+Structured-output LLM calls stream their JSON response in arbitrary chunks.
+JsonFieldStreamer follows the JSON structure as chunks arrive and returns the
+decoded text of one top-level string field as soon as it is generated, so it
+can be forwarded to the client before the full object is complete.
+"""
+
+from typing import List, Optional
+
+_SIMPLE_ESCAPES = {
+    '"': '"',
+    '\\': '\\',
+    '/': '/',
+    'b': '\b',
+    'f': '\f',
+    'n': '\n',
+    'r': '\r',
+    't': '\t',
+}
+
+
+class JsonFieldStreamer:
+    """
+    Stream the value of a top-level string field out of a partial JSON object.
+
+    Usage:
+        streamer = JsonFieldStreamer("response_content")
+        for chunk in chunks:
+            text = streamer.feed(chunk)   # newly available field text, may be ""
+    """
+
+    def __init__(self, field_name: str):
+        self.field_name = field_name
+        self._depth = 0
+        self._in_string = False
+        self._escape: Optional[str] = None  # Pending escape sequence after the backslash
+        self._pending_high_surrogate: Optional[int] = None
+        self._string_chars: List[str] = []  # Current top-level key being read
+        self._reading_key = False
+        self._expect_key = False  # Next top-level string is a key
+        self._current_key: Optional[str] = None
+        self._in_target = False
+        self.complete = False  # Target field's closing quote was seen
+
+    def feed(self, chunk: str) -> str:
+        """Consume the next chunk and return any newly decoded text of the target field."""
+        emitted: List[str] = []
+        for char in chunk:
+            if self._in_string:
+                self._consume_string_char(char, emitted)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_chars = []
+                is_key = self._depth == 1 and self._expect_key
+                self._in_target = (
+                    self._depth == 1 and not is_key and self._current_key == self.field_name
+                )
+                self._reading_key = is_key
+            elif char in '{[':
+                self._depth += 1
+                self._expect_key = self._depth == 1 and char == '{'
+            elif char in '}]':
+                self._depth -= 1
+            elif char == ',' and self._depth == 1:
+                self._expect_key = True
+                self._current_key = None
+            elif char == ':' and self._depth == 1:
+                self._expect_key = False
+        return ''.join(emitted)
+
+    def _consume_string_char(self, char: str, emitted: List[str]):
+        if self._escape is not None:
+            self._escape += char
+            decoded = self._decode_escape()
+            if decoded is None:
+                return
+            self._escape = None
+            self._append(decoded, emitted)
+            return
+
+        if char == '\\':
+            self._escape = ''
+        elif char == '"':
+            self._in_string = False
+            if self._reading_key:
+                self._current_key = ''.join(self._string_chars)
+                self._expect_key = False
+            elif self._in_target:
+                self._in_target = False
+                self.complete = True
+        else:
+            self._append(char, emitted)
+
+    def _decode_escape(self) -> Optional[str]:
+        """Decode the pending escape, or return None if more characters are needed."""
+        escape = self._escape
+        if escape[0] != 'u':
+            return _SIMPLE_ESCAPES.get(escape[0], escape[0])
+        if len(escape) < 5:
+            return None
+        try:
+            code_point = int(escape[1:5], 16)
+        except ValueError:
+            return ''
+        if 0xD800 <= code_point <= 0xDBFF:
+            self._pending_high_surrogate = code_point
+            return ''
+        if 0xDC00 <= code_point <= 0xDFFF and self._pending_high_surrogate is not None:
+            high = self._pending_high_surrogate
+            self._pending_high_surrogate = None
+            return chr(0x10000 + ((high - 0xD800) << 10) + (code_point - 0xDC00))
+        return chr(code_point)
+
+    def _append(self, text: str, emitted: List[str]):
+        if self._reading_key:
+            self._string_chars.append(text)
+        elif self._in_target:
+            emitted.append(text)
@@ -0,0 +1,54 @@
+"""
+Shared scaffolding for the small SQLite files that the workers on one host
+use to share state (provider health, SerpAPI responses, DOI abstracts,
+embeddings, the article index metadata).
+
+The file is put in WAL mode so readers don't block the writer, every
+operation opens a short-lived autocommit connection (connections are never
+shared between threads or processes), and read-modify-write sequences take
+the write lock up front with BEGIN IMMEDIATE so two workers can't interleave.
+Every call blocks on disk and possibly on another worker's write lock, so
+async code goes through run(), which executes it in a worker thread.
+"""
+
+import asyncio
+import sqlite3
+from contextlib import closing, contextmanager
+from typing import Any, Callable, Iterator, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+class SQLiteStore:
+    """Base class for a SQLite file shared between processes"""
+
+    def __init__(self, path: str, schema: Sequence[str] = (), timeout: float = 5):
+        self.path = path
+        self.timeout = timeout
+        with self.connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            for statement in schema:
+                conn.execute(statement)
+
+    @contextmanager
+    def connect(self) -> Iterator[sqlite3.Connection]:
+        """Autocommit connection, closed on exit"""
+        with closing(sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)) as conn:
+            yield conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Connection holding the write lock; commits on exit, rolls back on error"""
+        with self.connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    @staticmethod
+    async def run(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking store call off the event loop"""
+        return await asyncio.to_thread(fn, *args, **kwargs)
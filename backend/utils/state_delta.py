@@ -0,0 +1,87 @@
+"""
+Agent State Delta Encoding
+
+Agent nodes report the full workflow state with most status events, but
+between two events only a handful of fields actually change. StateDeltaEncoder
+turns that sequence into one snapshot followed by RFC 6902 JSON-patch deltas,
+each tagged with a version counter so the client can verify it applies them
+in order:
+
+    {"type": "snapshot", "version": 1, "state": {...}}
+    {"type": "delta", "version": 2, "base_version": 1, "ops": [...]}
+
+The state is converted with model_dump(mode="json"), which handles datetimes
+and enums in pydantic-core instead of a recursive pure-Python pass, and events
+are serialized with orjson.
+"""
+
+from typing import Any, Dict, Optional
+
+import jsonpatch
+import orjson
+from pydantic import BaseModel
+
+# Payload key marking the full agent state (see state_payload)
+STATE_PAYLOAD_KEY = "agent_state"
+
+
+def state_payload(state: BaseModel) -> Dict[str, Any]:
+    """Wrap the agent state so the chat stream can delta-encode it"""
+    return {STATE_PAYLOAD_KEY: state.model_dump(mode="json")}
+
+
+def dumps(data: Any) -> str:
+    """Serialize an event to a JSON string"""
+    return orjson.dumps(data, default=_default).decode()
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class StateDeltaEncoder:
+    """Encodes successive agent states of one stream as a snapshot plus deltas"""
+
+    def __init__(self):
+        self.version = 0
+        self._last: Optional[Dict[str, Any]] = None
+
+    def encode(self, state: Any) -> Optional[Dict[str, Any]]:
+        """
+        Encode the next state.
+
+        Args:
+            state: Agent state, as a model or its model_dump(mode="json")
+
+        Returns:
+            A snapshot for the first state, a delta afterwards, or None if
+            nothing changed since the last encoded state
+        """
+        if isinstance(state, BaseModel):
+            state = state.model_dump(mode="json")
+
+        if self._last is None:
+            self._last = state
+            self.version += 1
+            return {"type": "snapshot", "version": self.version, "state": state}
+
+        ops = jsonpatch.make_patch(self._last, state).patch
+        if not ops:
+            return None
+
+        self._last = state
+        self.version += 1
+        return {
+            "type": "delta",
+            "version": self.version,
+            "base_version": self.version - 1,
+            "ops": ops
+        }
+
+    def encode_payload(self, payload: Any) -> Any:
+        """Replace a state payload with its snapshot/delta; other payloads pass through"""
+        if isinstance(payload, dict) and STATE_PAYLOAD_KEY in payload:
+            return self.encode(payload[STATE_PAYLOAD_KEY])
+        return payload
@@ -158,8 +158,12 @@ def extract_filter_data(result, *args, **kwargs) -> dict:
             data['filter_condition'] = request.filter_condition
         if hasattr(request, 'strictness'):
             data['strictness'] = request.strictness
-        if hasattr(request, 'articles'):
+        if getattr(request, 'articles', None):
             data['input_articles_count'] = len(request.articles)
+        if getattr(request, 'result_set_id', None):
+            data['result_set_id'] = request.result_set_id
+            if request.article_ids is not None:
+                data['input_articles_count'] = len(request.article_ids)
 
     # Extract from result (ArticleFilterResponse)
     if result:
@@ -201,8 +205,12 @@ def extract_columns_data(result, *args, **kwargs) -> dict:
                 for f in request.features
                 if hasattr(f, 'name') and hasattr(f, 'description')
             ]
-        if hasattr(request, 'articles'):
+        if getattr(request, 'articles', None):
             data['input_articles_count'] = len(request.articles)
+        if getattr(request, 'result_set_id', None):
+            data['result_set_id'] = request.result_set_id
+            if request.article_ids is not None:
+                data['input_articles_count'] = len(request.article_ids)
 
     # Extract from result (FeatureExtractionResponse)
     if result:
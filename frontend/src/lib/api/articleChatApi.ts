@@ -36,6 +36,14 @@ export interface ArticleChatStreamResponse {
     error?: string;
     article_id?: string;
     model?: string;
+    history_messages_kept?: number;
+    history_messages_dropped?: number;
+    usage?: {
+      prompt_tokens: number;
+      cached_tokens: number;
+      completion_tokens: number;
+      total_tokens: number;
+    };
   };
 }
 
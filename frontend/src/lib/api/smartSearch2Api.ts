@@ -21,6 +21,8 @@ export interface DirectSearchRequest {
     source: 'pubmed' | 'google_scholar';
     max_results?: number;
     offset?: number;
+    result_set_id?: string;  // Append this page to an existing server-side result set
+    register_result_set?: boolean;  // Register the results in a new server-side result set
 }
 
 export interface DirectSearchResponse {
@@ -28,6 +30,7 @@ export interface DirectSearchResponse {
     pagination: SearchPaginationInfo;
     source: string;
     query: string;
+    result_set_id?: string | null;  // Handle for referencing these results in filter/extract calls, when requested
 }
 
 export interface EvidenceSpecRequest {
@@ -83,7 +86,9 @@ export interface KeywordCombinationResponse {
 // Article filtering types
 export interface ArticleFilterRequest {
     filter_condition: string;
-    articles: CanonicalResearchArticle[];  // SmartSearch2 passes articles directly (no session needed)
+    articles?: CanonicalResearchArticle[];  // SmartSearch2 passes articles directly (no session needed)
+    result_set_id?: string;  // ...or references a server-side result set
+    article_ids?: string[];  // Optional subset of the result set
     strictness?: 'low' | 'medium' | 'high';
 }
 
@@ -103,7 +108,9 @@ export interface ArticleFilterResponse {
 
 // SmartSearch2-specific types (no session_id required)
 export interface FeatureExtractionRequest {
-    articles: CanonicalResearchArticle[];  // SmartSearch2 passes articles directly
+    articles?: CanonicalResearchArticle[];  // SmartSearch2 passes articles directly
+    result_set_id?: string;  // ...or references a server-side result set
+    article_ids?: string[];  // Optional subset of the result set
     features: CanonicalFeatureDefinition[];
 }
 
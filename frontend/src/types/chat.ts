@@ -96,6 +96,20 @@ export interface StreamResponsePayload {
     [key: string]: any;
 }
 
+// Agent state payloads: one snapshot per stream, then JSON-patch deltas
+export interface StateSnapshotPayload {
+    type: 'snapshot';
+    version: number;
+    state: Record<string, any>;
+}
+
+export interface StateDeltaPayload {
+    type: 'delta';
+    version: number;
+    base_version: number;
+    ops: Array<{ op: string; path: string; value?: any; from?: string }>;
+}
+
 // Core streaming response types (matches backend)
 export interface AgentResponse {
     token: string | null;